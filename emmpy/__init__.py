@@ -11,3 +11,9 @@ geomagmodel
 magmodel
 utilities
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
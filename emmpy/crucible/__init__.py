@@ -10,3 +10,9 @@ Packages
 core
 crust
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
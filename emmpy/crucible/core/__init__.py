@@ -12,3 +12,9 @@ Packages
 math
 rotations
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
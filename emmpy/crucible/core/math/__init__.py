@@ -16,3 +16,9 @@ Packages
 vectorfields
 vectorspace
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
@@ -9,3 +9,9 @@ Packages
 --------
 tests
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
@@ -14,7 +14,10 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.exceptions.abstractmethodexception import AbstractMethodException
+from emmpy.math.coordinates.vectorijk import VectorIJK
 from emmpy.math.vectorfields.vectorfield import VectorField
 
 
@@ -235,6 +238,36 @@ class DifferentiableVectorField(VectorField):
         """
         raise AbstractMethodException
 
+    def differentiateMany(self, positions):
+        """Compute the field and derivatives at an array of locations.
+
+        Compute the field and its Jacobian at each location by calling
+        differentiate() once per location. Subclasses which can work on
+        whole arrays at once should override this method.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Cartesian locations for the differentiation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Value of the field at each location.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            dF_i/dx_j at each location, indexed by [n, i, j].
+        """
+        positions = np.asarray(positions, dtype=float)
+        values = np.empty(positions.shape)
+        jacobian = np.empty(positions.shape + (3,))
+        for (i, position) in enumerate(positions):
+            r = self.differentiate(VectorIJK(position))
+            values[i] = r.f
+            jacobian[i] = [[r.dFxDx, r.dFxDy, r.dFxDz],
+                           [r.dFyDx, r.dFyDy, r.dFyDz],
+                           [r.dFzDx, r.dFzDy, r.dFzDz]]
+        return (values, jacobian)
+
 
 class Results:
     """Value and spatial derivatives of a 3-D Cartesian vector field.
@@ -3,10 +3,25 @@
 
 import unittest
 
+import numpy as np
+
 from emmpy.crucible.core.math.vectorfields.differentiablevectorfield import (
-    DifferentiableVectorField
+    DifferentiableVectorField, Results
 )
 from emmpy.exceptions.abstractmethodexception import AbstractMethodException
+from emmpy.math.coordinates.vectorijk import VectorIJK
+
+
+class ProductField(DifferentiableVectorField):
+    """The field (x*y, y*z, z*x)."""
+
+    def __init__(self):
+        pass
+
+    def differentiate(self, location):
+        (x, y, z) = (location.i, location.j, location.k)
+        return Results(VectorIJK(x*y, y*z, z*x),
+                       y, x, 0.0, 0.0, z, y, z, 0.0, x)
 
 
 class TestBuilder(unittest.TestCase):
@@ -67,6 +82,14 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(AbstractMethodException):
             DifferentiableVectorField.differentiate(None, None)
 
+    def test_differentiateMany(self):
+        """Test the differentiateMany method."""
+        positions = np.array([[1.0, 2.0, 3.0], [-1.0, 0.5, 2.0]])
+        (values, jacobian) = ProductField().differentiateMany(positions)
+        self.assertTrue(np.allclose(values[1], (-0.5, 1.0, -2.0)))
+        self.assertTrue(np.allclose(
+            jacobian[0], [[2.0, 1.0, 0.0], [0.0, 3.0, 2.0], [3.0, 0.0, 1.0]]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,8 @@
 
 import unittest
 
+import numpy as np
+
 from emmpy.crucible.core.math.vectorfields.vectorfields import scale
 from emmpy.math.coordinates.vectorijk import VectorIJK
 from emmpy.math.vectorfields.vectorfield import VectorField
@@ -48,6 +50,13 @@ class TestBuilder(unittest.TestCase):
         for i in range(3):
             self.assertAlmostEqual(v[i], vs[i])
 
+    def test_differentiateMany(self):
+        """Test the differentiateMany method."""
+        positions = np.array([[1.0, 2.0, 3.0], [-4.0, 0.5, 2.0]])
+        (values, jacobian) = scale(vf3, -1.1).differentiateMany(positions)
+        self.assertTrue(np.allclose(values, -1.1*(positions + 2)))
+        self.assertTrue(np.allclose(jacobian, -1.1*np.eye(3)))
+
 
 if __name__ == '__main__':
     unittest.main()
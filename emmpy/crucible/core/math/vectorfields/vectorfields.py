@@ -20,6 +20,102 @@ from emmpy.math.coordinates.vectorijk import VectorIJK
 from emmpy.math.vectorfields.vectorfield import VectorField
 
 
+class ScaledVectorField(VectorField):
+    """A vector field scaled by a constant factor.
+
+    The original field maintains its separate nature, and is only scaled
+    when this field is evaluated.
+
+    Attributes
+    ----------
+    field : VectorField
+        The vector field to scale.
+    scaleFactor : float
+        Scale factor to apply to vector field value.
+    """
+
+    def __init__(self, field, scaleFactor):
+        """Initialize a new ScaledVectorField object.
+
+        Initialize a new ScaledVectorField object.
+
+        Parameters
+        ----------
+        field : VectorField
+            The vector field to scale.
+        scaleFactor : float
+            Scale factor to apply to vector field value.
+        """
+        self.field = field
+        self.scaleFactor = scaleFactor
+
+    def evaluate(self, location, buffer=None):
+        """Evaluate the scaled field at a location.
+
+        Evaluate the scaled field at a location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location for evaluation.
+        buffer : VectorIJK, optional
+            Buffer to hold the result.
+
+        Returns
+        -------
+        fe : VectorIJK
+            The scaled field at location.
+        """
+        if buffer is None:
+            buffer = VectorIJK()
+        if isinstance(self.field, SphericalFieldDeformation):
+            fe = SphericalVectorField.evaluate(self.field, location, buffer)
+        else:
+            fe = self.field.evaluate(location, buffer)
+        fe *= self.scaleFactor
+        return fe
+
+    def evaluateMany(self, positions):
+        """Evaluate the scaled field at an array of positions.
+
+        Evaluate the scaled field at an array of positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The scaled field at each position.
+        """
+        values = self.field.evaluateMany(positions)
+        values *= self.scaleFactor
+        return values
+
+    def differentiateMany(self, positions):
+        """Evaluate the scaled field and its Jacobian.
+
+        Evaluate the scaled field and its Jacobian at an array of
+        positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The scaled field at each position.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the scaled field at each position.
+        """
+        (values, jacobian) = self.field.differentiateMany(positions)
+        return (self.scaleFactor*values, self.scaleFactor*jacobian)
+
+
 def scale(field, scaleFactor):
     """Create a vector field by scaling a vector field.
 
@@ -36,26 +132,8 @@ def scale(field, scaleFactor):
 
     Returns
     -------
-    vf : VectorField
+    vf : ScaledVectorField
         A VectorField that computes the scaled version of the original.
         field.
     """
-    vf = VectorField()
-
-    # This custom evaluate() method dynamically scales the original vector
-    # field and stores the result in the buffer.
-    def my_evaluate(*my_args):
-        if len(my_args) == 1:
-            (location,) = my_args
-            buffer = VectorIJK()
-        else:
-            (location, buffer) = my_args
-        if isinstance(field, SphericalFieldDeformation):
-            fe = SphericalVectorField.evaluate(field, location, buffer)
-        else:
-            fe = field.evaluate(location, buffer)
-        fe *= scaleFactor
-        return fe
-
-    vf.evaluate = my_evaluate
-    return vf
+    return ScaledVectorField(field, scaleFactor)
@@ -10,3 +10,9 @@ Packages
 --------
 tests
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
@@ -7,3 +7,9 @@ Packages
 --------
 vectorfieldsij
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
@@ -4,6 +4,11 @@ This class defines a differentiable scalar field in 2 dimensions.
 """
 
 
+import numpy as np
+
+from emmpy.math.coordinates.vectorij import VectorIJ
+
+
 class DifferentiableScalarFieldIJ:
     """The value and derivatives of a 2-D scalar field.
 
@@ -51,6 +56,69 @@ class DifferentiableScalarFieldIJ:
         self.differentiateFDi = iDerivativeFunction
         self.differentiateFDj = jDerivativeFunction
 
+    def evaluateMany(self, positions):
+        """Evaluate the scalar field at an array of positions.
+
+        Evaluate the scalar field at an array of positions. This default
+        implementation calls the evaluation function once per position.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 2)
+            Positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N,)
+            Field values at the positions.
+        """
+        return np.array(
+            [self.evaluate(VectorIJ(i, j)) for (i, j) in positions],
+            dtype=float
+        )
+
+    def differentiateFDiMany(self, positions):
+        """Evaluate the i-derivative at an array of positions.
+
+        Evaluate the i-derivative at an array of positions. This default
+        implementation calls the derivative function once per position.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 2)
+            Positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N,)
+            Derivative values at the positions.
+        """
+        return np.array(
+            [self.differentiateFDi(VectorIJ(i, j)) for (i, j) in positions],
+            dtype=float
+        )
+
+    def differentiateFDjMany(self, positions):
+        """Evaluate the j-derivative at an array of positions.
+
+        Evaluate the j-derivative at an array of positions. This default
+        implementation calls the derivative function once per position.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 2)
+            Positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N,)
+            Derivative values at the positions.
+        """
+        return np.array(
+            [self.differentiateFDj(VectorIJ(i, j)) for (i, j) in positions],
+            dtype=float
+        )
+
     @staticmethod
     def createConstant(constant):
         """Create a constant differentiable scalar field.
@@ -68,10 +136,130 @@ class DifferentiableScalarFieldIJ:
         dsfij : DifferentiableScalarFieldIJ
             The constant differentiable 2-D scalar field.
         """
-        evaluateFunction = lambda location: constant
-        iDerivativeFunction = lambda location: 0
-        jDerivativeFunction = lambda location: 0
-        dsfij = DifferentiableScalarFieldIJ(
-            evaluateFunction, iDerivativeFunction, jDerivativeFunction
-        )
-        return dsfij
+        return ConstantScalarFieldIJ(constant)
+
+
+class ConstantScalarFieldIJ(DifferentiableScalarFieldIJ):
+    """A constant differentiable 2-D scalar field.
+
+    The derivatives of the constant field are always 0.
+
+    Attributes
+    ----------
+    constant : float
+        The constant field value.
+    """
+
+    def __init__(self, constant):
+        """Initialize a new ConstantScalarFieldIJ object.
+
+        Initialize a new ConstantScalarFieldIJ object.
+
+        Parameters
+        ----------
+        constant : float
+            The constant field value.
+        """
+        self.constant = constant
+
+    def evaluate(self, location):
+        """Evaluate the field at a position.
+
+        Evaluate the field at a position.
+
+        Parameters
+        ----------
+        location : VectorIJ
+            Position for evaluation.
+
+        Returns
+        -------
+        result : float
+            The constant field value.
+        """
+        return self.constant
+
+    def differentiateFDi(self, location):
+        """Evaluate the i-derivative at a position.
+
+        Evaluate the i-derivative at a position.
+
+        Parameters
+        ----------
+        location : VectorIJ
+            Position for evaluation.
+
+        Returns
+        -------
+        result : int
+            Always 0.
+        """
+        return 0
+
+    def differentiateFDj(self, location):
+        """Evaluate the j-derivative at a position.
+
+        Evaluate the j-derivative at a position.
+
+        Parameters
+        ----------
+        location : VectorIJ
+            Position for evaluation.
+
+        Returns
+        -------
+        result : int
+            Always 0.
+        """
+        return 0
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of positions.
+
+        Evaluate the field at an array of positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 2)
+            Positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N,)
+            The constant field value at each position.
+        """
+        return np.full(len(positions), float(self.constant))
+
+    def differentiateFDiMany(self, positions):
+        """Evaluate the i-derivative at an array of positions.
+
+        Evaluate the i-derivative at an array of positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 2)
+            Positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N,)
+            Always 0.
+        """
+        return np.zeros(len(positions))
+
+    def differentiateFDjMany(self, positions):
+        """Evaluate the j-derivative at an array of positions.
+
+        Evaluate the j-derivative at an array of positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 2)
+            Positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N,)
+            Always 0.
+        """
+        return np.zeros(len(positions))
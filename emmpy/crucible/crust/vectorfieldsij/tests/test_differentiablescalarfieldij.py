@@ -3,6 +3,8 @@
 
 import unittest
 
+import numpy as np
+
 from emmpy.crucible.crust.vectorfieldsij.differentiablescalarfieldij import (
     DifferentiableScalarFieldIJ
 )
@@ -45,6 +47,29 @@ class TestBuilder(unittest.TestCase):
         self.assertAlmostEqual(dsfij.differentiateFDi(location), 0)
         self.assertAlmostEqual(dsfij.differentiateFDj(location), 0)
 
+    def test_evaluateMany(self):
+        """Test the array evaluation methods."""
+        positions = np.array([[x, y], [-y, 0.5]])
+        dsfij = DifferentiableScalarFieldIJ(
+            lambda location: location[0]**2 + location[1]**3,
+            lambda location: 2*location[0],
+            lambda location: 3*location[1]**2
+        )
+        self.assertTrue(np.allclose(
+            dsfij.evaluateMany(positions),
+            positions[:, 0]**2 + positions[:, 1]**3
+        ))
+        self.assertTrue(np.allclose(
+            dsfij.differentiateFDiMany(positions), 2*positions[:, 0]
+        ))
+        self.assertTrue(np.allclose(
+            dsfij.differentiateFDjMany(positions), 3*positions[:, 1]**2
+        ))
+        dsfij = DifferentiableScalarFieldIJ.createConstant(1.9)
+        self.assertTrue(np.allclose(dsfij.evaluateMany(positions), 1.9))
+        self.assertTrue(np.allclose(dsfij.differentiateFDiMany(positions), 0))
+        self.assertTrue(np.allclose(dsfij.differentiateFDjMany(positions), 0))
+
 
 if __name__ == "__main__":
     unittest.main()
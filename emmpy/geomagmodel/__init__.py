@@ -7,5 +7,12 @@ Packages
 --------
 t01
 tests
+tracing
 ts07
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
@@ -7,3 +7,9 @@ Packages
 --------
 deformation
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
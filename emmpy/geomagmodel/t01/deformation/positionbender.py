@@ -184,3 +184,58 @@ class PositionBender:
                           dYsDx, dYsDy, dYsDz,
                           dZsDx, dZsDy, dZsDz)
         return results
+
+    def differentiateMany(self, positions):
+        """Compute the deformation and its Jacobian at many locations.
+
+        Compute the deformed location and its Jacobian at each of an array
+        of Cartesian locations, with the same formulas as differentiate().
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Cartesian locations to compute the deformation.
+
+        Returns
+        -------
+        deformed : np.ndarray of float, shape (N, 3)
+            Deformed (starred) location for each location.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the deformation, indexed as [n, i, j] for the
+            derivative of deformed component i with respect to original
+            component j.
+        """
+        positions = np.asarray(positions, dtype=float)
+        (x, y, z) = positions.T
+        r = np.linalg.norm(positions, axis=-1)
+        z_r = z/r
+
+        # Tsy. 1998 eq. 12 and eq. 10, as in differentiate().
+        rh = self.rh0 + RH2*z_r**2
+        r_rh = r/rh
+        Q = 1/(1 + r_rh**EPSILON)**(1/EPSILON)
+        sinTiltS = self.sinTilt*Q
+        cosTiltS = np.sqrt(1 - sinTiltS**2)
+        xS = x*cosTiltS - z*sinTiltS
+        zS = x*sinTiltS + z*cosTiltS
+
+        # Gradient of Q.
+        dRhDr = -2*RH2*z_r**2/r
+        dRhDz = 2*RH2*z_r/r
+        fr = -r_rh**(EPSILON - 1)*Q**(EPSILON + 1)/rh
+        dQdRh = -r_rh*fr
+        dQdr = fr - fr*r_rh*dRhDr
+        gradQ = (dQdr/r)[:, np.newaxis]*positions
+        gradQ[:, 2] += dQdRh*dRhDz
+        gradQ *= (self.sinTilt/cosTiltS)[:, np.newaxis]
+
+        deformed = np.stack((xS, y, zS), axis=-1)
+        jacobian = np.zeros(positions.shape + (3,))
+        jacobian[:, 0] = -zS[:, np.newaxis]*gradQ
+        jacobian[:, 2] = xS[:, np.newaxis]*gradQ
+        jacobian[:, 0, 0] += cosTiltS
+        jacobian[:, 0, 2] -= sinTiltS
+        jacobian[:, 1, 1] = 1.0
+        jacobian[:, 2, 0] += sinTiltS
+        jacobian[:, 2, 2] += cosTiltS
+        return (deformed, jacobian)
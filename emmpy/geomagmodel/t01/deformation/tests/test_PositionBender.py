@@ -4,9 +4,12 @@
 from math import sin
 import unittest
 
+import numpy as np
+
 from emmpy.geomagmodel.t01.deformation.positionbender import (
     PositionBender
 )
+from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
 class TestBuilder(unittest.TestCase):
@@ -29,6 +32,21 @@ class TestBuilder(unittest.TestCase):
         """Test the differentiate method."""
         pass
 
+    def test_differentiateMany(self):
+        """Test the differentiateMany method."""
+        pb = PositionBender(0.3, 8.0)
+        rng = np.random.default_rng(5)
+        positions = rng.uniform(-10.0, 10.0, (6, 3))
+        (deformed, jacobian) = pb.differentiateMany(positions)
+        self.assertEqual(jacobian.shape, (6, 3, 3))
+        for (p, f, j) in zip(positions, deformed, jacobian):
+            r = pb.differentiate(VectorIJK(p))
+            self.assertTrue(np.allclose(f, r.f))
+            self.assertTrue(np.allclose(j, [
+                [r.dFxDx, r.dFxDy, r.dFxDz],
+                [r.dFyDx, r.dFyDy, r.dFyDz],
+                [r.dFzDx, r.dFzDy, r.dFzDz]]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,11 @@
 import unittest
 
+import numpy as np
+
 from emmpy.geomagmodel.t01.deformation.twistwarpffunction import (
     TwistWarpFfunction
 )
+from emmpy.math.coordinates.cylindricalvector import CylindricalVector
 
 
 class TestBuilder(unittest.TestCase):
@@ -13,6 +16,21 @@ class TestBuilder(unittest.TestCase):
     def test_deformField(self):
         pass
 
+    def test_differentiateMany(self):
+        f = TwistWarpFfunction(3.0, 0.1, 0.4)
+        rng = np.random.default_rng(6)
+        locations = rng.uniform((0.0, 0.0, -20.0), (30.0, 6.0, 10.0), (6, 3))
+        locations[0, 0] = 0.0
+        (deformed, jacobian) = f.differentiateMany(locations)
+        self.assertEqual(jacobian.shape, (6, 3, 3))
+        for (p, d, j) in zip(locations, deformed, jacobian):
+            r = f.differentiate(CylindricalVector(*p))
+            self.assertTrue(np.allclose(d, r.f))
+            self.assertTrue(np.allclose(j, [
+                [r.dFrDr, r.dFrDp, r.dFrDz],
+                [r.dFpDr, r.dFpDp, r.dFpDz],
+                [r.dFzDr, r.dFzDp, r.dFzDz]]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -11,6 +11,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import cos, sin
 
+import numpy as np
+
 from emmpy.magmodel.core.math.coords.cylindricalcoordsxaligned import (
     CylindricalCoordsXAligned
 )
@@ -180,3 +182,58 @@ class TwistWarpFfunction:
             dF_dRho, dF_dPhi, dF_dx,
             dx_dRho, dx_dPhi, dx_dx
         )
+
+    def differentiateMany(self, locations):
+        """Evaluate the twist and warp transformation at many locations.
+
+        Compute the deformed location and its Jacobian at each of an array
+        of modified cylindrical locations, with the same formulas as
+        differentiate().
+
+        Parameters
+        ----------
+        locations : array-like of float, shape (N, 3)
+            Cylindrical (rho, phi, x) locations to perform the
+            differentiation.
+
+        Returns
+        -------
+        deformed : np.ndarray of float, shape (N, 3)
+            Deformed (rho, F, x) location for each location.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the deformation, indexed as [n, i, j] for the
+            derivative of deformed component i with respect to original
+            component j.
+        """
+        locations = np.asarray(locations, dtype=float)
+        (rho, phi, x) = locations.T
+        rho = np.where(rho == 0.0, 1.0E-14, rho)
+        rho2 = rho*rho
+        sinPhi = np.sin(phi)
+        cosPhi = np.cos(phi)
+        xL4 = TwistWarpFfunction.xL**4
+        rho4L4 = rho/(rho2*rho2 + xL4)
+
+        # Calculate F (the adjusted phi measurement) and its derivatives
+        F = (
+            phi + self.warpParam*rho2*rho4L4*cosPhi*self.sinDipoleTilt +
+            self.twistParam*x
+        )
+        jacobian = np.zeros(locations.shape + (3,))
+        jacobian[:, 0, 0] = 1.0
+        jacobian[:, 1, 0] = (
+            self.warpParam*rho4L4*rho4L4*(3*xL4 - rho2*rho2) *
+            cosPhi*self.sinDipoleTilt
+        )
+        jacobian[:, 1, 1] = (
+            1 - self.warpParam*rho2*rho4L4*sinPhi*self.sinDipoleTilt
+        )
+        jacobian[:, 1, 2] = (
+            rho4L4*cosPhi*self.sinDipoleTilt *
+            (TwistWarpFfunction.dG_dx*rho2 - self.warpParam*rho*rho4L4*4 *
+             TwistWarpFfunction.xL**3*TwistWarpFfunction.dxL_dx) +
+            self.twistParam
+        )
+        jacobian[:, 2, 2] = 1.0
+        deformed = np.stack((rho, F, x), axis=-1)
+        return (deformed, jacobian)
@@ -0,0 +1,18 @@
+"""Trace magnetic field lines through the geomagnetic field models.
+
+Modules
+-------
+boundaries.py
+dipolefield.py
+fieldlinetracer.py
+
+Packages
+--------
+tests
+"""
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
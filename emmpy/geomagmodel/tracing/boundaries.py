@@ -0,0 +1,198 @@
+"""Boundaries which stop the tracing of field lines.
+
+Boundaries which stop the tracing of field lines.
+
+Each boundary encloses the region in which field lines are traced, and
+has a contains() method which tests an array of positions at once. A
+field line stops when it leaves the region enclosed by any of the
+boundaries. Positions are in Earth radii, in GSM coordinates.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import numpy as np
+
+
+class SphereBoundary:
+    """A spherical boundary about the origin.
+
+    Encloses the region outside a sphere about the origin, such as the
+    surface of the Earth or the top of the ionosphere. Field lines which
+    reach it are stopped at their footpoints.
+
+    Attributes
+    ----------
+    radius : float
+        Radius of the sphere.
+    """
+
+    def __init__(self, radius):
+        """Initialize a new SphereBoundary object.
+
+        Initialize a new SphereBoundary object.
+
+        Parameters
+        ----------
+        radius : float
+            Radius of the sphere.
+
+        Raises
+        ------
+        ValueError
+            If radius is not positive.
+        """
+        if radius <= 0:
+            raise ValueError("radius must be positive, got %r" % radius)
+        self.radius = radius
+
+    def contains(self, positions):
+        """Test if positions are outside the sphere.
+
+        Test if positions are outside the sphere.
+
+        Parameters
+        ----------
+        positions : np.ndarray of float, shape (N, 3)
+            The positions to test.
+
+        Returns
+        -------
+        result : np.ndarray of bool, shape (N,)
+            True for each position outside the sphere.
+        """
+        return np.einsum("ij,ij->i", positions, positions) > self.radius**2
+
+
+class BoxBoundary:
+    """A rectangular box boundary.
+
+    Encloses the region inside an axis-aligned box.
+
+    Attributes
+    ----------
+    lower : np.ndarray of float, shape (3,)
+        Lower x, y and z limits of the box.
+    upper : np.ndarray of float, shape (3,)
+        Upper x, y and z limits of the box.
+    """
+
+    def __init__(self, lower, upper):
+        """Initialize a new BoxBoundary object.
+
+        Initialize a new BoxBoundary object.
+
+        Parameters
+        ----------
+        lower : array-like of float, shape (3,)
+            Lower x, y and z limits of the box.
+        upper : array-like of float, shape (3,)
+            Upper x, y and z limits of the box.
+
+        Raises
+        ------
+        ValueError
+            If a lower limit is not less than its upper limit.
+        """
+        self.lower = np.array(lower, dtype=float)
+        self.upper = np.array(upper, dtype=float)
+        if not np.all(self.lower < self.upper):
+            raise ValueError("lower limits %s must be less than upper "
+                             "limits %s" % (self.lower, self.upper))
+
+    def contains(self, positions):
+        """Test if positions are inside the box.
+
+        Test if positions are inside the box.
+
+        Parameters
+        ----------
+        positions : np.ndarray of float, shape (N, 3)
+            The positions to test.
+
+        Returns
+        -------
+        result : np.ndarray of bool, shape (N,)
+            True for each position inside the box.
+        """
+        return np.all((positions > self.lower) & (positions < self.upper),
+                      axis=1)
+
+
+class MagnetopauseBoundary:
+    """The T96 magnetopause.
+
+    Encloses the region inside the magnetopause of the T96 model, which is
+    also used by the TS07D model. The dayside magnetopause is a prolate
+    ellipsoid of revolution about the x-axis, and the tail magnetopause is
+    a cylinder, and both scale with the solar wind dynamic pressure as
+    Pdyn**-0.14. The shape does not bend with the dipole tilt.
+
+    See Tsyganenko 1995, section 2.5, and the T96_MGNP subroutine.
+
+    Attributes
+    ----------
+    dynamicPressure : float
+        Solar wind dynamic pressure (nPa).
+    a : float
+        Scale length of the ellipsoidal coordinates.
+    x0 : float
+        x-coordinate of the center of the ellipsoidal coordinates.
+    xm : float
+        x-coordinate where the tail cylinder begins.
+    """
+
+    # Parameters of the magnetopause for a dynamic pressure of 2 nPa.
+    a0 = 70.0
+    s0 = 1.08
+    x00 = 5.48
+
+    def __init__(self, dynamicPressure):
+        """Initialize a new MagnetopauseBoundary object.
+
+        Initialize a new MagnetopauseBoundary object.
+
+        Parameters
+        ----------
+        dynamicPressure : float
+            Solar wind dynamic pressure (nPa).
+
+        Raises
+        ------
+        ValueError
+            If dynamicPressure is not positive.
+        """
+        if dynamicPressure <= 0:
+            raise ValueError(
+                "dynamicPressure must be positive, got %r" % dynamicPressure)
+        self.dynamicPressure = dynamicPressure
+        scale = (dynamicPressure/2)**0.14
+        self.a = MagnetopauseBoundary.a0/scale
+        self.x0 = MagnetopauseBoundary.x00/scale
+        self.xm = self.x0 - self.a
+
+    def contains(self, positions):
+        """Test if positions are inside the magnetopause.
+
+        Test if positions are inside the magnetopause.
+
+        Parameters
+        ----------
+        positions : np.ndarray of float, shape (N, 3)
+            The positions to test.
+
+        Returns
+        -------
+        result : np.ndarray of bool, shape (N,)
+            True for each position inside the magnetopause.
+        """
+        s0 = MagnetopauseBoundary.s0
+        x = positions[:, 0]
+        rho = np.hypot(positions[:, 1], positions[:, 2])
+        xksi = (x - self.x0)/self.a + 1
+        xdzt = rho/self.a
+        sigma = 0.5*(np.hypot(1 + xksi, xdzt) + np.hypot(1 - xksi, xdzt))
+        return np.where(x < self.xm, rho < self.a*np.sqrt(s0**2 - 1),
+                        sigma < s0)
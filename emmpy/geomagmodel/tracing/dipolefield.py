@@ -0,0 +1,142 @@
+"""The Earth's internal dipole field.
+
+The Earth's internal dipole field.
+
+The dipole field in GSM coordinates, for a dipole tilted by the dipole
+tilt angle in the x-z plane, from the DIP subroutine of the Tsyganenko
+models. Positions are in Earth radii, and the field is in nT.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+from math import cos, sin
+
+import numpy as np
+
+from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.vectorfield import VectorField
+
+
+# Magnitude of the dipole field at the equator on the Earth's surface (nT),
+# as used by the DIP subroutine of the Tsyganenko models.
+DEFAULT_DIPOLE_STRENGTH = 30115.0
+
+
+class DipoleField(VectorField):
+    """The Earth's internal dipole field.
+
+    The field of a dipole at the origin, whose axis is tilted from the
+    GSM z-axis toward the x-axis by the dipole tilt angle. The field
+    points northward (+z) on the equator.
+
+    Attributes
+    ----------
+    dipoleTiltAngle : float
+        Dipole tilt angle (radians).
+    dipoleStrength : float
+        Magnitude of the field at the equator at a distance of 1.
+    """
+
+    def __init__(self, dipoleTiltAngle, dipoleStrength=DEFAULT_DIPOLE_STRENGTH):
+        """Initialize a new DipoleField object.
+
+        Initialize a new DipoleField object.
+
+        Parameters
+        ----------
+        dipoleTiltAngle : float
+            Dipole tilt angle (radians).
+        dipoleStrength : float, optional
+            Magnitude of the field at the equator at a distance of 1.
+        """
+        self.dipoleTiltAngle = dipoleTiltAngle
+        self.dipoleStrength = dipoleStrength
+
+    def evaluate(self, location, buffer=None):
+        """Evaluate the dipole field at a location.
+
+        Evaluate the dipole field at a location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location for evaluation.
+        buffer : VectorIJK, optional
+            Buffer to hold the result.
+
+        Returns
+        -------
+        buffer : VectorIJK
+            The dipole field at location.
+        """
+        if buffer is None:
+            buffer = VectorIJK()
+        buffer[:] = self.evaluateMany(np.reshape(location, (1, 3)))[0]
+        return buffer
+
+    def evaluateMany(self, positions):
+        """Evaluate the dipole field at an array of positions.
+
+        Evaluate the dipole field at an array of positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The dipole field at each position.
+        """
+        positions = np.asarray(positions, dtype=float)
+        (x, y, z) = (positions[:, 0], positions[:, 1], positions[:, 2])
+        sps = sin(self.dipoleTiltAngle)
+        cps = cos(self.dipoleTiltAngle)
+        (p, t, u) = (x*x, y*y, z*z)
+        v = 3*z*x
+        q = self.dipoleStrength/np.sqrt(p + t + u)**5
+        values = np.empty(positions.shape)
+        values[:, 0] = q*((t + u - 2*p)*sps - v*cps)
+        values[:, 1] = -3*y*q*(x*sps + z*cps)
+        values[:, 2] = q*((p + t - 2*u)*cps - v*sps)
+        return values
+
+    def differentiateMany(self, positions):
+        """Evaluate the dipole field and its Jacobian.
+
+        Evaluate the dipole field and its Jacobian at an array of
+        positions. For the dipole moment m, the field is
+        B = S*(3*(m.r)*r - m*r**2)/r**5, which is differentiated
+        analytically.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The dipole field at each position.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            dB_i/dx_j at each position, indexed by [n, i, j].
+        """
+        positions = np.asarray(positions, dtype=float)
+        m = -np.array([sin(self.dipoleTiltAngle), 0.0,
+                       cos(self.dipoleTiltAngle)])
+        r2 = np.sum(positions*positions, axis=-1)[:, np.newaxis]
+        mr = positions.dot(m)[:, np.newaxis]
+        q = self.dipoleStrength/r2**2.5
+        values = q*(3*mr*positions - m*r2)
+        jacobian = (
+            q[..., np.newaxis]*(
+                3*positions[:, :, np.newaxis]*m +
+                3*mr[..., np.newaxis]*np.eye(3) -
+                2*m[:, np.newaxis]*positions[:, np.newaxis, :]) -
+            5*values[:, :, np.newaxis]*(positions/r2)[:, np.newaxis, :]
+        )
+        return (values, jacobian)
@@ -0,0 +1,524 @@
+"""Trace magnetic field lines through a model field.
+
+Trace magnetic field lines through a model field.
+
+A FieldLineTracer advances many field lines at once with the adaptive
+Dormand-Prince 5(4) Runge-Kutta method. The lines are integrated in arc
+length along the unit vector of the field, so the step size is a distance
+(Earth radii). At each stage of the method, the field is evaluated for all
+of the active lines with a single call to evaluateMany(), and each line
+has its own step size. Lines which stop are dropped from the active set,
+so the cost of each step falls as the lines finish.
+
+A line stops when it leaves the region enclosed by the boundaries: the
+inner sphere (usually the Earth or the ionosphere) and any outer
+boundaries, such as the magnetopause or a box around the model domain.
+It also stops after a maximum number of steps, or where the field is zero
+or cannot be evaluated.
+
+The external field models do not include the Earth's internal field, so
+their field lines do not close. Give a dipole tilt angle to add the
+internal dipole field to the model field.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import numpy as np
+
+from emmpy.geomagmodel.tracing.boundaries import SphereBoundary
+from emmpy.geomagmodel.tracing.dipolefield import DipoleField
+from emmpy.math.vectorfields.vectorfield import add
+
+
+# Reasons a field line stopped. ACTIVE is only used while tracing.
+ACTIVE = -1
+INNER_BOUNDARY = 0
+OUTER_BOUNDARY = 1
+MAX_STEPS = 2
+NULL_FIELD = 3
+
+# Classifications of field lines traced in both directions.
+CLOSED = 0
+OPEN = 1
+DETACHED = 2
+UNKNOWN = 3
+
+# Dormand-Prince 5(4) coefficients. The field does not depend on the arc
+# length, so the nodes are not needed. The last row of _A is the fifth
+# order solution, and its stage is reused as the first stage of the next
+# step.
+_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+    (35/384, 0, 500/1113, 125/192, -2187/6784, 11/84),
+)
+
+# Difference between the fifth and fourth order weights.
+_E = (71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40)
+
+# Limits on the factor by which a step size changes, and the safety
+# factor applied to the optimal step size.
+_MIN_FACTOR = 0.2
+_MAX_FACTOR = 5.0
+_SAFETY = 0.9
+
+# Number of bisections used to find where a step crosses a boundary.
+_BISECTION_ITERATIONS = 40
+
+
+def _hermite(starts, ends, startSlopes, endSlopes, steps):
+    """Return a function which interpolates within steps.
+
+    Return a function of the fraction of each step, which interpolates the
+    position within each step with the cubic Hermite polynomial matching
+    the positions and directions at both ends of the step.
+    """
+    (starts, ends) = (starts.copy(), ends.copy())
+    startSlopes = startSlopes*steps[:, np.newaxis]
+    endSlopes = endSlopes*steps[:, np.newaxis]
+
+    def interpolate(fractions):
+        t = fractions[:, np.newaxis]
+        (t2, t3) = (t*t, t*t*t)
+        return ((2*t3 - 3*t2 + 1)*starts + (t3 - 2*t2 + t)*startSlopes +
+                (3*t2 - 2*t3)*ends + (t3 - t2)*endSlopes)
+    return interpolate
+
+
+def _bisect(inside, interpolate, high):
+    """Find where interpolated steps leave a region, by bisection.
+
+    Find the fraction of each step at which the interpolated position
+    first leaves a region, given that it starts inside the region and is
+    outside it at the fraction high. Return the fraction just past the
+    crossing.
+    """
+    low = np.zeros(len(high))
+    for _ in range(_BISECTION_ITERATIONS):
+        middle = 0.5*(low + high)
+        isInside = inside(interpolate(middle))
+        low = np.where(isInside, middle, low)
+        high = np.where(isInside, high, middle)
+    return high
+
+
+class FieldLineTraces:
+    """The results of tracing a set of field lines.
+
+    Attributes
+    ----------
+    seeds : np.ndarray of float, shape (N, 3)
+        Starting point of each line.
+    directions : np.ndarray of int, shape (N,)
+        +1 for lines traced along the field, -1 for lines traced against
+        it.
+    endpoints : np.ndarray of float, shape (N, 3)
+        Last point of each line. For lines which stopped at the inner
+        boundary, this is the footpoint.
+    terminations : np.ndarray of int, shape (N,)
+        Why each line stopped: INNER_BOUNDARY, OUTER_BOUNDARY, MAX_STEPS
+        or NULL_FIELD.
+    boundaryIndices : np.ndarray of int, shape (N,)
+        For lines which stopped at an outer boundary, the index of the
+        boundary in the list of outer boundaries; otherwise -1.
+    lengths : np.ndarray of float, shape (N,)
+        Arc length of each line.
+    numSteps : np.ndarray of int, shape (N,)
+        Number of steps taken along each line.
+    equatorialCrossings : np.ndarray of float, shape (N, 3)
+        First point at which each line crosses the z=0 plane, or NaN if it
+        does not cross it.
+    paths : list of np.ndarray of float, shape (n, 3)
+        The points along each line, from the seed to the endpoint, or None
+        if the paths were not recorded.
+    """
+
+    def __init__(self, seeds, directions, endpoints, terminations,
+                 boundaryIndices, lengths, numSteps, equatorialCrossings,
+                 paths=None):
+        """Initialize a new FieldLineTraces object.
+
+        Initialize a new FieldLineTraces object.
+
+        Parameters
+        ----------
+        seeds, directions, endpoints, terminations, boundaryIndices,
+        lengths, numSteps, equatorialCrossings, paths
+            Values of the attributes of the same names.
+        """
+        self.seeds = seeds
+        self.directions = directions
+        self.endpoints = endpoints
+        self.terminations = terminations
+        self.boundaryIndices = boundaryIndices
+        self.lengths = lengths
+        self.numSteps = numSteps
+        self.equatorialCrossings = equatorialCrossings
+        self.paths = paths
+
+    def __len__(self):
+        """Return the number of lines."""
+        return len(self.seeds)
+
+    def select(self, indices):
+        """Return the results for some of the lines.
+
+        Return the results for some of the lines.
+
+        Parameters
+        ----------
+        indices : slice or array-like of int
+            Indices of the lines to select.
+
+        Returns
+        -------
+        traces : FieldLineTraces
+            The results for the selected lines.
+        """
+        paths = None
+        if self.paths is not None:
+            paths = [self.paths[i] for i in
+                     np.arange(len(self.paths))[indices]]
+        return FieldLineTraces(
+            self.seeds[indices], self.directions[indices],
+            self.endpoints[indices], self.terminations[indices],
+            self.boundaryIndices[indices], self.lengths[indices],
+            self.numSteps[indices], self.equatorialCrossings[indices], paths
+        )
+
+
+class FieldLineTracer:
+    """Trace magnetic field lines through a model field.
+
+    Attributes
+    ----------
+    field : VectorField
+        The field to trace, including the dipole field if requested.
+    innerBoundary : SphereBoundary
+        The inner boundary, or None.
+    boundaries : list
+        The outer boundaries. Each has a contains() method which returns
+        True for each position inside the region it encloses.
+    tolerance : float
+        Relative and absolute error tolerance of each step.
+    initialStep : float
+        Size of the first step along each line.
+    minStep : float
+        Smallest step size. Steps of this size are always accepted.
+    maxStep : float
+        Largest step size.
+    maxSteps : int
+        Largest number of steps along each line.
+    """
+
+    def __init__(self, field, innerRadius=1.0, boundaries=(),
+                 dipoleTiltAngle=None, tolerance=1e-6, initialStep=0.1,
+                 minStep=1e-4, maxStep=1.0, maxSteps=10000):
+        """Initialize a new FieldLineTracer object.
+
+        Initialize a new FieldLineTracer object.
+
+        Parameters
+        ----------
+        field : VectorField
+            The field to trace. It should implement evaluateMany() for
+            whole arrays of positions.
+        innerRadius : float, optional
+            Radius of the inner boundary, or None for no inner boundary.
+        boundaries : iterable, optional
+            The outer boundaries, such as a MagnetopauseBoundary or a
+            BoxBoundary.
+        dipoleTiltAngle : float, optional
+            If given, the internal dipole field for this dipole tilt angle
+            (radians) is added to the field.
+        tolerance : float, optional
+            Relative and absolute error tolerance of each step.
+        initialStep : float, optional
+            Size of the first step along each line.
+        minStep : float, optional
+            Smallest step size.
+        maxStep : float, optional
+            Largest step size.
+        maxSteps : int, optional
+            Largest number of steps along each line.
+
+        Raises
+        ------
+        ValueError
+            If the tolerance or step sizes are not positive, or are out of
+            order.
+        """
+        if tolerance <= 0:
+            raise ValueError("tolerance must be positive, got %r" % tolerance)
+        if not 0 < minStep <= initialStep <= maxStep:
+            raise ValueError(
+                "Step sizes must satisfy 0 < minStep <= initialStep <= "
+                "maxStep, got %r, %r, %r" % (minStep, initialStep, maxStep))
+        if dipoleTiltAngle is not None:
+            field = add(field, DipoleField(dipoleTiltAngle))
+        self.field = field
+        self.innerBoundary = None
+        if innerRadius is not None:
+            self.innerBoundary = SphereBoundary(innerRadius)
+        self.boundaries = list(boundaries)
+        self.tolerance = tolerance
+        self.initialStep = initialStep
+        self.minStep = minStep
+        self.maxStep = maxStep
+        self.maxSteps = maxSteps
+
+    def _direction(self, positions, signs):
+        """Return the unit vector of the field, and where it is valid."""
+        values = self.field.evaluateMany(positions)
+        magnitudes = np.sqrt(np.einsum("ij,ij->i", values, values))
+        valid = np.isfinite(magnitudes) & (magnitudes > 0)
+        scale = np.zeros(len(positions))
+        scale[valid] = signs[valid]/magnitudes[valid]
+        return (values*scale[:, np.newaxis], valid)
+
+    def _locate(self, positions):
+        """Return the first boundary each position is outside, or -1.
+
+        Boundary 0 is the inner boundary, if there is one, and the outer
+        boundaries follow it.
+        """
+        which = np.full(len(positions), -1)
+        boundaries = self.boundaries
+        if self.innerBoundary is not None:
+            boundaries = [self.innerBoundary] + boundaries
+        for (i, boundary) in enumerate(boundaries):
+            which[(which < 0) & ~boundary.contains(positions)] = i
+        return which
+
+    def _stop(self, which, terminations, boundaryIndices, indices):
+        """Record the boundaries at which lines stopped."""
+        offset = 0 if self.innerBoundary is None else 1
+        inner = which < offset
+        terminations[indices] = np.where(inner, INNER_BOUNDARY,
+                                         OUTER_BOUNDARY)
+        boundaryIndices[indices] = np.where(inner, -1, which - offset)
+
+    def _findCrossings(self, interpolate, starts):
+        """Find where steps first leave the traced region.
+
+        Bisect each step from a point inside all of the boundaries to a
+        point outside at least one of them, and return the fraction of
+        the step to just past the crossing, the point there, and the
+        boundary crossed.
+        """
+        fractions = _bisect(
+            lambda points: self._locate(points) < 0, interpolate,
+            np.ones(len(starts)))
+        points = interpolate(fractions)
+        return (fractions, points, self._locate(points))
+
+    def trace(self, seeds, direction=1, recordPaths=False):
+        """Trace field lines from an array of seed points.
+
+        Trace a field line from each seed point, along the field
+        (direction=+1) or against it (direction=-1), until it stops.
+
+        Parameters
+        ----------
+        seeds : array-like of float, shape (N, 3)
+            Starting point of each line.
+        direction : int or array-like of int, shape (N,), optional
+            +1 to trace along the field, -1 to trace against it, for all
+            of the lines or for each line.
+        recordPaths : bool, optional
+            True to record the points along each line.
+
+        Returns
+        -------
+        traces : FieldLineTraces
+            The results for each line.
+        """
+        seeds = np.array(seeds, dtype=float).reshape(-1, 3)
+        numLines = len(seeds)
+        directions = np.array(np.broadcast_to(direction, (numLines,)),
+                              dtype=int)
+        endpoints = seeds.copy()
+        terminations = np.full(numLines, ACTIVE)
+        boundaryIndices = np.full(numLines, -1)
+        lengths = np.zeros(numLines)
+        numSteps = np.zeros(numLines, dtype=int)
+        equatorialCrossings = np.full((numLines, 3), np.nan)
+        onEquator = seeds[:, 2] == 0
+        equatorialCrossings[onEquator] = seeds[onEquator]
+        pathIndices = [np.arange(numLines)]
+        pathPoints = [seeds]
+
+        # Lines which start outside the traced region stop at once.
+        which = self._locate(seeds)
+        outside = which >= 0
+        self._stop(which[outside], terminations, boundaryIndices,
+                   np.flatnonzero(outside))
+        indices = np.flatnonzero(~outside)
+        (k1, valid) = self._direction(seeds[indices], directions[indices])
+        terminations[indices[~valid]] = NULL_FIELD
+        (indices, k1) = (indices[valid], k1[valid])
+        positions = seeds[indices]
+        signs = directions[indices]
+        steps = np.full(len(indices), float(self.initialStep))
+
+        while len(indices) > 0:
+            # Evaluate the stages for all active lines together.
+            k = [k1]
+            good = np.ones(len(indices), dtype=bool)
+            for a in _A[1:]:
+                stagePositions = positions + steps[:, np.newaxis]*sum(
+                    c*ki for (c, ki) in zip(a, k) if c != 0)
+                (ks, valid) = self._direction(stagePositions, signs)
+                good &= valid
+                k.append(ks)
+            newPositions = stagePositions
+            errors = steps[:, np.newaxis]*sum(
+                e*ki for (e, ki) in zip(_E, k) if e != 0)
+            scale = self.tolerance*(
+                1 + np.maximum(np.abs(positions), np.abs(newPositions)))
+            error = np.sqrt(np.mean((errors/scale)**2, axis=1))
+            atMinimum = steps <= self.minStep
+            accepted = good & ((error <= 1) | atMinimum)
+
+            # Lines where the field vanishes at the smallest step stop.
+            stalled = ~good & atMinimum
+            terminations[indices[stalled]] = NULL_FIELD
+
+            # Choose the next step size for each line.
+            with np.errstate(divide="ignore"):
+                factor = np.clip(_SAFETY*error**-0.2, _MIN_FACTOR,
+                                 _MAX_FACTOR)
+            factor[~good] = _MIN_FACTOR
+            factor[~accepted] = np.minimum(factor[~accepted], 1.0)
+            oldSteps = steps
+            steps = np.clip(steps*factor, self.minStep, self.maxStep)
+
+            # Advance the accepted lines, stopping those which leave the
+            # traced region partway through their step. Points within a
+            # step are interpolated with a cubic Hermite polynomial.
+            a = np.flatnonzero(accepted)
+            starts = positions[a]
+            ends = newPositions[a]
+            fractions = np.ones(len(a))
+            which = self._locate(ends)
+            crossed = np.flatnonzero(which >= 0)
+            if len(crossed) > 0:
+                c = a[crossed]
+                interpolate = _hermite(positions[c], newPositions[c], k1[c],
+                                       k[-1][c], oldSteps[c])
+                (fractions[crossed], ends[crossed], which) = (
+                    self._findCrossings(interpolate, starts[crossed]))
+                self._stop(which, terminations, boundaryIndices,
+                           indices[c])
+            lineIndices = indices[a]
+            lengths[lineIndices] += fractions*oldSteps[a]
+            numSteps[lineIndices] += 1
+            endpoints[lineIndices] = ends
+
+            # Record the first crossing of the z=0 plane.
+            (z0, z1) = (starts[:, 2], ends[:, 2])
+            crossing = np.flatnonzero(
+                np.isnan(equatorialCrossings[lineIndices, 0]) &
+                (np.sign(z0) != np.sign(z1)) & (z0 != 0)
+            )
+            if len(crossing) > 0:
+                c = a[crossing]
+                interpolate = _hermite(positions[c], newPositions[c], k1[c],
+                                       k[-1][c], oldSteps[c])
+                side = np.sign(z0[crossing])
+                t = _bisect(lambda points: np.sign(points[:, 2]) == side,
+                            interpolate, fractions[crossing])
+                equatorialCrossings[lineIndices[crossing]] = interpolate(t)
+            if recordPaths:
+                pathIndices.append(lineIndices)
+                pathPoints.append(ends)
+
+            # Lines which have taken all of their steps stop.
+            maxedOut = numSteps[lineIndices] >= self.maxSteps
+            maxedOut &= terminations[lineIndices] == ACTIVE
+            terminations[lineIndices[maxedOut]] = MAX_STEPS
+
+            # Drop the stopped lines from the active set.
+            positions[a] = newPositions[a]
+            k1[a] = k[-1][a]
+            keep = terminations[indices] == ACTIVE
+            (indices, positions, k1, steps, signs) = (
+                indices[keep], positions[keep], k1[keep], steps[keep],
+                signs[keep])
+
+        paths = None
+        if recordPaths:
+            pathIndices = np.concatenate(pathIndices)
+            order = np.argsort(pathIndices, kind="stable")
+            counts = np.bincount(pathIndices, minlength=numLines)
+            paths = np.split(np.concatenate(pathPoints)[order],
+                             np.cumsum(counts)[:-1])
+        return FieldLineTraces(
+            seeds, directions, endpoints, terminations, boundaryIndices,
+            lengths, numSteps, equatorialCrossings, paths
+        )
+
+    def traceBoth(self, seeds, recordPaths=False):
+        """Trace field lines in both directions from an array of seeds.
+
+        Trace the field line through each seed point both along and
+        against the field. Both halves of all of the lines are traced
+        together, as a single set of active lines.
+
+        Parameters
+        ----------
+        seeds : array-like of float, shape (N, 3)
+            Point on each line.
+        recordPaths : bool, optional
+            True to record the points along each line.
+
+        Returns
+        -------
+        along : FieldLineTraces
+            The halves of the lines traced along the field.
+        against : FieldLineTraces
+            The halves of the lines traced against the field.
+        """
+        seeds = np.array(seeds, dtype=float).reshape(-1, 3)
+        numLines = len(seeds)
+        directions = np.repeat([1, -1], numLines)
+        traces = self.trace(np.concatenate([seeds, seeds]), directions,
+                            recordPaths)
+        return (traces.select(slice(0, numLines)),
+                traces.select(slice(numLines, None)))
+
+
+def classify(along, against):
+    """Classify field lines traced in both directions.
+
+    Classify each field line traced in both directions by where its ends
+    stopped.
+
+    Parameters
+    ----------
+    along, against : FieldLineTraces
+        The halves of the lines, as returned by traceBoth().
+
+    Returns
+    -------
+    classes : np.ndarray of int, shape (N,)
+        CLOSED if both ends reached the inner boundary, OPEN if one end
+        reached the inner boundary and the other an outer boundary,
+        DETACHED if both ends reached outer boundaries, and UNKNOWN if
+        either end stopped for another reason.
+    """
+    inner = ((along.terminations == INNER_BOUNDARY).astype(int) +
+             (against.terminations == INNER_BOUNDARY))
+    outer = ((along.terminations == OUTER_BOUNDARY).astype(int) +
+             (against.terminations == OUTER_BOUNDARY))
+    return np.select(
+        [inner == 2, (inner == 1) & (outer == 1), outer == 2],
+        [CLOSED, OPEN, DETACHED], UNKNOWN
+    )
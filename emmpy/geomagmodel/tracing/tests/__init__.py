@@ -0,0 +1,11 @@
+"""Tests for the geomagmodel.tracing package.
+
+Modules
+-------
+test_boundaries.py
+test_DipoleField.py
+test_FieldLineTracer.py
+
+Packages
+--------
+"""
@@ -0,0 +1,67 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from emmpy.geomagmodel.tracing.dipolefield import (
+    DEFAULT_DIPOLE_STRENGTH, DipoleField
+)
+from emmpy.math.coordinates.cartesianvector import CartesianVectorArray
+from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.differentiation import (
+    divergence, evaluateWithDifferences
+)
+
+
+class TestBuilder(unittest.TestCase):
+
+    def test___init__(self):
+        field = DipoleField(0.1)
+        self.assertEqual(field.dipoleTiltAngle, 0.1)
+        self.assertEqual(field.dipoleStrength, DEFAULT_DIPOLE_STRENGTH)
+
+    def test_evaluate(self):
+        field = DipoleField(0.0, 1.0)
+        # The field is northward on the equator, and downward at the north
+        # pole, where it is twice as strong.
+        self.assertTrue(np.allclose(field.evaluate(VectorIJK(2.0, 0.0, 0.0)),
+                                    (0.0, 0.0, 1/8)))
+        buffer = VectorIJK()
+        self.assertIs(field.evaluate(VectorIJK(0.0, 0.0, 1.0), buffer),
+                      buffer)
+        self.assertTrue(np.allclose(buffer, (0.0, 0.0, -2.0)))
+
+    def test_evaluateMany(self):
+        rng = np.random.default_rng(29)
+        positions = rng.uniform(-10.0, 10.0, (20, 3))
+        tilt = 0.3
+        field = DipoleField(tilt)
+        # Compare with the field of the rotated dipole moment.
+        moment = -DEFAULT_DIPOLE_STRENGTH*np.array(
+            [np.sin(tilt), 0.0, np.cos(tilt)])
+        r = np.linalg.norm(positions, axis=1)[:, np.newaxis]
+        expected = (3*positions*(positions @ moment)[:, np.newaxis]/r**2 -
+                    moment)/r**3
+        self.assertTrue(np.allclose(field.evaluateMany(positions), expected))
+        self.assertTrue(np.allclose(
+            field.evaluateMany(CartesianVectorArray(positions)), expected))
+        self.assertTrue(np.allclose(
+            pickle.loads(pickle.dumps(field)).evaluateMany(positions),
+            expected))
+
+    def test_differentiateMany(self):
+        rng = np.random.default_rng(31)
+        positions = rng.uniform(-10.0, 10.0, (20, 3))
+        field = DipoleField(-0.2)
+        (values, jacobian) = field.differentiateMany(positions)
+        self.assertTrue(np.allclose(values, field.evaluateMany(positions)))
+        (_, expected) = evaluateWithDifferences(field, positions, 1e-4, 4)
+        self.assertTrue(np.allclose(jacobian, expected))
+        # The dipole field is curl-free, so the Jacobian is symmetric, and
+        # divergence-free.
+        self.assertTrue(np.allclose(jacobian, jacobian.transpose((0, 2, 1))))
+        self.assertTrue(np.allclose(divergence(jacobian), 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
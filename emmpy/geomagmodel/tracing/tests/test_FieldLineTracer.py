@@ -0,0 +1,126 @@
+import unittest
+
+import numpy as np
+
+from emmpy.geomagmodel.tracing.boundaries import BoxBoundary
+from emmpy.geomagmodel.tracing.dipolefield import DipoleField
+from emmpy.geomagmodel.tracing.fieldlinetracer import (
+    CLOSED, DETACHED, FieldLineTracer, INNER_BOUNDARY, MAX_STEPS,
+    NULL_FIELD, OPEN, OUTER_BOUNDARY, classify
+)
+from emmpy.math.vectorfields.vectorfield import VectorField
+
+
+class UniformField(VectorField):
+    """A uniform field, counting the calls to evaluateMany()."""
+
+    def __init__(self, value):
+        self.value = np.array(value, dtype=float)
+        self.calls = 0
+
+    def evaluateMany(self, positions):
+        self.calls += 1
+        return np.tile(self.value, (len(positions), 1))
+
+
+def dipoleFootpointLatitude(seeds):
+    """Return the footpoint latitude of dipole field lines through seeds."""
+    r = np.linalg.norm(seeds, axis=1)
+    shellParameter = r**3/(seeds[:, 0]**2 + seeds[:, 1]**2)
+    return np.arccos(np.sqrt(1/shellParameter))
+
+
+class TestBuilder(unittest.TestCase):
+
+    def test___init__(self):
+        field = UniformField((0.0, 0.0, 1.0))
+        tracer = FieldLineTracer(field)
+        self.assertIs(tracer.field, field)
+        self.assertEqual(tracer.innerBoundary.radius, 1.0)
+        self.assertEqual(tracer.boundaries, [])
+        tracer = FieldLineTracer(field, innerRadius=None, dipoleTiltAngle=0.1)
+        self.assertIsNone(tracer.innerBoundary)
+        self.assertIsInstance(tracer.field.fields[1], DipoleField)
+        with self.assertRaises(ValueError):
+            FieldLineTracer(field, tolerance=0.0)
+        with self.assertRaises(ValueError):
+            FieldLineTracer(field, minStep=1.0, initialStep=0.1)
+
+    def test_trace(self):
+        # Lines in a uniform field are straight, and stop at the box.
+        field = UniformField((3.0, 4.0, 0.0))
+        tracer = FieldLineTracer(
+            field, boundaries=[BoxBoundary((-10, -10, -1), (10, 10, 1))],
+            maxStep=2.0)
+        seeds = [[2.0, 0.0, 0.0], [5.0, 5.0, 0.5], [0.0, 0.0, 5.0],
+                 [0.5, 0.0, 0.0]]
+        traces = tracer.trace(seeds, direction=[1, -1, 1, 1],
+                              recordPaths=True)
+        self.assertEqual(list(traces.terminations),
+                         [OUTER_BOUNDARY, OUTER_BOUNDARY, OUTER_BOUNDARY,
+                          INNER_BOUNDARY])
+        self.assertEqual(list(traces.boundaryIndices), [0, 0, 0, -1])
+        self.assertTrue(np.allclose(traces.endpoints[:2],
+                                    [[9.5, 10.0, 0.0], [-6.25, -10.0, 0.5]]))
+        self.assertTrue(np.allclose(traces.lengths[:2], [12.5, 18.75]))
+        # The seed outside the box, and the seed inside the Earth, stop
+        # without moving.
+        self.assertEqual(list(traces.numSteps[2:]), [0, 0])
+        self.assertTrue(np.array_equal(traces.endpoints[2:], traces.seeds[2:]))
+        for (seed, path, endpoint) in zip(traces.seeds, traces.paths,
+                                          traces.endpoints):
+            self.assertTrue(np.array_equal(path[0], seed))
+            self.assertTrue(np.array_equal(path[-1], endpoint))
+        self.assertTrue(np.array_equal(traces.equatorialCrossings[0],
+                                       seeds[0]))
+        self.assertTrue(np.all(np.isnan(traces.equatorialCrossings[1])))
+
+        # Each step evaluates the field once per stage for all lines.
+        self.assertEqual(field.calls, 1 + 6*traces.numSteps.max())
+
+    def test_trace_limits(self):
+        tracer = FieldLineTracer(UniformField((0.0, 0.0, 1.0)),
+                                 maxSteps=3, maxStep=0.1)
+        traces = tracer.trace([[5.0, 0.0, 0.0]])
+        self.assertEqual(traces.terminations[0], MAX_STEPS)
+        self.assertEqual(traces.numSteps[0], 3)
+        self.assertTrue(np.allclose(traces.endpoints, [[5.0, 0.0, 0.3]]))
+        tracer = FieldLineTracer(UniformField((0.0, 0.0, 0.0)))
+        traces = tracer.trace([[5.0, 0.0, 0.0]])
+        self.assertEqual(traces.terminations[0], NULL_FIELD)
+
+    def test_traceBoth(self):
+        # Dipole field lines close at the footpoint latitudes given by the
+        # shell parameter.
+        tracer = FieldLineTracer(
+            DipoleField(0.0), boundaries=[BoxBoundary((-6, -6, -2), (6, 6, 2))])
+        seeds = np.array([[2.0, 0.0, 0.1], [3.0, 1.0, -0.5],
+                          [-4.0, 0.0, 0.0], [5.5, 0.0, 0.0]])
+        (along, against) = tracer.traceBoth(seeds)
+        self.assertEqual(len(along), 4)
+        self.assertEqual(list(classify(along, against)),
+                         [CLOSED, CLOSED, CLOSED, DETACHED])
+        latitude = dipoleFootpointLatitude(seeds[:3])
+        for (traces, sign) in ((along, 1), (against, -1)):
+            endpoints = traces.endpoints[:3]
+            self.assertTrue(np.allclose(np.linalg.norm(endpoints, axis=1),
+                                        1.0))
+            self.assertTrue(np.allclose(
+                np.arcsin(endpoints[:, 2]), sign*latitude, atol=1e-5))
+        # The line through the seed below the equator crosses it at its
+        # shell parameter.
+        crossing = against.equatorialCrossings[0]
+        self.assertAlmostEqual(crossing[2], 0.0)
+        self.assertTrue(np.isnan(along.equatorialCrossings[0, 0]))
+
+        # A line which reaches past the box is open, with the dipole added
+        # to an external field.
+        tracer = FieldLineTracer(
+            UniformField((0.0, 0.0, 0.0)), dipoleTiltAngle=0.0,
+            boundaries=[BoxBoundary((-3, -3, -3), (3, 3, 3))])
+        (along, against) = tracer.traceBoth([[2.9, 0.0, 0.5]])
+        self.assertEqual(classify(along, against)[0], OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
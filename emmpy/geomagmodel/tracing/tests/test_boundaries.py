@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from emmpy.geomagmodel.tracing.boundaries import (
+    BoxBoundary, MagnetopauseBoundary, SphereBoundary
+)
+
+
+class TestBuilder(unittest.TestCase):
+
+    def test_SphereBoundary(self):
+        boundary = SphereBoundary(2.0)
+        self.assertEqual(boundary.radius, 2.0)
+        positions = np.array([[1.0, 1.0, 1.0], [2.0, 0.5, 0.0]])
+        self.assertEqual(list(boundary.contains(positions)), [False, True])
+        with self.assertRaises(ValueError):
+            SphereBoundary(0.0)
+
+    def test_BoxBoundary(self):
+        boundary = BoxBoundary((-10, -5, -5), (5, 5, 5))
+        positions = np.array([[-9.0, 4.0, -4.0], [6.0, 0.0, 0.0],
+                              [0.0, 0.0, -5.5]])
+        self.assertEqual(list(boundary.contains(positions)),
+                         [True, False, False])
+        with self.assertRaises(ValueError):
+            BoxBoundary((0, 0, 0), (1, 1, 0))
+
+    def test_MagnetopauseBoundary(self):
+        boundary = MagnetopauseBoundary(2.0)
+        # The subsolar point is at x0 + a*(s0 - 1), and the tail radius is
+        # a*sqrt(s0**2 - 1).
+        subsolar = 5.48 + 70.0*0.08
+        tailRadius = 70.0*np.sqrt(1.08**2 - 1)
+        positions = np.array([
+            [subsolar - 0.01, 0.0, 0.0], [subsolar + 0.01, 0.0, 0.0],
+            [-100.0, tailRadius - 0.01, 0.0], [-100.0, 0.0, tailRadius + 0.01],
+            [boundary.xm, tailRadius - 0.01, 0.0]
+        ])
+        self.assertEqual(list(boundary.contains(positions)),
+                         [True, False, True, False, True])
+        # A higher pressure compresses the magnetopause.
+        compressed = MagnetopauseBoundary(8.0)
+        self.assertFalse(compressed.contains(positions[:1])[0])
+        self.assertAlmostEqual(compressed.a, 70.0/4**0.14)
+        with self.assertRaises(ValueError):
+            MagnetopauseBoundary(-1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,10 @@
 
 Modules
 -------
+ts07depochindex.py
 ts07dmodelbuilder.py
+ts07dmodelcache.py
+ts07dtimeseries.py
 
 Packages
 --------
@@ -10,3 +13,9 @@ coefficientreader
 modeling
 tests
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
@@ -7,6 +7,8 @@ facregion.py
 thincurrentsheetshieldingcoefficients.py
 ts07dstaticcoefficientsfactory.py
 ts07dvariablecoefficients.py
+ts07dvariablecoefficientsarchive.py
+ts07dvariablecoefficientsfile.py
 ts07dvariablecoefficientsutils.py
 ts07equatoriallinearcoefficients.py
 ts07equatorialvariablecoefficients.py
@@ -17,3 +19,9 @@ Packages
 --------
 tests
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
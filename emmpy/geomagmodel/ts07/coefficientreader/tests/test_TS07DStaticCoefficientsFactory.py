@@ -1,17 +1,187 @@
+import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
+
+import emmpy
 from emmpy.geomagmodel.ts07.coefficientreader.ts07dstaticcoefficientsfactory import (
     TS07DStaticCoefficientsFactory
 )
 
 
+# Sample static coefficients shipped with the examples.
+staticCoefficientsDirectory = os.path.join(
+    os.path.dirname(os.path.dirname(emmpy.__file__)), "examples",
+    "staticcoefficients", "coeffs_n8_m6"
+)
+haveExamples = os.path.isdir(staticCoefficientsDirectory)
+
+
+def assertSameCoefficients(test, a, b):
+    """Assert that two sets of static coefficients are identical."""
+    test.assertEqual(a.numAzimuthalExpansions, b.numAzimuthalExpansions)
+    test.assertEqual(a.numRadialExpansions, b.numRadialExpansions)
+    for name in ("symmetricTailExpansion", "symmetricTailWaveExpansion",
+                 "oddTailExpansion", "oddTailWaveExpansion",
+                 "evenTailExpansion", "evenTailWaveExpansion"):
+        test.assertTrue(np.array_equal(
+            np.array(getattr(a, name), dtype=float),
+            np.array(getattr(b, name), dtype=float)))
+
+
 class TestBuilder(unittest.TestCase):
 
     def test___init__(self):
         pass
 
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
     def test_create(self):
-        pass
+        ascii = TS07DStaticCoefficientsFactory.create(
+            staticCoefficientsDirectory)
+        self.assertEqual(ascii.numAzimuthalExpansions, 4)
+        self.assertEqual(ascii.numRadialExpansions, 5)
+        with tempfile.TemporaryDirectory() as directory:
+            binaryFile = os.path.join(directory, "coeffs.npz")
+            TS07DStaticCoefficientsFactory.compile(
+                staticCoefficientsDirectory, binaryFile)
+            binary = TS07DStaticCoefficientsFactory.create(binaryFile, 4, 5)
+        assertSameCoefficients(self, ascii, binary)
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_createFromBinary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            binaryFile = os.path.join(directory, "coeffs.npz")
+            TS07DStaticCoefficientsFactory.compile(
+                staticCoefficientsDirectory, binaryFile)
+            binary = TS07DStaticCoefficientsFactory.createFromBinary(
+                binaryFile, 6, 8)
+            with self.assertRaises(ValueError):
+                TS07DStaticCoefficientsFactory.createFromBinary(
+                    binaryFile, 7, 8)
+        ascii = TS07DStaticCoefficientsFactory.create(
+            staticCoefficientsDirectory, 6, 8)
+        assertSameCoefficients(self, ascii, binary)
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_compile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            binaryFile = os.path.join(directory, "coeffs.npz")
+            self.assertEqual(
+                TS07DStaticCoefficientsFactory.compile(
+                    staticCoefficientsDirectory, binaryFile),
+                binaryFile)
+            with np.load(binaryFile) as data:
+                self.assertEqual(data["numAzimuthalExpansions"], 6)
+                self.assertEqual(data["numRadialExpansions"], 8)
+                self.assertEqual(data["symmetricTail"].shape, (8, 15, 5))
+                self.assertEqual(data["oddWave"].shape, (6, 8, 5))
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_createFromMapped(self):
+        ascii = TS07DStaticCoefficientsFactory.create(
+            staticCoefficientsDirectory, 6, 8)
+        with tempfile.TemporaryDirectory() as directory:
+            mappedFile = os.path.join(directory, "coeffs.emmc")
+            TS07DStaticCoefficientsFactory.compileMapped(
+                staticCoefficientsDirectory, mappedFile)
+            mapped = TS07DStaticCoefficientsFactory.createFromMapped(
+                mappedFile, 6, 8)
+            assertSameCoefficients(self, ascii, mapped)
+            with self.assertRaises(ValueError):
+                TS07DStaticCoefficientsFactory.createFromMapped(
+                    mappedFile, 6, 9)
+
+            # The coefficients are read-only views of the mapped file.
+            tail = mapped.oddTailExpansion[2][3]
+            self.assertIsInstance(tail.base, np.memmap)
+            self.assertFalse(tail.flags.writeable)
+            self.assertIsInstance(mapped.stackedTailExpansion, np.memmap)
+            self.assertEqual(mapped.stackedTailWaveExpansion.shape,
+                             (8 + 2*6*8, 5))
+
+            # A subset of the expansions has no stacked arrays.
+            subset = TS07DStaticCoefficientsFactory.createFromMapped(
+                mappedFile, 4, 5)
+            assertSameCoefficients(
+                self, subset,
+                TS07DStaticCoefficientsFactory.create(
+                    staticCoefficientsDirectory, 4, 5))
+            self.assertIsNone(subset.stackedTailExpansion)
+
+            # create() maps a file with the mapped file extension.
+            created = TS07DStaticCoefficientsFactory.create(mappedFile, 6, 8)
+            self.assertIsInstance(created.stackedTailExpansion, np.memmap)
+            del mapped, tail, subset, created
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_compileMapped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            mappedFile = os.path.join(directory, "coeffs.emmc")
+            self.assertEqual(
+                TS07DStaticCoefficientsFactory.compileMapped(
+                    staticCoefficientsDirectory, mappedFile),
+                mappedFile)
+            (header, tails, waves) = TS07DStaticCoefficientsFactory.mapArrays(
+                mappedFile)
+            self.assertEqual(header.dtype, np.int64)
+            self.assertTrue(np.array_equal(header, (6, 8, 15, 5)))
+            self.assertEqual(tails.shape, (8 + 2*6*8, 15, 5))
+            self.assertEqual(waves.shape, (8 + 2*6*8, 5))
+
+            # The shielding fields are in evaluation order.
+            arrays = TS07DStaticCoefficientsFactory.readDirectory(
+                staticCoefficientsDirectory)
+            self.assertTrue(np.array_equal(tails[7],
+                                           arrays["symmetricTail"][7]))
+            self.assertTrue(np.array_equal(tails[8 + 2*6 + 3],
+                                           arrays["oddTail"][3, 2]))
+            self.assertTrue(np.array_equal(waves[8 + 6*8 + 6*7 + 5],
+                                           arrays["evenWave"][5, 7]))
+            del header, tails, waves
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_isCompiledFileCurrent(self):
+        with tempfile.TemporaryDirectory() as directory:
+            directory = os.path.join(directory, "coeffs")
+            shutil.copytree(staticCoefficientsDirectory, directory)
+            binaryFile = TS07DStaticCoefficientsFactory.compile(directory)
+            self.assertTrue(
+                TS07DStaticCoefficientsFactory.isCompiledFileCurrent(
+                    binaryFile, directory))
+            self.assertFalse(
+                TS07DStaticCoefficientsFactory.isCompiledFileCurrent(
+                    os.path.join(directory, "missing.npz"), directory))
+
+            # Edit an ASCII file after compiling the directory.
+            sourceFile = os.path.join(directory, "tailamebhr_01.par")
+            with open(sourceFile) as f:
+                lines = f.readlines()
+            lines[0] = "1.5\n"
+            with open(sourceFile, "w") as f:
+                f.writelines(lines)
+            time = os.path.getmtime(binaryFile) + 10
+            os.utime(sourceFile, (time, time))
+            with self.assertWarns(UserWarning):
+                self.assertFalse(
+                    TS07DStaticCoefficientsFactory.isCompiledFileCurrent(
+                        binaryFile, directory))
+            with self.assertWarns(UserWarning):
+                coeffs = TS07DStaticCoefficientsFactory.create(directory)
+            self.assertEqual(coeffs.symmetricTailExpansion[0][0, 0], 1.5)
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_readDirectory(self):
+        arrays = TS07DStaticCoefficientsFactory.readDirectory(
+            staticCoefficientsDirectory)
+        shapes = {
+            "symmetricTail": (8, 15, 5), "symmetricWave": (8, 5),
+            "oddTail": (6, 8, 15, 5), "oddWave": (6, 8, 5),
+            "evenTail": (6, 8, 15, 5), "evenWave": (6, 8, 5),
+        }
+        for (name, shape) in shapes.items():
+            self.assertEqual(arrays[name].shape, shape)
 
     def test_createFromBuiltInNewSet(self):
         pass
@@ -19,6 +189,16 @@ class TestBuilder(unittest.TestCase):
     def test_createFromBuiltInOriginalSet(self):
         pass
 
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_readShieldFile(self):
+        (values, waveNumberValues) = (
+            TS07DStaticCoefficientsFactory.readShieldFile(
+                os.path.join(staticCoefficientsDirectory,
+                             "tailamebhr_01.par")))
+        self.assertEqual(values.shape, (15, 5))
+        self.assertEqual(waveNumberValues.shape, (5,))
+        self.assertAlmostEqual(values[0, 0], 13.25539804)
+
     def test_readTailS(self):
         pass
 
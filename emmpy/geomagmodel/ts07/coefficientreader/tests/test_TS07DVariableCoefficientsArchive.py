@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsarchive import (
+    TS07DVariableCoefficientsArchive, findCoefficientFiles, parseEpoch
+)
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsutils import (
+    TS07DVariableCoefficientsUtils
+)
+from emmpy.geomagmodel.ts07.tests.examplecoefficients import (
+    createEpochDirectory, haveExamples
+)
+
+
+class TestBuilder(unittest.TestCase):
+
+    def test_parseEpoch(self):
+        self.assertEqual(parseEpoch("/data/2015_076_16_20.par"),
+                         np.datetime64("2015-03-17T16:20"))
+        self.assertEqual(parseEpoch("2016_366_00_05.par"),
+                         np.datetime64("2016-12-31T00:05"))
+        with self.assertRaises(ValueError):
+            parseEpoch("coeffs.par")
+
+    def test_findCoefficientFiles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for fileName in ("2015_076_16_25.par", "2015_076_16_20.par",
+                             "notes.par"):
+                open(os.path.join(directory, fileName), "w").close()
+            (epochs, files) = findCoefficientFiles(directory)
+        self.assertTrue(np.array_equal(
+            epochs, np.array(["2015-03-17T16:20", "2015-03-17T16:25"],
+                             dtype="datetime64[m]")))
+        self.assertEqual([os.path.basename(f) for f in files],
+                         ["2015_076_16_20.par", "2015_076_16_25.par"])
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test___init__(self):
+        with tempfile.TemporaryDirectory() as directory:
+            createEpochDirectory(
+                directory, ("2015_076_16_25.par", "2015_076_16_20.par"))
+            archiveDirectory = os.path.join(directory, "archive")
+            TS07DVariableCoefficientsUtils.packArchive(
+                directory, archiveDirectory)
+            archive = TS07DVariableCoefficientsArchive(archiveDirectory)
+            self.assertEqual(len(archive), 2)
+            self.assertIsInstance(archive.coefficients, np.memmap)
+            self.assertEqual(archive.coefficients.shape, (2, 101))
+            self.assertTrue(np.array_equal(
+                archive.epochs,
+                np.array(["2015-03-17T16:20", "2015-03-17T16:25"],
+                         dtype="datetime64[m]")))
+            self.assertEqual(archive.configuration.tolist(),
+                             [[1, 4, 5, 4], [1, 4, 5, 4]])
+            self.assertTrue(np.allclose(archive.dynamicPressure, 12.7903))
+            self.assertTrue(np.allclose(archive.dipoleTiltAngle, 0.143911))
+            self.assertTrue(np.allclose(archive.Q, 26.2329))
+            self.assertTrue(np.allclose(archive.Brms, 52.0307))
+            # Columns of different lengths are rejected.
+            np.save(os.path.join(archiveDirectory, "Q.npy"), np.zeros(3))
+            with self.assertRaises(ValueError):
+                TS07DVariableCoefficientsArchive(archiveDirectory)
+            del archive
+
+
+if __name__ == '__main__':
+    unittest.main()
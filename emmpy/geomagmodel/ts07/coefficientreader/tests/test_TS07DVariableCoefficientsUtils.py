@@ -1,8 +1,24 @@
+import os
+import tempfile
 import unittest
 
+import numpy as np
+
+from emmpy.exceptions.emmpyexception import EmmpyException
+from emmpy.geomagmodel.ts07.coefficientreader.defaultfacconfigurationoptions import (
+    DefaultFacConfigurationOptions
+)
 from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsutils import (
     TS07DVariableCoefficientsUtils
 )
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsarchive import (
+    TS07DVariableCoefficientsArchive
+)
+from emmpy.geomagmodel.ts07.tests.examplecoefficients import (
+    createEpochDirectory, haveExamples, staticCoefficientsDirectory,
+    variableCoefficientsFile
+)
+from emmpy.geomagmodel.ts07.ts07dmodelbuilder import TS07DModelBuilder
 
 
 class TestBuilder(unittest.TestCase):
@@ -10,8 +26,65 @@ class TestBuilder(unittest.TestCase):
     def test_createTS07D(self):
         pass
 
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
     def test_create(self):
-        pass
+        coeffs = TS07DVariableCoefficientsUtils.create(variableCoefficientsFile)
+        self.assertAlmostEqual(coeffs.cfAmplitude, 1.0)
+        self.assertAlmostEqual(
+            coeffs.equatorialCoeffs.twistParam, 0.00909948/10)
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_parse(self):
+        contents = TS07DVariableCoefficientsUtils.parse(
+            variableCoefficientsFile)
+        self.assertEqual(contents.numCurrentSheets, 1)
+        self.assertEqual(contents.numAzimuthalExpansions, 4)
+        self.assertEqual(contents.numRadialExpansions, 5)
+        self.assertEqual(contents.facConfiguration.numberOfFields, 4)
+        self.assertAlmostEqual(contents.dynamicPressure, 12.7903)
+        self.assertAlmostEqual(contents.dipoleTiltAngle, 0.143911)
+        self.assertAlmostEqual(contents.Q, 26.2329)
+        self.assertAlmostEqual(contents.Brms, 52.0307)
+        self.assertEqual(len(contents.values), 101)
+        self.assertAlmostEqual(contents.values[-1], 0.00909948)
+        # The metadata matches the individual readers.
+        readers = TS07DVariableCoefficientsUtils
+        self.assertEqual(
+            contents.dynamicPressure,
+            readers.readDynamicPressure(variableCoefficientsFile))
+        self.assertEqual(
+            contents.dipoleTiltAngle,
+            readers.readDipoleTiltAngle(variableCoefficientsFile))
+        # The coefficients match the reference reader.
+        coeffs = contents.coefficients
+        reference = TS07DVariableCoefficientsUtils.create(
+            variableCoefficientsFile, 1, 4, 5,
+            DefaultFacConfigurationOptions(
+                DefaultFacConfigurationOptions.TS07D))
+        self.assertEqual(coeffs.cfAmplitude, reference.cfAmplitude)
+        self.assertTrue(np.array_equal(
+            coeffs.equatorialCoeffs.currThicks,
+            reference.equatorialCoeffs.currThicks))
+        self.assertEqual(coeffs.equatorialCoeffs.twistParam,
+                         reference.equatorialCoeffs.twistParam)
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_parse_invalid(self):
+        with open(variableCoefficientsFile) as f:
+            lines = f.readlines()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bad.par")
+            # A missing coefficient.
+            with open(path, "w") as f:
+                f.writelines(lines[1:])
+            with self.assertRaises(ValueError):
+                TS07DVariableCoefficientsUtils.parse(path)
+            # No resolution in the trailer.
+            with open(path, "w") as f:
+                f.writelines(
+                    [l for l in lines if not l.lstrip().startswith("M=")])
+            with self.assertRaises(ValueError):
+                TS07DVariableCoefficientsUtils.parse(path)
 
     def test_createWithThinCurrentSheet(self):
         pass
@@ -43,6 +116,84 @@ class TestBuilder(unittest.TestCase):
     def test_createFromArray(self):
         pass
 
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_packArchive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            createEpochDirectory(directory, ("2015_076_16_20.par",))
+            archiveDirectory = os.path.join(directory, "archive")
+            result = TS07DVariableCoefficientsUtils.packArchive(
+                directory, archiveDirectory)
+            self.assertEqual(result, archiveDirectory)
+            archive = TS07DVariableCoefficientsArchive(archiveDirectory)
+            contents = TS07DVariableCoefficientsUtils.parse(
+                variableCoefficientsFile)
+            self.assertTrue(np.array_equal(archive.coefficients[0],
+                                           contents.values))
+            del archive
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_fromArchive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            createEpochDirectory(
+                directory, ("2015_076_16_20.par", "2015_076_16_25.par"))
+            archiveDirectory = os.path.join(directory, "archive")
+            TS07DVariableCoefficientsUtils.packArchive(
+                directory, archiveDirectory)
+            archive = TS07DVariableCoefficientsArchive(archiveDirectory)
+            contents = TS07DVariableCoefficientsUtils.parse(
+                variableCoefficientsFile)
+            # The archived coefficients build the same model.
+            positions = np.array([[4.0, 5.0, -2.0], [-8.0, 1.0, 3.0]])
+            values = []
+            for coeffs in (
+                    contents.coefficients,
+                    TS07DVariableCoefficientsUtils.fromArchive(archive, 1),
+                    TS07DVariableCoefficientsUtils.fromArchive(
+                        archiveDirectory, 0)):
+                builder = TS07DModelBuilder.create(
+                    archive.dipoleTiltAngle[0], archive.dynamicPressure[0],
+                    coeffs)
+                builder.withStaticCoefficients(staticCoefficientsDirectory)
+                values.append(builder.build().evaluateMany(positions))
+            self.assertTrue(np.array_equal(values[1], values[0]))
+            self.assertTrue(np.array_equal(values[2], values[0]))
+            del archive
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_parseArchive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            createEpochDirectory(directory, ("2015_076_16_20.par",))
+            archiveDirectory = os.path.join(directory, "archive")
+            TS07DVariableCoefficientsUtils.packArchive(
+                directory, archiveDirectory)
+            expected = TS07DVariableCoefficientsUtils.parse(
+                variableCoefficientsFile)
+            contents = TS07DVariableCoefficientsUtils.parseArchive(
+                archiveDirectory, 0)
+            self.assertTrue(np.array_equal(contents.values, expected.values))
+            for name in ("numCurrentSheets", "numAzimuthalExpansions",
+                         "numRadialExpansions", "dynamicPressure",
+                         "dipoleTiltAngle", "Q", "Brms"):
+                self.assertEqual(getattr(contents, name),
+                                 getattr(expected, name))
+            self.assertEqual(
+                contents.facConfiguration.numberOfFields,
+                expected.facConfiguration.numberOfFields)
+            del contents
+
+            # A corrupt configuration fails when it is read.
+            configurationFile = os.path.join(archiveDirectory,
+                                             "configuration.npy")
+            configuration = np.load(configurationFile)
+            for (column, value, error) in ((3, 5, EmmpyException),
+                                           (1, 9, ValueError)):
+                corrupt = configuration.copy()
+                corrupt[0, column] = value
+                np.save(configurationFile, corrupt)
+                with self.assertRaises(error):
+                    TS07DVariableCoefficientsUtils.parseArchive(
+                        archiveDirectory, 0)
+
     def test_writeToFile(self):
         pass
 
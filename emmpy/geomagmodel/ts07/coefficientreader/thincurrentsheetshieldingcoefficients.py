@@ -37,13 +37,20 @@ class ThinCurrentSheetShieldingCoefficients:
         Coefficients for even tail expansion.
     evenTailWaveExpansion : CoefficientExpansion1D
         Coefficients for even tail wave expansion.
+    stackedTailExpansion : np.ndarray of float, shape (N + 2*M*N, L, K)
+        Coefficients of every shielding field as one array, in the order
+        symmetric[n], odd[n][m], even[n][m], or None.
+    stackedTailWaveExpansion : np.ndarray of float, shape (N + 2*M*N, K)
+        Wave numbers of every shielding field as one array, in the same
+        order, or None.
     """
 
     def __init__(
         self, numAzimuthalExpansions, numRadialExpansions,
         symmetricTailExpansion, symmetricTailWaveExpansion,
         oddTailExpansion, oddTailWaveExpansion,
-        evenTailExpansion, evenTailWaveExpansion):
+        evenTailExpansion, evenTailWaveExpansion,
+        stackedTailExpansion=None, stackedTailWaveExpansion=None):
         """Initialize a new ThinCurrentSheetShieldingCoefficients object.
 
         Constructor is package private, should be constructed using the
@@ -67,7 +74,12 @@ class ThinCurrentSheetShieldingCoefficients:
             Coefficients for even tail expansion.
         evenTailWaveExpansion : CoefficientExpansion1D
             Coefficients for even tail wave expansion.
-
+        stackedTailExpansion : np.ndarray of float, optional
+            Coefficients of every shielding field as one array, in the
+            order symmetric[n], odd[n][m], even[n][m].
+        stackedTailWaveExpansion : np.ndarray of float, optional
+            Wave numbers of every shielding field as one array, in the
+            same order.
         """
         self.numRadialExpansions = numRadialExpansions
         self.numAzimuthalExpansions = numAzimuthalExpansions
@@ -77,3 +89,5 @@ class ThinCurrentSheetShieldingCoefficients:
         self.oddTailWaveExpansion = oddTailWaveExpansion
         self.evenTailExpansion = evenTailExpansion
         self.evenTailWaveExpansion = evenTailWaveExpansion
+        self.stackedTailExpansion = stackedTailExpansion
+        self.stackedTailWaveExpansion = stackedTailWaveExpansion
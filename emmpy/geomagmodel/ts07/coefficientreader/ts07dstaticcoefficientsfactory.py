@@ -10,7 +10,11 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import glob
 import os
+import warnings
+
+import numpy as np
 
 from emmpy.geomagmodel.ts07.coefficientreader.thincurrentsheetshieldingcoefficients import (
     ThinCurrentSheetShieldingCoefficients
@@ -24,6 +28,32 @@ from emmpy.math.expansions.arraycoefficientexpansion2d import (
 from emmpy.utilities.nones import nones
 
 
+# Name of the binary coefficient file created in a static coefficient
+# directory by TS07DStaticCoefficientsFactory.compile().
+BINARY_COEFFICIENTS_FILE = "staticcoefficients.npz"
+
+# Extension and name of the memory-mappable coefficient file created in a
+# static coefficient directory by TS07DStaticCoefficientsFactory.
+# compileMapped(). It holds several arrays, so it is not a .npy file.
+MAPPED_COEFFICIENTS_EXTENSION = ".emmc"
+MAPPED_COEFFICIENTS_FILE = "staticcoefficients" + MAPPED_COEFFICIENTS_EXTENSION
+
+# Pattern matching the names of the ASCII coefficient files.
+SOURCE_FILE_PATTERN = "tailam*hr_*.par"
+
+# Names of the coefficient arrays in the binary and memory-mappable files.
+# The symmetric arrays are indexed by [n, ...], and the odd and even arrays
+# are indexed by [m, n, ...].
+COEFFICIENT_ARRAY_NAMES = (
+    "symmetricTail", "symmetricWave", "oddTail", "oddWave", "evenTail",
+    "evenWave"
+)
+
+# Number of Bessel orders and wave numbers in each shielding field.
+NUM_SHIELD_AZIMUTHAL_EXPANSIONS = 15
+NUM_SHIELD_RADIAL_EXPANSIONS = 5
+
+
 class SymmetricCylindricalExpansionPair:
     """Wrap a pair of symmetric expansion coefficient sets.
 
@@ -93,6 +123,19 @@ class TS07DStaticCoefficientsFactory:
 
     http://geomag_field.jhuapl.edu/model/TAIL_PAR.zip.
 
+    Reading the hundreds of ASCII files in a high resolution coefficient
+    set is slow, so a directory can be compiled once into a single binary
+    file with compile(). The binary file is used automatically by create()
+    when it is present, unless it is older than any of the ASCII files, in
+    which case it is ignored with a warning.
+
+    When many processes use the same coefficients, the directory can
+    instead be compiled with compileMapped(). The coefficients are then
+    read-only views of a memory-mapped file, so all of the processes share
+    a single copy of them in the page cache. The file holds the shielding
+    fields in the order in which they are evaluated, so a shielding field
+    which uses all of them stacks them without copying.
+
     Attributes
     ----------
     None
@@ -102,12 +145,21 @@ class TS07DStaticCoefficientsFactory:
     def create(*args):
         """Create a new set of static coefficients.
         
-        Create a new set of static coefficients.
-        
+        Create a new set of static coefficients. If the directory contains
+        a memory-mappable coefficient file created by compileMapped(), the
+        coefficients are mapped from it. Otherwise, if the directory
+        contains a binary coefficient file created by compile(), the
+        coefficients are read from it. Otherwise they are read from the
+        ASCII files. A compiled file in the directory which is older than
+        any of the ASCII files is stale, and is ignored with a warning. A
+        compiled file passed by path is always used.
+
         Parameters
         ----------
         staticCoeffDirectory : str
-            Path to the directory where the static coefficients live.
+            Path to the directory where the static coefficients live, or
+            to a binary (.npz) or memory-mappable (.emmc) coefficient
+            file.
         numAzimuthalExpansions : int, optional
             Number of azimuthal expansions.
         numRadialExpansions : int, optional
@@ -128,6 +180,27 @@ class TS07DStaticCoefficientsFactory:
         elif len(args) == 3:
             (staticCoeffDirectory, numAzimuthalExpansions,
              numRadialExpansions) = args
+            if os.path.isfile(staticCoeffDirectory):
+                if staticCoeffDirectory.endswith(
+                        MAPPED_COEFFICIENTS_EXTENSION):
+                    return TS07DStaticCoefficientsFactory.createFromMapped(
+                        staticCoeffDirectory, numAzimuthalExpansions,
+                        numRadialExpansions)
+                return TS07DStaticCoefficientsFactory.createFromBinary(
+                    staticCoeffDirectory, numAzimuthalExpansions,
+                    numRadialExpansions)
+            mappedFile = os.path.join(staticCoeffDirectory,
+                                      MAPPED_COEFFICIENTS_FILE)
+            if TS07DStaticCoefficientsFactory.isCompiledFileCurrent(
+                    mappedFile, staticCoeffDirectory):
+                return TS07DStaticCoefficientsFactory.createFromMapped(
+                    mappedFile, numAzimuthalExpansions, numRadialExpansions)
+            binaryFile = os.path.join(staticCoeffDirectory,
+                                      BINARY_COEFFICIENTS_FILE)
+            if TS07DStaticCoefficientsFactory.isCompiledFileCurrent(
+                    binaryFile, staticCoeffDirectory):
+                return TS07DStaticCoefficientsFactory.createFromBinary(
+                    binaryFile, numAzimuthalExpansions, numRadialExpansions)
             tailS = TS07DStaticCoefficientsFactory.readTailS(
                 staticCoeffDirectory, numRadialExpansions)
             tailO = TS07DStaticCoefficientsFactory.readTail(
@@ -144,6 +217,389 @@ class TS07DStaticCoefficientsFactory:
         else:
             raise Exception
 
+    @staticmethod
+    def isCompiledFileCurrent(compiledFile, staticCoeffDirectory):
+        """Check if a compiled coefficient file can be used.
+
+        Check if a compiled coefficient file exists, and is at least as
+        new as all of the ASCII coefficient files in the directory. A
+        warning is issued for a compiled file which is stale.
+
+        Parameters
+        ----------
+        compiledFile : str
+            Path to the binary or memory-mappable coefficient file.
+        staticCoeffDirectory : str
+            Path to the directory containing the ASCII coefficient files.
+
+        Returns
+        -------
+        result : bool
+            True if the compiled file exists and is not stale.
+        """
+        if not os.path.isfile(compiledFile):
+            return False
+        sourceTimes = [
+            os.path.getmtime(f) for f in
+            glob.glob(os.path.join(staticCoeffDirectory, SOURCE_FILE_PATTERN))
+        ]
+        if sourceTimes and os.path.getmtime(compiledFile) < max(sourceTimes):
+            warnings.warn(
+                "Ignoring %s, which is older than the coefficient files in"
+                " %s; compile the directory again to use it." %
+                (compiledFile, staticCoeffDirectory))
+            return False
+        return True
+
+    @staticmethod
+    def createFromBinary(binaryFile, numAzimuthalExpansions,
+                         numRadialExpansions):
+        """Create a set of static coefficients from a binary file.
+
+        Create a set of static coefficients from a binary file created by
+        compile().
+
+        Parameters
+        ----------
+        binaryFile : str
+            Path to the binary coefficient file.
+        numAzimuthalExpansions : int
+            Number of azimuthal expansions.
+        numRadialExpansions : int
+            Number of radial expansions.
+
+        Returns
+        -------
+        result : ThinCurrentSheetShieldingCoefficients
+            Coefficient set from the binary file.
+
+        Raises
+        ------
+        ValueError
+            If the file has too few expansions.
+        """
+        with np.load(binaryFile) as data:
+            arrays = {name: data[name] for name in COEFFICIENT_ARRAY_NAMES}
+        return TS07DStaticCoefficientsFactory.createFromArrays(
+            arrays, numAzimuthalExpansions, numRadialExpansions, binaryFile)
+
+    @staticmethod
+    def createFromMapped(mappedFile, numAzimuthalExpansions,
+                         numRadialExpansions):
+        """Create a set of static coefficients from a memory-mapped file.
+
+        Create a set of static coefficients from a file created by
+        compileMapped(). The file is memory-mapped read-only, and the
+        coefficients are views into it, so processes which map the same
+        file share its pages rather than holding their own copies. If all
+        of the expansions in the file are used, the stacked coefficients
+        are views of the whole file.
+
+        Parameters
+        ----------
+        mappedFile : str
+            Path to the memory-mappable coefficient file.
+        numAzimuthalExpansions : int
+            Number of azimuthal expansions.
+        numRadialExpansions : int
+            Number of radial expansions.
+
+        Returns
+        -------
+        result : ThinCurrentSheetShieldingCoefficients
+            Coefficient set viewing the mapped file.
+
+        Raises
+        ------
+        ValueError
+            If the file has too few expansions.
+        """
+        (header, tails, waves) = TS07DStaticCoefficientsFactory.mapArrays(
+            mappedFile)
+        (M, N, L, K) = (int(v) for v in header)
+        numShields = N + 2*M*N
+        if tails.shape != (numShields, L, K) or waves.shape != (numShields, K):
+            raise ValueError("%s does not hold %d shielding fields" %
+                             (mappedFile, numShields))
+
+        # The odd and even fields are stored in [n, m] order.
+        arrays = {"symmetricTail": tails[:N], "symmetricWave": waves[:N]}
+        for (i, name) in enumerate(("odd", "even")):
+            start = N + i*M*N
+            arrays[name + "Tail"] = tails[start:start + M*N].reshape(
+                (N, M, L, K)).swapaxes(0, 1)
+            arrays[name + "Wave"] = waves[start:start + M*N].reshape(
+                (N, M, K)).swapaxes(0, 1)
+        if (numAzimuthalExpansions, numRadialExpansions) == (M, N):
+            stackedArrays = (tails, waves)
+        else:
+            stackedArrays = None
+        return TS07DStaticCoefficientsFactory.createFromArrays(
+            arrays, numAzimuthalExpansions, numRadialExpansions, mappedFile,
+            stackedArrays)
+
+    @staticmethod
+    def createFromArrays(arrays, numAzimuthalExpansions, numRadialExpansions,
+                         source, stackedArrays=None):
+        """Create a set of static coefficients from coefficient arrays.
+
+        Create a set of static coefficients from the coefficient arrays of
+        a binary or memory-mappable file. The expansion objects are views
+        of the arrays, not copies.
+
+        Parameters
+        ----------
+        arrays : dict of str: np.ndarray of float
+            Coefficient arrays, with the names in COEFFICIENT_ARRAY_NAMES.
+        numAzimuthalExpansions : int
+            Number of azimuthal expansions.
+        numRadialExpansions : int
+            Number of radial expansions.
+        source : str
+            Path to the file the arrays came from, for error messages.
+        stackedArrays : tuple of np.ndarray of float, optional
+            Coefficients and wave numbers of all of the requested
+            shielding fields, in evaluation order.
+
+        Returns
+        -------
+        result : ThinCurrentSheetShieldingCoefficients
+            Coefficient set viewing the arrays.
+
+        Raises
+        ------
+        ValueError
+            If the arrays have too few expansions.
+        """
+        (availableM, availableN) = arrays["oddWave"].shape[:2]
+        if (numAzimuthalExpansions > availableM or
+            numRadialExpansions > availableN):
+            raise ValueError(
+                "%s has only %d azimuthal and %d radial expansions" %
+                (source, availableM, availableN))
+        M = numAzimuthalExpansions
+        N = numRadialExpansions
+
+        def tails(a):
+            return [t.view(ArrayCoefficientExpansion2D) for t in a]
+
+        def waves(a):
+            return [w.view(ScalarExpansion1D) for w in a]
+
+        return ThinCurrentSheetShieldingCoefficients(
+            numAzimuthalExpansions, numRadialExpansions,
+            ArrayExpansion1D(tails(arrays["symmetricTail"][:N])),
+            ArrayExpansion1D(waves(arrays["symmetricWave"][:N])),
+            ArrayExpansion2D([tails(row) for row in
+                              arrays["oddTail"][:M, :N]]),
+            ArrayExpansion2D([waves(row) for row in
+                              arrays["oddWave"][:M, :N]]),
+            ArrayExpansion2D([tails(row) for row in
+                              arrays["evenTail"][:M, :N]]),
+            ArrayExpansion2D([waves(row) for row in
+                              arrays["evenWave"][:M, :N]]),
+            *(stackedArrays or ()))
+
+    @staticmethod
+    def compile(staticCoeffDirectory, binaryFile=None):
+        """Compile a directory of static coefficients into a binary file.
+
+        Read all of the ASCII coefficient files in a directory, and save
+        them in a single binary (.npz) file which can be read by
+        createFromBinary(). By default, the binary file is written into
+        the directory, where it will be found by create().
+
+        Parameters
+        ----------
+        staticCoeffDirectory : str
+            Path to directory containing the coefficient files.
+        binaryFile : str, optional
+            Path to the binary file to create.
+
+        Returns
+        -------
+        binaryFile : str
+            Path to the binary file which was created.
+        """
+        if binaryFile is None:
+            binaryFile = os.path.join(staticCoeffDirectory,
+                                      BINARY_COEFFICIENTS_FILE)
+        arrays = TS07DStaticCoefficientsFactory.readDirectory(
+            staticCoeffDirectory)
+        (M, N) = arrays["oddWave"].shape[:2]
+        with open(binaryFile, "wb") as f:
+            np.savez(f, numAzimuthalExpansions=M, numRadialExpansions=N,
+                     **arrays)
+        return binaryFile
+
+    @staticmethod
+    def compileMapped(staticCoeffDirectory, mappedFile=None):
+        """Compile a directory of static coefficients for memory mapping.
+
+        Read all of the ASCII coefficient files in a directory, and save
+        them in a single .emmc file which can be memory-mapped by
+        createFromMapped(). The file holds three arrays, each written by
+        np.save(), so np.load() would only read the first of them: an
+        integer header of the sizes M, N, L and K, then the
+        coefficients, shape (N + 2*M*N, L, K), and wave numbers, shape
+        (N + 2*M*N, K), of the shielding fields. The shielding fields are
+        in the order in which they are evaluated: symmetric[n], then
+        odd[n][m], then even[n][m]. By default, the file is written into
+        the directory, where it will be found by create().
+
+        Parameters
+        ----------
+        staticCoeffDirectory : str
+            Path to directory containing the coefficient files.
+        mappedFile : str, optional
+            Path to the memory-mappable file to create.
+
+        Returns
+        -------
+        mappedFile : str
+            Path to the memory-mappable file which was created.
+        """
+        if mappedFile is None:
+            mappedFile = os.path.join(staticCoeffDirectory,
+                                      MAPPED_COEFFICIENTS_FILE)
+        arrays = TS07DStaticCoefficientsFactory.readDirectory(
+            staticCoeffDirectory)
+        (M, N, L, K) = arrays["oddTail"].shape
+        header = np.array((M, N, L, K), dtype=np.int64)
+        tails = np.concatenate(
+            [arrays["symmetricTail"]] +
+            [arrays[name].swapaxes(0, 1).reshape((M*N, L, K))
+             for name in ("oddTail", "evenTail")])
+        waves = np.concatenate(
+            [arrays["symmetricWave"]] +
+            [arrays[name].swapaxes(0, 1).reshape((M*N, K))
+             for name in ("oddWave", "evenWave")])
+        with open(mappedFile, "wb") as f:
+            np.save(f, header)
+            np.save(f, tails)
+            np.save(f, waves)
+        return mappedFile
+
+    @staticmethod
+    def mapArrays(mappedFile):
+        """Memory-map the arrays in a file.
+
+        Memory-map, read-only, each of the arrays in a file which holds
+        one or more arrays written one after another by np.save().
+
+        Parameters
+        ----------
+        mappedFile : str
+            Path to the file.
+
+        Returns
+        -------
+        arrays : list of np.memmap
+            The arrays in the file, in order.
+
+        Raises
+        ------
+        ValueError
+            If the file holds an array in an unsupported format.
+        """
+        arrays = []
+        size = os.path.getsize(mappedFile)
+        with open(mappedFile, "rb") as f:
+            while f.tell() < size:
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    header = np.lib.format.read_array_header_1_0(f)
+                elif version == (2, 0):
+                    header = np.lib.format.read_array_header_2_0(f)
+                else:
+                    raise ValueError("Unsupported array format %s in %s" %
+                                     (version, mappedFile))
+                (shape, fortranOrder, dtype) = header
+                offset = f.tell()
+                arrays.append(np.memmap(
+                    mappedFile, dtype=dtype, mode="r", offset=offset,
+                    shape=shape, order="F" if fortranOrder else "C"))
+                f.seek(offset + arrays[-1].nbytes)
+        return arrays
+
+    @staticmethod
+    def readDirectory(staticCoeffDirectory):
+        """Read all of the ASCII coefficient files in a directory.
+
+        Read all of the ASCII coefficient files in a directory. The
+        numbers of azimuthal and radial expansions are determined from the
+        names of the files in the directory, and are the largest for which
+        all of the files are present.
+
+        Parameters
+        ----------
+        staticCoeffDirectory : str
+            Path to directory containing the coefficient files.
+
+        Returns
+        -------
+        arrays : dict of str: np.ndarray of float
+            Coefficient arrays, with the names in COEFFICIENT_ARRAY_NAMES.
+        """
+        N = len(glob.glob(os.path.join(staticCoeffDirectory,
+                                       "tailamebhr_*.par")))
+
+        # Some directories hold extra azimuthal expansions for the lower
+        # radial expansions, so use the number available for all of them.
+        M = min(
+            len(glob.glob(os.path.join(staticCoeffDirectory,
+                                       "tailamhr_o_%02d_*.par" % (n + 1))))
+            for n in range(N)
+        )
+        symmetric = [
+            TS07DStaticCoefficientsFactory.readShieldFile(
+                os.path.join(staticCoeffDirectory,
+                             "tailamebhr_%02d.par" % (n + 1)))
+            for n in range(N)
+        ]
+        arrays = {
+            "symmetricTail": np.array([t for (t, w) in symmetric]),
+            "symmetricWave": np.array([w for (t, w) in symmetric]),
+        }
+        for (name, fileName) in (("odd", "tailamhr_o_"),
+                                 ("even", "tailamhr_e_")):
+            shields = [
+                [TS07DStaticCoefficientsFactory.readShieldFile(
+                    os.path.join(staticCoeffDirectory,
+                                 fileName + "%02d_%02d.par" % (n + 1, m + 1)))
+                 for n in range(N)]
+                for m in range(M)
+            ]
+            arrays[name + "Tail"] = np.array(
+                [[t for (t, w) in row] for row in shields])
+            arrays[name + "Wave"] = np.array(
+                [[w for (t, w) in row] for row in shields])
+        return arrays
+
+    @staticmethod
+    def readShieldFile(inFile):
+        """Read the coefficients of one shielding field from a file.
+
+        Read the coefficients and wave numbers of one shielding field
+        from an ASCII file, which holds one value per line.
+
+        Parameters
+        ----------
+        inFile : str
+            Path to the coefficient file.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (15, 5)
+            The shielding coefficients.
+        waveNumberValues : np.ndarray of float, shape (5,)
+            The wave numbers.
+        """
+        L = NUM_SHIELD_AZIMUTHAL_EXPANSIONS
+        K = NUM_SHIELD_RADIAL_EXPANSIONS
+        data = np.loadtxt(inFile, usecols=0, max_rows=L*K + K, ndmin=1)
+        return (data[:L*K].reshape((L, K)), data[L*K:])
+
     @staticmethod
     def readTailS(staticCoeffDirectory, numRadialExpansions):
         """Read in tail shielding coefficients from a file.
@@ -162,8 +618,8 @@ class TS07DStaticCoefficientsFactory:
         result : SymmetricCylindricalExpansionPair
             The coefficients.
         """
-        numShieldAzimuthalExpansions = 15
-        numShieldRadialExpansions = 5
+        numShieldAzimuthalExpansions = NUM_SHIELD_AZIMUTHAL_EXPANSIONS
+        numShieldRadialExpansions = NUM_SHIELD_RADIAL_EXPANSIONS
         expansions = nones((numRadialExpansions,))
         waveExpansions = nones((numRadialExpansions,))
         for i in range(numRadialExpansions):
@@ -215,8 +671,8 @@ class TS07DStaticCoefficientsFactory:
         result : AsymmetricCylindricalExpansionPair
             The coefficients.
         """
-        numShieldAzimuthalExpansions = 15
-        numShieldRadialExpansions = 5
+        numShieldAzimuthalExpansions = NUM_SHIELD_AZIMUTHAL_EXPANSIONS
+        numShieldRadialExpansions = NUM_SHIELD_RADIAL_EXPANSIONS
         expansions = nones((numAzimuthalExpansions, numRadialExpansions))
         waveExpansions = nones((numAzimuthalExpansions, numRadialExpansions))
         for n in range(numRadialExpansions):
@@ -0,0 +1,170 @@
+"""A columnar archive of TS07D variable coefficients.
+
+A columnar archive of TS07D variable coefficients.
+
+The TS07D variable coefficients are produced for a sequence of epochs, one
+file per epoch, named YYYY_DDD_HH_MM.par for the start time of the epoch
+(year, day of year, hour and minute). Listing and parsing a year of these
+files is slow, so they can be packed into an archive with
+TS07DVariableCoefficientsUtils.packArchive().
+
+An archive is a directory of .npy files, one per column, each with one row
+per epoch, in order of epoch:
+
+epochs.npy : datetime64[m], shape (E,)
+    Start time of each epoch.
+coefficients.npy : float, shape (E, C)
+    Leading column of each coefficient file, padded with NaN to the length
+    of the longest file.
+configuration.npy : int, shape (E, 4)
+    Number of current sheets, azimuthal expansions, radial expansions and
+    FAC fields of each file.
+dipoleTiltAngle.npy, dynamicPressure.npy, Q.npy, Brms.npy : float, shape (E,)
+    Values from the trailer of each file, or NaN if missing.
+
+The archive is read by memory-mapping each column, so opening it is fast,
+and only the rows which are used are read from disk.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import glob
+import os
+import re
+
+import numpy as np
+
+
+# Pattern for the names of the variable coefficient files.
+EPOCH_FILE_PATTERN = re.compile(r"^(\d{4})_(\d{3})_(\d{2})_(\d{2})\.par$")
+
+# Names of the columns of an archive, each stored as <name>.npy.
+ARCHIVE_ARRAY_NAMES = (
+    "epochs", "coefficients", "configuration", "dipoleTiltAngle",
+    "dynamicPressure", "Q", "Brms"
+)
+
+
+def parseEpoch(variableCoefficientsFile):
+    """Return the epoch of a variable coefficient file.
+
+    Return the start time of the epoch of a variable coefficient file,
+    from its name.
+
+    Parameters
+    ----------
+    variableCoefficientsFile : str
+        Path to a file named YYYY_DDD_HH_MM.par.
+
+    Returns
+    -------
+    epoch : np.datetime64
+        Start time of the epoch, to the minute.
+
+    Raises
+    ------
+    ValueError
+        If the file name is not in the expected format.
+    """
+    match = EPOCH_FILE_PATTERN.match(os.path.basename(variableCoefficientsFile))
+    if match is None:
+        raise ValueError(
+            "%s is not named YYYY_DDD_HH_MM.par" % variableCoefficientsFile)
+    (year, dayOfYear, hour, minute) = (int(g) for g in match.groups())
+    return (
+        np.datetime64("%04d-01-01" % year, "m") +
+        np.timedelta64(dayOfYear - 1, "D") + np.timedelta64(hour, "h") +
+        np.timedelta64(minute, "m")
+    )
+
+
+def findCoefficientFiles(coefficientDirectory):
+    """Find the variable coefficient files in a directory.
+
+    Find the variable coefficient files in a directory, and sort them by
+    epoch. Files which are not named YYYY_DDD_HH_MM.par are ignored.
+
+    Parameters
+    ----------
+    coefficientDirectory : str
+        Path to the directory of variable coefficient files.
+
+    Returns
+    -------
+    epochs : np.ndarray of np.datetime64, shape (E,)
+        Start time of each epoch, in increasing order.
+    files : list of str
+        Path to the coefficient file for each epoch.
+    """
+    files = [
+        f for f in glob.glob(os.path.join(coefficientDirectory, "*.par"))
+        if EPOCH_FILE_PATTERN.match(os.path.basename(f))
+    ]
+    epochs = np.array([parseEpoch(f) for f in files], dtype="datetime64[m]")
+    order = np.argsort(epochs, kind="stable")
+    return (epochs[order], [files[i] for i in order])
+
+
+class TS07DVariableCoefficientsArchive:
+    """A columnar archive of TS07D variable coefficients.
+
+    A read-only view of an archive created by
+    TS07DVariableCoefficientsUtils.packArchive(). Each column is
+    memory-mapped, so the archive may be larger than memory, and processes
+    which open the same archive share its pages. Use
+    TS07DVariableCoefficientsUtils.fromArchive() to create the variable
+    coefficients for an epoch.
+
+    Attributes
+    ----------
+    archiveDirectory : str
+        Path to the archive directory.
+    epochs : np.memmap of np.datetime64, shape (E,)
+        Start time of each epoch, in increasing order.
+    coefficients : np.memmap of float, shape (E, C)
+        Leading column of each coefficient file, padded with NaN.
+    configuration : np.memmap of int, shape (E, 4)
+        Number of current sheets, azimuthal expansions, radial expansions
+        and FAC fields of each epoch.
+    dipoleTiltAngle : np.memmap of float, shape (E,)
+        Dipole tilt angle of each epoch.
+    dynamicPressure : np.memmap of float, shape (E,)
+        Dynamic pressure of each epoch.
+    Q : np.memmap of float, shape (E,)
+        Q value of the fit for each epoch.
+    Brms : np.memmap of float, shape (E,)
+        RMS magnetic field residual of the fit for each epoch.
+    """
+
+    def __init__(self, archiveDirectory):
+        """Initialize a new TS07DVariableCoefficientsArchive object.
+
+        Open an archive, memory-mapping each of its columns.
+
+        Parameters
+        ----------
+        archiveDirectory : str
+            Path to the archive directory.
+
+        Raises
+        ------
+        ValueError
+            If the columns do not all have the same number of epochs.
+        """
+        self.archiveDirectory = archiveDirectory
+        for name in ARCHIVE_ARRAY_NAMES:
+            path = os.path.join(archiveDirectory, name + ".npy")
+            setattr(self, name, np.load(path, mmap_mode="r"))
+        for name in ARCHIVE_ARRAY_NAMES:
+            if len(getattr(self, name)) != len(self.epochs):
+                raise ValueError(
+                    "%s has %d epochs, but %s.npy has %d rows" %
+                    (archiveDirectory, len(self.epochs), name,
+                     len(getattr(self, name))))
+
+    def __len__(self):
+        """Return the number of epochs in the archive."""
+        return len(self.epochs)
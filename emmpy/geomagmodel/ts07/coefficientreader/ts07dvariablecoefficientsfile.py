@@ -0,0 +1,87 @@
+"""The contents of a TS07D variable coefficients file.
+
+The contents of a TS07D variable coefficients file.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+class TS07DVariableCoefficientsFile:
+    """The contents of a TS07D variable coefficients file.
+
+    A container for everything read from a variable coefficients (.par)
+    file in a single pass: the variable coefficients, the model resolution
+    and FAC configuration, and the values from the trailer of the file.
+
+    To construct this class, use TS07DVariableCoefficientsUtils.parse() or
+    TS07DVariableCoefficientsUtils.parseArchive().
+
+    Attributes
+    ----------
+    coefficients : TS07DVariableCoefficients
+        The variable coefficients.
+    values : np.ndarray of float
+        The leading column of the file, as read (the last value is the
+        twist factor multiplied by 10).
+    numCurrentSheets : int
+        Number of current sheets.
+    numAzimuthalExpansions : int
+        Number of azimuthal expansions (M).
+    numRadialExpansions : int
+        Number of radial expansions (N).
+    facConfiguration : DefaultFacConfigurationOptions
+        Configuration of the field-aligned currents.
+    dynamicPressure : float
+        Solar wind dynamic pressure (Pdyn), or None if not in the file.
+    dipoleTiltAngle : float
+        Dipole tilt angle (tilt), or None if not in the file.
+    Q : float
+        Q value of the fit, or None if not in the file.
+    Brms : float
+        RMS magnetic field residual of the fit (B_rms), or None if not in
+        the file.
+    """
+
+    def __init__(self, coefficients, values, numCurrentSheets,
+                 numAzimuthalExpansions, numRadialExpansions,
+                 facConfiguration, dynamicPressure, dipoleTiltAngle, Q,
+                 Brms):
+        """Initialize a new TS07DVariableCoefficientsFile object.
+
+        Initialize a new TS07DVariableCoefficientsFile object.
+
+        Parameters
+        ----------
+        coefficients : TS07DVariableCoefficients
+            The variable coefficients.
+        values : np.ndarray of float
+            The leading column of the file, as read.
+        numCurrentSheets : int
+            Number of current sheets.
+        numAzimuthalExpansions : int
+            Number of azimuthal expansions (M).
+        numRadialExpansions : int
+            Number of radial expansions (N).
+        facConfiguration : DefaultFacConfigurationOptions
+            Configuration of the field-aligned currents.
+        dynamicPressure : float
+            Solar wind dynamic pressure (Pdyn), or None.
+        dipoleTiltAngle : float
+            Dipole tilt angle (tilt), or None.
+        Q : float
+            Q value of the fit, or None.
+        Brms : float
+            RMS magnetic field residual of the fit (B_rms), or None.
+        """
+        self.coefficients = coefficients
+        self.values = values
+        self.numCurrentSheets = numCurrentSheets
+        self.numAzimuthalExpansions = numAzimuthalExpansions
+        self.numRadialExpansions = numRadialExpansions
+        self.facConfiguration = facConfiguration
+        self.dynamicPressure = dynamicPressure
+        self.dipoleTiltAngle = dipoleTiltAngle
+        self.Q = Q
+        self.Brms = Brms
@@ -10,8 +10,11 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import os
 import re
 
+import numpy as np
+
 from emmpy.exceptions.emmpyexception import EmmpyException
 
 from emmpy.geomagmodel.ts07.coefficientreader.defaultfacconfigurationoptions import (
@@ -20,6 +23,12 @@ from emmpy.geomagmodel.ts07.coefficientreader.defaultfacconfigurationoptions imp
 from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficients import (
     TS07DVariableCoefficients
 )
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsarchive import (
+    TS07DVariableCoefficientsArchive, findCoefficientFiles
+)
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsfile import (
+    TS07DVariableCoefficientsFile
+)
 from emmpy.geomagmodel.ts07.coefficientreader.ts07equatoriallinearcoefficients import (
     Ts07EquatorialLinearCoefficients
 )
@@ -36,6 +45,13 @@ from emmpy.math.expansions.arraycoefficientexpansion2d import (
 from emmpy.utilities.nones import nones
 
 
+# Pattern for the comments on the FAC amplitude lines.
+FAC_COMMENT_PATTERN = re.compile("# reg-[1|2] M-[1|2]")
+
+# Comment on the current sheet thickness lines.
+CURRENT_SHEET_THICKNESS_COMMENT = " # current sheet thickness"
+
+
 class TS07DVariableCoefficientsUtils:
     """Utilities for time-dependent coefficients.
 
@@ -83,26 +99,8 @@ class TS07DVariableCoefficientsUtils:
             # WITH a customized resolution. This set of coefficients can be
             # used to construct the TS07D model. The model configuration is
             # interpreted from the file.
-            numCurrentSheets = (
-                TS07DVariableCoefficientsUtils.readCurrentSheetNumber(
-                    variableCoefficientsFile
-                )
-            )
-            numAzimuthalExpansions = (
-                TS07DVariableCoefficientsUtils.readAzimuthalExpansionNumber(
-                    variableCoefficientsFile
-                )
-            )
-            numRadialExpansions = (
-                TS07DVariableCoefficientsUtils.readRadialExpansionNumber(
-                    variableCoefficientsFile
-                )
-            )
-            facConfiguration = (
-                TS07DVariableCoefficientsUtils.readFACConfiguration(
-                    variableCoefficientsFile
-                )
-            )
+            return TS07DVariableCoefficientsUtils.parse(
+                variableCoefficientsFile).coefficients
         elif len(args) == 5:
             (variableCoefficientsFile, numCurrentSheets,
              numAzimuthalExpansions, numRadialExpansions,
@@ -117,20 +115,10 @@ class TS07DVariableCoefficientsUtils:
         # limit the public API to only support 1 or 2 current sheets, not
         # many current sheets.
 
-        # The number of asymmetric expansions is simply n*m.
-        numAsymmetricExpansions = (
-            numRadialExpansions*numAzimuthalExpansions
-        )
-
-        # Half the number of equatorial expansion coefficients, r+2*(r*a).
-        # This is half the expansions as the dynamic pressure terms double
-        # this number.
-        numHalfExpansions = numRadialExpansions + 2*numAsymmetricExpansions
-        numExpansions = numHalfExpansions*2*numCurrentSheets
-
         totalNumberOfCoefficients = (
-            1 + numExpansions + numCurrentSheets + 5 +
-            facConfiguration.numberOfFields
+            TS07DVariableCoefficientsUtils.getNumberOfCoefficients(
+                numCurrentSheets, numAzimuthalExpansions,
+                numRadialExpansions, facConfiguration)
         )
 
         coeffs = nones((totalNumberOfCoefficients,))
@@ -152,6 +140,315 @@ class TS07DVariableCoefficientsUtils:
             numRadialExpansions, facConfiguration
         )
 
+    @staticmethod
+    def getNumberOfCoefficients(numCurrentSheets, numAzimuthalExpansions,
+                                numRadialExpansions, facConfiguration):
+        """Return the number of values in a variable coefficients file.
+
+        Return the number of values in the leading column of a variable
+        coefficients file with the given configuration.
+
+        Parameters
+        ----------
+        numCurrentSheets : int
+            Number of current sheets.
+        numAzimuthalExpansions : int
+            Number of azimuthal expansions.
+        numRadialExpansions : int
+            Number of radial expansions.
+        facConfiguration : FacConfiguration
+            Configuration of FAC.
+
+        Returns
+        -------
+        result : int
+            The number of coefficients.
+        """
+        # The number of asymmetric expansions is simply n*m.
+        numAsymmetricExpansions = (
+            numRadialExpansions*numAzimuthalExpansions
+        )
+
+        # Half the number of equatorial expansion coefficients, r+2*(r*a).
+        # This is half the expansions as the dynamic pressure terms double
+        # this number.
+        numHalfExpansions = numRadialExpansions + 2*numAsymmetricExpansions
+        numExpansions = numHalfExpansions*2*numCurrentSheets
+        return (
+            1 + numExpansions + numCurrentSheets + 5 +
+            facConfiguration.numberOfFields
+        )
+
+    @staticmethod
+    def parse(variableCoefficientsFile, createCoefficients=True):
+        """Read everything in a variable coefficients file in one pass.
+
+        Read a variable coefficients file once, and return the variable
+        coefficients along with the model configuration and the values in
+        the trailer of the file (Q, B_rms, M, N, Pdyn and tilt). The
+        leading column of every line before the trailer is converted to
+        float in a single array conversion.
+
+        Parameters
+        ----------
+        variableCoefficientsFile : str
+            An ASCII file containing a list of the coefficients.
+        createCoefficients : bool, optional
+            False to skip creating the coefficient objects, when only the
+            values and metadata are needed. The coefficients are then None.
+
+        Returns
+        -------
+        result : TS07DVariableCoefficientsFile
+            The contents of the file.
+
+        Raises
+        ------
+        ValueError
+            If M or N is missing from the file, or if the number of values
+            does not match the configuration read from the file.
+        EmmpyException
+            If the coefficients file contains an invalid FAC configuration
+            code.
+        """
+        tokens = []
+        trailer = {}
+        numCurrentSheets = 0
+        numFacs = 0
+        with open(variableCoefficientsFile) as f:
+            for line in f:
+                fields = line.split()
+                if not fields:
+                    continue
+                if "=" in fields[0]:
+                    # Trailer lines look like "Pdyn=   12.7903".
+                    (name, _, value) = line.partition("=")
+                    trailer[name.strip()] = value.split()[-1]
+                    continue
+                if trailer:
+                    continue
+                tokens.append(fields[0])
+                if CURRENT_SHEET_THICKNESS_COMMENT in line:
+                    numCurrentSheets += 1
+                elif FAC_COMMENT_PATTERN.search(line):
+                    numFacs += 1
+        values = np.array(tokens, dtype=float)
+
+        if "M" not in trailer or "N" not in trailer:
+            raise ValueError(
+                "%s does not contain M and N" % variableCoefficientsFile)
+        numAzimuthalExpansions = int(trailer["M"])
+        numRadialExpansions = int(trailer["N"])
+        facConfiguration = (
+            TS07DVariableCoefficientsUtils.createFACConfiguration(numFacs)
+        )
+        totalNumberOfCoefficients = (
+            TS07DVariableCoefficientsUtils.getNumberOfCoefficients(
+                numCurrentSheets, numAzimuthalExpansions,
+                numRadialExpansions, facConfiguration)
+        )
+        if len(values) != totalNumberOfCoefficients:
+            raise ValueError(
+                "%s contains %d coefficients, but M=%d, N=%d needs %d" %
+                (variableCoefficientsFile, len(values),
+                 numAzimuthalExpansions, numRadialExpansions,
+                 totalNumberOfCoefficients))
+
+        coefficients = None
+        if createCoefficients:
+            coefficients = TS07DVariableCoefficientsUtils.createFromValues(
+                values, numCurrentSheets, numAzimuthalExpansions,
+                numRadialExpansions, facConfiguration)
+
+        def readFloat(name):
+            return float(trailer[name]) if name in trailer else None
+        return TS07DVariableCoefficientsFile(
+            coefficients, values, numCurrentSheets, numAzimuthalExpansions,
+            numRadialExpansions, facConfiguration, readFloat("Pdyn"),
+            readFloat("tilt"), readFloat("Q"), readFloat("B_rms")
+        )
+
+    @staticmethod
+    def createFromValues(values, numCurrentSheets, numAzimuthalExpansions,
+                         numRadialExpansions, facConfiguration):
+        """Create the variable coefficients from the values in a file.
+
+        Create the variable coefficients from the leading column of a
+        variable coefficients file, as read (with the last value being the
+        twist factor multiplied by 10).
+
+        Parameters
+        ----------
+        values : array-like of float
+            The leading column of the file.
+        numCurrentSheets : int
+            Number of current sheets.
+        numAzimuthalExpansions : int
+            Number of azimuthal expansions.
+        numRadialExpansions : int
+            Number of radial expansions.
+        facConfiguration : FacConfiguration
+            Configuration of FAC.
+
+        Returns
+        -------
+        result : TS07DVariableCoefficients
+            The variable coefficients.
+        """
+        # NOTE, this is a deviation from the FORTRAN code, the FORTRAN
+        # code handles this in the WARPED subroutine.
+        coeffs = np.asarray(values, dtype=float).tolist()
+        coeffs[-1] /= 10
+        return TS07DVariableCoefficientsUtils.createFromArray(
+            coeffs, numCurrentSheets, numAzimuthalExpansions,
+            numRadialExpansions, facConfiguration
+        )
+
+    @staticmethod
+    def packArchive(coefficientDirectory, archiveDirectory):
+        """Pack a directory of variable coefficient files into an archive.
+
+        Parse every file named YYYY_DDD_HH_MM.par in a directory, and save
+        the values and metadata of all of the files as the columns of an
+        archive, in order of epoch. See the ts07dvariablecoefficientsarchive
+        module for the layout of the archive.
+
+        Parameters
+        ----------
+        coefficientDirectory : str
+            Path to the directory of variable coefficient files.
+        archiveDirectory : str
+            Path to the archive directory to create.
+
+        Returns
+        -------
+        archiveDirectory : str
+            Path to the archive directory which was created.
+        """
+        (epochs, files) = findCoefficientFiles(coefficientDirectory)
+        contents = [
+            TS07DVariableCoefficientsUtils.parse(f, createCoefficients=False)
+            for f in files
+        ]
+        numCoefficients = max([len(c.values) for c in contents], default=0)
+        coefficients = np.full((len(contents), numCoefficients), np.nan)
+        for (row, c) in zip(coefficients, contents):
+            row[:len(c.values)] = c.values
+        configuration = np.array(
+            [(c.numCurrentSheets, c.numAzimuthalExpansions,
+              c.numRadialExpansions, c.facConfiguration.numberOfFields)
+             for c in contents], dtype=np.int64
+        ).reshape((len(contents), 4))
+
+        def column(name):
+            values = [getattr(c, name) for c in contents]
+            return np.array([np.nan if v is None else v for v in values],
+                            dtype=float)
+        columns = {
+            "epochs": epochs,
+            "coefficients": coefficients,
+            "configuration": configuration,
+            "dipoleTiltAngle": column("dipoleTiltAngle"),
+            "dynamicPressure": column("dynamicPressure"),
+            "Q": column("Q"),
+            "Brms": column("Brms"),
+        }
+        os.makedirs(archiveDirectory, exist_ok=True)
+        for (name, array) in columns.items():
+            with open(os.path.join(archiveDirectory, name + ".npy"), "wb") as f:
+                np.save(f, array)
+        return archiveDirectory
+
+    @staticmethod
+    def fromArchive(archive, epochIndex):
+        """Create the variable coefficients for an epoch in an archive.
+
+        Create the variable coefficients for one epoch of an archive
+        created by packArchive(). Only the row of the archive for the epoch
+        is read. To avoid reopening the archive for every epoch, pass an
+        open TS07DVariableCoefficientsArchive.
+
+        Parameters
+        ----------
+        archive : TS07DVariableCoefficientsArchive or str
+            The archive, or the path to the archive directory.
+        epochIndex : int
+            Index of the epoch in the archive.
+
+        Returns
+        -------
+        result : TS07DVariableCoefficients
+            The variable coefficients for the epoch.
+        """
+        return TS07DVariableCoefficientsUtils.parseArchive(
+            archive, epochIndex).coefficients
+
+    @staticmethod
+    def parseArchive(archive, epochIndex):
+        """Read the coefficients and metadata for an epoch in an archive.
+
+        Read the variable coefficients, model resolution, FAC configuration
+        and trailer values for one epoch of an archive created by
+        packArchive(), as parse() reads them from a file. Only the row of
+        the archive for the epoch is read. To avoid reopening the archive
+        for every epoch, pass an open TS07DVariableCoefficientsArchive.
+
+        Parameters
+        ----------
+        archive : TS07DVariableCoefficientsArchive or str
+            The archive, or the path to the archive directory.
+        epochIndex : int
+            Index of the epoch in the archive.
+
+        Returns
+        -------
+        result : TS07DVariableCoefficientsFile
+            The coefficients and metadata for the epoch.
+
+        Raises
+        ------
+        ValueError
+            If the row of the archive does not hold the number of
+            coefficients needed by its configuration.
+        EmmpyException
+            If the configuration has an invalid number of FACs.
+        """
+        if not isinstance(archive, TS07DVariableCoefficientsArchive):
+            archive = TS07DVariableCoefficientsArchive(archive)
+        (numCurrentSheets, numAzimuthalExpansions, numRadialExpansions,
+         numFacFields) = (int(v) for v in archive.configuration[epochIndex])
+        facConfiguration = (
+            TS07DVariableCoefficientsUtils.createFACConfiguration(
+                numFacFields)
+        )
+        numCoefficients = (
+            TS07DVariableCoefficientsUtils.getNumberOfCoefficients(
+                numCurrentSheets, numAzimuthalExpansions,
+                numRadialExpansions, facConfiguration)
+        )
+        values = archive.coefficients[epochIndex, :numCoefficients]
+        if len(values) != numCoefficients or np.isnan(values).any():
+            raise ValueError(
+                "Epoch %d of the archive does not contain the %d"
+                " coefficients needed for M=%d, N=%d" %
+                (epochIndex, numCoefficients, numAzimuthalExpansions,
+                 numRadialExpansions))
+        coefficients = TS07DVariableCoefficientsUtils.createFromValues(
+            values, numCurrentSheets, numAzimuthalExpansions,
+            numRadialExpansions, facConfiguration)
+
+        # Missing trailer values are stored as NaN.
+        def readFloat(column):
+            value = float(column[epochIndex])
+            return None if np.isnan(value) else value
+        return TS07DVariableCoefficientsFile(
+            coefficients, values, numCurrentSheets, numAzimuthalExpansions,
+            numRadialExpansions, facConfiguration,
+            readFloat(archive.dynamicPressure),
+            readFloat(archive.dipoleTiltAngle), readFloat(archive.Q),
+            readFloat(archive.Brms)
+        )
+
     @staticmethod
     def readDynamicPressure(variableCoefficientsFile):
         """Parse the dynamic pressure from the variable coefficients file.
@@ -216,7 +513,7 @@ class TS07DVariableCoefficientsUtils:
         """
         numCurrSheets = 0
         for line in open(variableCoefficientsFile):
-            if " # current sheet thickness" in line:
+            if CURRENT_SHEET_THICKNESS_COMMENT in line:
                 numCurrSheets += 1
         return numCurrSheets
 
@@ -294,8 +591,32 @@ class TS07DVariableCoefficientsUtils:
         """
         count = 0
         for line in open(variableCoefficientsFile):
-            if re.search("# reg-[1|2] M-[1|2]", line):
+            if FAC_COMMENT_PATTERN.search(line):
                 count += 1
+        return TS07DVariableCoefficientsUtils.createFACConfiguration(count)
+
+    @staticmethod
+    def createFACConfiguration(count):
+        """Return the FAC configuration with the given number of FACs.
+
+        Return the FAC configuration with the given number of FAC
+        amplitudes.
+
+        Parameters
+        ----------
+        count : int
+            Number of FAC amplitudes in the coefficients file.
+
+        Returns
+        -------
+        result : DefaultFacConfigurationOptions
+            The FAC configuration with count FACs.
+
+        Raises
+        ------
+        EmmpyException
+            If there is no FAC configuration with count FACs.
+        """
         if count == 4:
             return DefaultFacConfigurationOptions(
                 DefaultFacConfigurationOptions.TS07D)
@@ -9,3 +9,9 @@ dipoleshield
 equatorial
 fieldaligned
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
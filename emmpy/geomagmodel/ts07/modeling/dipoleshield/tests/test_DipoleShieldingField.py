@@ -1,8 +1,11 @@
 import unittest
 
+import numpy as np
+
 from emmpy.geomagmodel.ts07.modeling.dipoleshield.dipoleshieldingfield import (
     DipoleShieldingField
 )
+from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
 class TestBuilder(unittest.TestCase):
@@ -11,7 +14,12 @@ class TestBuilder(unittest.TestCase):
         pass
 
     def test_create(self):
-        pass
+        field = DipoleShieldingField.create(0.3, 2.5)
+        positions = np.array([[-5.0, 2.0, 1.0], [1.0, -3.0, 4.0],
+                              [-10.0, 0.5, -2.0]])
+        expected = [field.evaluate(VectorIJK(p)) for p in positions]
+        self.assertTrue(np.allclose(field.evaluateMany(positions), expected,
+                                    rtol=1e-12, atol=0))
 
     def test_createScaled(self):
         pass
@@ -2,6 +2,7 @@
 
 Modules
 -------
+collapsedthincurrentsheetfield.py
 shieldedthincurrentsheetfield.py
 thinasymmetriccurrentsheetbasisvectorshieldingfield.py
 ts07equatorialmagneticfieldbuilder.py
@@ -10,3 +11,9 @@ Packages
 --------
 tests
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
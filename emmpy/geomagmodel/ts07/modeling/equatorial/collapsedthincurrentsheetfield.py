@@ -0,0 +1,258 @@
+"""A shielded thin current sheet field with its coefficients folded in.
+
+A shielded thin current sheet field with its coefficients folded in.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import numpy as np
+
+from emmpy.magmodel.core.math.cylindricalharmonicfield import (
+    differentiateStacked, evaluateCombined, evaluateStackedGrid
+)
+from emmpy.magmodel.core.math.vectorfields.basisvectorfield import (
+    BasisVectorField
+)
+from emmpy.magmodel.core.modeling.equatorial.expansion.tailsheetcoefficients import (
+    TailSheetCoefficients
+)
+from emmpy.magmodel.core.modeling.equatorial.expansion.thinasymmetriccurrentsheetbasisvectorfield import (
+    ThinAsymmetricCurrentSheetBasisVectorField
+)
+from emmpy.math.coordinates.vectorijk import VectorIJK
+
+
+class CollapsedThinCurrentSheetField(BasisVectorField):
+    """A shielded thin current sheet field with its coefficients folded in.
+
+    This field computes the weighted sum of the 2*M*N + N basis functions
+    of a ShieldedThinCurrentSheetField, as a single basis function. The
+    weights are folded into the thin current sheet coefficients and into
+    the static shielding coefficients when the field is created, so the
+    shielding is evaluated as one combined cylindrical harmonic sum, rather
+    than one sum per basis function.
+
+    Attributes
+    ----------
+    thinCurrentSheet : ThinAsymmetricCurrentSheetBasisVectorField
+        Thin current sheet with the weights folded into its coefficients.
+    includeShield : bool
+        True to include the shielding field, else False.
+    besselCache : BesselFunctionCache
+        Cache for the Bessel function tables, or None.
+    shieldCoefficients : np.ndarray of float, shape (2*M*N + N, L, K)
+        Shielding coefficients with the weights and signs folded in.
+    shieldWaveNumbers : np.ndarray of float, shape (2*M*N + N, K)
+        Wave numbers of every shielding field.
+    shieldIsEven : np.ndarray of bool, shape (2*M*N + N,)
+        True for the shielding fields with EVEN trig parity.
+    """
+
+    def __init__(self, shieldedField, coeffs):
+        """Initialize a new CollapsedThinCurrentSheetField object.
+
+        Initialize a new CollapsedThinCurrentSheetField object.
+
+        Parameters
+        ----------
+        shieldedField : ShieldedThinCurrentSheetField
+            The field to collapse.
+        coeffs : array-like of float, shape (2*M*N + N,)
+            Weight of each basis function of shieldedField, in the order
+            returned by its evaluateExpansion() method.
+        """
+        coeffs = np.asarray(coeffs, dtype=float)
+        thin = shieldedField.thinCurrentSheet
+        M = thin.numAzimuthalExpansions
+        N = thin.numRadialExpansions
+        thinCoeffs = TailSheetCoefficients.createFromArray(
+            coeffs*thin.coeffs.getAsSingleExpansion(), M, N)
+        self.thinCurrentSheet = ThinAsymmetricCurrentSheetBasisVectorField(
+            thin.tailLength, thin.currentSheetHalfThickness, thinCoeffs,
+            thin.besselCache)
+        self.includeShield = shieldedField.includeShield
+        self.besselCache = None
+        self.shieldCoefficients = None
+        self.shieldWaveNumbers = None
+        self.shieldIsEven = None
+        if self.includeShield:
+            shield = shieldedField.thinCurrentSheetShield
+            if shield.stackedCoefficients is None:
+                shield.stackCoefficients()
+            weights = coeffs*shield.stackedSigns
+            self.besselCache = shield.besselCache
+            self.shieldCoefficients = (
+                shield.stackedCoefficients*weights[:, np.newaxis, np.newaxis]
+            )
+            self.shieldWaveNumbers = shield.stackedWaveNumbers
+            self.shieldIsEven = shield.stackedIsEven
+
+    def evaluate(self, location, buffer=None):
+        """Evaluate the field at the given location.
+
+        Evaluate the field at the given location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the field.
+        buffer : VectorIJK, optional
+            Buffer to hold the result.
+
+        Returns
+        -------
+        buffer : VectorIJK
+            The field evaluated at location.
+        """
+        positions = np.asarray(location, dtype=float).reshape((1, 3))
+        if buffer is None:
+            buffer = VectorIJK()
+        buffer[:] = self.evaluateMany(positions)[0]
+        return buffer
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (P, 3)
+            The field evaluated at each location.
+        """
+        positions = np.asarray(positions, dtype=float)
+        values = self.thinCurrentSheet.evaluateMany(positions)
+        if self.includeShield:
+            values += evaluateCombined(
+                positions, self.shieldCoefficients, self.shieldWaveNumbers,
+                self.shieldIsEven, self.besselCache)
+        return values
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at an array of locations.
+
+        Evaluate the field and its Jacobian at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (P, 3)
+            The field evaluated at each location.
+        jacobian : np.ndarray of float, shape (P, 3, 3)
+            Jacobian of the field at each location.
+        """
+        positions = np.asarray(positions, dtype=float)
+        (values, jacobian) = self.thinCurrentSheet.differentiateMany(
+            positions)
+        if self.includeShield:
+            (v, j) = differentiateStacked(
+                positions, self.shieldCoefficients, self.shieldWaveNumbers,
+                self.shieldIsEven, self.besselCache, combine=True)
+            values += v
+            jacobian += j
+        return (values, jacobian)
+
+    def evaluateGrid(self, grid):
+        """Evaluate the field on a regular grid.
+
+        Evaluate the field on a regular grid.
+
+        Parameters
+        ----------
+        grid : CartesianGrid or CylindricalGrid
+            Grid of locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape grid.shape + (3,)
+            The field evaluated at each grid point.
+        """
+        values = self.thinCurrentSheet.evaluateGrid(grid)
+        if self.includeShield:
+            values += evaluateStackedGrid(
+                grid, self.shieldCoefficients, self.shieldWaveNumbers,
+                self.shieldIsEven, self.besselCache, combine=True)
+        return values
+
+    def evaluateExpansion(self, location):
+        """Evaluate the expansion at the given location.
+
+        Evaluate the expansion at the given location. The expansion has a
+        single element, the weighted sum of the collapsed basis functions.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the expansion.
+
+        Returns
+        -------
+        result : list of VectorIJK
+            Expansion evaluated at location.
+        """
+        return [self.evaluate(location)]
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the expansion at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (P, 1, 3)
+            Expansion evaluated at each location.
+        """
+        return self.evaluateMany(positions)[:, np.newaxis, :]
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the expansion and its Jacobian at an array of locations.
+
+        Evaluate the expansion and its Jacobian at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (P, 1, 3)
+            Expansion evaluated at each location.
+        jacobians : np.ndarray of float, shape (P, 1, 3, 3)
+            Jacobian of the expansion at each location.
+        """
+        (values, jacobian) = self.differentiateMany(positions)
+        return (values[:, np.newaxis], jacobian[:, np.newaxis])
+
+    def getNumberOfBasisFunctions(self):
+        """Return the number of basis functions.
+
+        Return the number of basis functions.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : int
+            The number of basis functions, always 1.
+        """
+        return 1
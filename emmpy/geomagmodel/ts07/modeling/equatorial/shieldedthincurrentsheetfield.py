@@ -9,6 +9,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.geomagmodel.ts07.modeling.equatorial.thinasymmetriccurrentsheetbasisvectorshieldingfield import (
     ThinAsymmetricCurrentSheetBasisVectorShieldingField
 )
@@ -23,6 +25,7 @@ from emmpy.magmodel.core.modeling.equatorial.expansion.tailsheetexpansions impor
 from emmpy.magmodel.core.modeling.equatorial.expansion.thinasymmetriccurrentsheetbasisvectorfield import (
     ThinAsymmetricCurrentSheetBasisVectorField
 )
+from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
 class ShieldedThinCurrentSheetField(BasisVectorField):
@@ -67,7 +70,8 @@ class ShieldedThinCurrentSheetField(BasisVectorField):
 
     @staticmethod
     def createUnity(currentSheetHalfThickness, tailLength,
-                    staticCoefficients, includeShield):
+                    staticCoefficients, includeShield, besselCache=None,
+                    thinCurrentSheetShield=None):
         """The createUnity method.
 
         The createUnity method.
@@ -82,6 +86,11 @@ class ShieldedThinCurrentSheetField(BasisVectorField):
             Static coefficients.
         includeShield : bool
             True to include the shield.
+        besselCache : BesselFunctionCache, optional
+            Bessel function cache for the new fields.
+        thinCurrentSheetShield : ThinAsymmetricCurrentSheetBasisVectorShieldingField, optional
+            Existing shield for the static coefficients, to reuse instead
+            of creating a new one.
         
         Returns
         -------
@@ -92,10 +101,11 @@ class ShieldedThinCurrentSheetField(BasisVectorField):
             ThinAsymmetricCurrentSheetBasisVectorField.createUnity(
                 tailLength, currentSheetHalfThickness,
                 staticCoefficients.numAzimuthalExpansions,
-                staticCoefficients.numRadialExpansions)
+                staticCoefficients.numRadialExpansions, besselCache)
         )
-        thinCurrentSheetShield = ThinAsymmetricCurrentSheetBasisVectorShieldingField(
-            staticCoefficients)
+        if thinCurrentSheetShield is None:
+            thinCurrentSheetShield = ThinAsymmetricCurrentSheetBasisVectorShieldingField(
+                staticCoefficients, besselCache)
         return ShieldedThinCurrentSheetField(
             thinCurrentSheet, thinCurrentSheetShield, includeShield)
 
@@ -160,4 +170,119 @@ class ShieldedThinCurrentSheetField(BasisVectorField):
         result : list of VectorIJK
             Expansion evaluated at location.
         """
-        return self.evaluateExpansions(location).getExpansionsAsList()
+        return [VectorIJK(v) for v in self.evaluateExpansionArray(location)]
+
+    def evaluateExpansionArray(self, location):
+        """Evaluate the expansion at a location as a single array.
+
+        Evaluate the expansion at a location as a single array.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the expansion.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (2*M*N + N, 3)
+            Expansion evaluated at location, in the same order as returned
+            by evaluateExpansion().
+        """
+        positions = np.asarray(location, dtype=float).reshape((1, 3))
+        return self.evaluateExpansionMany(positions)[0]
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the expansion at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (P, 2*M*N + N, 3)
+            Expansion evaluated at each location, in the same order as
+            returned by evaluateExpansion().
+        """
+        expansions = self.thinCurrentSheet.evaluateExpansionMany(positions)
+
+        # As above, only compute the shielding if it is needed.
+        if self.includeShield:
+            expansions += self.thinCurrentSheetShield.evaluateExpansionMany(
+                positions)
+        return expansions
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at an array of locations.
+
+        Evaluate the sum of the basis functions and its Jacobian at an
+        array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (P, 3)
+            Field evaluated at each location.
+        jacobian : np.ndarray of float, shape (P, 3, 3)
+            Jacobian of the field at each location.
+        """
+        (values, jacobian) = self.thinCurrentSheet.differentiateMany(
+            positions)
+        if self.includeShield:
+            (v, j) = self.thinCurrentSheetShield.differentiateMany(positions)
+            values += v
+            jacobian += j
+        return (values, jacobian)
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the expansion and its Jacobians at an array of locations.
+
+        Evaluate the expansion and its Jacobians at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (P, 2*M*N + N, 3)
+            Expansion evaluated at each location.
+        jacobians : np.ndarray of float, shape (P, 2*M*N + N, 3, 3)
+            Jacobian of each basis function at each location.
+        """
+        (expansions, jacobians) = (
+            self.thinCurrentSheet.differentiateExpansionMany(positions))
+        if self.includeShield:
+            (e, j) = self.thinCurrentSheetShield.differentiateExpansionMany(
+                positions)
+            expansions += e
+            jacobians += j
+        return (expansions, jacobians)
+
+    def evaluateGrid(self, grid):
+        """Evaluate the field on a regular grid.
+
+        Evaluate the sum of the basis functions on a regular grid.
+
+        Parameters
+        ----------
+        grid : CartesianGrid or CylindricalGrid
+            Grid of locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape grid.shape + (3,)
+            Field evaluated at each grid point.
+        """
+        values = self.thinCurrentSheet.evaluateGrid(grid)
+        if self.includeShield:
+            values += self.thinCurrentSheetShield.evaluateGrid(grid)
+        return values
@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+from emmpy.crucible.crust.vectorfieldsij.differentiablescalarfieldij import (
+    DifferentiableScalarFieldIJ
+)
+from emmpy.geomagmodel.ts07.modeling.equatorial.collapsedthincurrentsheetfield import (
+    CollapsedThinCurrentSheetField
+)
+from emmpy.geomagmodel.ts07.modeling.equatorial.shieldedthincurrentsheetfield import (
+    ShieldedThinCurrentSheetField
+)
+from emmpy.geomagmodel.ts07.modeling.equatorial.tests.test_ThinAsymmetricCurrentSheetBasisVectorShieldingField import (
+    createRandomCoefficients
+)
+from emmpy.magmodel.core.math.besselfunctioncache import BesselFunctionCache
+from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.differentiation import evaluateWithDifferences
+from emmpy.math.vectorfields.gridevaluation import CylindricalGrid
+
+
+class TestBuilder(unittest.TestCase):
+
+    def test___init__(self):
+        pass
+
+    def test_evaluateMany(self):
+        (M, N) = (2, 3)
+        rng = np.random.default_rng(13)
+        staticCoefficients = createRandomCoefficients(M, N, 4, 3, rng)
+        currentSheetHalfThickness = DifferentiableScalarFieldIJ.createConstant(
+            2.3)
+        coeffs = rng.normal(size=N + 2*M*N)
+        positions = rng.uniform(-12.0, 12.0, (6, 3))
+        for includeShield in (True, False):
+            shieldedField = ShieldedThinCurrentSheetField.createUnity(
+                currentSheetHalfThickness, 20.0, staticCoefficients,
+                includeShield)
+            field = CollapsedThinCurrentSheetField(shieldedField, coeffs)
+            values = field.evaluateMany(positions)
+            expected = np.einsum(
+                "b,pbi->pi", coeffs,
+                shieldedField.evaluateExpansionMany(positions))
+            self.assertTrue(np.allclose(values, expected))
+            b = field.evaluate(VectorIJK(positions[0]))
+            self.assertTrue(np.allclose(b, expected[0]))
+
+    def test_evaluateGrid(self):
+        (M, N) = (2, 3)
+        rng = np.random.default_rng(17)
+        staticCoefficients = createRandomCoefficients(M, N, 4, 3, rng)
+        currentSheetHalfThickness = DifferentiableScalarFieldIJ.createConstant(
+            2.3)
+        coeffs = rng.normal(size=N + 2*M*N)
+        grid = CylindricalGrid([3.0, 7.0, 11.0], [1.0, 3.0], [-2.0, 0.5, 4.0])
+        for includeShield in (True, False):
+            shieldedField = ShieldedThinCurrentSheetField.createUnity(
+                currentSheetHalfThickness, 20.0, staticCoefficients,
+                includeShield, BesselFunctionCache())
+            field = CollapsedThinCurrentSheetField(shieldedField, coeffs)
+            values = field.evaluateGrid(grid)
+            self.assertEqual(values.shape, (3, 2, 3, 3))
+            expected = field.evaluateMany(grid.positions())
+            self.assertTrue(np.allclose(values.reshape((-1, 3)), expected))
+            values = shieldedField.evaluateGrid(grid)
+            expected = shieldedField.evaluateMany(grid.positions())
+            self.assertTrue(np.allclose(values.reshape((-1, 3)), expected))
+
+    def test_differentiateMany(self):
+        (M, N) = (2, 3)
+        rng = np.random.default_rng(19)
+        staticCoefficients = createRandomCoefficients(M, N, 4, 3, rng)
+        currentSheetHalfThickness = DifferentiableScalarFieldIJ.createConstant(
+            2.3)
+        coeffs = rng.normal(size=N + 2*M*N)
+        positions = rng.uniform(-12.0, 12.0, (6, 3))
+        for includeShield in (True, False):
+            shieldedField = ShieldedThinCurrentSheetField.createUnity(
+                currentSheetHalfThickness, 20.0, staticCoefficients,
+                includeShield)
+            field = CollapsedThinCurrentSheetField(shieldedField, coeffs)
+            (values, jacobian) = field.differentiateMany(positions)
+            self.assertTrue(np.allclose(values, field.evaluateMany(positions)))
+            (_, expected) = evaluateWithDifferences(field, positions, 1e-4, 4)
+            self.assertTrue(np.allclose(jacobian, expected))
+            (expansions, jacobians) = shieldedField.differentiateExpansionMany(
+                positions)
+            self.assertTrue(np.allclose(
+                jacobian, np.einsum("b,pbij->pij", coeffs, jacobians)))
+            (_, summed) = shieldedField.differentiateMany(positions)
+            self.assertTrue(np.allclose(summed, jacobians.sum(axis=1)))
+
+    def test_evaluateExpansion(self):
+        pass
+
+    def test_getNumberOfBasisFunctions(self):
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
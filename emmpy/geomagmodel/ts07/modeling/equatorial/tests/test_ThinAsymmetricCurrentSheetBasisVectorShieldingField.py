@@ -1,8 +1,47 @@
+import mmap
+import os
+import tempfile
 import unittest
 
+import numpy as np
+
+import emmpy
+from emmpy.geomagmodel.ts07.coefficientreader.thincurrentsheetshieldingcoefficients import (
+    ThinCurrentSheetShieldingCoefficients
+)
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dstaticcoefficientsfactory import (
+    TS07DStaticCoefficientsFactory
+)
 from emmpy.geomagmodel.ts07.modeling.equatorial.thinasymmetriccurrentsheetbasisvectorshieldingfield import (
     ThinAsymmetricCurrentSheetBasisVectorShieldingField
 )
+from emmpy.magmodel.core.math.besselfunctioncache import BesselFunctionCache
+from emmpy.math.coordinates.cartesianvector import CartesianVector
+from emmpy.math.vectorfields.differentiation import (
+    evaluateExpansionWithDifferences
+)
+from emmpy.math.vectorfields.gridevaluation import CartesianGrid
+
+
+# Sample static coefficients shipped with the examples.
+staticCoefficientsDirectory = os.path.join(
+    os.path.dirname(os.path.dirname(emmpy.__file__)), "examples",
+    "staticcoefficients", "coeffs_n8_m6"
+)
+haveExamples = os.path.isdir(staticCoefficientsDirectory)
+
+
+def createRandomCoefficients(M, N, L, K, rng):
+    """Create a random set of shielding coefficients."""
+    return ThinCurrentSheetShieldingCoefficients(
+        M, N,
+        list(rng.normal(size=(N, L, K))),
+        list(rng.uniform(0.05, 0.5, (N, K))),
+        [list(c) for c in rng.normal(size=(M, N, L, K))],
+        [list(w) for w in rng.uniform(0.05, 0.5, (M, N, K))],
+        [list(c) for c in rng.normal(size=(M, N, L, K))],
+        [list(w) for w in rng.uniform(0.05, 0.5, (M, N, K))]
+    )
 
 
 class TestBuilder(unittest.TestCase):
@@ -16,6 +55,80 @@ class TestBuilder(unittest.TestCase):
     def test_evaluateExpansions(self):
         pass
 
+    def test_evaluateExpansionMany(self):
+        (M, N) = (2, 3)
+        rng = np.random.default_rng(5)
+        coeffs = createRandomCoefficients(M, N, 4, 3, rng)
+        field = ThinAsymmetricCurrentSheetBasisVectorShieldingField(coeffs)
+        positions = rng.uniform(-10.0, 10.0, (4, 3))
+        expansions = field.evaluateExpansionMany(positions)
+        self.assertEqual(expansions.shape, (4, N + 2*M*N, 3))
+        for (position, expansion) in zip(positions, expansions):
+            # Compare with one CylindricalHarmonicField per basis function.
+            expected = field.evaluateExpansions(
+                CartesianVector(position)).getExpansionsAsList()
+            self.assertTrue(np.allclose(expansion, np.array(expected)))
+
+    def test_differentiateExpansionMany(self):
+        (M, N) = (2, 3)
+        rng = np.random.default_rng(6)
+        coeffs = createRandomCoefficients(M, N, 4, 3, rng)
+        positions = rng.uniform(-10.0, 10.0, (4, 3))
+        for besselCache in (None, BesselFunctionCache()):
+            field = ThinAsymmetricCurrentSheetBasisVectorShieldingField(
+                coeffs, besselCache)
+            (expansions, jacobians) = field.differentiateExpansionMany(
+                positions)
+            self.assertEqual(jacobians.shape, (4, N + 2*M*N, 3, 3))
+            self.assertTrue(np.allclose(
+                expansions, field.evaluateExpansionMany(positions)))
+            (_, expected) = evaluateExpansionWithDifferences(
+                field, positions, 1e-4, 4)
+            self.assertTrue(np.allclose(jacobians, expected))
+            (values, jacobian) = field.differentiateMany(positions)
+            self.assertTrue(np.allclose(values, expansions.sum(axis=1)))
+            self.assertTrue(np.allclose(jacobian, jacobians.sum(axis=1)))
+
+    def test_evaluateGrid(self):
+        (M, N) = (2, 3)
+        rng = np.random.default_rng(8)
+        coeffs = createRandomCoefficients(M, N, 4, 3, rng)
+        field = ThinAsymmetricCurrentSheetBasisVectorShieldingField(coeffs)
+        grid = CartesianGrid([-9.0, -1.0, 6.0], [-3.0, 4.0], [-2.0, 1.0])
+        values = field.evaluateGrid(grid)
+        self.assertEqual(values.shape, (3, 2, 2, 3))
+        expected = field.evaluateExpansionMany(grid.positions()).sum(axis=1)
+        self.assertTrue(np.allclose(values.reshape((-1, 3)), expected))
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_stackCoefficients(self):
+        positions = np.array([[-5.0, 2.0, 1.0], [3.0, -4.0, -0.5]])
+        ascii = ThinAsymmetricCurrentSheetBasisVectorShieldingField(
+            TS07DStaticCoefficientsFactory.create(
+                staticCoefficientsDirectory, 6, 8))
+        with tempfile.TemporaryDirectory() as directory:
+            mappedFile = TS07DStaticCoefficientsFactory.compileMapped(
+                staticCoefficientsDirectory,
+                os.path.join(directory, "coeffs.emmc"))
+            coeffs = TS07DStaticCoefficientsFactory.createFromMapped(
+                mappedFile, 6, 8)
+            field = ThinAsymmetricCurrentSheetBasisVectorShieldingField(
+                coeffs)
+            field.stackCoefficients()
+
+            # The stacked arrays are views of the mapped file.
+            for array in (field.stackedCoefficients,
+                          field.stackedWaveNumbers):
+                base = array
+                while not isinstance(base, mmap.mmap):
+                    base = base.base
+                mapping = np.frombuffer(base, dtype=np.uint8)
+                self.assertTrue(np.shares_memory(array, mapping))
+            self.assertTrue(np.array_equal(
+                field.evaluateExpansionMany(positions),
+                ascii.evaluateExpansionMany(positions)))
+            del coeffs, field, array, base, mapping
+
     def test_getNumberOfBasisFunctions(self):
         pass
 
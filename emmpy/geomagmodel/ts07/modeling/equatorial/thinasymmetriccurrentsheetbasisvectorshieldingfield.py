@@ -9,8 +9,11 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.magmodel.core.math.cylindricalharmonicfield import (
-    CylindricalHarmonicField
+    CylindricalHarmonicField, differentiateStacked, evaluateStacked,
+    evaluateStackedGrid
 )
 from emmpy.magmodel.core.math.expansions.arrayexpansion1d import ArrayExpansion1D
 from emmpy.magmodel.core.math.expansions.arrayexpansion2d import ArrayExpansion2D
@@ -38,9 +41,19 @@ class ThinAsymmetricCurrentSheetBasisVectorShieldingField(BasisVectorField):
         Number of azimuthal expansions
     numRadialExpansions : int
         Number of radial expansions.
+    besselCache : BesselFunctionCache
+        Cache for the Bessel function tables, or None.
+    stackedCoefficients : np.ndarray of float, shape (2*M*N + N, L, K)
+        Coefficients of every shielding field, in basis function order.
+    stackedWaveNumbers : np.ndarray of float, shape (2*M*N + N, K)
+        Wave numbers of every shielding field, in basis function order.
+    stackedIsEven : np.ndarray of bool, shape (2*M*N + N,)
+        True for the shielding fields with EVEN trig parity.
+    stackedSigns : np.ndarray of float, shape (2*M*N + N,)
+        Sign applied to each shielding field.
     """
 
-    def __init__(self, coeffs):
+    def __init__(self, coeffs, besselCache=None):
         """Initialize a new object.
 
         Initialize a new object.
@@ -49,11 +62,21 @@ class ThinAsymmetricCurrentSheetBasisVectorShieldingField(BasisVectorField):
         ----------
         coeffs : ThinCurrentSheetShieldingCoefficients
             Shielding coefficients.
+        besselCache : BesselFunctionCache, optional
+            Cache for the Bessel function tables.
         """
         self.coeffs = coeffs
+        self.besselCache = besselCache
         self.numAzimuthalExpansions = coeffs.numAzimuthalExpansions
         self.numRadialExpansions = coeffs.numRadialExpansions
 
+        # The stacked coefficients are assembled on first use by
+        # evaluateExpansionMany().
+        self.stackedCoefficients = None
+        self.stackedWaveNumbers = None
+        self.stackedIsEven = None
+        self.stackedSigns = None
+
     def evaluateExpansion(self, location):
         """Evaluate the expansion at a location.
 
@@ -69,7 +92,131 @@ class ThinAsymmetricCurrentSheetBasisVectorShieldingField(BasisVectorField):
         result : list of VectorIJK
             Expansion evaluated at location.
         """
-        return self.evaluateExpansions(location).getExpansionsAsList()
+        return [VectorIJK(v) for v in self.evaluateExpansionArray(location)]
+
+    def evaluateExpansionArray(self, location):
+        """Evaluate the expansion at a location as a single array.
+
+        Evaluate the expansion at a location as a single array.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location for evaluation.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (2*M*N + N, 3)
+            Expansion evaluated at location, in the same order as returned
+            by evaluateExpansion().
+        """
+        positions = np.asarray(location, dtype=float).reshape((1, 3))
+        return self.evaluateExpansionMany(positions)[0]
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate every symmetric, odd, and even shielding field at every
+        location in one batch.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations for evaluation.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (P, 2*M*N + N, 3)
+            Expansion evaluated at each location, in the same order as
+            returned by evaluateExpansion().
+        """
+        if self.stackedCoefficients is None:
+            self.stackCoefficients()
+        expansions = evaluateStacked(
+            positions, self.stackedCoefficients, self.stackedWaveNumbers,
+            self.stackedIsEven, self.besselCache
+        )
+        expansions *= self.stackedSigns[:, np.newaxis]
+        return expansions
+
+    def differentiateMany(self, positions):
+        """Evaluate the sum of the shielding fields and its Jacobian.
+
+        Evaluate the sum of the shielding fields and its Jacobian at an
+        array of locations, with the signs folded into the coefficients.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (P, 3)
+            Sum of the shielding fields at each location.
+        jacobian : np.ndarray of float, shape (P, 3, 3)
+            Jacobian of the sum at each location.
+        """
+        if self.stackedCoefficients is None:
+            self.stackCoefficients()
+        signs = self.stackedSigns[:, np.newaxis, np.newaxis]
+        return differentiateStacked(
+            positions, self.stackedCoefficients*signs,
+            self.stackedWaveNumbers, self.stackedIsEven, self.besselCache,
+            combine=True)
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the expansion and its Jacobians at an array of locations.
+
+        Evaluate every shielding field and its Jacobian at every location
+        in one batch.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Locations for evaluation.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (P, 2*M*N + N, 3)
+            Expansion evaluated at each location, in the same order as
+            returned by evaluateExpansion().
+        jacobians : np.ndarray of float, shape (P, 2*M*N + N, 3, 3)
+            Jacobian of each shielding field at each location.
+        """
+        if self.stackedCoefficients is None:
+            self.stackCoefficients()
+        (expansions, jacobians) = differentiateStacked(
+            positions, self.stackedCoefficients, self.stackedWaveNumbers,
+            self.stackedIsEven, self.besselCache
+        )
+        expansions *= self.stackedSigns[:, np.newaxis]
+        jacobians *= self.stackedSigns[:, np.newaxis, np.newaxis]
+        return (expansions, jacobians)
+
+    def evaluateGrid(self, grid):
+        """Evaluate the sum of the shielding fields on a regular grid.
+
+        Evaluate the sum of the shielding fields on a regular grid, with
+        the signs folded into the coefficients.
+
+        Parameters
+        ----------
+        grid : CartesianGrid or CylindricalGrid
+            Grid of locations for evaluation.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape grid.shape + (3,)
+            Sum of the shielding fields at each grid point.
+        """
+        if self.stackedCoefficients is None:
+            self.stackCoefficients()
+        signs = self.stackedSigns[:, np.newaxis, np.newaxis]
+        coefficients = self.stackedCoefficients*signs
+        return evaluateStackedGrid(
+            grid, coefficients, self.stackedWaveNumbers, self.stackedIsEven,
+            self.besselCache, combine=True)
 
     def evaluateExpansions(self, location):
         """Evaluate the expansions at a location.
@@ -149,6 +296,46 @@ class ThinAsymmetricCurrentSheetBasisVectorShieldingField(BasisVectorField):
             ArrayExpansion2D(oddExpansions),
             ArrayExpansion2D(evenExpansions))
 
+    def stackCoefficients(self):
+        """Stack the coefficients of all of the shielding fields.
+
+        Stack the coefficients of all of the shielding fields, in the same
+        order as returned by evaluateExpansion(), for evaluation with
+        evaluateStacked(). If the coefficients already hold the stacked
+        arrays, as they do when they are mapped from a file created by
+        TS07DStaticCoefficientsFactory.compileMapped(), the stacked
+        coefficients are views of them rather than copies.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        M = self.numAzimuthalExpansions
+        N = self.numRadialExpansions
+        self.stackedIsEven = np.zeros(N + 2*M*N, dtype=bool)
+        self.stackedIsEven[N + M*N:] = True
+        self.stackedSigns = np.where(self.stackedIsEven, -1.0, 1.0)
+        if self.coeffs.stackedTailExpansion is not None:
+            self.stackedCoefficients = self.coeffs.stackedTailExpansion
+            self.stackedWaveNumbers = self.coeffs.stackedTailWaveExpansion
+            return
+        tailExpansions = list(self.coeffs.symmetricTailExpansion[:N])
+        waveExpansions = list(self.coeffs.symmetricTailWaveExpansion[:N])
+        for (tail, wave) in (
+            (self.coeffs.oddTailExpansion, self.coeffs.oddTailWaveExpansion),
+            (self.coeffs.evenTailExpansion, self.coeffs.evenTailWaveExpansion)
+        ):
+            for n in range(N):
+                for m in range(M):
+                    tailExpansions.append(tail[m][n])
+                    waveExpansions.append(wave[m][n])
+        self.stackedCoefficients = np.array(tailExpansions, dtype=float)
+        self.stackedWaveNumbers = np.array(waveExpansions, dtype=float)
+
     def getNumberOfBasisFunctions(self):
         """Return the number of basis functions.
 
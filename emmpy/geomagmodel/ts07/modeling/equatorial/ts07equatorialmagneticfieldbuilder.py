@@ -19,9 +19,18 @@ from emmpy.geomagmodel.t01.deformation.positionbender import (
 from emmpy.geomagmodel.t01.deformation.twistwarpffunction import (
     TwistWarpFfunction
 )
+from emmpy.geomagmodel.ts07.modeling.equatorial.collapsedthincurrentsheetfield import (
+    CollapsedThinCurrentSheetField
+)
 from emmpy.geomagmodel.ts07.modeling.equatorial.shieldedthincurrentsheetfield import (
     ShieldedThinCurrentSheetField
 )
+from emmpy.geomagmodel.ts07.modeling.equatorial.thinasymmetriccurrentsheetbasisvectorshieldingfield import (
+    ThinAsymmetricCurrentSheetBasisVectorShieldingField
+)
+from emmpy.magmodel.core.math.besselfunctioncache import (
+    BesselFunctionCache
+)
 from emmpy.magmodel.core.math.vectorfields.basisvectorfields import (
     BasisVectorFields
 )
@@ -47,8 +56,14 @@ class Ts07EquatorialMagneticFieldBuilder:
         Shielding coefficients.
     includeShield : bool
         True to include the shielding field.
+    collapseCoefficients : bool
+        True to fold the linear coefficients into the current sheet fields.
     withTA15deformation : float
         z-component of interplanetary magnetic field.
+    shieldingFieldCache : LRUCache
+        Cache of the thin current sheet shielding fields, or None.
+    besselCache : BesselFunctionCache
+        Bessel function cache shared by the current sheets, or None.
     """
 
     def __init__(self, dipoleTiltAngle, dynamicPressure, coeffs, tailLength,
@@ -76,7 +91,10 @@ class Ts07EquatorialMagneticFieldBuilder:
         self.tailLength = tailLength
         self.shieldingCoeffs = shieldingCoeffs
         self.includeShield = True
+        self.collapseCoefficients = False
         self.withTA15deformation = 0.0
+        self.shieldingFieldCache = None
+        self.besselCache = None
 
     def withEquatorialShielding(self):
         """Turn on equatorial shielding.
@@ -119,6 +137,77 @@ class Ts07EquatorialMagneticFieldBuilder:
         self.includeShield = False
         return self
 
+    def withCollapsedCoefficients(self):
+        """Fold the linear coefficients into the current sheet fields.
+
+        By default, the equatorial field has one basis function for each
+        linear coefficient (and each pressure-dependent linear
+        coefficient) of each current sheet. When only the total field is
+        needed, the linear coefficients can instead be folded into the
+        thin current sheet and shielding coefficients when the field is
+        built. Each current sheet is then a single basis function, and its
+        shielding is evaluated as one combined cylindrical harmonic sum,
+        which is much faster.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        self : Ts07EquatorialMagneticFieldBuilder
+            This builder object.
+        """
+        self.collapseCoefficients = True
+        return self
+
+    def withExpandedCoefficients(self):
+        """Keep one basis function for each linear coefficient.
+
+        This is the default, so if you haven't previously called
+        withCollapsedCoefficients(), you won't need to call this.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        self : Ts07EquatorialMagneticFieldBuilder
+            This builder object.
+        """
+        self.collapseCoefficients = False
+        return self
+
+    def withShieldingFieldCache(self, shieldingFieldCache, besselCache):
+        """Share the thin current sheet shielding fields between builds.
+
+        The shielding fields depend only on the tail length and static
+        coefficients, so they can be reused when the current sheet
+        thicknesses, dipole tilt angle, dynamic pressure or linear
+        coefficients change. The shielding fields hold the stacked
+        shielding coefficient tables, which are expensive to assemble. The
+        thin current sheets themselves are cheap, and are created for each
+        build. Shielding fields are looked up in, and added to, the
+        provided cache, and new fields are created with the provided Bessel
+        function cache.
+
+        Parameters
+        ----------
+        shieldingFieldCache : LRUCache
+            Cache of the thin current sheet shielding fields.
+        besselCache : BesselFunctionCache
+            Bessel function cache for new fields.
+
+        Returns
+        -------
+        self : Ts07EquatorialMagneticFieldBuilder
+            This builder object.
+        """
+        self.shieldingFieldCache = shieldingFieldCache
+        self.besselCache = besselCache
+        return self
+
     def build(self):
         """Build the equatorial magnetic field.
 
@@ -139,6 +228,25 @@ class Ts07EquatorialMagneticFieldBuilder:
         twistParam = self.coeffs.twistParam
         equatorialFields = nones((numCurrSheets,))
 
+        # All of the current sheets are evaluated at the same deformed
+        # locations, so they share the Bessel function tables.
+        besselCache = self.besselCache
+        if besselCache is None:
+            besselCache = BesselFunctionCache()
+
+        # The shielding field depends only on the tail length and static
+        # coefficients, so all of the current sheets share it, and it is
+        # reused from a previous build if possible.
+        key = (self.tailLength, self.shieldingCoeffs)
+        shield = None
+        if self.shieldingFieldCache is not None:
+            shield = self.shieldingFieldCache.get(key)
+        if shield is None:
+            shield = ThinAsymmetricCurrentSheetBasisVectorShieldingField(
+                self.shieldingCoeffs, besselCache)
+            if self.shieldingFieldCache is not None:
+                self.shieldingFieldCache.put(key, shield)
+
         # Loop through each of the current sheets.
         for currSheetIndex in range(numCurrSheets):
             currSheetThick = self.coeffs.currThicks[currSheetIndex]
@@ -152,7 +260,17 @@ class Ts07EquatorialMagneticFieldBuilder:
             # Construct the shielded thin current sheet.
             thinCurrentSheet = ShieldedThinCurrentSheetField.createUnity(
                 currentSheetHalfThickness, self.tailLength,
-                self.shieldingCoeffs, self.includeShield)
+                self.shieldingCoeffs, self.includeShield, besselCache,
+                shield)
+            coeffs = linearCoeffs.coeffs.getAsSingleExpansion()
+            pdsc = linearCoeffs.getPdynScaledCoeffs(self.dynamicPressure)
+            pdynCoeffs = pdsc.getAsSingleExpansion()
+
+            # If requested, fold the linear coefficients into the current
+            # sheet now, since the deformations are linear in the field.
+            if self.collapseCoefficients:
+                thinCurrentSheet = CollapsedThinCurrentSheetField(
+                    thinCurrentSheet, coeffs + pdynCoeffs)
 
             # If the with TA15 deformation was called, apply the TA15
             # deformation instead of the T01 deformation.
@@ -181,14 +299,14 @@ class Ts07EquatorialMagneticFieldBuilder:
                 pdynScaling = pow(self.dynamicPressure/2.0, 0.155)
                 scaledBentWarpedField = BasisVectorFields.scaleLocation(
                     bentWarpedField, pdynScaling)
-                coeffs = linearCoeffs.coeffs.getAsSingleExpansion()
-                pdsc = linearCoeffs.getPdynScaledCoeffs(self.dynamicPressure)
-                pdynCoeffs = pdsc.getAsSingleExpansion()
 
                 # Finally, expand the coefficients by including a term
                 # that includes the dynamical pressure.
-                equatorialField = BasisVectorFields.expandCoefficients2(
-                    scaledBentWarpedField, coeffs, [pdynCoeffs])
+                if self.collapseCoefficients:
+                    equatorialField = scaledBentWarpedField
+                else:
+                    equatorialField = BasisVectorFields.expandCoefficients2(
+                        scaledBentWarpedField, coeffs, [pdynCoeffs])
                 equatorialFields[currSheetIndex] = equatorialField
 
-            return BasisVectorFields.concatAll(equatorialFields)
+        return BasisVectorFields.concatAll(equatorialFields)
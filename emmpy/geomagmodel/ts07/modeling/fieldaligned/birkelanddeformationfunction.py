@@ -9,7 +9,7 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
-from math import cos, sin, sqrt
+import numpy as np
 
 from emmpy.magmodel.core.math.vectorfields.differentiablesphericalvectorfield import (
     Results
@@ -152,6 +152,48 @@ class BirkelandDeformationFunction:
         return Results(locDef, drDef_dr, drDef_dtheta, 0, dthetaDef_dr,
                        dthetaDef_dTheta, 0, 0, 0, dphiDef_dPhi)
 
+    def differentiateMany(self, locations):
+        """Differentiate the deformation function at many locations.
+
+        Compute the deformed location and its Jacobian at each of an array
+        of spherical locations, with the same numerical derivatives as
+        differentiate().
+
+        Parameters
+        ----------
+        locations : array-like of float, shape (N, 3)
+            Spherical (r, theta, phi) locations for differentiation.
+
+        Returns
+        -------
+        deformed : np.ndarray of float, shape (N, 3)
+            Deformed (r, theta, phi) location for each location.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the deformation, indexed as [n, i, j] for the
+            derivative of deformed component i with respect to original
+            component j.
+        """
+        locations = np.asarray(locations, dtype=float)
+        (r, theta, phi) = locations.T
+        delta = BirkelandDeformationFunction.delta
+        deformed = np.stack(
+            (self.rDeform(r, theta), self.thetaDeform(r, theta), phi),
+            axis=-1)
+
+        # Numerically approximate derivatives for deformation.
+        jacobian = np.zeros(locations.shape + (3,))
+        for (j, (dr, dtheta)) in enumerate(((delta, 0.0), (0.0, delta))):
+            jacobian[:, 0, j] = (
+                self.rDeform(r + dr, theta + dtheta) -
+                self.rDeform(r - dr, theta - dtheta)
+            )/(2*delta)
+            jacobian[:, 1, j] = (
+                self.thetaDeform(r + dr, theta + dtheta) -
+                self.thetaDeform(r - dr, theta - dtheta)
+            )/(2*delta)
+        jacobian[:, 2, 2] = 1.0
+        return (deformed, jacobian)
+
     def rDeform(self, r, theta):
         """Deform the radius to describe the field aligned current.
 
@@ -167,26 +209,27 @@ class BirkelandDeformationFunction:
 
         Parameters
         ----------
-        r : float
+        r : float or np.ndarray of float
             The undeformed radius.
-        theta : float
+        theta : float or np.ndarray of float
             The undeformed polar angle (measured from the GSM Z axis).
         
         Returns
         -------
-        result: float
+        result: float or np.ndarray of float
             The deformed radius.
         """
         r2 = r*r
         return (
-            r + self.a[0]/r + (self.a[1]*r /(sqrt(r2 + self.b[0]*self.b[0]))) +
+            r + self.a[0]/r +
+            (self.a[1]*r/(np.sqrt(r2 + self.b[0]*self.b[0]))) +
             (self.a[2]*r/(r2 + self.b[1]*self.b[1])) +
-            cos(theta)*(self.a[3] + self.a[4]/r + self.a[5]*r /
-                        sqrt(r2 + self.b[2]*self.b[2]) +
-                        self.a[6]*r/(r2 + self.b[3]*self.b[3])) +
-            cos(2*theta)*(self.a[7]*r/sqrt(r2 + self.b[4]*self.b[4]) +
-                          self.a[8]*r/((r2 + self.b[5]*self.b[5]) *
-                                       (r2 + self.b[5]*self.b[5])))
+            np.cos(theta)*(self.a[3] + self.a[4]/r + self.a[5]*r /
+                           np.sqrt(r2 + self.b[2]*self.b[2]) +
+                           self.a[6]*r/(r2 + self.b[3]*self.b[3])) +
+            np.cos(2*theta)*(self.a[7]*r/np.sqrt(r2 + self.b[4]*self.b[4]) +
+                             self.a[8]*r/((r2 + self.b[5]*self.b[5]) *
+                                          (r2 + self.b[5]*self.b[5])))
         )
 
     def thetaDeform(self, r, theta):
@@ -198,22 +241,23 @@ class BirkelandDeformationFunction:
 
         Parameters
         ----------
-        r : float
+        r : float or np.ndarray of float
             The initial radius.
-        theta : float
+        theta : float or np.ndarray of float
             The initial polar angle (measured from the GSM Z axis).
         
         Returns
         -------
-        result : float
+        result : float or np.ndarray of float
             The deformed polar angle (theta).
         """
         r2 = r*r
         return (
             theta + (self.c[0] + self.c[1]/r + self.c[2]/r2 +
-                     self.c[3]*r/sqrt(r2 + self.d[0]*self.d[0]))*sin(theta) +
-            (self.c[4] + self.c[5]*r/sqrt(r2 + self.d[1]*self.d[1]) +
-             self.c[6]*r/(r2 + self.d[2]*self.d[2])) * sin(2 * theta) +
+                     self.c[3]*r/np.sqrt(r2 + self.d[0]*self.d[0])) *
+            np.sin(theta) +
+            (self.c[4] + self.c[5]*r/np.sqrt(r2 + self.d[1]*self.d[1]) +
+             self.c[6]*r/(r2 + self.d[2]*self.d[2])) * np.sin(2 * theta) +
             (self.c[7] + self.c[8]/r + self.c[9]*r /
-             (r2 + self.d[3]*self.d[3]))*sin(3*theta)
+             (r2 + self.d[3]*self.d[3]))*np.sin(3*theta)
         )
@@ -11,6 +11,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 import math
 
+import numpy as np
+
 from emmpy.math.coordinates.cylindricalvector import CylindricalVector
 from emmpy.math.coordinates.vectorijk import VectorIJK
 
@@ -188,3 +190,55 @@ class Ffunction:
             return self.evaluate(CylindricalVector(rho, phi, y)).getF()
         else:
             raise TypeError
+
+    def evaluateMany(self, locations):
+        """Evaluate the function at an array of locations.
+
+        Evaluate the stretch transformation and its partial derivatives
+        at each of an array of modified cylindrical locations, with the
+        same formulas as evaluate().
+
+        Parameters
+        ----------
+        locations : array-like of float, shape (N, 3)
+            Modified cylindrical (rho, phi, y) locations for evaluation.
+
+        Returns
+        -------
+        result : FDerivatives
+            Result of the evaluation, with an array of shape (N,) for F
+            and each of its partial derivatives.
+        """
+        (rho, phi, y) = np.moveaxis(np.asarray(locations, dtype=float), -1, 0)
+        rho2 = rho*rho
+        r = np.sqrt(rho2 + y*y)
+        sinPhi = np.sin(phi)
+        cosPhi = np.cos(phi)
+
+        # Tsy 2002-1 eq. (21), as in evaluate().
+        sinPhiCoef = (
+            self.deltaPhi + Ffunction.bConst*Ffunction.rho02 /
+            (Ffunction.rho02 + 1)*(rho2 - 1)/(Ffunction.rho02 + rho2)
+        )
+        rRh = (r - 1)/Ffunction.hingeDistance
+        rRhEps = rRh**Ffunction.epsilon
+        fm1 = rRhEps/rRh
+        f = 1 + rRhEps
+        qr = f**(1/Ffunction.epsilon)
+        dQr = qr*f
+        psiTerm = Ffunction.beta*self.dipoleTilt/qr
+        phiStretched = phi - sinPhiCoef*sinPhi - psiTerm
+
+        # Compute derivatives of F with respect to phi, rho, and y.
+        dF_dPhi = 1 - sinPhiCoef*cosPhi
+        dF_dRho = (
+            -2*Ffunction.bConst*Ffunction.rho02*rho /
+            ((Ffunction.rho02 + rho2)*(Ffunction.rho02 + rho2))*sinPhi +
+            Ffunction.beta*self.dipoleTilt*fm1*rho /
+            (Ffunction.hingeDistance*r*dQr)
+        )
+        dF_dy = (
+            Ffunction.beta*self.dipoleTilt*fm1*y /
+            (Ffunction.hingeDistance*r*dQr)
+        )
+        return FDerivatives(phiStretched, dF_dPhi, dF_dRho, dF_dy)
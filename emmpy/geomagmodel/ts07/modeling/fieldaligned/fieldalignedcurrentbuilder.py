@@ -108,6 +108,8 @@ class FieldAlignedCurrentBuilder:
     kappa :
     dPhi :
     scalingCoefficient :
+    conicalFieldCache : LRUCache
+        Cache of the deformed two-cone fields, or None.
     """
 
     def __init__(self, *args):
@@ -146,6 +148,7 @@ class FieldAlignedCurrentBuilder:
         TypeError
             If invalid parameters are provided.
         """
+        self.conicalFieldCache = None
         if len(args) == 4:
             (options, dipoleTilt, dynamicPressure, kappa) = args
             region = options.getRegion().getAsInt()
@@ -241,6 +244,27 @@ class FieldAlignedCurrentBuilder:
         self.deltaTheta = deltaTheta
         return self
 
+    def withConicalFieldCache(self, conicalFieldCache):
+        """Share the deformed two-cone fields between builds.
+
+        The deformed two-cone field depends only on the configuration of
+        the FAC, not on the dipole tilt, dynamic pressure, kappa scaling or
+        amplitude, so it can be reused when those change. Fields are
+        looked up in, and added to, the provided cache.
+
+        Parameters
+        ----------
+        conicalFieldCache : LRUCache
+            Cache of the deformed two-cone fields.
+
+        Returns
+        -------
+        self : FieldAlignedCurrentBuilder
+            The current object.
+        """
+        self.conicalFieldCache = conicalFieldCache
+        return self
+
     def build(self):
         """Build the field-aligned current.
         
@@ -261,6 +285,47 @@ class FieldAlignedCurrentBuilder:
         # between the Java and the Fortran version of the model.
         dynamicPressureScalingFactor = pow(self.dynamicPressure/2, 0.155)
 
+        # Reuse the deformed two-cone field if it has already been built.
+        key = (self.theta0, self.deltaTheta, self.mode, self.trigParity,
+               self.smoothed, tuple(self.a), tuple(self.b), tuple(self.c),
+               tuple(self.d), self.bmScaleFactor)
+        twoCones = None
+        if self.conicalFieldCache is not None:
+            twoCones = self.conicalFieldCache.get(key)
+        if twoCones is None:
+            twoCones = self.buildTwoConicalFields()
+            if self.conicalFieldCache is not None:
+                self.conicalFieldCache.put(key, twoCones)
+
+        # Scale the field output by the coefficient.
+        scaledTwoCones = vectorfields.scale(twoCones, self.scalingCoefficient)
+
+        stretchedField = ScaledField(
+            StretchedField(
+                scaledTwoCones, self.dipoleTilt, self.dPhi
+            ), self.kappa
+        )
+
+        # Scale position vector for solar wind (see Tsy 2002-1 2.4).
+        pDynScaledField = scaleLocation(stretchedField, dynamicPressureScalingFactor)
+
+        return pDynScaledField
+
+    def buildTwoConicalFields(self):
+        """Build the deformed two-cone field.
+
+        Build the deformed two-cone field, before it is scaled, stretched
+        and bent.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        twoCones : TwoConicalFields
+            The deformed two-cone field.
+        """
         # Construct the conical field, eq. 14 & 15 of T91.
         undeformedConicalField = None
         if self.smoothed:
@@ -288,17 +353,4 @@ class FieldAlignedCurrentBuilder:
 
         # Make it two cones.
         twoCones = TwoConicalFields(deformedField)
-
-        # Scale the field output by the coefficient.
-        scaledTwoCones = vectorfields.scale(twoCones, self.scalingCoefficient)
-
-        stretchedField = ScaledField(
-            StretchedField(
-                scaledTwoCones, self.dipoleTilt, self.dPhi
-            ), self.kappa
-        )
-
-        # Scale position vector for solar wind (see Tsy 2002-1 2.4).
-        pDynScaledField = scaleLocation(stretchedField, dynamicPressureScalingFactor)
-
-        return pDynScaledField
+        return twoCones
@@ -9,6 +9,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.math.vectorfields.vectorfield import VectorField
 
 
@@ -71,3 +73,26 @@ class ScaledField(VectorField):
         # Apply the kappa scaling factor eq. (25).
         buffer *= self.kappaScale
         return buffer
+
+    def evaluateMany(self, positions):
+        """Evaluate the scaled field at an array of locations.
+
+        Evaluate the scaled field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Field evaluated at each location.
+        """
+        # Perform spatial scaling, eq. (25).
+        scaledPositions = np.asarray(positions, dtype=float)*self.kappaScale
+        values = self.unscaledField.evaluateMany(scaledPositions)
+
+        # Apply the kappa scaling factor eq. (25).
+        values *= self.kappaScale
+        return values
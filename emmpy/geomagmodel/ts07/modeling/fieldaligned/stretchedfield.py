@@ -12,6 +12,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import atan2, cos, sin, sqrt
 
+import numpy as np
+
 from emmpy.geomagmodel.ts07.modeling.fieldaligned.ffunction import Ffunction
 from emmpy.math.coordinates.cylindricalvector import CylindricalVector
 from emmpy.math.coordinates.vectorijk import VectorIJK
@@ -147,6 +149,57 @@ class StretchedField(VectorField):
         buffer[:] = [bx, by, bz]
         return buffer
 
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations, with the same steps
+        as evaluate(). The unstretched field is evaluated at all of the
+        stretched locations with a single call to evaluateMany().
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Field evaluated at each location.
+        """
+        positions = np.asarray(positions, dtype=float)
+        (x, y, z) = positions.T
+
+        # Convert to cylindrical, with phi = 0 on the y-axis.
+        rho = np.sqrt(x*x + z*z)
+        phi = np.where((x == 0) & (z == 0), 0.0, np.arctan2(-z, x))
+        sinPhi = np.sin(phi)
+        cosPhi = np.cos(phi)
+
+        # Tsy 2002-1 eqn 21, the stretch transformation function.
+        fValues = self.fFunction.evaluateMany(
+            np.stack((rho, phi, y), axis=-1))
+        dF_dPhi = fValues.dF_dPhi
+        dF_dRho = fValues.dF_dRho
+        dF_dy = fValues.dF_dy
+        sinF = np.sin(fValues.f)
+        cosF = np.cos(fValues.f)
+        (bx, by, bz) = self.unstretchedField.evaluateMany(
+            np.stack((rho*cosF, y, -rho*sinF), axis=-1)).T
+
+        # Tsy 2002-1 eqn 22, B* the original undeformed field evaluated with
+        # the deformed coordinates.
+        bRhoStar = bx*cosF - bz*sinF
+        bPhiStar = -bx*sinF - bz*cosF
+
+        # Tsy 2002-1 eqn 23, B' apply the transformation matrix.
+        bRho = bRhoStar*dF_dPhi
+        bPhi = bPhiStar - rho*(by*dF_dy + bRhoStar*dF_dRho)
+        by = by*dF_dPhi
+
+        # Tsy 2002-1 eqn 24, and now convert B' from cylindrial to Cartesian.
+        return np.stack((bRho*cosPhi - bPhi*sinPhi, by,
+                         -bRho*sinPhi - bPhi*cosPhi), axis=-1)
+
     def evaluate2(self, location, buffer):
         """An alternative evaluation of the field.
 
@@ -1,8 +1,11 @@
 import unittest
 
+import numpy as np
+
 from emmpy.geomagmodel.ts07.modeling.fieldaligned.birkelanddeformationfunction import (
     BirkelandDeformationFunction
 )
+from emmpy.math.coordinates.sphericalvector import SphericalVector
 
 
 class TestBuilder(unittest.TestCase):
@@ -16,6 +19,22 @@ class TestBuilder(unittest.TestCase):
     def test_differentiate(self):
         pass
 
+    def test_differentiateMany(self):
+        rng = np.random.default_rng(7)
+        (a, b, c, d) = (list(rng.uniform(-1.0, 1.0, n)) for n in (9, 6, 10, 4))
+        f = BirkelandDeformationFunction(a, b, c, d)
+        locations = rng.uniform((1.0, 0.0, 0.0), (10.0, np.pi, 2*np.pi),
+                                (6, 3))
+        (deformed, jacobian) = f.differentiateMany(locations)
+        self.assertEqual(jacobian.shape, (6, 3, 3))
+        for (p, v, j) in zip(locations, deformed, jacobian):
+            r = f.differentiate(SphericalVector(*p))
+            self.assertTrue(np.allclose(v, r.f))
+            self.assertTrue(np.allclose(j, [
+                [r.dFrDr, r.dFrDt, r.dFrDp],
+                [r.dFtDr, r.dFtDt, r.dFtDp],
+                [r.dFpDr, r.dFpDt, r.dFpDp]]))
+
     def test_rDeform(self):
         pass
 
@@ -1,6 +1,9 @@
 import unittest
 
+import numpy as np
+
 from emmpy.geomagmodel.ts07.modeling.fieldaligned.ffunction import Ffunction
+from emmpy.math.coordinates.cylindricalvector import CylindricalVector
 
 
 class TestBuilder(unittest.TestCase):
@@ -13,6 +16,17 @@ class TestBuilder(unittest.TestCase):
     def test_evaluate(self):
         pass
 
+    def test_evaluateMany(self):
+        ff = Ffunction(0.1, 0.3)
+        locations = np.random.default_rng(15).uniform(
+            (0.0, -np.pi, -5.0), (8.0, np.pi, 5.0), (5, 3))
+        result = ff.evaluateMany(locations)
+        for (i, location) in enumerate(locations):
+            expected = ff.evaluate(CylindricalVector(*location))
+            for name in ("f", "dF_dPhi", "dF_dRho", "dF_dy"):
+                self.assertAlmostEqual(getattr(result, name)[i],
+                                       getattr(expected, name))
+
 
 if __name__ == '__main__':
     unittest.main()
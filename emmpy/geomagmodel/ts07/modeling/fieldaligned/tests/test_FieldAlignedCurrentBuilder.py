@@ -1,8 +1,12 @@
 import unittest
 
+import numpy as np
+
 from emmpy.geomagmodel.ts07.modeling.fieldaligned.fieldalignedcurrentbuilder import (
     FieldAlignedCurrentBuilder
 )
+from emmpy.magmodel.core.math.trigparity import ODD
+from emmpy.utilities.lrucache import LRUCache
 
 
 class TestBuilder(unittest.TestCase):
@@ -22,6 +26,22 @@ class TestBuilder(unittest.TestCase):
     def test_withDeltaTheta(self):
         pass
 
+    def test_withConicalFieldCache(self):
+        cache = LRUCache()
+        builder = FieldAlignedCurrentBuilder(1, 1, ODD, 0.1, 2.0, 1.0, 5.0)
+        self.assertIs(builder.withConicalFieldCache(cache), builder)
+        field = builder.build()
+        self.assertEqual(len(cache), 1)
+
+        # A different tilt and amplitude reuse the same two-cone field.
+        tilted = FieldAlignedCurrentBuilder(1, 1, ODD, 0.3, 2.0, 1.0, 7.0)
+        tilted.withConicalFieldCache(cache).build()
+        self.assertEqual(len(cache), 1)
+        positions = np.array([[3.0, 4.0, 5.0], [-6.0, 2.0, 1.0]])
+        uncached = FieldAlignedCurrentBuilder(1, 1, ODD, 0.1, 2.0, 1.0, 5.0)
+        self.assertTrue(np.allclose(field.evaluateMany(positions),
+                                    uncached.build().evaluateMany(positions)))
+
     def test_build(self):
         pass
 
@@ -1,8 +1,14 @@
 import unittest
 
+import numpy as np
+
 from emmpy.geomagmodel.ts07.modeling.fieldaligned.stretchedfield import (
     StretchedField
 )
+from emmpy.magmodel.core.modeling.fac.tests.test_XYPlaneReflectedField import (
+    ProductField
+)
+from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
 class TestBuilder(unittest.TestCase):
@@ -13,6 +19,16 @@ class TestBuilder(unittest.TestCase):
     def test_evaluate(self):
         pass
 
+    def test_evaluateMany(self):
+        field = StretchedField(ProductField(), 0.3, 0.1)
+        positions = np.random.default_rng(16).uniform(-5.0, 5.0, (5, 3))
+        positions[0] = (0.0, 2.0, 0.0)
+        values = field.evaluateMany(positions)
+        self.assertEqual(values.shape, (5, 3))
+        for (position, value) in zip(positions, values):
+            expected = field.evaluate(VectorIJK(position), VectorIJK())
+            self.assertTrue(np.allclose(value, expected))
+
     def test_evaluate2(self):
         pass
 
@@ -1,8 +1,14 @@
 import unittest
 
+import numpy as np
+
+from emmpy.geomagmodel.ts07.coefficientreader.defaultfacconfigurationoptions import (
+    DefaultFacConfigurationOptions
+)
 from emmpy.geomagmodel.ts07.modeling.fieldaligned.ts07dfieldalignedmagneticfield import (
     Ts07DFieldAlignedMagneticField
 )
+from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
 class TestBuilder(unittest.TestCase):
@@ -13,6 +19,18 @@ class TestBuilder(unittest.TestCase):
     def test_create(self):
         pass
 
+    def test_evaluateExpansionMany(self):
+        options = DefaultFacConfigurationOptions.getTs07(
+            [1.0, -2.0, 0.5, 3.0])
+        field = Ts07DFieldAlignedMagneticField.create(
+            0.2, 2.0, 1.1, 0.9, options, True)
+        positions = np.random.default_rng(18).uniform(-8.0, 8.0, (3, 3))
+        expansions = field.evaluateExpansionMany(positions)
+        self.assertEqual(expansions.shape, (3, 4, 3))
+        for (position, expansion) in zip(positions, expansions):
+            expected = field.evaluateExpansion(VectorIJK(position))
+            self.assertTrue(np.allclose(expansion, expected))
+
 
 if __name__ == '__main__':
     unittest.main()
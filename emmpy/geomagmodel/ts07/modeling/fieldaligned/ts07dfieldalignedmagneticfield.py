@@ -9,6 +9,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 import emmpy.crucible.core.math.vectorfields.vectorfields as vectorfields
 from emmpy.geomagmodel.ts07.modeling.fieldaligned.fieldalignedcurrentbuilder import (
     FieldAlignedCurrentBuilder
@@ -55,7 +57,8 @@ class Ts07DFieldAlignedMagneticField(BasisVectorField):
     """
 
     def __init__(self, dipoleTiltAngle, dynamicPressure, region1KappaScaling,
-                 region2KappaScaling, options, includeShielding):
+                 region2KappaScaling, options, includeShielding,
+                 conicalFieldCache=None):
         """Initialize a new Ts07DFieldAlignedMagneticField object.
 
         Initialize a new Ts07DFieldAlignedMagneticField object.
@@ -74,6 +77,8 @@ class Ts07DFieldAlignedMagneticField(BasisVectorField):
             options
         includeShielding : bool
             True to compute shielding field.
+        conicalFieldCache : LRUCache, optional
+            Cache of the deformed two-cone fields, shared between builds.
         """
         self.includeShielding = includeShielding
 
@@ -113,6 +118,8 @@ class Ts07DFieldAlignedMagneticField(BasisVectorField):
             builder.withTheta0(option.theta0)
             builder.withDeltaTheta(option.deltaTheta)
             builder.smoothing = option.isSmoothed()
+            if conicalFieldCache is not None:
+                builder.withConicalFieldCache(conicalFieldCache)
 
             field = builder.build()
             internalFieldsBuilder.append(field)
@@ -140,7 +147,8 @@ class Ts07DFieldAlignedMagneticField(BasisVectorField):
 
     @staticmethod
     def create(dipoleTiltAngle, dynamicPressure, region1KappaScaling,
-               region2KappaScaling, options, includeShielding):
+               region2KappaScaling, options, includeShielding,
+               conicalFieldCache=None):
         """Create a new Ts07DFieldAlignedMagneticField module.
 
         Creates a new Ts07DFieldAlignedMagneticField module from the
@@ -160,6 +168,8 @@ class Ts07DFieldAlignedMagneticField(BasisVectorField):
             options
         includeShielding :bool;
             includeShielding
+        conicalFieldCache : LRUCache, optional
+            Cache of the deformed two-cone fields, shared between builds.
         
         Returns
         -------
@@ -168,7 +178,8 @@ class Ts07DFieldAlignedMagneticField(BasisVectorField):
         """
         return Ts07DFieldAlignedMagneticField(
             dipoleTiltAngle, dynamicPressure, region1KappaScaling,
-            region2KappaScaling, options, includeShielding)
+            region2KappaScaling, options, includeShielding,
+            conicalFieldCache)
 
     def evaluate(self, location, buffer):
         """Evaluate the field.
@@ -224,6 +235,29 @@ class Ts07DFieldAlignedMagneticField(BasisVectorField):
             values.append(v)
         return values
 
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the expansion at an array of locations, evaluating each
+        basis function at all of the locations at once.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, nb, 3)
+            Evaluation of expansion components at each location.
+        """
+        positions = np.asarray(positions, dtype=float)
+        values = np.empty((len(positions), len(self.basisFunctions), 3))
+        for (i, (basisFunction, coeff)) in enumerate(
+                zip(self.basisFunctions, self.basisCoefficients)):
+            values[:, i] = coeff*basisFunction.evaluateMany(positions)
+        return values
+
     def getNumberOfBasisFunctions(self):
         """Get the number of basis functions.
 
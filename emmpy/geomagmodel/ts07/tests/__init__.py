@@ -2,6 +2,7 @@
 
 Modules
 -------
+examplecoefficients.py
 test_TS07DModelBuilder.py
 
 Packages
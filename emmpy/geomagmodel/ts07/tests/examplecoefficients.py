@@ -0,0 +1,50 @@
+"""Example coefficients shared by the TS07D tests.
+
+Example coefficients shared by the TS07D tests.
+
+The tests which need the sample coefficients shipped with the examples
+should be skipped unless haveExamples is True.
+"""
+
+
+import os
+import shutil
+
+import emmpy
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsutils import (
+    TS07DVariableCoefficientsUtils
+)
+from emmpy.geomagmodel.ts07.ts07dmodelbuilder import TS07DModelBuilder
+
+
+# Sample coefficients shipped with the examples.
+examplesDirectory = os.path.join(
+    os.path.dirname(os.path.dirname(emmpy.__file__)), "examples"
+)
+variableCoefficientsFile = os.path.join(
+    examplesDirectory, "2015_076_16_20.par"
+)
+staticCoefficientsDirectory = os.path.join(
+    examplesDirectory, "staticcoefficients", "coeffs_n8_m6"
+)
+haveExamples = (
+    os.path.exists(variableCoefficientsFile) and
+    os.path.isdir(staticCoefficientsDirectory)
+)
+
+
+def createExampleBuilder():
+    """Create a model builder using the example coefficients."""
+    contents = TS07DVariableCoefficientsUtils.parse(variableCoefficientsFile)
+    builder = TS07DModelBuilder.create(
+        contents.dipoleTiltAngle, contents.dynamicPressure,
+        contents.coefficients)
+    builder.withStaticCoefficients(staticCoefficientsDirectory)
+    return builder
+
+
+def createEpochDirectory(directory, fileNames):
+    """Copy the example coefficients to files for several epochs."""
+    for fileName in fileNames:
+        shutil.copy(variableCoefficientsFile,
+                    os.path.join(directory, fileName))
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsarchive import (
+    TS07DVariableCoefficientsArchive
+)
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsutils import (
+    TS07DVariableCoefficientsUtils
+)
+from emmpy.geomagmodel.ts07.tests.examplecoefficients import (
+    createEpochDirectory, haveExamples, staticCoefficientsDirectory
+)
+from emmpy.geomagmodel.ts07.ts07depochindex import (
+    CONTAINING, NEAREST, PREVIOUS, TS07DEpochIndex
+)
+from emmpy.geomagmodel.ts07.ts07dtimeseries import TS07DTimeSeries
+
+
+# Example epochs, as coefficient file names.
+epochFileNames = (
+    "2015_076_16_20.par", "2015_076_16_25.par", "2015_076_16_40.par"
+)
+
+# Times to look up in the example epochs.
+times = np.array(["2015-03-17T16:19:59", "2015-03-17T16:20:00",
+                  "2015-03-17T16:27:30", "2015-03-17T16:31:00",
+                  "2015-03-17T16:32:30", "2015-03-17T16:44:59",
+                  "2015-03-17T16:45:00"], dtype="datetime64[s]")
+
+
+@unittest.skipUnless(haveExamples, "example coefficients not found")
+class TestBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        createEpochDirectory(self.directory.name, epochFileNames)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test___init__(self):
+        index = TS07DEpochIndex(self.directory.name)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.epochs[2], np.datetime64("2015-03-17T16:40"))
+        self.assertEqual([os.path.basename(f) for f in index.files],
+                         list(epochFileNames))
+        self.assertIsNone(index.archive)
+        index = TS07DEpochIndex(os.path.join(self.directory.name, "empty"))
+        self.assertEqual(len(index), 0)
+
+    def test_lookup(self):
+        index = TS07DEpochIndex(self.directory.name)
+        self.assertEqual(index.lookup(times[1]), 0)
+        self.assertEqual(index.lookup(times[0]), -1)
+        self.assertEqual(index.lookup(times[0], NEAREST), 0)
+
+    def test_lookupMany(self):
+        index = TS07DEpochIndex(self.directory.name)
+        self.assertEqual(list(index.lookupMany(times)),
+                         [-1, 0, 1, -1, -1, 2, -1])
+        self.assertEqual(list(index.lookupMany(times, CONTAINING)),
+                         [-1, 0, 1, -1, -1, 2, -1])
+        self.assertEqual(list(index.lookupMany(times, PREVIOUS)),
+                         [-1, 0, 1, 1, 1, 2, 2])
+        # 16:32:30 is midway between 16:25 and 16:40, so it goes to the
+        # earlier epoch.
+        self.assertEqual(list(index.lookupMany(times, NEAREST)),
+                         [0, 0, 1, 1, 1, 2, 2])
+        index = TS07DEpochIndex(self.directory.name,
+                                epochDuration=np.timedelta64(10, "m"))
+        self.assertEqual(list(index.lookupMany(times)),
+                         [-1, 0, 1, 1, 1, 2, 2])
+        with self.assertRaises(ValueError):
+            index.lookupMany(times, "latest")
+        empty = TS07DEpochIndex(os.path.join(self.directory.name, "empty"))
+        for policy in (CONTAINING, PREVIOUS, NEAREST):
+            self.assertEqual(list(empty.lookupMany(times, policy)),
+                             [-1]*len(times))
+
+    def test_group(self):
+        (usedEpochs, order, bounds) = TS07DEpochIndex.group(
+            [2, -1, 0, 2, -1, 0, 0])
+        self.assertEqual(list(usedEpochs), [0, 2])
+        self.assertEqual(list(order), [2, 5, 6, 0, 3])
+        self.assertEqual(list(bounds), [0, 3, 5])
+        (usedEpochs, order, bounds) = TS07DEpochIndex.group([-1, -1])
+        self.assertEqual(len(usedEpochs), 0)
+        self.assertEqual(len(order), 0)
+        self.assertEqual(list(bounds), [0])
+
+    def test_groupPositions(self):
+        index = TS07DEpochIndex(self.directory.name)
+        positions = np.arange(len(times)*3, dtype=float).reshape(-1, 3)
+        groups = list(index.groupPositions(times, positions, PREVIOUS))
+        self.assertEqual([g[0] for g in groups], [0, 1, 2])
+        self.assertEqual([list(g[1]) for g in groups],
+                         [[1], [2, 3, 4], [5, 6]])
+        for (_, indices, epochPositions) in groups:
+            self.assertTrue(epochPositions.flags.c_contiguous)
+            self.assertTrue(np.array_equal(epochPositions,
+                                           positions[indices]))
+
+    def test_read(self):
+        index = TS07DEpochIndex(self.directory.name)
+        contents = index.read(1)
+        archiveDirectory = os.path.join(self.directory.name, "archive")
+        TS07DVariableCoefficientsUtils.packArchive(
+            self.directory.name, archiveDirectory)
+        archiveIndex = TS07DEpochIndex(
+            TS07DVariableCoefficientsArchive(archiveDirectory))
+        self.assertIsNone(archiveIndex.files)
+        self.assertTrue(np.array_equal(archiveIndex.epochs, index.epochs))
+        archiveContents = archiveIndex.read(1)
+        self.assertTrue(np.array_equal(archiveContents.values,
+                                       contents.values))
+        for name in ("numCurrentSheets", "numAzimuthalExpansions",
+                     "numRadialExpansions", "dynamicPressure",
+                     "dipoleTiltAngle", "Q", "Brms"):
+            self.assertEqual(getattr(archiveContents, name),
+                             getattr(contents, name))
+        self.assertEqual(
+            archiveContents.facConfiguration.numberOfFields,
+            contents.facConfiguration.numberOfFields)
+
+        # A time series over the archive gives the same values.
+        rng = np.random.default_rng(23)
+        positions = rng.uniform(-12.0, 12.0, (len(times), 3))
+        values = TS07DTimeSeries(
+            index, staticCoefficientsDirectory).evaluateAll(times, positions)
+        archiveValues = TS07DTimeSeries(
+            archiveIndex, staticCoefficientsDirectory
+        ).evaluateAll(times, positions)
+        self.assertTrue(np.allclose(archiveValues, values, equal_nan=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,22 @@
+import pickle
 import unittest
 
-from emmpy.geomagmodel.ts07.ts07dmodelbuilder import TS07DModelBuilder
+import numpy as np
+
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficients import (
+    TS07DVariableCoefficients
+)
+from emmpy.geomagmodel.ts07.coefficientreader.ts07equatorialvariablecoefficients import (
+    Ts07EquatorialVariableCoefficients
+)
+from emmpy.geomagmodel.ts07.tests.examplecoefficients import (
+    createExampleBuilder, haveExamples
+)
+from emmpy.geomagmodel.ts07.ts07dmodelbuilder import (
+    CONICAL_FIELD_CACHE_SIZE, TS07DModelBuilder
+)
+from emmpy.geomagmodel.ts07.ts07dmodelcache import TS07DModelCache
+from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
 class TestBuilder(unittest.TestCase):
@@ -29,6 +45,83 @@ class TestBuilder(unittest.TestCase):
     def test_withoutEquatorialShielding(self):
         pass
 
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_withCollapsedEquatorialCoefficients(self):
+        builder = createExampleBuilder()
+        self.assertIs(builder.withCollapsedEquatorialCoefficients(), builder)
+        collapsed = builder.build()
+        expanded = builder.withExpandedEquatorialCoefficients().build()
+        rng = np.random.default_rng(9)
+        positions = rng.uniform(-12.0, 12.0, (8, 3))
+        self.assertLess(collapsed.evaluateExpansionMany(positions).shape[1],
+                        expanded.evaluateExpansionMany(positions).shape[1])
+        self.assertTrue(np.allclose(collapsed.evaluateMany(positions),
+                                    expanded.evaluateMany(positions),
+                                    rtol=0, atol=1e-8))
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_withModelCache(self):
+        cache = TS07DModelCache()
+        builder = createExampleBuilder()
+        self.assertIs(builder.withModelCache(cache), builder)
+        model = builder.build()
+        self.assertIs(createExampleBuilder().withModelCache(cache).build(),
+                      model)
+        self.assertIsNot(
+            createExampleBuilder().withModelCache(cache).
+            withDynamicPressureValue(builder.dynamicPressure + 1.0).build(),
+            model)
+        self.assertIsNot(builder.withoutModelCache().build(), model)
+        statistics = cache.getStatistics()
+        self.assertEqual((statistics["hits"], statistics["misses"]), (1, 2))
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_rebuild(self):
+        builder = createExampleBuilder()
+        builder.rebuild()
+        shields = builder.shieldingFieldCache.values()
+        self.assertEqual(len(shields), 1)
+        rng = np.random.default_rng(3)
+        positions = rng.uniform(-12.0, 12.0, (6, 3))
+        for (tilt, pressure) in ((0.3, None), (None, 3.5), (-0.2, 1.2)):
+            model = builder.rebuild(tilt, pressure)
+            expected = (
+                createExampleBuilder().
+                withDipoleTiltAngleValue(builder.dipoleTiltAngle).
+                withDynamicPressureValue(builder.dynamicPressure).build()
+            )
+            self.assertTrue(np.allclose(model.evaluateMany(positions),
+                                        expected.evaluateMany(positions),
+                                        rtol=0, atol=1e-12))
+
+        # Changing the current sheet thickness reuses the shielding field.
+        coeffs = builder.variableCoefficients
+        equatorial = coeffs.equatorialCoeffs
+        thickerCoeffs = TS07DVariableCoefficients(
+            coeffs.cfAmplitude,
+            Ts07EquatorialVariableCoefficients(
+                [t + 0.5 for t in equatorial.currThicks],
+                equatorial.hingeDist, equatorial.warpingParam,
+                equatorial.twistParam, equatorial.equatorialLinearCoeffs),
+            coeffs.facCoeffs)
+        model = builder.rebuild(variableCoefficients=thickerCoeffs)
+        expected = (
+            createExampleBuilder().
+            withDipoleTiltAngleValue(builder.dipoleTiltAngle).
+            withDynamicPressureValue(builder.dynamicPressure).
+            withVariableCoefficientValues(thickerCoeffs).build()
+        )
+        self.assertTrue(np.allclose(model.evaluateMany(positions),
+                                    expected.evaluateMany(positions),
+                                    rtol=0, atol=1e-12))
+        self.assertEqual(builder.shieldingFieldCache.values(), shields)
+
+        # The two-cone fields were reused, in a bounded cache.
+        statistics = builder.conicalFieldCache.getStatistics()
+        self.assertEqual(statistics["size"], statistics["misses"])
+        self.assertLessEqual(statistics["size"], CONICAL_FIELD_CACHE_SIZE)
+        self.assertGreater(statistics["hits"], 0)
+
     def test_withTA15deformation(self):
         pass
 
@@ -53,8 +146,38 @@ class TestBuilder(unittest.TestCase):
     def test_withMagnetopause(self):
         pass
 
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
     def test_build(self):
-        pass
+        model = createExampleBuilder().build()
+        b = model.evaluate(VectorIJK(4.0, 5.0, -2.0))
+        b_ref = (18.11269495223987, 19.89715571940947, 17.20252488064584)
+        self.assertTrue(np.allclose(b, b_ref))
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_evaluateMany(self):
+        model = createExampleBuilder().build()
+        rng = np.random.default_rng(7)
+        positions = rng.uniform(-12.0, 12.0, (8, 3))
+        values = model.evaluateMany(positions)
+        self.assertEqual(values.shape, positions.shape)
+        # The batched deformations round differently from the scalar
+        # ones, and the model changes by ~1e-8 nT for a 1 ulp change in
+        # the location, so the results agree to about that level.
+        for (position, value) in zip(positions, values):
+            b = model.evaluate(VectorIJK(position))
+            self.assertTrue(np.allclose(value, b, rtol=0, atol=1e-7))
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_pickle(self):
+        positions = np.array([[4.0, 5.0, -2.0], [-8.0, 1.0, 3.0]])
+        for builder in (createExampleBuilder(),
+                        createExampleBuilder().
+                        withCollapsedEquatorialCoefficients()):
+            model = builder.build()
+            values = model.evaluateMany(positions)
+            model_copy = pickle.loads(pickle.dumps(model))
+            self.assertTrue(np.allclose(model_copy.evaluateMany(positions),
+                                        values, rtol=0, atol=1e-12))
 
 
 if __name__ == '__main__':
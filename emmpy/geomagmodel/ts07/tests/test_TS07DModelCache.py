@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from emmpy.geomagmodel.ts07.ts07dmodelcache import (
+    TS07DModelCache, canonicalHash, getDefaultModelCache
+)
+from emmpy.magmodel.core.math.trigparity import EVEN, ODD
+from emmpy.math.expansions.scalarexpansion1d import ScalarExpansion1D
+
+
+class Coefficients:
+    """Simple object for hashing."""
+    def __init__(self, values, parity):
+        self.values = values
+        self.parity = parity
+
+
+class TestBuilder(unittest.TestCase):
+
+    def test_canonicalHash(self):
+        a = Coefficients(ScalarExpansion1D([1.0, 2.0]), EVEN)
+        b = Coefficients(np.array([1.0, 2.0]), EVEN)
+        c = Coefficients(np.array([1.0, 2.5]), EVEN)
+        d = Coefficients(np.array([1.0, 2.0]), ODD)
+        self.assertEqual(canonicalHash(a, 0.5), canonicalHash(b, 0.5))
+        self.assertNotEqual(canonicalHash(a, 0.5), canonicalHash(a, 0.25))
+        self.assertNotEqual(canonicalHash(a), canonicalHash(c))
+        self.assertNotEqual(canonicalHash(a), canonicalHash(d))
+        self.assertNotEqual(canonicalHash([1, 2]), canonicalHash([[1], 2]))
+        self.assertNotEqual(canonicalHash(None), canonicalHash(False))
+        with self.assertRaises(TypeError):
+            canonicalHash(object())
+        # Functions would all hash the same, so they are rejected.
+        for f in (lambda x: x, np.sin, Coefficients):
+            with self.assertRaises(TypeError):
+                canonicalHash(Coefficients(f, EVEN))
+
+    def test_getDefaultModelCache(self):
+        cache = getDefaultModelCache()
+        self.assertIsInstance(cache, TS07DModelCache)
+        self.assertIs(getDefaultModelCache(), cache)
+
+    def test___init__(self):
+        cache = TS07DModelCache(3)
+        self.assertEqual(cache.models.maxSize, 3)
+        self.assertEqual(len(cache.models), 0)
+
+    def test_getOrBuild(self):
+        cache = TS07DModelCache(2)
+        models = {}
+
+        def builder(key):
+            def build():
+                models[key] = object()
+                return models[key]
+            return build
+
+        a = cache.getOrBuild("a", builder("a"))
+        self.assertIs(cache.getOrBuild("a", builder("a")), a)
+        cache.getOrBuild("b", builder("b"))
+        cache.getOrBuild("a", builder("a"))
+        cache.getOrBuild("c", builder("c"))
+
+        # "b" was the least recently used, so it was evicted.
+        self.assertEqual(list(cache.models.items), ["a", "c"])
+        self.assertIs(cache.getOrBuild("a", builder("a")), a)
+        self.assertEqual(cache.getStatistics(), {
+            "size": 2, "maxSize": 2, "hits": 3, "misses": 3, "evictions": 1
+        })
+
+    def test_getStatistics(self):
+        cache = TS07DModelCache()
+        self.assertEqual(cache.getStatistics()["hits"], 0)
+
+    def test_clear(self):
+        cache = TS07DModelCache()
+        cache.getOrBuild("a", object)
+        cache.clear()
+        self.assertEqual(cache.getStatistics()["size"], 0)
+        self.assertEqual(cache.getStatistics()["misses"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
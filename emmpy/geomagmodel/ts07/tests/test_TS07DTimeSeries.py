@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from emmpy.geomagmodel.ts07.tests.examplecoefficients import (
+    createEpochDirectory, createExampleBuilder, haveExamples,
+    staticCoefficientsDirectory
+)
+from emmpy.geomagmodel.ts07.ts07dtimeseries import TS07DTimeSeries
+
+
+class TestBuilder(unittest.TestCase):
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_assignEpochs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            createEpochDirectory(
+                directory, ("2015_076_16_20.par", "2015_076_16_25.par",
+                            "2015_076_16_40.par"))
+            series = TS07DTimeSeries(directory, staticCoefficientsDirectory)
+        times = np.array(["2015-03-17T16:19:59", "2015-03-17T16:20:00",
+                          "2015-03-17T16:27:30", "2015-03-17T16:31:00",
+                          "2015-03-17T16:44:59", "2015-03-17T16:45:00"],
+                         dtype="datetime64[s]")
+        self.assertEqual(list(series.assignEpochs(times)),
+                         [-1, 0, 1, -1, 2, -1])
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_evaluate(self):
+        model = createExampleBuilder().build()
+        rng = np.random.default_rng(17)
+        positions = rng.uniform(-12.0, 12.0, (7, 3))
+        times = np.array(["2015-03-17T16:26", "2015-03-17T16:21",
+                          "2015-03-17T16:29", "2015-03-17T17:00",
+                          "2015-03-17T16:20", "2015-03-17T16:27",
+                          "2015-03-17T16:24"], dtype="datetime64[m]")
+        expected = model.evaluateMany(positions)
+        with tempfile.TemporaryDirectory() as directory:
+            createEpochDirectory(
+                directory, ("2015_076_16_20.par", "2015_076_16_25.par"))
+            for prefetch in (False, True):
+                series = TS07DTimeSeries(
+                    directory, staticCoefficientsDirectory,
+                    prefetch=prefetch)
+                results = list(series.evaluate(times, positions))
+                self.assertEqual([list(r[1]) for r in results],
+                                 [[1, 4, 6], [0, 2, 5]])
+                for (epoch, indices, values) in results:
+                    self.assertTrue(np.allclose(values, expected[indices]))
+
+                # Only the model for the last epoch is kept.
+                self.assertEqual(list(series.models), [1])
+
+                # One builder built both models, sharing the shielding.
+                builder = series.builder
+                self.assertEqual(len(builder.shieldingFieldCache), 1)
+                values = series.evaluateAll(times, positions)
+                self.assertTrue(np.all(np.isnan(values[3])))
+                self.assertTrue(np.allclose(np.delete(values, 3, axis=0),
+                                            np.delete(expected, 3, axis=0)))
+                self.assertIs(series.builder, builder)
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_evaluateStream(self):
+        rng = np.random.default_rng(19)
+        positions = rng.uniform(-12.0, 12.0, (4, 3))
+        times = np.array(["2015-03-17T16:21", "2015-03-17T16:22",
+                          "2015-03-17T16:23", "2015-03-17T16:26"],
+                         dtype="datetime64[m]")
+        with tempfile.TemporaryDirectory() as directory:
+            createEpochDirectory(
+                directory, ("2015_076_16_20.par", "2015_076_16_25.par"))
+            series = TS07DTimeSeries(directory, staticCoefficientsDirectory)
+            chunks = [(times[:2], positions[:2]), (times[2:], positions[2:])]
+            results = list(series.evaluateStream(chunks))
+        expected = createExampleBuilder().build().evaluateMany(positions)
+        values = np.concatenate([r[2] for r in results])
+        self.assertTrue(np.allclose(values, expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
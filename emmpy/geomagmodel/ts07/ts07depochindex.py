@@ -0,0 +1,254 @@
+"""An index from times to TS07D variable coefficient epochs.
+
+An index from times to TS07D variable coefficient epochs.
+
+A TS07DEpochIndex holds the sorted start times of the epochs in a
+directory of variable coefficient files, or in an archive created by
+TS07DVariableCoefficientsUtils.packArchive(). Times are matched to epochs
+with a binary search, using one of three policies:
+
+CONTAINING
+    The latest epoch which starts at or before the time, if the time is
+    within epochDuration of the start of that epoch.
+PREVIOUS
+    The latest epoch which starts at or before the time.
+NEAREST
+    The epoch whose start is closest to the time. Ties go to the earlier
+    epoch.
+
+Times which have no matching epoch are given the epoch index -1.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import numpy as np
+
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsarchive import (
+    TS07DVariableCoefficientsArchive, findCoefficientFiles
+)
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsutils import (
+    TS07DVariableCoefficientsUtils
+)
+
+
+# Default length of the epoch covered by each coefficient file.
+DEFAULT_EPOCH_DURATION = np.timedelta64(5, "m")
+
+# Epoch matching policies.
+CONTAINING = "containing"
+PREVIOUS = "previous"
+NEAREST = "nearest"
+POLICIES = (CONTAINING, PREVIOUS, NEAREST)
+
+
+class TS07DEpochIndex:
+    """An index from times to TS07D variable coefficient epochs.
+
+    Attributes
+    ----------
+    epochs : np.ndarray of np.datetime64, shape (E,)
+        Start time of each epoch, in increasing order.
+    files : list of str
+        Path to the coefficient file for each epoch, or None for an
+        archive.
+    archive : TS07DVariableCoefficientsArchive
+        The archive holding the coefficients, or None for a directory.
+    epochDuration : np.timedelta64
+        Length of each epoch.
+    """
+
+    def __init__(self, coefficientSource,
+                 epochDuration=DEFAULT_EPOCH_DURATION):
+        """Initialize a new TS07DEpochIndex object.
+
+        Index the epochs of a directory of variable coefficient files, or
+        of an archive.
+
+        Parameters
+        ----------
+        coefficientSource : str or TS07DVariableCoefficientsArchive
+            Path to a directory of variable coefficient files, or an
+            archive.
+        epochDuration : np.timedelta64, optional
+            Length of each epoch.
+        """
+        self.epochDuration = epochDuration
+        if isinstance(coefficientSource, TS07DVariableCoefficientsArchive):
+            self.archive = coefficientSource
+            self.files = None
+            self.epochs = np.asarray(self.archive.epochs,
+                                     dtype="datetime64[m]")
+        else:
+            self.archive = None
+            (self.epochs, self.files) = findCoefficientFiles(
+                coefficientSource)
+
+    def __len__(self):
+        """Return the number of epochs in the index."""
+        return len(self.epochs)
+
+    def lookup(self, time, policy=CONTAINING):
+        """Find the epoch for a single time.
+
+        Find the index of the epoch matching a single time.
+
+        Parameters
+        ----------
+        time : np.datetime64
+            The time to look up.
+        policy : str, optional
+            Epoch matching policy, CONTAINING, PREVIOUS or NEAREST.
+
+        Returns
+        -------
+        epochIndex : int
+            Index of the matching epoch, or -1 if there is none.
+
+        Raises
+        ------
+        ValueError
+            If the policy is invalid.
+        """
+        return int(self.lookupMany([time], policy)[0])
+
+    def lookupMany(self, times, policy=CONTAINING):
+        """Find the epoch for each of an array of times.
+
+        Find the index of the epoch matching each time, with a vectorized
+        binary search.
+
+        Parameters
+        ----------
+        times : array-like of np.datetime64, shape (N,)
+            The times to look up.
+        policy : str, optional
+            Epoch matching policy, CONTAINING, PREVIOUS or NEAREST.
+
+        Returns
+        -------
+        epochIndices : np.ndarray of int, shape (N,)
+            Index of the matching epoch for each time, or -1 if there is
+            none.
+
+        Raises
+        ------
+        ValueError
+            If the policy is invalid.
+        """
+        if policy not in POLICIES:
+            raise ValueError("Invalid epoch matching policy: %r" % (policy,))
+        times = np.asarray(times, dtype="datetime64[ms]")
+        previous = np.searchsorted(self.epochs, times, side="right") - 1
+        if policy == PREVIOUS:
+            return previous
+        if policy == CONTAINING:
+            epochIndices = previous.copy()
+            found = previous >= 0
+            found[found] = (
+                times[found] < self.epochs[previous[found]] +
+                self.epochDuration
+            )
+            epochIndices[~found] = -1
+            return epochIndices
+
+        # NEAREST: choose between the previous and next epochs.
+        if len(self.epochs) == 0:
+            return np.full(times.shape, -1, dtype=previous.dtype)
+        following = np.minimum(previous + 1, len(self.epochs) - 1)
+        previousDistance = np.abs(
+            times - self.epochs[np.maximum(previous, 0)])
+        followingDistance = np.abs(self.epochs[following] - times)
+        useFollowing = (previous < 0) | (followingDistance < previousDistance)
+        return np.where(useFollowing, following, previous)
+
+    @staticmethod
+    def group(epochIndices):
+        """Group points by epoch.
+
+        Find the points in each epoch. Points are ordered by epoch with a
+        single stable sort, so the points of each epoch are a contiguous
+        range of the sorted order, and are in their original order within
+        the range. Points with epoch index -1 are left out.
+
+        Parameters
+        ----------
+        epochIndices : array-like of int, shape (N,)
+            Epoch index of each point, or -1.
+
+        Returns
+        -------
+        usedEpochs : np.ndarray of int, shape (G,)
+            Index of each epoch which has points, in increasing order.
+        order : np.ndarray of int, shape (n,)
+            Indices of the points which are in an epoch, sorted by epoch.
+        bounds : np.ndarray of int, shape (G + 1,)
+            The points of usedEpochs[g] are order[bounds[g]:bounds[g + 1]].
+        """
+        epochIndices = np.asarray(epochIndices)
+        order = np.argsort(epochIndices, kind="stable")
+        sortedIndices = epochIndices[order]
+        numMissing = np.searchsorted(sortedIndices, 0)
+        order = order[numMissing:]
+        sortedIndices = sortedIndices[numMissing:]
+        (usedEpochs, starts) = np.unique(sortedIndices, return_index=True)
+        bounds = np.append(starts, len(sortedIndices))
+        return (usedEpochs, order, bounds)
+
+    def groupPositions(self, times, positions, policy=CONTAINING):
+        """Group timestamped positions by epoch.
+
+        Match each time to an epoch, and generate the positions of each
+        epoch as one contiguous array. The positions are gathered into
+        epoch order with a single copy, and each epoch's array is a slice
+        of that copy.
+
+        Parameters
+        ----------
+        times : array-like of np.datetime64, shape (N,)
+            Times of the positions.
+        positions : array-like of float, shape (N, 3)
+            The positions.
+        policy : str, optional
+            Epoch matching policy, CONTAINING, PREVIOUS or NEAREST.
+
+        Yields
+        ------
+        epochIndex : int
+            Index of the epoch.
+        indices : np.ndarray of int, shape (n,)
+            Indices of the positions in the epoch.
+        epochPositions : np.ndarray of float, shape (n, 3)
+            The positions in the epoch, as a contiguous array.
+        """
+        (usedEpochs, order, bounds) = self.group(
+            self.lookupMany(times, policy))
+        sortedPositions = np.asarray(positions, dtype=float)[order]
+        for (g, epochIndex) in enumerate(usedEpochs):
+            (start, stop) = (bounds[g], bounds[g + 1])
+            yield (int(epochIndex), order[start:stop],
+                   sortedPositions[start:stop])
+
+    def read(self, epochIndex):
+        """Read the coefficients and metadata for an epoch.
+
+        Read the coefficients and metadata for an epoch, from its file or
+        from the archive.
+
+        Parameters
+        ----------
+        epochIndex : int
+            Index of the epoch.
+
+        Returns
+        -------
+        result : TS07DVariableCoefficientsFile
+            The coefficients and metadata for the epoch.
+        """
+        if self.archive is None:
+            return TS07DVariableCoefficientsUtils.parse(
+                self.files[epochIndex])
+        return TS07DVariableCoefficientsUtils.parseArchive(
+            self.archive, epochIndex)
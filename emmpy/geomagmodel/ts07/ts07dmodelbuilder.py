@@ -18,22 +18,18 @@ from emmpy.geomagmodel.ts07.coefficientreader.ts07dstaticcoefficientsfactory imp
 from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsutils import (
     TS07DVariableCoefficientsUtils
 )
-from emmpy.geomagmodel.ts07.coefficientreader.ts07equatorialvariablecoefficients import (
-    Ts07EquatorialVariableCoefficients
+from emmpy.geomagmodel.ts07.ts07dmodelcache import (
+    canonicalHash, getDefaultModelCache
 )
-from emmpy.geomagmodel.ts07.modeling.dipoleshield.dipoleshieldingfield import (
-    DipoleShieldingField
+from emmpy.magmodel.core.math.besselfunctioncache import (
+    BesselFunctionCache
 )
-from emmpy.geomagmodel.ts07.modeling.equatorial.ts07equatorialmagneticfieldbuilder import (
-    Ts07EquatorialMagneticFieldBuilder
-)
-from emmpy.geomagmodel.ts07.modeling.fieldaligned.ts07dfieldalignedmagneticfield import (
-    Ts07DFieldAlignedMagneticField
-)
-from emmpy.magmodel.core.math.vectorfields.basisvectorfields import (
-    BasisVectorFields
-)
-from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.utilities.lrucache import LRUCache
+
+
+# Maximum number of deformed two-cone fields kept by rebuild(). Each model
+# uses a few of them, so this holds those of several FAC configurations.
+CONICAL_FIELD_CACHE_SIZE = 16
 
 
 class TS07DModelBuilder:
@@ -65,12 +61,22 @@ class TS07DModelBuilder:
         tailLength
     includeEquatorialShielding : bool
         includeEquatorialShielding
+    collapseEquatorialCoefficients : bool
+        collapseEquatorialCoefficients
     staticCoefficients : ThinCurrentSheetShieldingCoefficients
         staticCoefficients
     _withTA15deformation : float
         withTA15deformation
     _withMagnetopause : bool
         withMagnetopause
+    modelCache : TS07DModelCache
+        Cache of built models, or None.
+    shieldingFieldCache : LRUCache
+        Thin current sheet shielding fields reused by rebuild(), or None.
+    conicalFieldCache : LRUCache
+        FAC two-cone fields reused by rebuild(), or None.
+    besselCache : BesselFunctionCache
+        Bessel function cache reused by rebuild(), or None.
     """
 
     def __init__(self, dipoleTiltAngle, dynamicPressure, variableCoefficients):
@@ -98,6 +104,10 @@ class TS07DModelBuilder:
         # By default the equatorial shielding is included.
         self.includeEquatorialShielding = True
 
+        # By default, each equatorial linear coefficient has its own basis
+        # function.
+        self.collapseEquatorialCoefficients = False
+
         # Constructing the static coefficients is expensive, much more
         # expensive than the model evaluation, so don't construct until/unless
         # necessary. When build is called, if it is still null (i.e. the user
@@ -113,6 +123,15 @@ class TS07DModelBuilder:
         self.twistParameter = None
         self._withTA15deformation = None
 
+        # By default, every call to build() builds a new model.
+        self.modelCache = None
+
+        # The parts of the model reused by rebuild() are kept here once
+        # rebuild() has been called.
+        self.shieldingFieldCache = None
+        self.conicalFieldCache = None
+        self.besselCache = None
+
     @staticmethod
     def create(*args):
         """Create a new object that can construct the TS07D model.
@@ -304,6 +323,44 @@ class TS07DModelBuilder:
         self.includeEquatorialShielding = False
         return self
 
+    def withCollapsedEquatorialCoefficients(self):
+        """Fold the equatorial linear coefficients into the model.
+
+        Fold the equatorial linear coefficients into the thin current
+        sheet and shielding coefficients when the model is built, so that
+        each current sheet is evaluated as a single combined sum. The
+        total field is unchanged, but the model no longer has a separate
+        basis function for each equatorial linear coefficient.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        self : TS07DModelBuilder
+            This object.
+        """
+        self.collapseEquatorialCoefficients = True
+        return self
+
+    def withExpandedEquatorialCoefficients(self):
+        """Keep a basis function for each equatorial linear coefficient.
+
+        This is the default.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        self : TS07DModelBuilder
+            This object.
+        """
+        self.collapseEquatorialCoefficients = False
+        return self
+
     def withTA15deformation(self, bzIMF):
         """Set the z-component of the IMF.
 
@@ -504,10 +561,82 @@ class TS07DModelBuilder:
         self._withMagnetopause = True
         return self
 
+    def withModelCache(self, modelCache=None):
+        """Cache the models built by this builder.
+
+        When a model cache is set, build() returns the cached model if an
+        identical model has already been built, rather than building a new
+        one. Models are identified by a canonical hash of the values of the
+        variable and static coefficients, dipole tilt angle, dynamic
+        pressure, tail length and the other options set on this builder.
+
+        Parameters
+        ----------
+        modelCache : TS07DModelCache, optional
+            Cache to use. By default, the process-wide cache is used.
+
+        Returns
+        -------
+        self : TS07DModelBuilder
+            This object.
+        """
+        if modelCache is None:
+            modelCache = getDefaultModelCache()
+        self.modelCache = modelCache
+        return self
+
+    def withoutModelCache(self):
+        """Build a new model on every call to build().
+
+        This is the default.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        self : TS07DModelBuilder
+            This object.
+        """
+        self.modelCache = None
+        return self
+
+    def getCacheKey(self):
+        """Return the key identifying the model built by this builder.
+
+        Return the canonical hash of all of the inputs to the model built
+        by this builder. If the static coefficients have not been set, the
+        path to the default static coefficients is used in their place.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        key : str
+            Canonical hash of the model inputs.
+        """
+        staticCoefficients = self.staticCoefficients
+        if staticCoefficients is None:
+            staticCoefficients = (
+                TS07DStaticCoefficientsFactory.
+                retrieveOriginalBuiltInCoefficientsPath()
+            )
+        return canonicalHash(
+            self.dipoleTiltAngle, self.dynamicPressure,
+            self.variableCoefficients, self.parameters, self.tailLength,
+            self.includeEquatorialShielding,
+            self.collapseEquatorialCoefficients, staticCoefficients,
+            self._withMagnetopause, self.twistParameterSet,
+            self.twistParameter, self._withTA15deformation)
+
     def build(self):
         """Build a new dipole shielding field.
         
-        Build a new dipole shielding field.
+        Build a new dipole shielding field. If a model cache has been set
+        with withModelCache(), a previously built model may be returned.
 
         Parameters
         ----------
@@ -518,6 +647,79 @@ class TS07DModelBuilder:
         totalExternalField : VectorField
             The total field computed by the model.
         """
+        if self.modelCache is not None:
+            return self.modelCache.getOrBuild(
+                self.getCacheKey(), self._buildModel)
+        return self._buildModel()
+
+    def rebuild(self, dipoleTiltAngle=None, dynamicPressure=None,
+                variableCoefficients=None):
+        """Build the model again after changing some of its inputs.
+
+        Update the dipole tilt angle, dynamic pressure and/or variable
+        coefficients, and build the model. The parts of the model which do
+        not depend on them are reused from previous calls to rebuild():
+        the thin current sheet shielding fields (with their stacked
+        shielding coefficient tables), the Bessel function cache, and the
+        FAC two-cone fields. Only the parts which depend on the tilt,
+        pressure and coefficients (the thin current sheets, deformations,
+        scalings, shielding fields and linear coefficients) are built
+        again. The thin current sheet shielding fields are cached by tail
+        length and static coefficients, so they are reused when the
+        current sheet thicknesses change. The shielding fields and the
+        two-cone fields are held in thread-safe LRUCaches, which discard
+        the least recently used fields when they are full.
+
+        After rebuild() has been called, build() also reuses these parts.
+
+        Parameters
+        ----------
+        dipoleTiltAngle : float, optional
+            New dipole tilt angle.
+        dynamicPressure : float, optional
+            New dynamic pressure.
+        variableCoefficients : TS07DVariableCoefficients, optional
+            New variable coefficients.
+
+        Returns
+        -------
+        totalExternalField : VectorField
+            The total field computed by the model.
+        """
+        if dipoleTiltAngle is not None:
+            self.dipoleTiltAngle = dipoleTiltAngle
+        if dynamicPressure is not None:
+            self.dynamicPressure = dynamicPressure
+        if variableCoefficients is not None:
+            self.variableCoefficients = variableCoefficients
+        if self.shieldingFieldCache is None:
+            self.shieldingFieldCache = LRUCache()
+            self.conicalFieldCache = LRUCache(CONICAL_FIELD_CACHE_SIZE)
+            self.besselCache = BesselFunctionCache()
+        return self.build()
+
+    def _buildModel(self):
+        """Build a new model, ignoring the model cache."""
+        # The field modules are imported here, rather than with this
+        # module, so that programs which only configure a builder, or
+        # which reuse cached models, do not pay to import them.
+        from emmpy.geomagmodel.ts07.coefficientreader.ts07equatorialvariablecoefficients import (
+            Ts07EquatorialVariableCoefficients
+        )
+        from emmpy.geomagmodel.ts07.modeling.dipoleshield.dipoleshieldingfield import (
+            DipoleShieldingField
+        )
+        from emmpy.geomagmodel.ts07.modeling.equatorial.ts07equatorialmagneticfieldbuilder import (
+            Ts07EquatorialMagneticFieldBuilder
+        )
+        from emmpy.geomagmodel.ts07.modeling.fieldaligned.ts07dfieldalignedmagneticfield import (
+            Ts07DFieldAlignedMagneticField
+        )
+        from emmpy.magmodel.core.math.vectorfields.basisvectorfields import (
+            BasisVectorFields
+        )
+        from emmpy.math.coordinates.vectorijk import VectorIJK
+
         # Construct the dipole shielding field.
         dipoleShieldingField = (
             BasisVectorFields.asBasisField(
@@ -596,6 +798,16 @@ class TS07DModelBuilder:
         else:
             equatorialFieldBuilder.withoutEquatorialShielding()
 
+        # If true, the equatorial linear coefficients are folded into the
+        # current sheets.
+        if self.collapseEquatorialCoefficients:
+            equatorialFieldBuilder.withCollapsedCoefficients()
+
+        # Reuse the current sheet shielding fields from previous builds.
+        if self.shieldingFieldCache is not None:
+            equatorialFieldBuilder.withShieldingFieldCache(
+                self.shieldingFieldCache, self.besselCache)
+
         # If true, the equatorial fields are deformed using the TA15 instead
         # of the T01 deformation.
         if self._withTA15deformation is not None:
@@ -608,7 +820,7 @@ class TS07DModelBuilder:
         fcs = fc.facConfigurations
         fieldAlignedField = Ts07DFieldAlignedMagneticField.create(
             self.dipoleTiltAngle, self.dynamicPressure, region1KappaScaling,
-            region2KappaScaling, fcs, True)
+            region2KappaScaling, fcs, True, self.conicalFieldCache)
 
         # And finally construct the total model.
         emf = equatorialFieldBuilder.build()
@@ -0,0 +1,217 @@
+"""A cache of built TS07D models.
+
+A cache of built TS07D models.
+
+Building a TS07D model constructs the dipole shielding field, all of the
+field-aligned current fields, and the equatorial current sheets, which is
+expensive compared to evaluating the model a few times. When the same
+model is requested repeatedly, a TS07DModelCache can be attached to the
+TS07DModelBuilder with withModelCache(), and build() will then return the
+previously built model.
+
+Models are keyed with canonicalHash(), which hashes the values (not the
+identities) of the model inputs, so equal coefficients read from the same
+file twice share a cache entry.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import hashlib
+import numbers
+import struct
+
+import numpy as np
+
+from emmpy.magmodel.core.math.trigparity import EVEN, ODD
+from emmpy.utilities.lrucache import LRUCache
+
+
+# Default maximum number of models held by a TS07DModelCache.
+DEFAULT_MAX_SIZE = 16
+
+# Process-wide cache, created on first use by getDefaultModelCache().
+defaultModelCache = None
+
+
+def canonicalHash(*values):
+    """Compute a canonical hash of a set of values.
+
+    Compute a hash of a set of values, which depends only on the types and
+    contents of the values. Numbers, strings, None, the trig parities,
+    np.ndarray objects, lists, tuples and dicts are hashed directly. Other
+    objects are hashed using their class name and their attributes.
+    Functions and other callables cannot be hashed, since their behavior
+    is not determined by their attributes.
+
+    Parameters
+    ----------
+    values : object
+        The values to hash.
+
+    Returns
+    -------
+    result : str
+        Hexadecimal SHA-256 digest of the values.
+
+    Raises
+    ------
+    TypeError
+        If a value cannot be hashed, or is callable.
+    """
+    digest = hashlib.sha256()
+    _updateHash(digest, values)
+    return digest.hexdigest()
+
+
+def _updateHash(digest, value):
+    """Add a value to a canonical hash."""
+    if value is None:
+        digest.update(b"N")
+    elif value is EVEN:
+        digest.update(b"E")
+    elif value is ODD:
+        digest.update(b"O")
+    elif isinstance(value, (bool, np.bool_)):
+        digest.update(b"T" if value else b"F")
+    elif isinstance(value, numbers.Integral):
+        digest.update(b"I%d;" % value)
+    elif isinstance(value, numbers.Real):
+        digest.update(b"R" + struct.pack("<d", value))
+    elif isinstance(value, str):
+        data = value.encode()
+        digest.update(b"S%d;" % len(data) + data)
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        value = np.ascontiguousarray(value, dtype=float)
+        digest.update(b"A%r;" % (value.shape,))
+        digest.update(value.tobytes())
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        digest.update(b"L%d;" % len(value))
+        for item in value:
+            _updateHash(digest, item)
+    elif isinstance(value, dict):
+        digest.update(b"D%d;" % len(value))
+        for key in sorted(value):
+            _updateHash(digest, key)
+            _updateHash(digest, value[key])
+    elif callable(value):
+        # Functions all have the same class and (usually) no attributes,
+        # so different functions would get the same hash.
+        raise TypeError("Cannot hash callable %r" % (value,))
+    elif hasattr(value, "__dict__"):
+        name = type(value).__qualname__.encode()
+        digest.update(b"C%d;" % len(name) + name)
+        _updateHash(digest, vars(value))
+    else:
+        raise TypeError("Cannot hash %r" % (value,))
+
+
+def getDefaultModelCache():
+    """Return the process-wide model cache.
+
+    Return the process-wide model cache, creating it if needed.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    defaultModelCache : TS07DModelCache
+        The process-wide model cache.
+    """
+    global defaultModelCache
+    if defaultModelCache is None:
+        defaultModelCache = TS07DModelCache()
+    return defaultModelCache
+
+
+class TS07DModelCache:
+    """A cache of built TS07D models.
+
+    Holds up to maxSize built models, keyed by a canonical hash of their
+    inputs, in an LRUCache. When the cache is full, the least recently
+    used model is discarded. The LRUCache is thread-safe, but models are
+    built outside of its lock, so two threads which miss on the same key
+    at the same time may both build the model.
+
+    A cached model may be returned to several threads at once. The models
+    built by TS07DModelBuilder.rebuild() share a BesselFunctionCache,
+    which is thread-safe, so they may be evaluated from several threads.
+
+    Attributes
+    ----------
+    models : LRUCache
+        Cached models, keyed by hash, with the hit, miss and eviction
+        counts.
+    """
+
+    def __init__(self, maxSize=DEFAULT_MAX_SIZE):
+        """Initialize a new TS07DModelCache object.
+
+        Initialize a new TS07DModelCache object.
+
+        Parameters
+        ----------
+        maxSize : int, optional
+            Maximum number of models to hold.
+        """
+        self.models = LRUCache(maxSize)
+
+    def getOrBuild(self, key, build):
+        """Return the model for a key, building it if needed.
+
+        Return the cached model for a key. If there is no cached model,
+        call build() to build it, and add it to the cache.
+
+        Parameters
+        ----------
+        key : str
+            Canonical hash of the model inputs.
+        build : callable
+            Function with no arguments which builds the model.
+
+        Returns
+        -------
+        model : VectorField
+            The cached or newly-built model.
+        """
+        model = self.models.get(key)
+        if model is None:
+            model = build()
+            self.models.put(key, model)
+        return model
+
+    def getStatistics(self):
+        """Return the cache statistics.
+
+        Return the cache statistics.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : dict
+            The current size and maximum size of the cache, and the
+            numbers of hits, misses and evictions.
+        """
+        return self.models.getStatistics()
+
+    def clear(self):
+        """Discard all cached models and reset the statistics.
+
+        Discard all cached models and reset the statistics.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.models.clear()
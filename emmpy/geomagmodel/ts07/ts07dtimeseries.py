@@ -0,0 +1,302 @@
+"""Evaluate the TS07D model along a time series of positions.
+
+Evaluate the TS07D model along a time series of positions.
+
+The TS07D variable coefficients are produced for a sequence of epochs, one
+file per epoch, named YYYY_DDD_HH_MM.par for the start time of the epoch
+(year, day of year, hour and minute), or packed into an archive. A
+TS07DTimeSeries uses a TS07DEpochIndex to bin timestamped positions by
+epoch, builds the model for each epoch once, and evaluates all of the
+positions in each epoch with a single call to evaluateMany(). The models
+are built by a single TS07DModelBuilder, using rebuild(), so the parts of
+the model which do not change between epochs are only built once.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import numpy as np
+
+from emmpy.geomagmodel.ts07.coefficientreader.thincurrentsheetshieldingcoefficients import (
+    ThinCurrentSheetShieldingCoefficients
+)
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dstaticcoefficientsfactory import (
+    TS07DStaticCoefficientsFactory
+)
+from emmpy.geomagmodel.ts07.ts07depochindex import (
+    CONTAINING, DEFAULT_EPOCH_DURATION, TS07DEpochIndex
+)
+from emmpy.geomagmodel.ts07.ts07dmodelbuilder import TS07DModelBuilder
+
+
+class TS07DTimeSeries:
+    """Evaluate the TS07D model along a time series of positions.
+
+    Bins timestamped positions by coefficient epoch, builds the model for
+    each epoch once, and evaluates each epoch's positions in one array
+    call. All of the models are built by one TS07DModelBuilder, which
+    reuses the parts of the model that do not change between epochs.
+
+    By default, a position belongs to the latest epoch which starts at
+    or before its time, if it is within epochDuration of the start of
+    that epoch; the other TS07DEpochIndex policies may be used instead.
+    Positions which are not in any epoch are not evaluated.
+
+    When prefetch is True, the model for the next epoch is read and built
+    in a background thread while the current epoch is evaluated.
+
+    Attributes
+    ----------
+    index : TS07DEpochIndex
+        Index of the coefficient epochs.
+    epochs : np.ndarray of np.datetime64, shape (E,)
+        Start time of each epoch, in increasing order.
+    staticCoefficients : ThinCurrentSheetShieldingCoefficients
+        Static coefficients shared by all of the models.
+    policy : str
+        Epoch matching policy, CONTAINING, PREVIOUS or NEAREST.
+    prefetch : bool
+        True to build the next model while evaluating the current one.
+    configure : callable
+        Function called with the TS07DModelBuilder before the first model
+        is built, or None.
+    builder : TS07DModelBuilder
+        Builder of the models, or None if no model has been built.
+    builderLock : threading.Lock
+        Lock serializing the use of the builder, which changes its inputs
+        for each epoch. The caches the builder shares between its models
+        are thread-safe themselves.
+    models : dict of int: VectorField
+        Models in use, by epoch index.
+    """
+
+    def __init__(self, coefficientSource, staticCoefficients=None,
+                 epochDuration=DEFAULT_EPOCH_DURATION, prefetch=False,
+                 configure=None, policy=CONTAINING):
+        """Initialize a new TS07DTimeSeries object.
+
+        Initialize a new TS07DTimeSeries object.
+
+        Parameters
+        ----------
+        coefficientSource : str, TS07DVariableCoefficientsArchive or TS07DEpochIndex
+            Path to the directory of variable coefficient files, an
+            archive, or an index of either.
+        staticCoefficients : str or ThinCurrentSheetShieldingCoefficients, optional
+            Static coefficients, or the path to them. By default, the
+            original built-in static coefficients are used.
+        epochDuration : np.timedelta64, optional
+            Length of each epoch, if coefficientSource is not an index.
+        prefetch : bool, optional
+            True to build the next model while evaluating the current one.
+        configure : callable, optional
+            Function called with the TS07DModelBuilder before the first
+            model is built, to select options such as
+            withoutEquatorialShielding().
+        policy : str, optional
+            Epoch matching policy, CONTAINING, PREVIOUS or NEAREST.
+        """
+        if not isinstance(coefficientSource, TS07DEpochIndex):
+            coefficientSource = TS07DEpochIndex(
+                coefficientSource, epochDuration)
+        self.index = coefficientSource
+        self.epochs = self.index.epochs
+        # Read the static coefficients once, for all of the models.
+        if staticCoefficients is None:
+            staticCoefficients = (
+                TS07DStaticCoefficientsFactory.
+                retrieveOriginalBuiltInCoefficientsPath()
+            )
+        if not isinstance(staticCoefficients,
+                          ThinCurrentSheetShieldingCoefficients):
+            staticCoefficients = TS07DStaticCoefficientsFactory.create(
+                staticCoefficients)
+        self.staticCoefficients = staticCoefficients
+        self.policy = policy
+        self.prefetch = prefetch
+        self.configure = configure
+        self.builder = None
+        self.builderLock = threading.Lock()
+        self.models = {}
+
+    def buildModel(self, epochIndex):
+        """Build the model for an epoch.
+
+        Read the coefficients for an epoch, and build its model. The
+        builder is created for the first epoch, and rebuilt with the new
+        coefficients for the others.
+
+        Parameters
+        ----------
+        epochIndex : int
+            Index of the epoch.
+
+        Returns
+        -------
+        model : VectorField
+            The model for the epoch.
+        """
+        contents = self.index.read(epochIndex)
+        with self.builderLock:
+            if self.builder is None:
+                builder = TS07DModelBuilder.create(
+                    contents.dipoleTiltAngle, contents.dynamicPressure,
+                    contents.coefficients)
+                builder.withStaticCoefficients(self.staticCoefficients)
+                if self.configure is not None:
+                    self.configure(builder)
+                self.builder = builder
+            return self.builder.rebuild(
+                dipoleTiltAngle=contents.dipoleTiltAngle,
+                dynamicPressure=contents.dynamicPressure,
+                variableCoefficients=contents.coefficients)
+
+    def getModel(self, epochIndex):
+        """Return the model for an epoch.
+
+        Return the model for an epoch, building it if it is not already in
+        use.
+
+        Parameters
+        ----------
+        epochIndex : int
+            Index of the epoch.
+
+        Returns
+        -------
+        model : VectorField
+            The model for the epoch.
+        """
+        model = self.models.get(epochIndex)
+        if model is None:
+            model = self.buildModel(epochIndex)
+            self.models[epochIndex] = model
+        return model
+
+    def assignEpochs(self, times):
+        """Find the epoch for each time.
+
+        Find the index of the epoch matching each time, using the epoch
+        matching policy of this time series.
+
+        Parameters
+        ----------
+        times : array-like of np.datetime64, shape (N,)
+            Times of the positions.
+
+        Returns
+        -------
+        epochIndices : np.ndarray of int, shape (N,)
+            Index of the epoch matching each time, or -1 if no epoch
+            matches it.
+        """
+        return self.index.lookupMany(times, self.policy)
+
+    def evaluate(self, times, positions):
+        """Evaluate the model at timestamped positions, one epoch at a time.
+
+        Group the positions by epoch, and evaluate the model for each
+        epoch at its positions. The results are generated one epoch at a
+        time, in order of epoch, so they can be written out as they are
+        computed.
+
+        Parameters
+        ----------
+        times : array-like of np.datetime64, shape (N,)
+            Times of the positions.
+        positions : array-like of float, shape (N, 3)
+            Positions to evaluate the model.
+
+        Yields
+        ------
+        epoch : np.datetime64
+            Start time of the epoch.
+        indices : np.ndarray of int, shape (n,)
+            Indices of the positions in the epoch.
+        values : np.ndarray of float, shape (n, 3)
+            Value of the model at each of the positions in the epoch.
+        """
+        groups = self.index.groupPositions(times, positions, self.policy)
+        group = next(groups, None)
+        executor = None
+        future = None
+        try:
+            while group is not None:
+                (epochIndex, indices, epochPositions) = group
+                nextGroup = next(groups, None)
+                if future is not None:
+                    self.models[epochIndex] = future.result()
+                    future = None
+                model = self.getModel(epochIndex)
+
+                # Only keep the model for this epoch, in case the next call
+                # continues it.
+                self.models = {epochIndex: model}
+
+                # Build the model for the next epoch while this one is
+                # evaluated.
+                if self.prefetch and nextGroup is not None:
+                    if executor is None:
+                        executor = ThreadPoolExecutor(max_workers=1)
+                    future = executor.submit(self.buildModel, nextGroup[0])
+                values = model.evaluateMany(epochPositions)
+                yield (self.epochs[epochIndex], indices, values)
+                group = nextGroup
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def evaluateAll(self, times, positions):
+        """Evaluate the model at timestamped positions.
+
+        Evaluate the model at timestamped positions, and return all of the
+        values at once.
+
+        Parameters
+        ----------
+        times : array-like of np.datetime64, shape (N,)
+            Times of the positions.
+        positions : array-like of float, shape (N, 3)
+            Positions to evaluate the model.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Value of the model at each position, or NaN for positions
+            which are not in any epoch.
+        """
+        values = np.full(np.shape(positions), np.nan)
+        for (_, indices, epochValues) in self.evaluate(times, positions):
+            values[indices] = epochValues
+        return values
+
+    def evaluateStream(self, chunks):
+        """Evaluate the model along a stream of timestamped positions.
+
+        Evaluate the model for each chunk of a stream of timestamped
+        positions, such as the blocks of an ephemeris file. Models are
+        kept between chunks, so a chunk which continues the epoch of the
+        previous chunk does not rebuild its model.
+
+        Parameters
+        ----------
+        chunks : iterable of (times, positions)
+            Chunks of times, shape (n,), and positions, shape (n, 3).
+
+        Yields
+        ------
+        times : np.ndarray of np.datetime64, shape (n,)
+            Times of the positions in the chunk.
+        positions : np.ndarray of float, shape (n, 3)
+            Positions in the chunk.
+        values : np.ndarray of float, shape (n, 3)
+            Value of the model at each position, or NaN for positions
+            which are not in any epoch.
+        """
+        for (times, positions) in chunks:
+            yield (times, positions, self.evaluateAll(times, positions))
@@ -9,8 +9,6 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
-from math import cos, sin
-
 import numpy as np
 
 from emmpy.magmodel.core.math.trigparity import ODD
@@ -80,10 +78,8 @@ class ChebyshevIteration:
         else:
             raise TypeError
         size = len(args[1])
-        sizes = np.array(range(0, size))
-        phis = phi*sizes
-        sines = np.sin(phis)
-        cosines = np.cos(phis)
+        (sines, cosines) = ChebyshevIteration.evaluateTrigExpansionsMany(
+            phi, size - 1)
         if len(args) == 3:
             sinMphi[:] = sines
             cosMphi[:] = cosines
@@ -94,3 +90,61 @@ class ChebyshevIteration:
             else:
                 trigMphi[:] = cosines
                 dTrigMphi[:] = -sines
+
+    @staticmethod
+    def evaluateTrigExpansionsMany(phi, maxOrder):
+        """Compute the trigonometric expansion tables for many angles.
+
+        Compute the sines and cosines of the integral multiples of each
+        angle in phi, for multiples 0 to maxOrder:
+
+        sinMphi[..., m] = sin(m*phi)
+        cosMphi[..., m] = cos(m*phi)
+
+        Only sin(phi) and cos(phi) are evaluated directly. The higher
+        multiples come from the Chebyshev recurrence
+
+        sin((m + 1)*phi) = 2*cos(phi)*sin(m*phi) - sin((m - 1)*phi)
+        cos((m + 1)*phi) = 2*cos(phi)*cos(m*phi) - cos((m - 1)*phi)
+
+        The two tables serve both trigonometric parities:
+
+        ODD:  trigMphi = sinMphi, dTrigMphi =  cosMphi
+        EVEN: trigMphi = cosMphi, dTrigMphi = -sinMphi
+
+        Parameters
+        ----------
+        phi : float or array-like of float, shape (N,)
+            The angles to use for computing the expansions.
+        maxOrder : int
+            Largest multiple of phi in the tables.
+
+        Returns
+        -------
+        sinMphi, cosMphi : np.ndarray of float, shape (N, maxOrder + 1)
+            Sines and cosines of the multiples of each angle.
+
+        Raises
+        ------
+        ValueError
+            If maxOrder is negative.
+        """
+        if maxOrder < 0:
+            raise ValueError("Invalid maximum order: %s" % maxOrder)
+        phi = np.asarray(phi, dtype=float)
+        sinMphi = np.empty(phi.shape + (maxOrder + 1,))
+        cosMphi = np.empty(phi.shape + (maxOrder + 1,))
+        sinMphi[..., 0] = 0.0
+        cosMphi[..., 0] = 1.0
+        if maxOrder > 0:
+            sinMphi[..., 1] = np.sin(phi)
+            cosMphi[..., 1] = np.cos(phi)
+            twoCosPhi = 2*cosMphi[..., 1]
+            for m in range(2, maxOrder + 1):
+                sinMphi[..., m] = (
+                    twoCosPhi*sinMphi[..., m - 1] - sinMphi[..., m - 2]
+                )
+                cosMphi[..., m] = (
+                    twoCosPhi*cosMphi[..., m - 1] - cosMphi[..., m - 2]
+                )
+        return (sinMphi, cosMphi)
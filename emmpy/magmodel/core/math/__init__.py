@@ -3,6 +3,7 @@
 Modules
 -------
 alternatecartesianharmonicfield.py
+besselfunctioncache.py
 cartesianharmonicfield.py
 cylindricalharmonicfield.py
 perpendicularandparallelcartesianharmonicfield.py
@@ -16,3 +17,9 @@ expansions
 tests
 vectorfields
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
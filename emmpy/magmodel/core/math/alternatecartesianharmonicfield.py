@@ -51,6 +51,8 @@ class AlternateCartesianHarmonicField(BasisVectorField):
         trigParityI
     trigParityK : TrigParity
         trigParityK
+    sqrtP : np.ndarray of float, shape (ni, nk)
+        Table of the decay rates sqrt(p_i**2 + p_k**2).
     """
 
     def __init__(self, piCoeffs, pkCoeffs, aikCoeffs, trigParityI,
@@ -77,6 +79,11 @@ class AlternateCartesianHarmonicField(BasisVectorField):
         self.aikCoeffs = aikCoeffs
         self.trigParityI = trigParityI
         self.trigParityK = trigParityK
+        # Precompute the coefficient arrays for the array methods.
+        self.pi = np.asarray(piCoeffs, dtype=float)
+        self.pk = np.asarray(pkCoeffs, dtype=float)
+        self.aik = np.asarray(aikCoeffs, dtype=float)
+        self.sqrtP = np.sqrt(np.add.outer(self.pi**2, self.pk**2))
 
     def evaluateExpansion2D(self, location):
         """Return the full expansion results.
@@ -93,61 +100,14 @@ class AlternateCartesianHarmonicField(BasisVectorField):
         result : Expansion2D
             Expansion at location.
         """
-        x = location.i
-        y = location.j
-        z = location.k
-        if self.trigParityI is ODD:
-            itrig = np.sin
-            idtrig = np.cos
-        else:
-            itrig = np.cos
-            idtrig = lambda x: -np.sin(x)
-        if self.trigParityK is ODD:
-            ktrig = np.sin
-            kdtrig = np.cos
-        else:
-            ktrig = np.cos
-            kdtrig = lambda x: -np.sin(x)
-        expansions = nones((len(self.aikCoeffs), len(self.aikCoeffs[0])))
-        sinYpi = itrig(self.piCoeffs*y)
-        cosYpi = idtrig(self.piCoeffs*y)
-        sinZpk = ktrig(self.pkCoeffs*z)
-        cosZpk = kdtrig(self.pkCoeffs*z)
-        sqrtP = np.sqrt(np.array([[pi**2 + pk**2 for pk in self.pkCoeffs] for pi in self.piCoeffs]))
-        exp_ = np.exp(x*sqrtP)
-        aik = np.array(self.aikCoeffs[...])
-        pi = np.array(self.piCoeffs)
-        pk = np.array(self.pkCoeffs)
-        sinYpiXsinZpk = np.outer(sinYpi, sinZpk)
-        sinYpiXcosZpk = np.outer(sinYpi, cosZpk)
-        cosYpiXsinZpk = np.outer(cosYpi, sinZpk)
         ni = len(self.piCoeffs)
         nk = len(self.pkCoeffs)
-        bx = np.empty((ni, nk))
-        bx[:, :-1] = -aik[:, :-1]*exp_[:, :-1]*sqrtP[:, :-1]*sinYpiXsinZpk[:, :-1]
-        bx[:, -1] = (
-            -aik[:, -1]*exp_[:, -1]*sinYpi *
-            (sqrtP[:, -1]*z*cosZpk[-1] + sinZpk[-1]*pk[-1]*(x + 1.0/sqrtP[:, -1]))
-        )
-        by = np.empty((ni, nk))
-        by[:, :-1] = (
-            -aik[:, :-1]*exp_[:, :-1]*np.broadcast_to(pi, (nk, ni)).T[:, :-1]*cosYpiXsinZpk[:, :-1]
-        )
-        by[:, -1] = (
-            -aik[:, -1]*exp_[:, -1]*np.broadcast_to(pi, (nk, ni)).T[:, -1] *
-            np.broadcast_to(cosYpi, (nk, ni)).T[:, -1] *
-            (z*cosZpk[-1] + x*pk[-1]*sinZpk[-1]/sqrtP[:, -1])
-        )
-        bz = np.empty((ni, nk))
-        bz[:, :-1] = -aik[:, :-1]*exp_[:, :-1]*pk[:-1]*sinYpiXcosZpk[:, :-1]
-        bz[:, -1] = (
-            -aik[:, -1]*exp_[:, -1] * sinYpi * 
-            (cosZpk[-1]*(1.0 + x*pk[-1]*pk[-1]/sqrtP[:, -1]) - z*pk[-1]*sinZpk[-1])
-        )
+        vectors = self.evaluateExpansionMany([location])[0]
+        vectors = vectors.reshape((ni, nk, 3))
+        expansions = nones((ni, nk))
         for i in range(ni):
             for k in range(nk):
-                vect = VectorIJK(bx[i, k], by[i, k], bz[i, k])
-                expansions[i][k] = vect
+                expansions[i][k] = VectorIJK(vectors[i, k])
         return ArrayExpansion2D(expansions)
 
     def evaluateExpansion(self, location):
@@ -171,3 +131,74 @@ class AlternateCartesianHarmonicField(BasisVectorField):
             for k in range(len(self.aikCoeffs[0])):
                 functions.append(expansions[i][k])
         return functions
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the expansion at an array of locations, using outer
+        products of the Y and Z trigonometric tables. The basis vectors
+        are ordered by i, then k.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, ni*nk, 3)
+            Basis vectors at each location.
+        """
+        positions = np.asarray(positions, dtype=float).reshape((-1, 3))
+        (x, y, z) = (c[:, np.newaxis] for c in positions.T)
+        if self.trigParityI is ODD:
+            itrig = np.sin
+            idtrig = np.cos
+        else:
+            itrig = np.cos
+            idtrig = lambda x: -np.sin(x)
+        if self.trigParityK is ODD:
+            ktrig = np.sin
+            kdtrig = np.cos
+        else:
+            ktrig = np.cos
+            kdtrig = lambda x: -np.sin(x)
+        sinYpi = itrig(self.pi*y)
+        cosYpi = idtrig(self.pi*y)
+        sinZpk = ktrig(self.pk*z)
+        cosZpk = kdtrig(self.pk*z)
+        sqrtP = self.sqrtP
+        pi = self.pi[:, np.newaxis]
+        pk = self.pk
+        aExp = -self.aik*np.exp(x[..., np.newaxis]*sqrtP)
+        bx = aExp*sqrtP*sinYpi[..., np.newaxis]*sinZpk[:, np.newaxis]
+        by = aExp*pi*cosYpi[..., np.newaxis]*sinZpk[:, np.newaxis]
+        bz = aExp*pk*sinYpi[..., np.newaxis]*cosZpk[:, np.newaxis]
+        # The last K term is the derivative term.
+        (sqrtPk, pkk) = (sqrtP[:, -1], pk[-1])
+        (sinZ, cosZ) = (sinZpk[:, -1:], cosZpk[:, -1:])
+        bx[..., -1] = aExp[..., -1]*sinYpi*(
+            sqrtPk*z*cosZ + sinZ*pkk*(x + 1.0/sqrtPk))
+        by[..., -1] = aExp[..., -1]*self.pi*cosYpi*(
+            z*cosZ + x*pkk*sinZ/sqrtPk)
+        bz[..., -1] = aExp[..., -1]*sinYpi*(
+            cosZ*(1.0 + x*pkk*pkk/sqrtPk) - z*pkk*sinZ)
+        expansions = np.stack((bx, by, bz), axis=-1)
+        return expansions.reshape((len(positions), -1, 3))
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, 3)
+            Field values at the locations.
+        """
+        return self.evaluateExpansionMany(positions).sum(axis=1)
@@ -0,0 +1,183 @@
+"""A cache of Bessel function tables shared within an evaluation.
+
+A cache of Bessel function tables shared within an evaluation.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import numpy as np
+
+from emmpy.utilities.lazyimport import lazyImport
+from emmpy.utilities.lrucache import LRUCache
+
+
+# scipy.special is slow to import, so import it when it is first used.
+sps = lazyImport("scipy.special")
+
+# Arguments smaller than this are evaluated directly with jv(), since the
+# recurrence divides by the argument.
+MIN_RECURRENCE_ARGUMENT = 1e-3
+
+# Default maximum number of table elements held by a BesselFunctionCache
+# (16 MB of float64). See the BesselFunctionCache docstring for sizing.
+DEFAULT_MAX_SIZE = 2**21
+
+
+def besselTable(x, numOrders):
+    """Compute the Bessel functions J_0..J_(L-1) for an array of arguments.
+
+    Compute the Bessel functions of the first kind of orders 0 through
+    numOrders - 1 for every argument. Only the two highest orders are
+    computed with jv(), the rest are filled in with the downward
+    recurrence:
+
+    J_(l-1)(x) = (2*l/x)*J_l(x) - J_(l+1)(x)
+
+    Parameters
+    ----------
+    x : array-like of float
+        Arguments of the Bessel functions.
+    numOrders : int
+        Number of orders L to compute.
+
+    Returns
+    -------
+    table : np.ndarray of float, shape x.shape + (L,)
+        Bessel functions, indexed by [..., l].
+    """
+    x = np.asarray(x, dtype=float)
+    table = np.empty(x.shape + (numOrders,))
+    if numOrders <= 2:
+        table[...] = sps.jv(np.arange(numOrders), x[..., np.newaxis])
+        return table
+    table[..., -1] = sps.jv(numOrders - 1, x)
+    table[..., -2] = sps.jv(numOrders - 2, x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        twoInvX = 2/x
+        for l in range(numOrders - 2, 0, -1):
+            table[..., l - 1] = l*twoInvX*table[..., l] - table[..., l + 1]
+
+    # Small arguments are computed directly.
+    small = x < MIN_RECURRENCE_ARGUMENT
+    if small.any():
+        table[small] = sps.jv(np.arange(numOrders), x[small][:, np.newaxis])
+    return table
+
+
+def _tableEntrySize(entry):
+    """Return the number of elements in a cached (rho, table) pair."""
+    return entry[1].size
+
+
+class BesselFunctionCache:
+    """A cache of Bessel function tables shared within an evaluation.
+
+    Holds tables of J_l(k*rho) for recently used sets of cylindrical radii
+    rho and wave numbers k. Fields which are evaluated at the same
+    locations (the thin current sheets and their shielding fields, for
+    every current sheet in the model) can share a cache, so that each
+    table is only computed once. The tables are held in an LRUCache
+    weighted by their number of elements, so the least recently used
+    tables are discarded when the total size of the cached tables exceeds
+    maxSize.
+
+    A table is only reused when exactly the same radii come back, which
+    happens within one evaluateMany() call, where every current sheet is
+    evaluated at the same deformed positions. The shielding tables need
+    L*K*(N + 2*M*N) elements per position (3375 with the default M=4,
+    N=5), so the default maxSize of 2**21 elements (16 MB) holds all of
+    the tables for a batch of several hundred positions. Larger batches
+    are evaluated correctly, but each current sheet computes its own
+    tables. A TS07DModelBuilder keeps its cache between calls to
+    rebuild(), so the default is kept to about one batch; pass a larger
+    maxSize to reuse the tables of larger batches.
+
+    This class is thread-safe, since the fields sharing a cache may be
+    evaluated from several threads. Tables are computed outside of the
+    lock of the LRUCache, so two threads which miss on the same table at
+    the same time may both compute it. A pickled cache does not include
+    its tables, since they are only useful for the locations of the
+    current evaluation.
+
+    Attributes
+    ----------
+    tables : LRUCache
+        Cached (rho, table) pairs, weighted by the number of elements in
+        each table.
+    """
+
+    def __init__(self, maxSize=DEFAULT_MAX_SIZE):
+        """Initialize a new BesselFunctionCache object.
+
+        Initialize a new BesselFunctionCache object.
+
+        Parameters
+        ----------
+        maxSize : int, optional
+            Maximum number of table elements to hold.
+        """
+        self.tables = LRUCache(maxSize, _tableEntrySize)
+
+    def __getstate__(self):
+        """Return the state to pickle, without the tables."""
+        state = self.__dict__.copy()
+        state["tables"] = LRUCache(self.tables.maxSize, _tableEntrySize)
+        return state
+
+    def evaluate(self, rho, waveNumbers, numOrders):
+        """Return the table of J_l(k*rho).
+
+        Return the table of Bessel functions for every combination of
+        radius and wave number, computing it if it is not cached. The
+        returned table is read-only.
+
+        Parameters
+        ----------
+        rho : array-like of float, shape (P,)
+            Cylindrical radii.
+        waveNumbers : array-like of float
+            Wave numbers k.
+        numOrders : int
+            Number of orders L to compute.
+
+        Returns
+        -------
+        table : np.ndarray of float, shape (P,) + waveNumbers.shape + (L,)
+            Bessel functions J_l(k*rho), indexed by [p, ..., l].
+        """
+        rho = np.asarray(rho, dtype=float)
+        waveNumbers = np.asarray(waveNumbers, dtype=float)
+        key = (hash(rho.tobytes()), waveNumbers.shape, waveNumbers.tobytes(),
+               numOrders)
+        entry = self.tables.get(key)
+        if entry is not None and np.array_equal(entry[0], rho):
+            return entry[1]
+
+        # Compute each distinct wave number only once.
+        (uniqueWaveNumbers, inverse) = np.unique(
+            waveNumbers, return_inverse=True)
+        uniqueTable = besselTable(np.outer(rho, uniqueWaveNumbers), numOrders)
+        table = uniqueTable[:, inverse.reshape(waveNumbers.shape)]
+        table.setflags(write=False)
+
+        # Add the new table, discarding old tables if needed.
+        self.tables.put(key, (np.array(rho), table))
+        return table
+
+    def clear(self):
+        """Discard all cached tables.
+
+        Discard all cached tables.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.tables.clear()
@@ -11,6 +11,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import cos, exp, sin, sqrt
 
+import numpy as np
+
 from emmpy.magmodel.core.math.trigparity import ODD
 from emmpy.magmodel.core.math.vectorfields.basisvectorfield import (
     BasisVectorField
@@ -50,6 +52,10 @@ class CartesianHarmonicField(BasisVectorField):
     trigParityK : TrigParity
         The TrigParity associated with the Z terms (odd=sine,
         even=cosine).
+    sqrtP : np.ndarray of float, shape (ni, nk)
+        Table of the decay rates sqrt(p_i**2 + p_k**2).
+    waveVectors : np.ndarray of float, shape (ni, nk, 3)
+        Gradient factors (sqrt(p_i**2 + p_k**2), p_i, p_k) of each term.
     """
 
     def __init__(self, piCoeffs, pkCoeffs, aikCoeffs, trigParityI,
@@ -78,6 +84,13 @@ class CartesianHarmonicField(BasisVectorField):
         self.aikCoeffs = aikCoeffs
         self.trigParityI = trigParityI
         self.trigParityK = trigParityK
+        # Precompute the coefficient arrays for the array methods.
+        self.pi = np.asarray(piCoeffs, dtype=float)
+        self.pk = np.asarray(pkCoeffs, dtype=float)
+        self.aik = np.asarray(aikCoeffs, dtype=float)
+        self.sqrtP = np.sqrt(np.add.outer(self.pi**2, self.pk**2))
+        self.waveVectors = np.stack(np.broadcast_arrays(
+            self.sqrtP, self.pi[:, np.newaxis], self.pk), axis=-1)
 
     def evaluate(self, location, buffer):
         """Evaluate the field.
@@ -131,3 +144,125 @@ class CartesianHarmonicField(BasisVectorField):
                 bz += aik*exp_*pk*sinYpi*cosZpk
         buffer[:] = [-bx, -by, -bz]
         return buffer
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the expansion at an array of locations. The basis
+        vectors are ordered by i, then k, and include the coefficients
+        a_ik.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, ni*nk, 3)
+            Basis vectors at each location.
+        """
+        (aExp, yz, dyz, ydz, _) = self._evaluateFactors(positions)
+        expansions = (aExp[..., np.newaxis]*self.waveVectors*
+                      np.stack((yz, dyz, ydz), axis=-1))
+        return expansions.reshape((len(aExp), -1, 3))
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, 3)
+            Field values at the locations.
+        """
+        return self.evaluateExpansionMany(positions).sum(axis=1)
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at an array of locations.
+
+        Evaluate the field and its Jacobian at an array of locations.
+        The field is the gradient of a sum of potentials
+        -a_ik*exp(x*sqrtP)*Y(p_i*y)*Z(p_k*z), so the Jacobian is the
+        symmetric Hessian of the same sum.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Field values at the locations.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            dB_i/dx_j at the locations, indexed by [n, i, j].
+        """
+        (aExp, yz, dyz, ydz, dydz) = self._evaluateFactors(positions)
+        first = np.stack((yz, dyz, ydz), axis=-1)
+        # The second derivatives of Y and Z are -Y and -Z.
+        second = np.stack((first,
+                           np.stack((dyz, -yz, dydz), axis=-1),
+                           np.stack((ydz, dydz, -yz), axis=-1)), axis=-2)
+        w = self.waveVectors
+        values = np.einsum("nik,ikj,nikj->nj", aExp, w, first)
+        jacobian = np.einsum("nik,ikl,ikm,niklm->nlm", aExp, w, w, second)
+        return (values, jacobian)
+
+    def _evaluateFactors(self, positions):
+        """Evaluate the factors of each term at an array of locations.
+
+        Evaluate the factors of each term at an array of locations, as
+        the outer products of the Y and Z trigonometric tables.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the factors.
+
+        Returns
+        -------
+        aExp : np.ndarray of float, shape (N, ni, nk)
+            -a_ik*exp(x*sqrtP) at each location.
+        yz, dyz, ydz, dydz : np.ndarray of float, shape (N, ni, nk)
+            Y*Z, Y'*Z, Y*Z' and Y'*Z' at each location.
+        """
+        positions = np.asarray(positions, dtype=float).reshape((-1, 3))
+        (x, y, z) = positions.T
+        (yTrig, yTrigDer) = _evaluateTrig(
+            self.trigParityI, np.multiply.outer(y, self.pi))
+        (zTrig, zTrigDer) = _evaluateTrig(
+            self.trigParityK, np.multiply.outer(z, self.pk))
+        aExp = -self.aik*np.exp(np.multiply.outer(x, self.sqrtP))
+        (yTrig, yTrigDer) = (yTrig[..., np.newaxis], yTrigDer[..., np.newaxis])
+        (zTrig, zTrigDer) = (zTrig[:, np.newaxis], zTrigDer[:, np.newaxis])
+        return (aExp, yTrig*zTrig, yTrigDer*zTrig, yTrig*zTrigDer,
+                yTrigDer*zTrigDer)
+
+
+def _evaluateTrig(trigParity, angles):
+    """Return the trig function of the given parity and its derivative.
+
+    Return the trig function of the given parity and its derivative.
+
+    Parameters
+    ----------
+    trigParity : TrigParity
+        Parity of the function (odd=sine, even=cosine).
+    angles : np.ndarray of float
+        Angles (radians) to evaluate the functions.
+
+    Returns
+    -------
+    values, derivatives : np.ndarray of float
+        The function and its derivative at each angle.
+    """
+    if trigParity is ODD:
+        return (np.sin(angles), np.cos(angles))
+    return (np.cos(angles), -np.sin(angles))
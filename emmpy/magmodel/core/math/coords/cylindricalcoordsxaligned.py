@@ -2,9 +2,19 @@
 
 
 from math import atan2, cos, pi, sin, sqrt
-from emmpy.math.coordinates.cartesianvector import CartesianVector
 
-from emmpy.math.coordinates.cylindricalvector import CylindricalVector
+import numpy as np
+
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
+
+from emmpy.math.coordinates.cylindricalvector import (
+    CylindricalVector, CylindricalVectorArray,
+    cartesianBasisToCylindricalBasisMany, cartesianFieldToCylindricalMany,
+    cartesianToCylindricalMany, cylindricalBasisToCartesianBasisMany,
+    cylindricalFieldToCartesianMany, cylindricalToCartesianMany
+)
 from emmpy.magmodel.core.math.vectorfields.basisvectorfield import (
     BasisVectorField
 )
@@ -15,6 +25,11 @@ from emmpy.math.coordinates.cartesianvector import CartesianVector
 from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
+# Order of the Cartesian components which maps x-aligned cylindrical
+# coordinates to standard cylindrical coordinates.
+_YZX = [1, 2, 0]
+
+
 class CylindricalCoordsXAligned:
     """Cylindrical coordinates aligned along the X-axis."""
 
@@ -127,6 +142,111 @@ class CylindricalCoordsXAligned:
             raise TypeError
         return convertedValue
 
+    @staticmethod
+    def convertMany(vectors, out=None):
+        """Convert arrays between Cartesian and X-aligned cylindrical.
+
+        If the input array is a CylindricalVectorArray, assume it holds
+        x-aligned cylindrical vectors and convert them to Cartesian.
+        Otherwise, convert the Cartesian vectors in the array to x-aligned
+        cylindrical. The x-aligned cylindrical coordinates of (x, y, z)
+        are the standard cylindrical coordinates of (y, z, x).
+
+        Parameters
+        ----------
+        vectors : CylindricalVectorArray or array-like, shape (N, 3)
+            Vectors to convert.
+        out : np.ndarray of float, shape (N, 3), optional
+            Array to hold the result. It may be vectors.
+
+        Returns
+        -------
+        convertedVectors : CartesianVectorArray or CylindricalVectorArray
+            The converted vectors, or out if it was provided.
+        """
+        if isinstance(vectors, CylindricalVectorArray):
+            (y, z, x) = np.moveaxis(cylindricalToCartesianMany(vectors), -1, 0)
+            return CartesianVectorArray.fromComponents(x, y, z, out=out)
+        vectors = np.asarray(vectors, dtype=float)
+        return cartesianToCylindricalMany(vectors[..., _YZX], out=out)
+
+    @staticmethod
+    def convertFieldValueMany(positions, values, out=None):
+        """Convert field value arrays between Cartesian and X-aligned.
+
+        If the positions are a CylindricalVectorArray, convert the values
+        from x-aligned cylindrical to Cartesian. Otherwise, the positions
+        are Cartesian, and the values are converted from Cartesian to
+        x-aligned cylindrical. The values may have extra axes between the
+        position axis and the component axis, for example to convert all
+        of the basis vectors of an expansion at once.
+
+        Parameters
+        ----------
+        positions : CylindricalVectorArray or array-like, shape (N, 3)
+            Positions of the field values.
+        values : array-like of float, shape (N, ..., 3)
+            Field values to convert.
+        out : np.ndarray of float, shape (N, ..., 3), optional
+            Array to hold the result. It may be values.
+
+        Returns
+        -------
+        convertedValues : np.ndarray of float, shape (N, ..., 3)
+            The converted values, or out if it was provided.
+        """
+        values = np.asarray(values, dtype=float)
+        if isinstance(positions, CylindricalVectorArray):
+            converted = cylindricalBasisToCartesianBasisMany(
+                positions, values)
+            (vy, vz, vx) = np.moveaxis(converted, -1, 0)
+            return CartesianVectorArray.fromComponents(vx, vy, vz, out=out)
+        positions = np.asarray(positions, dtype=float)
+        return cartesianBasisToCylindricalBasisMany(
+            positions[..., _YZX], values[..., _YZX], out=out)
+
+    @staticmethod
+    def convertFieldMany(positions, values, positionOut=None,
+                         valueOut=None):
+        """Convert field positions and values together.
+
+        Convert positions with convertMany() and the field values at
+        them with convertFieldValueMany(), computing the sine and cosine
+        of the polar angle once for both.
+
+        Parameters
+        ----------
+        positions : CylindricalVectorArray or array-like, shape (N, 3)
+            Positions of the field values.
+        values : array-like of float, shape (N, ..., 3)
+            Field values to convert.
+        positionOut : np.ndarray of float, shape (N, 3), optional
+            Array to hold the converted positions.
+        valueOut : np.ndarray of float, shape (N, ..., 3), optional
+            Array to hold the converted values.
+
+        Returns
+        -------
+        convertedPositions : CartesianVectorArray or CylindricalVectorArray
+            The converted positions.
+        convertedValues : np.ndarray of float, shape (N, ..., 3)
+            The converted values.
+        """
+        values = np.asarray(values, dtype=float)
+        if isinstance(positions, CylindricalVectorArray):
+            (p, v) = cylindricalFieldToCartesianMany(positions, values)
+            (y, z, x) = np.moveaxis(p, -1, 0)
+            (vy, vz, vx) = np.moveaxis(v, -1, 0)
+            return (
+                CartesianVectorArray.fromComponents(x, y, z,
+                                                    out=positionOut),
+                CartesianVectorArray.fromComponents(vx, vy, vz,
+                                                    out=valueOut))
+        positions = np.asarray(positions, dtype=float)
+        return cartesianFieldToCylindricalMany(
+            positions[..., _YZX], values[..., _YZX],
+            positionOut=positionOut, valueOut=valueOut)
+
     @staticmethod
     def convertBasisField(basisVectorField):
         """Convert a BVF between Cartesian and x-aligned cylindrical.
@@ -151,59 +271,212 @@ class CylindricalCoordsXAligned:
         """
         if isinstance(basisVectorField, CylindricalBasisVectorField):
             # Convert from x-aligned cylindrical coordinates to Cartesian
-            # coordinates using a custom object.
-            cyl_bvf = basisVectorField
-            cart_bvf = BasisVectorField()
-
-            def my_evaluateExpansion(location):
-                locCyl = CylindricalCoordsXAligned.convert(CartesianVector(location))
-                fieldCylExpansion = cyl_bvf.evaluateExpansion(locCyl)
-                fieldExpansion = []
-                for fieldCyl in fieldCylExpansion:
-                    fieldExpansion.append(
-                        CylindricalCoordsXAligned.convertFieldValue(
-                            locCyl, fieldCyl
-                        )
-                    )
-                return fieldExpansion
-            cart_bvf.evaluateExpansion = my_evaluateExpansion
-            cart_bvf.getNumberOfBasisFunctions = (
-                lambda: cyl_bvf.getNumberOfBasisFunctions()
-            )
-            converted_bvf = cart_bvf
+            # coordinates.
+            converted_bvf = CartesianFromCylindricalBasisVectorField(
+                basisVectorField)
         elif isinstance(basisVectorField, BasisVectorField):
             # Convert from Cartesian coordinates to x-aligned cylindrical
-            # coordinates using a custom object.
-            cart_bvf = basisVectorField
-            cyl_bvf = CylindricalBasisVectorField()
-
-            def my_evaluate(cylindricalLocation):
-                cartesianLocation = CylindricalCoordsXAligned.convert(
-                    cylindricalLocation)
-                cartesianValue = cart_bvf.evaluate(cartesianLocation)
-                cylindricalValue = CylindricalCoordsXAligned.convertFieldValue(
-                    cartesianLocation, cartesianValue)
-                return cylindricalValue
-            cyl_bvf.evaluate = my_evaluate
-
-            def my_evaluateExpansion(location):
-                cylindricalLocation = location
-                cartesianLocation = CylindricalCoordsXAligned.convert(
-                    cylindricalLocation)
-                cartesianExpansion = cart_bvf.evaluateExpansion(
-                    cartesianLocation
-                )
-                cylindricalExpansion = []
-                for fieldCart in cartesianExpansion:
-                    cylindricalExpansion.append(
-                        CylindricalCoordsXAligned.convertFieldValue(
-                            CartesianVector(cartesianLocation), CartesianVector(fieldCart)))
-                return cylindricalExpansion
-            cyl_bvf.evaluateExpansion = my_evaluateExpansion
-            cyl_bvf.getNumberOfBasisFunctions = (
-                lambda: cart_bvf.getNumberOfBasisFunctions()
-            )
-            converted_bvf = cyl_bvf
+            # coordinates.
+            converted_bvf = CylindricalFromCartesianBasisVectorField(
+                basisVectorField)
         else:
             raise TypeError
         return converted_bvf
+
+
+class CartesianFromCylindricalBasisVectorField(BasisVectorField):
+    """A Cartesian view of an x-aligned cylindrical basis vector field.
+
+    A Cartesian view of an x-aligned cylindrical basis vector field.
+
+    Attributes
+    ----------
+    cylindricalField : CylindricalBasisVectorField
+        The x-aligned cylindrical basis vector field.
+    """
+
+    def __init__(self, cylindricalField):
+        """Initialize a new CartesianFromCylindricalBasisVectorField object.
+
+        Initialize a new CartesianFromCylindricalBasisVectorField object.
+
+        Parameters
+        ----------
+        cylindricalField : CylindricalBasisVectorField
+            The x-aligned cylindrical basis vector field.
+        """
+        self.cylindricalField = cylindricalField
+
+    def evaluateExpansion(self, location):
+        """Evaluate the expansion at a Cartesian location.
+
+        Evaluate the expansion at a Cartesian location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Cartesian location to evaluate the expansion.
+
+        Returns
+        -------
+        fieldExpansion : list of VectorIJK
+            The Cartesian expansion evaluated at location.
+        """
+        locCyl = CylindricalCoordsXAligned.convert(CartesianVector(location))
+        fieldCylExpansion = self.cylindricalField.evaluateExpansion(locCyl)
+        fieldExpansion = []
+        for fieldCyl in fieldCylExpansion:
+            fieldExpansion.append(
+                CylindricalCoordsXAligned.convertFieldValue(locCyl, fieldCyl)
+            )
+        return fieldExpansion
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of Cartesian locations.
+
+        Evaluate the expansion at an array of Cartesian locations. The
+        locations and the basis vectors are converted for all locations
+        at once.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Cartesian locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            The Cartesian expansion evaluated at each location.
+        """
+        locCyl = CylindricalCoordsXAligned.convertMany(positions)
+        expansions = self.cylindricalField.evaluateExpansionMany(locCyl)
+        return CylindricalCoordsXAligned.convertFieldValueMany(
+            locCyl, expansions, out=expansions)
+
+    def getNumberOfBasisFunctions(self):
+        """Return the number of basis functions.
+
+        Return the number of basis functions.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : int
+            The number of basis functions of the cylindrical field.
+        """
+        return self.cylindricalField.getNumberOfBasisFunctions()
+
+
+class CylindricalFromCartesianBasisVectorField(CylindricalBasisVectorField):
+    """An x-aligned cylindrical view of a Cartesian basis vector field.
+
+    An x-aligned cylindrical view of a Cartesian basis vector field.
+
+    Attributes
+    ----------
+    cartesianField : BasisVectorField
+        The Cartesian basis vector field.
+    """
+
+    def __init__(self, cartesianField):
+        """Initialize a new CylindricalFromCartesianBasisVectorField object.
+
+        Initialize a new CylindricalFromCartesianBasisVectorField object.
+
+        Parameters
+        ----------
+        cartesianField : BasisVectorField
+            The Cartesian basis vector field.
+        """
+        self.cartesianField = cartesianField
+
+    def evaluate(self, cylindricalLocation):
+        """Evaluate the field at a cylindrical location.
+
+        Evaluate the field at a cylindrical location.
+
+        Parameters
+        ----------
+        cylindricalLocation : CylindricalVector
+            x-aligned cylindrical location to evaluate the field.
+
+        Returns
+        -------
+        cylindricalValue : CylindricalVector
+            The cylindrical field value at the location.
+        """
+        cartesianLocation = CylindricalCoordsXAligned.convert(
+            cylindricalLocation)
+        cartesianValue = self.cartesianField.evaluate(cartesianLocation)
+        cylindricalValue = CylindricalCoordsXAligned.convertFieldValue(
+            cartesianLocation, cartesianValue)
+        return cylindricalValue
+
+    def evaluateExpansion(self, location):
+        """Evaluate the expansion at a cylindrical location.
+
+        Evaluate the expansion at a cylindrical location.
+
+        Parameters
+        ----------
+        location : CylindricalVector
+            x-aligned cylindrical location to evaluate the expansion.
+
+        Returns
+        -------
+        cylindricalExpansion : list of CylindricalVector
+            The cylindrical expansion evaluated at location.
+        """
+        cartesianLocation = CylindricalCoordsXAligned.convert(location)
+        cartesianExpansion = self.cartesianField.evaluateExpansion(
+            cartesianLocation)
+        cylindricalExpansion = []
+        for fieldCart in cartesianExpansion:
+            cylindricalExpansion.append(
+                CylindricalCoordsXAligned.convertFieldValue(
+                    CartesianVector(cartesianLocation),
+                    CartesianVector(fieldCart)))
+        return cylindricalExpansion
+
+    def evaluateExpansionMany(self, locations):
+        """Evaluate the expansion at an array of cylindrical locations.
+
+        Evaluate the expansion at an array of x-aligned cylindrical
+        locations. The locations and the basis vectors are converted for
+        all locations at once.
+
+        Parameters
+        ----------
+        locations : array-like of float, shape (N, 3)
+            x-aligned cylindrical locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            The cylindrical expansion evaluated at each location.
+        """
+        cartesianLocations = CylindricalCoordsXAligned.convertMany(
+            CylindricalVectorArray(locations))
+        expansions = self.cartesianField.evaluateExpansionMany(
+            cartesianLocations)
+        return CylindricalCoordsXAligned.convertFieldValueMany(
+            cartesianLocations, expansions, out=expansions)
+
+    def getNumberOfBasisFunctions(self):
+        """Return the number of basis functions.
+
+        Return the number of basis functions.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : int
+            The number of basis functions of the Cartesian field.
+        """
+        return self.cartesianField.getNumberOfBasisFunctions()
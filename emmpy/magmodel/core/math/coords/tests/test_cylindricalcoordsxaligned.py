@@ -1,16 +1,46 @@
 """Tests for the cylindricalcoordsxaligned module."""
 
 
-from emmpy.math.coordinates.cartesianvector import CartesianVector
-from emmpy.math.coordinates.cylindricalvector import CylindricalVector
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
+from emmpy.math.coordinates.cylindricalvector import (
+    CylindricalVector, CylindricalVectorArray
+)
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.coords.cylindricalcoordsxaligned import (
-    CylindricalCoordsXAligned
+    CartesianFromCylindricalBasisVectorField, CylindricalCoordsXAligned,
+    CylindricalFromCartesianBasisVectorField
+)
+from emmpy.magmodel.core.math.vectorfields.basisvectorfield import (
+    BasisVectorField
+)
+from emmpy.magmodel.core.math.vectorfields.cylindricalbasisvectorfield import (
+    CylindricalBasisVectorField
 )
 from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
+class PairField(BasisVectorField):
+    """The 2 Cartesian basis vectors (y, z, x) and (1, x*y, z)."""
+
+    def evaluateExpansion(self, location):
+        (x, y, z) = location
+        return [VectorIJK(y, z, x), VectorIJK(1.0, x*y, z)]
+
+
+class PairCylindricalField(CylindricalBasisVectorField):
+    """The 2 cylindrical basis vectors (z, rho, 1) and (phi, 1, rho*z)."""
+
+    def evaluateExpansion(self, location):
+        (rho, phi, z) = (location.rho, location.phi, location.z)
+        return [CylindricalVector(z, rho, 1.0),
+                CylindricalVector(phi, 1.0, rho*z)]
+
+
 class TestBuilder(unittest.TestCase):
     """Tests for the cylindricalcoordsxaligned module."""
 
@@ -63,6 +93,59 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(TypeError):
             CylindricalCoordsXAligned.convertFieldValue(None, None)
 
+    def test_convertMany(self):
+        """Test the convertMany method."""
+        rng = np.random.default_rng(5)
+        cartesian = rng.uniform(-5.0, 5.0, (6, 3))
+        cylindrical = CylindricalCoordsXAligned.convertMany(cartesian)
+        self.assertIsInstance(cylindrical, CylindricalVectorArray)
+        for (c, v) in zip(cartesian, cylindrical):
+            expected = CylindricalCoordsXAligned.convert(CartesianVector(c))
+            self.assertTrue(np.allclose(v, expected))
+        converted = CylindricalCoordsXAligned.convertMany(cylindrical)
+        self.assertIsInstance(converted, CartesianVectorArray)
+        self.assertTrue(np.allclose(converted, cartesian))
+        # Convert in place.
+        CylindricalCoordsXAligned.convertMany(cylindrical, out=cylindrical)
+        self.assertTrue(np.allclose(cylindrical, cartesian))
+
+    def test_convertFieldValueMany(self):
+        """Test the convertFieldValueMany method."""
+        rng = np.random.default_rng(6)
+        positions = rng.uniform(-5.0, 5.0, (4, 3))
+        values = rng.uniform(-5.0, 5.0, (4, 2, 3))
+        converted = CylindricalCoordsXAligned.convertFieldValueMany(
+            positions, values)
+        self.assertEqual(converted.shape, (4, 2, 3))
+        for i in range(4):
+            for j in range(2):
+                expected = CylindricalCoordsXAligned.convertFieldValue(
+                    CartesianVector(positions[i]),
+                    CartesianVector(values[i, j]))
+                self.assertTrue(np.allclose(converted[i, j], expected))
+        cylindrical = CylindricalCoordsXAligned.convertMany(positions)
+        back = CylindricalCoordsXAligned.convertFieldValueMany(
+            cylindrical, converted)
+        self.assertTrue(np.allclose(back, values))
+
+    def test_convertFieldMany(self):
+        """Test the convertFieldMany method."""
+        rng = np.random.default_rng(7)
+        positions = rng.uniform(-5.0, 5.0, (4, 3))
+        values = rng.uniform(-5.0, 5.0, (4, 3))
+        (p, v) = CylindricalCoordsXAligned.convertFieldMany(
+            positions, values)
+        self.assertIsInstance(p, CylindricalVectorArray)
+        self.assertTrue(np.allclose(
+            p, CylindricalCoordsXAligned.convertMany(positions)))
+        self.assertTrue(np.allclose(
+            v, CylindricalCoordsXAligned.convertFieldValueMany(
+                positions, values)))
+        (p, v) = CylindricalCoordsXAligned.convertFieldMany(
+            p, v, positionOut=p, valueOut=v)
+        self.assertTrue(np.allclose(p, positions))
+        self.assertTrue(np.allclose(v, values))
+
     def test_convertBasisField(self):
         """Test the convertBasisField method."""
         # NEED THESE TESTS.
@@ -70,6 +153,29 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(TypeError):
             CylindricalCoordsXAligned.convertBasisField(None)
 
+    def test_CartesianFromCylindricalBasisVectorField(self):
+        """Test the CartesianFromCylindricalBasisVectorField class."""
+        field = CartesianFromCylindricalBasisVectorField(
+            PairCylindricalField())
+        positions = np.random.default_rng(21).uniform(-3.0, 3.0, (5, 3))
+        expansions = field.evaluateExpansionMany(positions)
+        self.assertEqual(expansions.shape, (5, 2, 3))
+        for (position, expansion) in zip(positions, expansions):
+            expected = field.evaluateExpansion(VectorIJK(position))
+            self.assertTrue(np.allclose(expansion, expected))
+
+    def test_CylindricalFromCartesianBasisVectorField(self):
+        """Test the CylindricalFromCartesianBasisVectorField class."""
+        field = CylindricalFromCartesianBasisVectorField(PairField())
+        locations = np.random.default_rng(22).uniform(
+            (0.5, 0.0, -3.0), (5.0, 2*np.pi, 3.0), (5, 3))
+        expansions = field.evaluateExpansionMany(locations)
+        self.assertEqual(expansions.shape, (5, 2, 3))
+        for (location, expansion) in zip(locations, expansions):
+            expected = field.evaluateExpansion(CylindricalVector(*location))
+            expected = [tuple(v) for v in expected]
+            self.assertTrue(np.allclose(expansion, expected))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -12,19 +12,32 @@ Eric Winter (eric.winter@jhuapl.edu)
 from math import cosh, sinh
 
 import numpy as np
-from scipy.special import jv
 
 from emmpy.magmodel.core.chebysheviteration import ChebyshevIteration
+from emmpy.magmodel.core.math.besselfunctioncache import besselTable
 from emmpy.magmodel.core.math.expansions.arrayexpansion2d import ArrayExpansion2D
+from emmpy.magmodel.core.math.trigparity import EVEN
 from emmpy.magmodel.core.math.vectorfields.basisvectorfield import (
     BasisVectorField
 )
 from emmpy.math.coordinates.cartesianvector import CartesianVector
 from emmpy.math.coordinates.cylindricalvector import cartesianToCylindrical
 from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.differentiation import (
+    cylindricalToCartesianJacobian
+)
+from emmpy.math.vectorfields.gridevaluation import evaluateGridInRows
+from emmpy.utilities.lazyimport import lazyImport
 from emmpy.utilities.nones import nones
 
 
+sps = lazyImport("scipy.special")
+
+# Maximum number of (position, field, wave number, order) terms to hold in
+# memory at once when evaluating stacked fields.
+MAX_STACKED_TERMS = 2**20
+
+
 class CylindricalHarmonicField(BasisVectorField):
     """A harmonic field in cylindrical coordinates.
 
@@ -100,7 +113,7 @@ class CylindricalHarmonicField(BasisVectorField):
             rhoKInv = min(1/rhoK, CylindricalHarmonicField.invMaxVal)
             rhoInv = min(1/rho, CylindricalHarmonicField.invMaxVal)
             # Calculate Bessel terms and their derivatives.
-            jns = jv(range(len(self.coefficientsExpansion)), rhoK)
+            jns = sps.jv(range(len(self.coefficientsExpansion)), rhoK)
             jnsDer = np.empty(len(self.coefficientsExpansion))
             jnsDer[0] = -jns[1]
             jnsDer[1:] = [jns[m - 1] - m*jns[m]*rhoKInv for m in range(1, len(self.coefficientsExpansion))]
@@ -146,3 +159,410 @@ class CylindricalHarmonicField(BasisVectorField):
             for n in range(len(self.coefficientsExpansion[0])):
                 functions.append(expansions[m][n])
         return functions
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Cartesian locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (P, 3)
+            Field values at the locations.
+        """
+        coefficients = np.asarray(self.coefficientsExpansion, dtype=float)
+        waveNumbers = np.asarray(self.waveNumberExpansion, dtype=float)
+        return evaluateStacked(
+            positions, coefficients[np.newaxis], waveNumbers[np.newaxis],
+            np.array([self.trigParity is EVEN])
+        )[:, 0, :]
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at an array of locations.
+
+        Evaluate the field and its Jacobian at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Cartesian locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (P, 3)
+            Field values at the locations.
+        jacobian : np.ndarray of float, shape (P, 3, 3)
+            dB_i/dx_j at the locations, indexed by [p, i, j].
+        """
+        coefficients = np.asarray(self.coefficientsExpansion, dtype=float)
+        waveNumbers = np.asarray(self.waveNumberExpansion, dtype=float)
+        return differentiateStacked(
+            positions, coefficients[np.newaxis], waveNumbers[np.newaxis],
+            np.array([self.trigParity is EVEN]), combine=True)
+
+    def evaluateGrid(self, grid):
+        """Evaluate the field on a regular grid.
+
+        Evaluate the field on a regular grid.
+
+        Parameters
+        ----------
+        grid : CartesianGrid or CylindricalGrid
+            Grid of locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape grid.shape + (3,)
+            Field values at the grid points.
+        """
+        coefficients = np.asarray(self.coefficientsExpansion, dtype=float)
+        waveNumbers = np.asarray(self.waveNumberExpansion, dtype=float)
+        return evaluateStackedGrid(
+            grid, coefficients[np.newaxis], waveNumbers[np.newaxis],
+            np.array([self.trigParity is EVEN]), combine=True)
+
+
+def evaluateStacked(positions, coefficients, waveNumbers, isEven,
+                    besselCache=None):
+    """Evaluate a stack of cylindrical harmonic fields.
+
+    Evaluate a stack of S cylindrical harmonic fields, each with L Bessel
+    orders and K wave numbers, at an array of P locations. All Bessel
+    functions are computed with a single call to jv(), and the sums over
+    orders and wave numbers are done as tensor contractions. Locations are
+    processed in chunks to limit memory use.
+
+    Parameters
+    ----------
+    positions : array-like of float, shape (P, 3)
+        Cartesian locations to evaluate the fields.
+    coefficients : np.ndarray of float, shape (S, L, K)
+        Linear scaling coefficients c_mn for each field.
+    waveNumbers : np.ndarray of float, shape (S, K)
+        Wave numbers k_n for each field.
+    isEven : np.ndarray of bool, shape (S,)
+        True for fields with EVEN trig parity, False for ODD.
+    besselCache : BesselFunctionCache, optional
+        Cache to use for the Bessel function tables.
+
+    Returns
+    -------
+    result : np.ndarray of float, shape (P, S, 3)
+        Value of each field at each location.
+    """
+    positions = np.asarray(positions, dtype=float)
+    (S, L, K) = coefficients.shape
+    result = np.empty((len(positions), S, 3))
+    chunkSize = max(1, MAX_STACKED_TERMS//(S*L*K))
+    for i in range(0, len(positions), chunkSize):
+        result[i:i + chunkSize] = _evaluateStackedChunk(
+            positions[i:i + chunkSize], coefficients, waveNumbers, isEven,
+            besselCache)
+    return result
+
+
+def evaluateCombined(positions, coefficients, waveNumbers, isEven,
+                     besselCache=None):
+    """Evaluate the sum of a stack of cylindrical harmonic fields.
+
+    Evaluate the sum of a stack of S cylindrical harmonic fields at an array
+    of P locations. This is equivalent to evaluateStacked(...).sum(axis=1),
+    but the stack is summed as part of the contraction over the wave
+    numbers, so the individual field values are never formed. Any weights
+    for the individual fields should be folded into the coefficients.
+
+    Parameters
+    ----------
+    positions : array-like of float, shape (P, 3)
+        Cartesian locations to evaluate the fields.
+    coefficients : np.ndarray of float, shape (S, L, K)
+        Linear scaling coefficients c_mn for each field.
+    waveNumbers : np.ndarray of float, shape (S, K)
+        Wave numbers k_n for each field.
+    isEven : np.ndarray of bool, shape (S,)
+        True for fields with EVEN trig parity, False for ODD.
+    besselCache : BesselFunctionCache, optional
+        Cache to use for the Bessel function tables.
+
+    Returns
+    -------
+    result : np.ndarray of float, shape (P, 3)
+        Sum of the fields at each location.
+    """
+    positions = np.asarray(positions, dtype=float)
+    (S, L, K) = coefficients.shape
+    result = np.empty((len(positions), 3))
+    chunkSize = max(1, MAX_STACKED_TERMS//(S*L*K))
+    for i in range(0, len(positions), chunkSize):
+        result[i:i + chunkSize] = _evaluateStackedChunk(
+            positions[i:i + chunkSize], coefficients, waveNumbers, isEven,
+            besselCache, combine=True)
+    return result
+
+
+def evaluateStackedGrid(grid, coefficients, waveNumbers, isEven,
+                        besselCache=None, combine=False):
+    """Evaluate a stack of cylindrical harmonic fields on a regular grid.
+
+    Evaluate a stack of S cylindrical harmonic fields on a regular grid.
+    The Bessel functions depend only on rho, the trig functions only on
+    phi, and the hyperbolic functions only on z, so each is computed once
+    per grid line rather than once per grid point, and the sum over orders
+    is done once per column of the grid rather than once per point.
+
+    Parameters
+    ----------
+    grid : CartesianGrid or CylindricalGrid
+        Grid of locations to evaluate the fields.
+    coefficients : np.ndarray of float, shape (S, L, K)
+        Linear scaling coefficients c_mn for each field.
+    waveNumbers : np.ndarray of float, shape (S, K)
+        Wave numbers k_n for each field.
+    isEven : np.ndarray of bool, shape (S,)
+        True for fields with EVEN trig parity, False for ODD.
+    besselCache : BesselFunctionCache, optional
+        Cache to use for the Bessel function tables.
+    combine : bool, optional
+        True to return the sum of the fields, as evaluateCombined() does.
+
+    Returns
+    -------
+    result : np.ndarray of float, shape grid.shape + (S, 3) or
+        grid.shape + (3,)
+        Value of each field, or of their sum, at each grid point.
+    """
+    (S, L, K) = coefficients.shape
+
+    def evaluateRows(rows):
+        (x, y, rho, phi) = rows.columns()
+        return _evaluateColumns(
+            x, y, rho, phi, rows.z, coefficients, waveNumbers, isEven,
+            besselCache, combine)
+
+    termsPerRow = grid.shape[1]*S*K*max(L, grid.shape[2])
+    valueShape = (3,) if combine else (S, 3)
+    return evaluateGridInRows(evaluateRows, grid, termsPerRow,
+                              MAX_STACKED_TERMS, valueShape)
+
+
+def differentiateStacked(positions, coefficients, waveNumbers, isEven,
+                         besselCache=None, combine=False):
+    """Evaluate a stack of cylindrical harmonic fields and their Jacobians.
+
+    Evaluate a stack of S cylindrical harmonic fields, and their Jacobians,
+    at an array of P locations. Each field is B = -del U for a potential
+    U = J_l(k*rho)*cos(l*phi)*sinh(k*z), so the second derivatives of the
+    Bessel functions come from Bessel's equation, and the derivatives are
+    contracted over the orders and wave numbers in the same way as the
+    values.
+
+    Parameters
+    ----------
+    positions : array-like of float, shape (P, 3)
+        Cartesian locations to evaluate the fields.
+    coefficients : np.ndarray of float, shape (S, L, K)
+        Linear scaling coefficients c_mn for each field.
+    waveNumbers : np.ndarray of float, shape (S, K)
+        Wave numbers k_n for each field.
+    isEven : np.ndarray of bool, shape (S,)
+        True for fields with EVEN trig parity, False for ODD.
+    besselCache : BesselFunctionCache, optional
+        Cache to use for the Bessel function tables.
+    combine : bool, optional
+        True to return the sum of the fields, as evaluateCombined() does.
+
+    Returns
+    -------
+    values : np.ndarray of float, shape (P, S, 3) or (P, 3)
+        Value of each field, or of their sum, at each location.
+    jacobian : np.ndarray of float, shape (P, S, 3, 3) or (P, 3, 3)
+        Jacobian of each field, or of their sum, at each location.
+    """
+    positions = np.asarray(positions, dtype=float)
+    (S, L, K) = coefficients.shape
+    shape = (len(positions),) if combine else (len(positions), S)
+    values = np.empty(shape + (3,))
+    jacobian = np.empty(shape + (3, 3))
+    chunkSize = max(1, MAX_STACKED_TERMS//(4*S*L*K))
+    for i in range(0, len(positions), chunkSize):
+        chunk = slice(i, i + chunkSize)
+        (values[chunk], jacobian[chunk]) = _differentiateStackedChunk(
+            positions[chunk], coefficients, waveNumbers, isEven,
+            besselCache, combine)
+    return (values, jacobian)
+
+
+def _evaluateStackedChunk(positions, coefficients, waveNumbers, isEven,
+                          besselCache, combine=False):
+    """Evaluate a stack of cylindrical harmonic fields for one chunk."""
+    x = positions[:, 0]
+    y = positions[:, 1]
+    z = positions[:, 2]
+
+    # Convert to cylindrical coordinates, with phi in [0, 2*pi).
+    rho = np.sqrt(x**2 + y**2)
+    phi = np.arctan2(y, x)
+    phi[phi < 0] += 2*np.pi
+    phi[rho == 0] = 0.0
+    return _evaluateColumns(x, y, rho, phi, z, coefficients, waveNumbers,
+                            isEven, besselCache, combine)
+
+
+def _evaluateColumns(x, y, rho, phi, z, coefficients, waveNumbers, isEven,
+                     besselCache, combine):
+    """Evaluate a stack of cylindrical harmonic fields on columns.
+
+    The column coordinates x, y, rho and phi have a common broadcast shape
+    C, and z broadcasts against C to the shape Q of the result. For
+    scattered locations, C and Q are both (P,). For a grid, C is (A, B, 1)
+    and z has shape (Z,), so everything which depends only on the column
+    is computed once per column.
+    """
+    L = coefficients.shape[1]
+
+    # Cap rho^-1 and (k*rho)^-1 at 10^8.
+    kn = np.abs(waveNumbers)
+    rhoK = rho[..., np.newaxis, np.newaxis]*kn
+    with np.errstate(divide="ignore"):
+        rhoInv = np.minimum(1/rho, CylindricalHarmonicField.invMaxVal)
+        rhoKInv = np.minimum(1/rhoK, CylindricalHarmonicField.invMaxVal)
+    zK = z[..., np.newaxis, np.newaxis]*kn
+    coshKZ = np.cosh(zK)
+    sinhKZ = np.sinh(zK)
+
+    # Bessel terms and their derivatives, indexed by [..., s, k, l].
+    orders = np.arange(L)
+    if besselCache is None:
+        jns = besselTable(rhoK, L)
+    else:
+        jns = besselCache.evaluate(rho.ravel(), kn, L).reshape(
+            rhoK.shape + (L,))
+    jnsDer = np.empty(jns.shape)
+    jnsDer[..., 0] = -jns[..., 1]
+    jnsDer[..., 1:] = (
+        jns[..., :-1] - orders[1:]*jns[..., 1:]*rhoKInv[..., np.newaxis]
+    )
+
+    # sin(l*phi) and cos(l*phi) for the ODD parity, swapped for EVEN.
+    # Indexed by [..., s, l].
+    (sines, cosines) = ChebyshevIteration.evaluateTrigExpansionsMany(
+        phi, L - 1)
+    sines = sines[..., np.newaxis, :]
+    cosines = cosines[..., np.newaxis, :]
+    even = isEven[:, np.newaxis]
+    sinLPhi = np.where(even, cosines, sines)
+    cosLPhi = np.where(even, -sines, cosines)
+
+    # Contract over the Bessel orders, once per column.
+    aRho = np.einsum("slk,...skl,...sl->...sk", coefficients, jnsDer, cosLPhi)
+    aPhi = np.einsum("slk,...skl,...sl->...sk",
+                     coefficients*orders[:, np.newaxis], jns, sinLPhi)
+    aZ = np.einsum("slk,...skl,...sl->...sk", coefficients, jns, cosLPhi)
+
+    # Contract over the wave numbers, and also over the stack if the
+    # fields are combined.
+    axes = (-2, -1) if combine else -1
+    bRho = np.sum(kn*aRho*sinhKZ, axis=axes)
+    bPhi = np.sum(aPhi*sinhKZ, axis=axes)
+    bz = np.sum(kn*aZ*coshKZ, axis=axes)
+
+    # Convert to Cartesian, the minus sign comes from the B=-del U.
+    if combine:
+        xRhoInv = x*rhoInv
+        yRhoInv = y*rhoInv
+        bPhi *= rhoInv
+    else:
+        xRhoInv = (x*rhoInv)[..., np.newaxis]
+        yRhoInv = (y*rhoInv)[..., np.newaxis]
+        bPhi *= rhoInv[..., np.newaxis]
+    result = np.empty(bRho.shape + (3,))
+    result[..., 0] = -(xRhoInv*bRho + yRhoInv*bPhi)
+    result[..., 1] = -(yRhoInv*bRho - xRhoInv*bPhi)
+    result[..., 2] = -bz
+    return result
+
+
+def _differentiateStackedChunk(positions, coefficients, waveNumbers, isEven,
+                               besselCache, combine):
+    """Differentiate a stack of cylindrical harmonic fields for one chunk."""
+    L = coefficients.shape[1]
+    (x, y, z) = positions.T
+    rho = np.sqrt(x**2 + y**2)
+    phi = np.arctan2(y, x)
+
+    # Terms are indexed by [p, s, k], as in _evaluateColumns().
+    kn = np.abs(waveNumbers)
+    rhoK = rho[:, np.newaxis, np.newaxis]*kn
+    with np.errstate(divide="ignore"):
+        rhoInv = np.minimum(1/rho, CylindricalHarmonicField.invMaxVal)
+        rhoKInv = np.minimum(1/rhoK, CylindricalHarmonicField.invMaxVal)
+    zK = z[:, np.newaxis, np.newaxis]*kn
+    coshKZ = np.cosh(zK)
+    sinhKZ = np.sinh(zK)
+
+    # Bessel terms and their 1st and 2nd derivatives, indexed by
+    # [p, s, k, l].
+    orders = np.arange(L)
+    if besselCache is None:
+        jns = besselTable(rhoK, L)
+    else:
+        jns = besselCache.evaluate(rho, kn, L).reshape(rhoK.shape + (L,))
+    jnsDer = np.empty(jns.shape)
+    jnsDer[..., 0] = -jns[..., 1]
+    jnsDer[..., 1:] = (
+        jns[..., :-1] - orders[1:]*jns[..., 1:]*rhoKInv[..., np.newaxis]
+    )
+    lRhoKInv = orders*rhoKInv[..., np.newaxis]
+    jnsDer2 = -jnsDer*rhoKInv[..., np.newaxis] - (1 - lRhoKInv**2)*jns
+
+    # The ODD and EVEN trig terms, indexed by [p, s, l].
+    (sines, cosines) = ChebyshevIteration.evaluateTrigExpansionsMany(
+        phi, L - 1)
+    sines = sines[:, np.newaxis, :]
+    cosines = cosines[:, np.newaxis, :]
+    even = isEven[:, np.newaxis]
+    sinLPhi = np.where(even, cosines, sines)
+    cosLPhi = np.where(even, -sines, cosines)
+
+    # Contract over the Bessel orders. Each derivative with respect to phi
+    # turns cos(l*phi) into -l*sin(l*phi), and sin(l*phi) into
+    # l*cos(l*phi).
+    l1 = coefficients*orders[:, np.newaxis]
+    l2 = l1*orders[:, np.newaxis]
+
+    def contract(c, j, trig):
+        return np.einsum("slk,pskl,psl->psk", c, j, trig)
+
+    aDer = contract(coefficients, jnsDer, cosLPhi)
+    aPhi = contract(l1, jns, sinLPhi)
+    aZ = contract(coefficients, jns, cosLPhi)
+    aDer2 = contract(coefficients, jnsDer2, cosLPhi)
+    aDerPhi = contract(l1, jnsDer, sinLPhi)
+    aPhiPhi = contract(l2, jns, cosLPhi)
+
+    # Cylindrical components of B = -del U and their derivatives with
+    # respect to rho, phi and z, each indexed by [p, s, k, component].
+    r = rhoInv[:, np.newaxis, np.newaxis]
+    k2 = kn*kn
+    b = np.stack((-kn*aDer*sinhKZ, aPhi*sinhKZ*r, -kn*aZ*coshKZ), axis=-1)
+    dbdRho = np.stack((-k2*aDer2*sinhKZ, (kn*aDerPhi - aPhi*r)*sinhKZ*r,
+                       -k2*aDer*coshKZ), axis=-1)
+    dbdPhi = np.stack((kn*aDerPhi*sinhKZ, aPhiPhi*sinhKZ*r,
+                       kn*aPhi*coshKZ), axis=-1)
+    dbdZ = np.stack((-k2*aDer*coshKZ, kn*aPhi*coshKZ*r,
+                     -k2*aZ*sinhKZ), axis=-1)
+
+    # Sum over the wave numbers, and also over the stack if the fields are
+    # combined.
+    axes = (1, 2) if combine else 2
+    (b, dbdRho, dbdPhi, dbdZ) = (
+        a.sum(axis=axes) for a in (b, dbdRho, dbdPhi, dbdZ))
+    if not combine:
+        (phi, rhoInv) = (phi[:, np.newaxis], rhoInv[:, np.newaxis])
+    return cylindricalToCartesianJacobian(phi, rhoInv, b, dbdRho, dbdPhi,
+                                          dbdZ)
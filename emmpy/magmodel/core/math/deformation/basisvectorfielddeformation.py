@@ -8,6 +8,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.magmodel.core.math.deformation.vectorfielddeformation import (
     VectorFieldDeformation
 )
@@ -63,6 +65,30 @@ class BasisVectorFieldDeformation(BasisVectorField):
             bFieldExpansionDeformed.append(VectorIJK(v.i, v.j, v.k))
         return bFieldExpansionDeformed
 
+    def evaluateExpansionMany(self, positions):
+        """Evaluate and deform the expansion at an array of locations.
+
+        Evaluate and deform the expansion at an array of locations. The
+        deformation matrices are computed for all of the locations at
+        once, and the original expansion is evaluated at all of the
+        deformed locations with a single call to evaluateExpansionMany().
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations for expansion evaluation.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            Deformed expansion terms at each location.
+        """
+        (deformed, jacobian) = self.coordDeformation.differentiateMany(
+            positions)
+        trans = VectorFieldDeformation.computeMatrices(jacobian)
+        expansions = self.originalField.evaluateExpansionMany(deformed)
+        return np.einsum("nij,nbj->nbi", trans, expansions)
+
     def getNumberOfBasisFunctions(self):
         """Return the number of basis functions.
         
@@ -9,13 +9,17 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.magmodel.core.math.deformation.cylindricalfielddeformation import (
     CylindricalFieldDeformation
 )
 from emmpy.magmodel.core.math.vectorfields.cylindricalbasisvectorfield import (
     CylindricalBasisVectorField
 )
-from emmpy.math.coordinates.cylindricalvector import CylindricalVector
+from emmpy.math.coordinates.cylindricalvector import (
+    CylindricalVector, CylindricalVectorArray
+)
 from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
@@ -67,3 +71,30 @@ class CylindricalBasisFieldDeformation(CylindricalBasisVectorField):
             v[:] = trans.dot(vcyl)
             bFieldExpansionDeformed.append(CylindricalVector(v.i, v.j, v.k))
         return bFieldExpansionDeformed
+
+    def evaluateExpansionMany(self, locations):
+        """Evaluate and deform the expansion at an array of locations.
+
+        Evaluate and deform the expansion at an array of locations. The
+        deformation matrices are computed for all of the locations at
+        once, and the original expansion is evaluated at all of the
+        deformed locations with a single call to evaluateExpansionMany().
+
+        Parameters
+        ----------
+        locations : array-like of float, shape (N, 3)
+            Cylindrical (rho, phi, z) locations to compute deformed field.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            Deformed (rho, phi, z) expansion components at each location.
+        """
+        locations = np.asarray(locations, dtype=float)
+        (deformed, jacobian) = self.coordDeformation.differentiateMany(
+            locations)
+        trans = CylindricalFieldDeformation.computeMatrices(
+            jacobian, locations[:, 0], deformed[:, 0])
+        expansions = self.originalField.evaluateExpansionMany(
+            CylindricalVectorArray(deformed))
+        return np.einsum("nij,nbj->nbi", trans, expansions)
@@ -11,6 +11,11 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 import sys
 
+import numpy as np
+
+from emmpy.magmodel.core.math.deformation.vectorfielddeformation import (
+    VectorFieldDeformation
+)
 from emmpy.math.coordinates.cylindricalvector import CylindricalVector
 from emmpy.math.coordinates.vectorijk import VectorIJK
 from emmpy.math.matrices.matrixijk import MatrixIJK
@@ -126,3 +131,38 @@ class CylindricalFieldDeformation:
             trans = MatrixIJK(trr, tpr, tzr, trp, tpp, tzp, trz, tpz, tzz)
 
         return trans
+
+    @staticmethod
+    def computeMatrices(jacobian, rho, rhoDeformed):
+        """Compute the deformation matrices from stacked Jacobians.
+
+        Compute the deformation matrix of computeMatrix() for each of an
+        array of deformation Jacobians. The matrices are not defined on
+        the axis (rho = 0).
+
+        Parameters
+        ----------
+        jacobian : array-like of float, shape (N, 3, 3)
+            Jacobian of the deformation at each location, indexed as
+            [n, i, j] for the derivative of deformed component i with
+            respect to original component j, in (rho, phi, z) order.
+        rho : array-like of float, shape (N,)
+            Original cylindrical radius of each location.
+        rhoDeformed : array-like of float, shape (N,)
+            Deformed cylindrical radius of each location.
+
+        Returns
+        -------
+        trans : np.ndarray of float, shape (N, 3, 3)
+            The transformation matrix for the deformation at each
+            location.
+        """
+        rho = np.asarray(rho, dtype=float)
+        rhoDeformed = np.asarray(rhoDeformed, dtype=float)
+        one = np.ones(rho.shape)
+        rowScale = np.stack((1/rho, one, 1/rho), axis=-1)
+        columnScale = np.stack((rhoDeformed, one, rhoDeformed), axis=-1)
+        trans = VectorFieldDeformation.computeMatrices(jacobian)
+        trans *= rowScale[..., :, np.newaxis]
+        trans *= columnScale[..., np.newaxis, :]
+        return trans
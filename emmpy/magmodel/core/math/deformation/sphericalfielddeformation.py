@@ -11,10 +11,18 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import sin
 
+import numpy as np
+
+from emmpy.magmodel.core.math.deformation.vectorfielddeformation import (
+    VectorFieldDeformation
+)
 from emmpy.magmodel.core.math.vectorfields.sphericalvectorfield import (
     SphericalVectorField
 )
-from emmpy.math.coordinates.sphericalvector import SphericalVector
+from emmpy.math.coordinates.sphericalvector import (
+    SphericalVector, cartesianToSphericalMany,
+    sphericalBasisToCartesianBasisMany
+)
 from emmpy.math.coordinates.vectorijk import VectorIJK
 from emmpy.math.matrices.matrixijk import MatrixIJK
 
@@ -67,6 +75,38 @@ class SphericalFieldDeformation(SphericalVectorField):
 
         return SphericalVector(v.i, v.j, v.k)
 
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of Cartesian locations.
+
+        Evaluate the field at an array of Cartesian locations. The
+        conversions between coordinate systems, the deformation
+        derivatives and the deformation matrices are computed for all of
+        the locations at once. The original field is evaluated at each
+        deformed location with its spherical evaluate() method.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Cartesian locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Cartesian deformed field values.
+        """
+        positions = np.asarray(positions, dtype=float)
+        locations = cartesianToSphericalMany(positions)
+        (deformed, jacobian) = self.coordDeformation.differentiateMany(
+            locations)
+        trans = self.computeMatrices(jacobian, locations, deformed)
+        bField = np.empty(positions.shape)
+        for (i, (r, theta, phi)) in enumerate(deformed):
+            bField[i] = self.originalField.evaluate(
+                SphericalVector(r, theta, phi))
+        values = np.einsum("nij,nj->ni", trans, bField)
+        return sphericalBasisToCartesianBasisMany(
+            locations, values, out=values)
+
     @staticmethod
     def computeMatrix(deformed, originalCoordinate):
         """Compute the deformation matrix.
@@ -115,3 +155,39 @@ class SphericalFieldDeformation(SphericalVectorField):
                            [ttr, ttt, ttp],
                            [tpr, tpt, tpp]])
         return trans
+
+    @staticmethod
+    def computeMatrices(jacobian, locations, deformedLocations):
+        """Compute the deformation matrices from stacked Jacobians.
+
+        Compute the deformation matrix of computeMatrix() for each of an
+        array of deformation Jacobians.
+
+        Parameters
+        ----------
+        jacobian : array-like of float, shape (N, 3, 3)
+            Jacobian of the deformation at each location, indexed as
+            [n, i, j] for the derivative of deformed component i with
+            respect to original component j, in (r, theta, phi) order.
+        locations : array-like of float, shape (N, 3)
+            Original spherical (r, theta, phi) locations.
+        deformedLocations : array-like of float, shape (N, 3)
+            Deformed spherical (r, theta, phi) locations.
+
+        Returns
+        -------
+        trans : np.ndarray of float, shape (N, 3, 3)
+            Deformation transformation matrix at each location.
+        """
+        (r, theta) = np.moveaxis(np.asarray(locations, dtype=float), -1, 0)[:2]
+        (rDef, thetaDef) = np.moveaxis(
+            np.asarray(deformedLocations, dtype=float), -1, 0)[:2]
+        rSinTheta = r*np.sin(theta)
+        rSinThetaDef = rDef*np.sin(thetaDef)
+        rowScale = np.stack((1/(r*rSinTheta), 1/rSinTheta, 1/r), axis=-1)
+        columnScale = np.stack((rDef*rSinThetaDef, rSinThetaDef, rDef),
+                               axis=-1)
+        trans = VectorFieldDeformation.computeMatrices(jacobian)
+        trans *= rowScale[..., :, np.newaxis]
+        trans *= columnScale[..., np.newaxis, :]
+        return trans
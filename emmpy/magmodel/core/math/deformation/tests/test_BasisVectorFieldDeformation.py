@@ -3,9 +3,26 @@
 
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.deformation.basisvectorfielddeformation import (
     BasisVectorFieldDeformation
 )
+from emmpy.magmodel.core.math.deformation.tests.test_VectorFieldDeformation import (
+    QuadraticDeformation
+)
+from emmpy.magmodel.core.math.vectorfields.basisvectorfield import (
+    BasisVectorField
+)
+from emmpy.math.coordinates.vectorijk import VectorIJK
+
+
+class PairBasisField(BasisVectorField):
+    """The 2 basis vectors (y, z, x) and (1, x*y, z)."""
+
+    def evaluateExpansion(self, location):
+        (x, y, z) = location
+        return [VectorIJK(y, z, x), VectorIJK(1.0, x*y, z)]
 
 
 class TestBuilder(unittest.TestCase):
@@ -20,6 +37,17 @@ class TestBuilder(unittest.TestCase):
         """Test the evaluateExpansion method."""
         pass
 
+    def test_evaluateExpansionMany(self):
+        """Test the evaluateExpansionMany method."""
+        field = BasisVectorFieldDeformation(PairBasisField(),
+                                            QuadraticDeformation())
+        positions = np.random.default_rng(10).uniform(-3.0, 3.0, (5, 3))
+        expansions = field.evaluateExpansionMany(positions)
+        self.assertEqual(expansions.shape, (5, 2, 3))
+        for (position, expansion) in zip(positions, expansions):
+            expected = field.evaluateExpansion(VectorIJK(position))
+            self.assertTrue(np.allclose(expansion, expected))
+
     def test_getNumberOfBasisFunctions(self):
         """Test the getNumberOfBasisFunctions method."""
         pass
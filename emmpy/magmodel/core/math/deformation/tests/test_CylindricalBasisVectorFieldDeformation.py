@@ -1,9 +1,24 @@
 from emmpy.magmodel.core.math.vectorfields.cylindricalbasisvectorfield import CylindricalBasisVectorField
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.deformation.cylindricalbasisfielddeformation import (
     CylindricalBasisFieldDeformation
 )
+from emmpy.magmodel.core.math.deformation.tests.test_CylindricalFieldDeformation import (
+    TwistDeformation
+)
+from emmpy.math.coordinates.cylindricalvector import CylindricalVector
+
+
+class PairCylindricalField(CylindricalBasisVectorField):
+    """The 2 basis vectors (z, rho, cos(phi)) and (1, rho*z, sin(phi))."""
+
+    def evaluateExpansion(self, location):
+        (rho, phi, z) = (location.rho, location.phi, location.z)
+        return [CylindricalVector(z, rho, np.cos(phi)),
+                CylindricalVector(1.0, rho*z, np.sin(phi))]
 
 
 class TestBuilder(unittest.TestCase):
@@ -11,6 +26,18 @@ class TestBuilder(unittest.TestCase):
     def test___init__(self):
         self.assertIsNotNone(CylindricalBasisFieldDeformation(None, None))
 
+    def test_evaluateExpansionMany(self):
+        field = CylindricalBasisFieldDeformation(PairCylindricalField(),
+                                                 TwistDeformation())
+        locations = np.random.default_rng(12).uniform(
+            (0.5, 0.0, -3.0), (5.0, 2*np.pi, 3.0), (5, 3))
+        expansions = field.evaluateExpansionMany(locations)
+        self.assertEqual(expansions.shape, (5, 2, 3))
+        for (location, expansion) in zip(locations, expansions):
+            expected = field.evaluateExpansion(CylindricalVector(*location))
+            expected = [tuple(v) for v in expected]
+            self.assertTrue(np.allclose(expansion, expected))
+
 
 if __name__ == '__main__':
     unittest.main()
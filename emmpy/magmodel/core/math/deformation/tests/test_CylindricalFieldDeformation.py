@@ -1,8 +1,34 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.deformation.cylindricalfielddeformation import (
     CylindricalFieldDeformation
 )
+from emmpy.magmodel.core.math.vectorfields.differentiablecylindricalvectorfield import (
+    Results
+)
+from emmpy.math.coordinates.cylindricalvector import CylindricalVector
+
+
+class TwistDeformation:
+    """The deformation (rho*(1 + z/10), phi + rho/20 + z/5, z)."""
+
+    def differentiateMany(self, locations):
+        (rho, phi, z) = np.asarray(locations, dtype=float).T
+        deformed = np.stack((rho*(1 + z/10), phi + rho/20 + z/5, z), axis=-1)
+        jacobian = np.zeros((len(rho), 3, 3))
+        jacobian[:, 0, 0] = 1 + z/10
+        jacobian[:, 0, 2] = rho/10
+        jacobian[:, 1, 0] = 0.05
+        jacobian[:, 1, 1] = 1.0
+        jacobian[:, 1, 2] = 0.2
+        jacobian[:, 2, 2] = 1.0
+        return (deformed, jacobian)
+
+    def differentiate(self, location):
+        (deformed, jacobian) = self.differentiateMany([tuple(location)])
+        return Results(CylindricalVector(*deformed[0]), *jacobian[0].ravel())
 
 
 class TestBuilder(unittest.TestCase):
@@ -16,6 +42,21 @@ class TestBuilder(unittest.TestCase):
     def test_computeMatrix(self):
         pass
 
+    def test_computeMatrices(self):
+        rng = np.random.default_rng(11)
+        jacobian = rng.uniform(-1.0, 1.0, (4, 3, 3))
+        rho = rng.uniform(0.5, 5.0, 4)
+        rhoDeformed = rng.uniform(0.5, 5.0, 4)
+        trans = CylindricalFieldDeformation.computeMatrices(
+            jacobian, rho, rhoDeformed)
+        self.assertEqual(trans.shape, (4, 3, 3))
+        for i in range(4):
+            expected = CylindricalFieldDeformation.computeMatrix(
+                Results(CylindricalVector(rhoDeformed[i], 0.0, 0.0),
+                        *jacobian[i].ravel()),
+                CylindricalVector(rho[i], 0.0, 0.0))
+            self.assertTrue(np.allclose(trans[i], expected))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,46 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.deformation.sphericalfielddeformation import (
     SphericalFieldDeformation
 )
+from emmpy.magmodel.core.math.vectorfields.differentiablesphericalvectorfield import (
+    Results
+)
+from emmpy.magmodel.core.math.vectorfields.sphericalvectorfield import (
+    SphericalVectorField
+)
+from emmpy.math.coordinates.sphericalvector import SphericalVector
+from emmpy.math.coordinates.vectorijk import VectorIJK
+
+
+class BulgeDeformation:
+    """The deformation (r*(1 + cos(theta)/10), theta + r/50, phi)."""
+
+    def differentiateMany(self, locations):
+        (r, theta, phi) = np.asarray(locations, dtype=float).T
+        deformed = np.stack((r*(1 + np.cos(theta)/10), theta + r/50, phi),
+                            axis=-1)
+        jacobian = np.zeros((len(r), 3, 3))
+        jacobian[:, 0, 0] = 1 + np.cos(theta)/10
+        jacobian[:, 0, 1] = -r*np.sin(theta)/10
+        jacobian[:, 1, 0] = 0.02
+        jacobian[:, 1, 1] = 1.0
+        jacobian[:, 2, 2] = 1.0
+        return (deformed, jacobian)
+
+    def differentiate(self, location):
+        (deformed, jacobian) = self.differentiateMany([tuple(location)])
+        return Results(SphericalVector(*deformed[0]), *jacobian[0].ravel())
+
+
+class WaveField(SphericalVectorField):
+    """The spherical field (cos(theta), r*sin(phi), 1/r)."""
+
+    def evaluate(self, location):
+        (r, theta, phi) = (location.r, location.theta, location.phi)
+        return SphericalVector(np.cos(theta), r*np.sin(phi), 1/r)
 
 
 class TestBuilder(unittest.TestCase):
@@ -13,9 +51,33 @@ class TestBuilder(unittest.TestCase):
     def test_evaluate(self):
         pass
 
+    def test_evaluateMany(self):
+        field = SphericalFieldDeformation(WaveField(), BulgeDeformation())
+        positions = np.random.default_rng(13).uniform(-3.0, 3.0, (5, 3))
+        values = field.evaluateMany(positions)
+        self.assertEqual(values.shape, (5, 3))
+        for (position, value) in zip(positions, values):
+            expected = SphericalVectorField.evaluate(
+                field, VectorIJK(position), VectorIJK())
+            self.assertTrue(np.allclose(value, expected))
+
     def test_computeMatrix(self):
         pass
 
+    def test_computeMatrices(self):
+        rng = np.random.default_rng(14)
+        jacobian = rng.uniform(-1.0, 1.0, (4, 3, 3))
+        locations = rng.uniform((0.5, 0.1, 0.0), (5.0, 3.0, 6.0), (4, 3))
+        deformed = rng.uniform((0.5, 0.1, 0.0), (5.0, 3.0, 6.0), (4, 3))
+        trans = SphericalFieldDeformation.computeMatrices(
+            jacobian, locations, deformed)
+        self.assertEqual(trans.shape, (4, 3, 3))
+        for i in range(4):
+            expected = SphericalFieldDeformation.computeMatrix(
+                Results(SphericalVector(*deformed[i]), *jacobian[i].ravel()),
+                SphericalVector(*locations[i]))
+            self.assertTrue(np.allclose(trans[i], expected))
+
 
 if __name__ == '__main__':
     unittest.main()
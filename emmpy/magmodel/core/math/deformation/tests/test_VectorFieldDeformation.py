@@ -1,8 +1,44 @@
 import unittest
 
+import numpy as np
+
+from emmpy.crucible.core.math.vectorfields.differentiablevectorfield import (
+    Results
+)
 from emmpy.magmodel.core.math.deformation.vectorfielddeformation import (
     VectorFieldDeformation
 )
+from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.vectorfield import VectorField
+
+
+class QuadraticDeformation:
+    """The deformation (x + y**2/10, y + x*z/5, z - x/4)."""
+
+    def differentiateMany(self, positions):
+        (x, y, z) = np.asarray(positions, dtype=float).T
+        deformed = np.stack((x + y*y/10, y + x*z/5, z - x/4), axis=-1)
+        jacobian = np.zeros((len(x), 3, 3))
+        jacobian[:, 0, 0] = 1.0
+        jacobian[:, 0, 1] = y/5
+        jacobian[:, 1, 0] = z/5
+        jacobian[:, 1, 1] = 1.0
+        jacobian[:, 1, 2] = x/5
+        jacobian[:, 2, 0] = -0.25
+        jacobian[:, 2, 2] = 1.0
+        return (deformed, jacobian)
+
+    def differentiate(self, position):
+        (deformed, jacobian) = self.differentiateMany([position])
+        return Results(VectorIJK(deformed[0]), *jacobian[0].ravel())
+
+
+class ProductField(VectorField):
+    """The field (y*z, x, x*y)."""
+
+    def evaluateMany(self, positions):
+        (x, y, z) = np.asarray(positions, dtype=float).T
+        return np.stack((y*z, x, x*y), axis=-1)
 
 
 class TestBuilder(unittest.TestCase):
@@ -15,10 +51,32 @@ class TestBuilder(unittest.TestCase):
         # IMPLEMENT
         pass
 
+    def test_evaluateMany(self):
+        deformation = QuadraticDeformation()
+        field = VectorFieldDeformation(ProductField(), deformation)
+        positions = np.random.default_rng(8).uniform(-3.0, 3.0, (5, 3))
+        values = field.evaluateMany(positions)
+        self.assertEqual(values.shape, (5, 3))
+        for (position, value) in zip(positions, values):
+            deformed = deformation.differentiate(position)
+            trans = VectorFieldDeformation.computeMatrix(deformed)
+            b = ProductField().evaluateMany([deformed.f])[0]
+            self.assertTrue(np.allclose(value, trans.dot(b)))
+
     def test_computeMatrix(self):
         # IMPLEMENT
         pass
 
+    def test_computeMatrices(self):
+        jacobian = np.random.default_rng(9).uniform(-1.0, 1.0, (4, 3, 3))
+        trans = VectorFieldDeformation.computeMatrices(jacobian)
+        self.assertEqual(trans.shape, (4, 3, 3))
+        for (t, j) in zip(trans, jacobian):
+            expected = VectorFieldDeformation.computeMatrix(
+                Results(None, *j.ravel()))
+            self.assertTrue(np.allclose(t, expected))
+            self.assertTrue(np.allclose(t.dot(j), np.linalg.det(j)*np.eye(3)))
+
 
 if __name__ == '__main__':
     unittest.main()
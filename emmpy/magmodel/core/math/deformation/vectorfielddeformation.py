@@ -9,6 +9,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.math.coordinates.vectorijk import VectorIJK
 from emmpy.math.matrices.matrixijk import MatrixIJK
 from emmpy.math.vectorfields.vectorfield import VectorField
@@ -67,6 +69,30 @@ class VectorFieldDeformation(VectorField):
         # Return the updated buffer.
         return buffer.setTo(v.i, v.j, v.k)
 
+    def evaluateMany(self, positions):
+        """Evaluate the deformed field at an array of locations.
+
+        Evaluate the deformed field at an array of locations. The
+        deformation derivatives and matrices are computed for all of the
+        locations at once, and the original field is evaluated at all of
+        the deformed locations with a single call to evaluateMany().
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate field before deformation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Deformed vector field value at each location.
+        """
+        (deformed, jacobian) = self.coordDeformation.differentiateMany(
+            positions)
+        trans = self.computeMatrices(jacobian)
+        bField = self.originalField.evaluateMany(deformed)
+        return np.einsum("nij,nj->ni", trans, bField)
+
     @staticmethod
     def computeMatrix(deformed):
         """Compute the deformation matrix from the field derivatives.
@@ -105,3 +131,29 @@ class VectorFieldDeformation(VectorField):
                            [tyx, tyy, tyz],
                            [tzx, tzy, tzz]])
         return trans
+
+    @staticmethod
+    def computeMatrices(jacobian):
+        """Compute the deformation matrices from stacked Jacobians.
+
+        Compute the deformation matrix of computeMatrix() for each of an
+        array of deformation Jacobians. The matrix is the adjugate of the
+        Jacobian, so its columns are the cross products of the rows of the
+        Jacobian.
+
+        Parameters
+        ----------
+        jacobian : array-like of float, shape (N, 3, 3)
+            Jacobian of the deformation at each location, indexed as
+            [n, i, j] for the derivative of deformed component i with
+            respect to original component j.
+
+        Returns
+        -------
+        trans : np.ndarray of float, shape (N, 3, 3)
+            The deformation matrix at each location.
+        """
+        jacobian = np.asarray(jacobian, dtype=float)
+        (a, b, c) = np.moveaxis(jacobian, -2, 0)
+        return np.stack((np.cross(b, c), np.cross(c, a), np.cross(a, b)),
+                        axis=-1)
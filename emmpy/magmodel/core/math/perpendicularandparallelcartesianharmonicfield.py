@@ -10,6 +10,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.crucible.core.math.vectorspace.rotationmatrixijk import (
     RotationMatrixIJK
 )
@@ -237,3 +239,65 @@ class PerpendicularAndParallelCartesianHarmonicField(BasisVectorField):
         for f in parFields:
             expansions.append(f)
         return expansions
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations. Each rotated field
+        applies its rotation to the whole array as a matrix product.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Cartesian locations for evaluation.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, 3)
+            Field evaluated at the locations.
+        """
+        return (self.perpendicularField.evaluateMany(positions) +
+                self.parallelField.evaluateMany(positions))
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the expansion at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Cartesian locations for evaluation.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            The perpendicular basis vectors, followed by the parallel
+            basis vectors, at each location.
+        """
+        return np.concatenate(
+            (self.perpendicularField.evaluateExpansionMany(positions),
+             self.parallelField.evaluateExpansionMany(positions)), axis=1)
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at an array of locations.
+
+        Evaluate the field and its Jacobian at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Cartesian locations for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Field evaluated at the locations.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            dB_i/dx_j at the locations, indexed by [n, i, j].
+        """
+        (perpValues, perpJacobian) = (
+            self.perpendicularField.differentiateMany(positions))
+        (parValues, parJacobian) = (
+            self.parallelField.differentiateMany(positions))
+        return (perpValues + parValues, perpJacobian + parJacobian)
@@ -1,8 +1,12 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.alternatecartesianharmonicfield import (
     AlternateCartesianHarmonicField
 )
+from emmpy.magmodel.core.math.trigparity import EVEN, ODD
+from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
 class TestBuilder(unittest.TestCase):
@@ -34,6 +38,24 @@ class TestBuilder(unittest.TestCase):
     def test_getNumberOfBasisFunctions(self):
         pass
 
+    def test_evaluateExpansionMany(self):
+        rng = np.random.default_rng(10)
+        aik = rng.normal(size=(2, 3))
+        positions = rng.uniform(-2.0, 1.0, (4, 3))
+        for parityI in (ODD, EVEN):
+            for parityK in (ODD, EVEN):
+                field = AlternateCartesianHarmonicField(
+                    [0.5, 1.2], [0.3, 0.8, 1.1], aik, parityI, parityK)
+                expansions = field.evaluateExpansionMany(positions)
+                self.assertEqual(expansions.shape, (4, 6, 3))
+                expected = [
+                    np.array(field.evaluateExpansion(VectorIJK(p)))
+                    for p in positions
+                ]
+                self.assertTrue(np.allclose(expansions, expected))
+                self.assertTrue(np.allclose(field.evaluateMany(positions),
+                                            np.sum(expected, axis=1)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import unittest
+
+import numpy as np
+from scipy.special import jv
+
+from emmpy.magmodel.core.math.besselfunctioncache import (
+    BesselFunctionCache, besselTable
+)
+
+
+class TestBuilder(unittest.TestCase):
+
+    def test_besselTable(self):
+        x = np.concatenate([[0.0, 1e-6], np.linspace(0.01, 40.0, 500)])
+        for numOrders in (1, 2, 5, 15):
+            table = besselTable(x, numOrders)
+            self.assertEqual(table.shape, (len(x), numOrders))
+            expected = jv(np.arange(numOrders), x[:, np.newaxis])
+            self.assertTrue(np.allclose(table, expected, rtol=0, atol=1e-13))
+
+    def test___init__(self):
+        cache = BesselFunctionCache(100)
+        self.assertEqual(cache.tables.maxSize, 100)
+        self.assertEqual(cache.tables.size, 0)
+
+    def test___getstate__(self):
+        cache = BesselFunctionCache(100)
+        cache.evaluate(np.array([0.5, 1.5]), np.array([0.1, 0.2]), 3)
+        copy = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(copy.tables.maxSize, 100)
+        self.assertEqual(copy.tables.size, 0)
+        self.assertEqual(len(copy.tables), 0)
+        self.assertEqual(len(cache.tables), 1)
+        # The copy has its own lock.
+        self.assertIsNot(copy.tables.lock, cache.tables.lock)
+        copy.evaluate(np.array([0.5]), np.array([0.1]), 3)
+        self.assertEqual(len(copy.tables), 1)
+
+    def test_evaluate(self):
+        cache = BesselFunctionCache()
+        rho = np.array([0.0, 1.5, 7.0])
+        waveNumbers = np.array([[0.1, 0.2], [0.2, 0.3]])
+        table = cache.evaluate(rho, waveNumbers, 4)
+        self.assertEqual(table.shape, (3, 2, 2, 4))
+        expected = jv(
+            np.arange(4),
+            (rho[:, np.newaxis, np.newaxis]*waveNumbers)[..., np.newaxis]
+        )
+        self.assertTrue(np.allclose(table, expected))
+        # The same radii and wave numbers return the cached table.
+        self.assertIs(cache.evaluate(rho.copy(), waveNumbers, 4), table)
+        # Different radii compute a new table.
+        self.assertIsNot(cache.evaluate(rho + 1, waveNumbers, 4), table)
+
+    def test_evaluateThreads(self):
+        # Many threads sharing a small cache keep it consistent.
+        cache = BesselFunctionCache(200)
+        rng = np.random.default_rng(1)
+        radii = [rng.uniform(0.0, 10.0, 7) for i in range(8)]
+        waveNumbers = np.array([0.1, 0.2, 0.3])
+
+        def evaluate(i):
+            rho = radii[i % len(radii)]
+            table = cache.evaluate(rho, waveNumbers, 5)
+            x = np.outer(rho, waveNumbers)[..., np.newaxis]
+            return np.allclose(table, jv(np.arange(5), x))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertTrue(all(executor.map(evaluate, range(200))))
+        self.assertLessEqual(cache.tables.size, 200)
+        self.assertEqual(cache.tables.size,
+                         sum(t.size for (_, t) in cache.tables.values()))
+
+    def test_clear(self):
+        cache = BesselFunctionCache(20)
+        rho = np.array([1.0, 2.0])
+        cache.evaluate(rho, np.array([0.1, 0.2]), 3)
+        cache.evaluate(rho, np.array([0.3, 0.4]), 3)
+        # Only the most recent table fits.
+        self.assertEqual(len(cache.tables), 1)
+        self.assertEqual(cache.tables.size, 12)
+        cache.clear()
+        self.assertEqual(len(cache.tables), 0)
+        self.assertEqual(cache.tables.size, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,34 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.cartesianharmonicfield import (
     CartesianHarmonicField
 )
+from emmpy.magmodel.core.math.trigparity import EVEN, ODD
+from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.differentiation import differentiateMany
+
+
+def createFields():
+    """Create a field for each combination of trig parities."""
+    rng = np.random.default_rng(7)
+    aik = rng.normal(size=(2, 3))
+    return [
+        CartesianHarmonicField([0.5, 1.2], [0.3, 0.8, 1.1], aik,
+                               parityI, parityK)
+        for parityI in (ODD, EVEN) for parityK in (ODD, EVEN)
+    ]
 
 
 class TestBuilder(unittest.TestCase):
 
     def test___init__(self):
-        pass
+        field = createFields()[0]
+        self.assertEqual(field.sqrtP.shape, (2, 3))
+        self.assertAlmostEqual(field.sqrtP[1, 2], np.hypot(1.2, 1.1))
+        self.assertTrue(np.array_equal(field.waveVectors[1, 2],
+                                       (field.sqrtP[1, 2], 1.2, 1.1)))
 
     def test_evaluate(self):
         pass
@@ -16,6 +36,37 @@ class TestBuilder(unittest.TestCase):
     def test_evaluateExpansion2D(self):
         pass
 
+    def test_evaluateExpansionMany(self):
+        positions = np.array([[-1.0, 0.5, 2.0], [0.5, -2.0, 1.0]])
+        for field in createFields():
+            expansions = field.evaluateExpansionMany(positions)
+            self.assertEqual(expansions.shape, (2, 6, 3))
+            self.assertTrue(np.allclose(expansions.sum(axis=1),
+                                        field.evaluateMany(positions)))
+
+    def test_evaluateMany(self):
+        rng = np.random.default_rng(8)
+        positions = rng.uniform(-2.0, 1.0, (5, 3))
+        for field in createFields():
+            expected = [field.evaluate(VectorIJK(p), VectorIJK())
+                        for p in positions]
+            self.assertTrue(np.allclose(field.evaluateMany(positions),
+                                        expected, rtol=0, atol=1e-14))
+
+    def test_differentiateMany(self):
+        rng = np.random.default_rng(9)
+        positions = rng.uniform(-2.0, 1.0, (5, 3))
+        for field in createFields():
+            (values, jacobian) = field.differentiateMany(positions)
+            self.assertTrue(np.allclose(values, field.evaluateMany(positions)))
+            self.assertTrue(np.allclose(
+                jacobian, differentiateMany(field, positions, 1e-4, 4)))
+            # The field is the gradient of a harmonic potential.
+            self.assertTrue(np.allclose(jacobian,
+                                        np.swapaxes(jacobian, 1, 2)))
+            self.assertTrue(np.allclose(np.trace(jacobian, axis1=1, axis2=2),
+                                        0.0))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,16 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.cylindricalharmonicfield import (
-    CylindricalHarmonicField
+    CylindricalHarmonicField, differentiateStacked, evaluateCombined,
+    evaluateStacked, evaluateStackedGrid
+)
+from emmpy.magmodel.core.math.trigparity import EVEN, ODD
+from emmpy.math.coordinates.cartesianvector import CartesianVector
+from emmpy.math.vectorfields.differentiation import evaluateWithDifferences
+from emmpy.math.vectorfields.gridevaluation import (
+    CartesianGrid, CylindricalGrid
 )
 
 
@@ -28,6 +37,102 @@ class TestBuilder(unittest.TestCase):
     def test_evaluateExpansion(self):
         pass
 
+    def test_evaluateMany(self):
+        rng = np.random.default_rng(3)
+        coefficients = rng.normal(size=(6, 3))
+        waveNumbers = rng.uniform(0.05, 0.5, 3)
+        positions = rng.uniform(-10.0, 10.0, (5, 3))
+        for trigParity in (ODD, EVEN):
+            chf = CylindricalHarmonicField(
+                coefficients, waveNumbers, trigParity)
+            values = chf.evaluateMany(positions)
+            self.assertEqual(values.shape, (5, 3))
+            for (position, value) in zip(positions, values):
+                b = chf.evaluate(CartesianVector(position))
+                self.assertTrue(np.allclose(value, b))
+
+    def test_differentiateMany(self):
+        rng = np.random.default_rng(4)
+        coefficients = rng.normal(size=(6, 3))
+        waveNumbers = rng.uniform(0.05, 0.5, 3)
+        positions = rng.uniform(-10.0, 10.0, (5, 3))
+        for trigParity in (ODD, EVEN):
+            chf = CylindricalHarmonicField(
+                coefficients, waveNumbers, trigParity)
+            (values, jacobian) = chf.differentiateMany(positions)
+            self.assertTrue(np.allclose(values, chf.evaluateMany(positions)))
+            (_, expected) = evaluateWithDifferences(chf, positions, 1e-4, 4)
+            self.assertTrue(np.allclose(jacobian, expected))
+
+    def test_differentiateStacked(self):
+        rng = np.random.default_rng(6)
+        coefficients = rng.normal(size=(4, 6, 3))
+        waveNumbers = rng.uniform(0.05, 0.5, (4, 3))
+        isEven = np.array([False, True, True, False])
+        positions = rng.uniform(-10.0, 10.0, (5, 3))
+        (values, jacobian) = differentiateStacked(
+            positions, coefficients, waveNumbers, isEven)
+        self.assertEqual(jacobian.shape, (5, 4, 3, 3))
+        self.assertTrue(np.allclose(values, evaluateStacked(
+            positions, coefficients, waveNumbers, isEven)))
+        for s in range(4):
+            chf = CylindricalHarmonicField(
+                coefficients[s], waveNumbers[s], EVEN if isEven[s] else ODD)
+            (_, expected) = chf.differentiateMany(positions)
+            self.assertTrue(np.allclose(jacobian[:, s], expected))
+        (values, combined) = differentiateStacked(
+            positions, coefficients, waveNumbers, isEven, combine=True)
+        self.assertEqual(combined.shape, (5, 3, 3))
+        self.assertTrue(np.allclose(combined, jacobian.sum(axis=1)))
+
+    def test_evaluateCombined(self):
+        rng = np.random.default_rng(5)
+        coefficients = rng.normal(size=(4, 6, 3))
+        waveNumbers = rng.uniform(0.05, 0.5, (4, 3))
+        isEven = np.array([False, False, True, True])
+        positions = rng.uniform(-10.0, 10.0, (5, 3))
+        values = evaluateCombined(
+            positions, coefficients, waveNumbers, isEven)
+        self.assertEqual(values.shape, (5, 3))
+        stacked = evaluateStacked(
+            positions, coefficients, waveNumbers, isEven)
+        self.assertTrue(np.allclose(values, stacked.sum(axis=1)))
+
+    def test_evaluateGrid(self):
+        rng = np.random.default_rng(7)
+        coefficients = rng.normal(size=(6, 3))
+        waveNumbers = rng.uniform(0.05, 0.5, 3)
+        grid = CartesianGrid([-8.0, -3.0, 2.5], [-4.0, 1.0], [-2.0, 0.5, 3.0])
+        for trigParity in (ODD, EVEN):
+            chf = CylindricalHarmonicField(
+                coefficients, waveNumbers, trigParity)
+            values = chf.evaluateGrid(grid)
+            self.assertEqual(values.shape, (3, 2, 3, 3))
+            self.assertTrue(np.allclose(
+                values.reshape((-1, 3)), chf.evaluateMany(grid.positions())))
+
+    def test_evaluateStackedGrid(self):
+        rng = np.random.default_rng(9)
+        coefficients = rng.normal(size=(4, 6, 3))
+        waveNumbers = rng.uniform(0.05, 0.5, (4, 3))
+        isEven = np.array([False, True, False, True])
+        for grid in (
+            CartesianGrid([-8.0, -3.0, 2.5], [-4.0, 1.0], [-2.0, 0.5, 3.0]),
+            CylindricalGrid([1.0, 5.0, 9.0], [0.2, 2.0, 4.0, 6.0], [-1.0, 2.0])
+        ):
+            positions = grid.positions()
+            values = evaluateStackedGrid(
+                grid, coefficients, waveNumbers, isEven)
+            self.assertEqual(values.shape, grid.shape + (4, 3))
+            stacked = evaluateStacked(
+                positions, coefficients, waveNumbers, isEven)
+            self.assertTrue(np.allclose(values.reshape((-1, 4, 3)), stacked))
+            values = evaluateStackedGrid(
+                grid, coefficients, waveNumbers, isEven, combine=True)
+            self.assertEqual(values.shape, grid.shape + (3,))
+            self.assertTrue(np.allclose(values.reshape((-1, 3)),
+                                        stacked.sum(axis=1)))
+
     def test_getNumberOfBasisFunctions(self):
         pass
 
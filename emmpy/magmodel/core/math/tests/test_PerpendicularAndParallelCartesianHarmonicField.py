@@ -1,8 +1,28 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.perpendicularandparallelcartesianharmonicfield import (
     PerpendicularAndParallelCartesianHarmonicField
 )
+from emmpy.magmodel.core.math.trigparity import EVEN, ODD
+from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.differentiation import differentiateMany
+
+
+def createFields():
+    """Create a field with and without the alternate perpendicular field."""
+    rng = np.random.default_rng(11)
+    perpCoeffs = rng.normal(size=(2, 3))
+    parCoeffs = rng.normal(size=(3, 2))
+    args = (0.3, [0.5, 1.2], [0.3, 0.8, 1.1], perpCoeffs,
+            -0.2, [0.4, 0.9, 1.3], [0.6, 1.0], parCoeffs)
+    return [
+        PerpendicularAndParallelCartesianHarmonicField.createWithRotation(
+            ODD, *args),
+        PerpendicularAndParallelCartesianHarmonicField.
+        createWithRotationAndAlternate(EVEN, *args)
+    ]
 
 
 class TestBuilder(unittest.TestCase):
@@ -28,6 +48,35 @@ class TestBuilder(unittest.TestCase):
     def test_getNumberOfBasisFunctions(self):
         pass
 
+    def test_evaluateMany(self):
+        rng = np.random.default_rng(12)
+        positions = rng.uniform(-2.0, 1.0, (5, 3))
+        for field in createFields():
+            expected = [field.evaluate(VectorIJK(p), VectorIJK())
+                        for p in positions]
+            self.assertTrue(np.allclose(field.evaluateMany(positions),
+                                        expected, rtol=0, atol=1e-13))
+
+    def test_evaluateExpansionMany(self):
+        positions = np.array([[-1.0, 0.5, 2.0], [0.5, -2.0, 1.0]])
+        (field, alternate) = createFields()
+        self.assertEqual(alternate.evaluateExpansionMany(positions).shape,
+                         (2, 12, 3))
+        expansions = field.evaluateExpansionMany(positions)
+        self.assertEqual(expansions.shape, (2, 12, 3))
+        self.assertTrue(np.allclose(expansions.sum(axis=1),
+                                    field.evaluateMany(positions)))
+
+    def test_differentiateMany(self):
+        rng = np.random.default_rng(13)
+        positions = rng.uniform(-2.0, 1.0, (5, 3))
+        for field in createFields():
+            (values, jacobian) = field.differentiateMany(positions)
+            self.assertTrue(np.allclose(values, field.evaluateMany(positions)))
+            self.assertTrue(np.allclose(
+                jacobian, differentiateMany(field, positions, 1e-4, 4),
+                atol=1e-7))
+
     def test_getPerpendicularField(self):
         pass
 
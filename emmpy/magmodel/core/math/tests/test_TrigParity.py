@@ -1,6 +1,7 @@
 """Tests for the trigparity module."""
 
 
+import pickle
 import unittest
 
 from emmpy.magmodel.core.math.trigparity import EVEN, ODD
@@ -18,6 +19,10 @@ def df_dx(x):
 class TestBuilder(unittest.TestCase):
     """Tests for the trigparity module."""
 
+    def test_pickle(self):
+        self.assertIs(pickle.loads(pickle.dumps(EVEN)), EVEN)
+        self.assertIs(pickle.loads(pickle.dumps(ODD)), ODD)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -17,8 +17,42 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+class TrigParity:
+    """A trigonometric parity.
+
+    Each parity is a single named instance, so parities may be compared
+    with "is". Pickling a parity stores only its name, so an unpickled
+    parity is the same instance as the original.
+
+    Attributes
+    ----------
+    name : str
+        Name of the parity in this module.
+    """
+
+    def __init__(self, name):
+        """Initialize a new TrigParity object.
+
+        Initialize a new TrigParity object.
+
+        Parameters
+        ----------
+        name : str
+            Name of the parity in this module.
+        """
+        self.name = name
+
+    def __reduce__(self):
+        """Pickle the parity by name."""
+        return self.name
+
+    def __repr__(self):
+        """Return the name of the parity."""
+        return self.name
+
+
 # The even trigonometric parity, the cosine function.
-EVEN = object()
+EVEN = TrigParity("EVEN")
 
 # The odd trigonometric parity, the sine function.
-ODD = object()
+ODD = TrigParity("ODD")
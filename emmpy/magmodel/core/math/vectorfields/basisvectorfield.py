@@ -9,7 +9,12 @@ G.K. Stephens
 Eric Winter (eric.winter@jhuapl.edu)
 """
 
+import numpy as np
+
 from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.differentiation import (
+    evaluateExpansionWithDifferences
+)
 from emmpy.math.vectorfields.vectorfield import VectorField
 
 
@@ -59,3 +64,55 @@ class BasisVectorField(VectorField):
             fz += basisVector.k
         buffer[:] = [fx, fy, fz]
         return buffer
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the basis vectors of the expansion at each of the
+        specified locations. This default implementation simply calls
+        evaluateExpansion() once per location. Subclasses which can work
+        on whole arrays at once should override this method.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            Basis vectors at each location, where nb is the number of
+            basis functions.
+        """
+        positions = np.asarray(positions, dtype=float)
+        expansions = [
+            np.array(self.evaluateExpansion(VectorIJK(position)), dtype=float)
+            for position in positions
+        ]
+        if len(expansions) == 0:
+            return np.empty((0, 0, 3))
+        return np.stack(expansions)
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the expansion and its Jacobians at an array of locations.
+
+        Evaluate the basis vectors of the expansion, and the Jacobian of
+        each basis function, at each of the specified locations. This
+        default implementation uses central differences, with a single
+        call to evaluateExpansionMany(). Subclasses which can compute
+        their derivatives analytically should override this method.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            Basis vectors at each location.
+        jacobians : np.ndarray of float, shape (N, nb, 3, 3)
+            Jacobian of each basis function at each location, indexed by
+            [n, b, i, j].
+        """
+        return evaluateExpansionWithDifferences(self, positions)
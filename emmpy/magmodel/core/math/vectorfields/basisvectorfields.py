@@ -9,12 +9,846 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.magmodel.core.math.vectorfields.basisvectorfield import (
     BasisVectorField
 )
 from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
+class VectorFieldBasisView(BasisVectorField):
+    """A BasisVectorField view of a vector field.
+
+    The view has a single basis function, the vector field itself.
+
+    Attributes
+    ----------
+    field : VectorField
+        The vector field to view as a basis vector field.
+    """
+
+    def __init__(self, field):
+        """Initialize a new VectorFieldBasisView object.
+
+        Initialize a new VectorFieldBasisView object.
+
+        Parameters
+        ----------
+        field : VectorField
+            The vector field to view as a basis vector field.
+        """
+        self.field = field
+
+    def evaluateExpansion(self, location):
+        """Evaluate the expansion at a location.
+
+        Evaluate the expansion at a location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the expansion.
+
+        Returns
+        -------
+        result : list of VectorIJK
+            The field value at location, as the only basis vector.
+        """
+        return [self.field.evaluate(location)]
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, 3)
+            The field evaluated at each location.
+        """
+        return self.field.evaluateMany(positions)
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the expansion at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, 1, 3)
+            The expansion evaluated at each location.
+        """
+        return self.field.evaluateMany(positions)[:, np.newaxis, :]
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at an array of locations.
+
+        Evaluate the field and its Jacobian at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The field evaluated at each location.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the field at each location.
+        """
+        return self.field.differentiateMany(positions)
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the expansion and its Jacobians at an array of locations.
+
+        Evaluate the expansion and its Jacobians at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, 1, 3)
+            The expansion evaluated at each location.
+        jacobians : np.ndarray of float, shape (N, 1, 3, 3)
+            Jacobian of the basis function at each location.
+        """
+        (values, jacobian) = self.field.differentiateMany(positions)
+        return (values[:, np.newaxis], jacobian[:, np.newaxis])
+
+    def getNumberOfBasisFunctions(self):
+        """Return the number of basis functions.
+
+        Return the number of basis functions.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : int
+            The number of basis functions, always 1.
+        """
+        return 1
+
+
+class ScaledLocationBasisVectorField(BasisVectorField):
+    """A basis vector field evaluated at scaled locations.
+
+    The value of this field at a location is the value of the original
+    field at scaleFactor times the location.
+
+    Attributes
+    ----------
+    field : BasisVectorField
+        Basis vector field to use for scaled inputs.
+    scaleFactor : float
+        Scale factor for input vectors.
+    """
+
+    def __init__(self, field, scaleFactor):
+        """Initialize a new ScaledLocationBasisVectorField object.
+
+        Initialize a new ScaledLocationBasisVectorField object.
+
+        Parameters
+        ----------
+        field : BasisVectorField
+            Basis vector field to use for scaled inputs.
+        scaleFactor : float
+            Scale factor for input vectors.
+        """
+        self.field = field
+        self.scaleFactor = scaleFactor
+
+    def evaluate(self, location, buffer=None):
+        """Evaluate the field at a scaled location.
+
+        Evaluate the field at a scaled location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the field, before scaling.
+        buffer : VectorIJK, optional
+            Buffer to hold the result.
+
+        Returns
+        -------
+        buffer : VectorIJK
+            The field evaluated at the scaled location.
+        """
+        if buffer is None:
+            buffer = VectorIJK()
+        return self.field.evaluate(self.scaleFactor*VectorIJK(location),
+                                   buffer)
+
+    def evaluateExpansion(self, location):
+        """Evaluate the expansion at a scaled location.
+
+        Evaluate the expansion at a scaled location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the expansion, before scaling.
+
+        Returns
+        -------
+        result : list of VectorIJK
+            The expansion evaluated at the scaled location.
+        """
+        return self.field.evaluateExpansion(
+            self.scaleFactor*VectorIJK(location))
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of scaled locations.
+
+        Evaluate the field at an array of scaled locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field, before scaling.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, 3)
+            The field evaluated at each scaled location.
+        """
+        return self.field.evaluateMany(
+            self.scaleFactor*np.asarray(positions, dtype=float))
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of scaled locations.
+
+        Evaluate the expansion at an array of scaled locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion, before scaling.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, nb, 3)
+            The expansion evaluated at each scaled location.
+        """
+        return self.field.evaluateExpansionMany(
+            self.scaleFactor*np.asarray(positions, dtype=float))
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at scaled locations.
+
+        Evaluate the field and its Jacobian at an array of scaled
+        locations. The Jacobian is with respect to the unscaled locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field, before scaling.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The field evaluated at each scaled location.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the field at each location.
+        """
+        (values, jacobian) = self.field.differentiateMany(
+            self.scaleFactor*np.asarray(positions, dtype=float))
+        return (values, self.scaleFactor*jacobian)
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the expansion and its Jacobians at scaled locations.
+
+        Evaluate the expansion and its Jacobians at an array of scaled
+        locations. The Jacobians are with respect to the unscaled
+        locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion, before scaling.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            The expansion evaluated at each scaled location.
+        jacobians : np.ndarray of float, shape (N, nb, 3, 3)
+            Jacobian of each basis function at each location.
+        """
+        (values, jacobians) = self.field.differentiateExpansionMany(
+            self.scaleFactor*np.asarray(positions, dtype=float))
+        return (values, self.scaleFactor*jacobians)
+
+    def getNumberOfBasisFunctions(self):
+        """Return the number of basis functions.
+
+        Return the number of basis functions.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : int
+            The number of basis functions of the original field.
+        """
+        return self.field.getNumberOfBasisFunctions()
+
+
+class ConcatenatedBasisVectorField(BasisVectorField):
+    """A concatenation of basis vector fields.
+
+    The expansion of this field is the concatenation of the expansions of
+    the individual fields.
+
+    Attributes
+    ----------
+    fields : list of BasisVectorField
+        Basis vector fields to concatenate.
+    """
+
+    def __init__(self, fields):
+        """Initialize a new ConcatenatedBasisVectorField object.
+
+        Initialize a new ConcatenatedBasisVectorField object.
+
+        Parameters
+        ----------
+        fields : list of BasisVectorField
+            Basis vector fields to concatenate.
+        """
+        self.fields = list(fields)
+
+    def evaluateExpansion(self, location):
+        """Evaluate the expansion at a location.
+
+        Evaluate the expansion at a location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the expansion.
+
+        Returns
+        -------
+        result : list of VectorIJK
+            The concatenated expansions evaluated at location.
+        """
+        result = []
+        for field in self.fields:
+            e = field.evaluateExpansion(location)
+            result.extend(e)
+        return result
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, 3)
+            The field evaluated at each location.
+        """
+        return self.evaluateExpansionMany(positions).sum(axis=1)
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the expansion at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, nb, 3)
+            The concatenated expansions evaluated at each location.
+        """
+        return np.concatenate(
+            [field.evaluateExpansionMany(positions) for field in self.fields],
+            axis=1
+        )
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at an array of locations.
+
+        Evaluate the field and its Jacobian at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The field evaluated at each location.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the field at each location.
+        """
+        (expansions, jacobians) = self.differentiateExpansionMany(positions)
+        return (expansions.sum(axis=1), jacobians.sum(axis=1))
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the expansion and its Jacobians at an array of locations.
+
+        Evaluate the expansion and its Jacobians at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            The concatenated expansions evaluated at each location.
+        jacobians : np.ndarray of float, shape (N, nb, 3, 3)
+            Jacobian of each basis function at each location.
+        """
+        (values, jacobians) = zip(
+            *[field.differentiateExpansionMany(positions)
+              for field in self.fields])
+        return (np.concatenate(values, axis=1),
+                np.concatenate(jacobians, axis=1))
+
+    def getNumberOfBasisFunctions(self):
+        """Return the number of basis functions.
+
+        Return the number of basis functions.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : int
+            The total number of basis functions of the fields.
+        """
+        return sum([field.getNumberOfBasisFunctions()
+                    for field in self.fields])
+
+
+class ExpandedCoefficientsBasisVectorField(BasisVectorField):
+    """A basis vector field expanded with sets of coefficients.
+
+    The expansion of this field is the expansion of the original field
+    scaled by each set of coefficients in turn.
+
+    Attributes
+    ----------
+    field : BasisVectorField
+        Basis vector field to expand.
+    coeffs, moreCoeffs : CoefficientExpansion1D
+        1st and 2nd sets of expansion coefficients.
+    allCoeffs : np.ndarray of float
+        All of the coefficient sets, concatenated. The sets may have
+        different lengths.
+    coeffOffsets : np.ndarray of int, shape (1 + len(moreCoeffs),)
+        Index of the start of each coefficient set in allCoeffs.
+    coeffLengths : np.ndarray of int, shape (1 + len(moreCoeffs),)
+        Length of each coefficient set.
+    """
+
+    def __init__(self, field, coeffs, moreCoeffs):
+        """Initialize a new ExpandedCoefficientsBasisVectorField object.
+
+        Initialize a new ExpandedCoefficientsBasisVectorField object.
+
+        Parameters
+        ----------
+        field : BasisVectorField
+            Basis vector field to expand.
+        coeffs, moreCoeffs : CoefficientExpansion1D
+            1st and 2nd sets of expansion coefficients.
+        """
+        self.field = field
+        self.coeffs = coeffs
+        self.moreCoeffs = moreCoeffs
+        # Concatenate all of the coefficient sets for use with arrays of
+        # basis vectors. Only the first nb coefficients of each set are
+        # used, so the sets need not have the same length.
+        sets = [np.asarray(c, dtype=float).ravel()
+                for c in [coeffs] + list(moreCoeffs)]
+        self.allCoeffs = np.concatenate(sets)
+        self.coeffLengths = np.array([len(c) for c in sets])
+        self.coeffOffsets = np.cumsum(self.coeffLengths) - self.coeffLengths
+
+    def evaluateExpansion(self, location):
+        """Evaluate the expansion at a location.
+
+        Evaluate the expansion at a location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the expansion.
+
+        Returns
+        -------
+        scaledExpansions : list of VectorIJK
+            The expansion scaled by each set of coefficients.
+        """
+        expansions = self.field.evaluateExpansion(location)
+        scaledExpansions = []
+        expansionIndex = 0
+        for expansion in expansions:
+            scaledExpansions.append(expansion*self.coeffs[expansionIndex])
+            expansionIndex += 1
+        for c in self.moreCoeffs:
+            expansionIndex = 0
+            for expansion in expansions:
+                scaledExpansions.append(expansion*c[expansionIndex])
+                expansionIndex += 1
+        return scaledExpansions
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, 3)
+            The field evaluated at each location.
+        """
+        return self.evaluateExpansionMany(positions).sum(axis=1)
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Evaluate the expansion at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, nb*(1 + len(moreCoeffs)), 3)
+            The expansion scaled by each set of coefficients.
+        """
+        expansions = self.field.evaluateExpansionMany(positions)
+        coeffs = self.getCoefficientTable(expansions.shape[1])
+        scaledExpansions = (
+            expansions[:, np.newaxis, :, :] *
+            coeffs[np.newaxis, :, :, np.newaxis]
+        )
+        return scaledExpansions.reshape((len(expansions), -1, 3))
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at an array of locations.
+
+        Evaluate the field and its Jacobian at an array of locations. Each
+        basis function of the original field appears once for each set of
+        coefficients, so its value and Jacobian are weighted by the sum of
+        its coefficients.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The field evaluated at each location.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the field at each location.
+        """
+        (expansions, jacobians) = self.field.differentiateExpansionMany(
+            positions)
+        weights = self.getCoefficientTable(expansions.shape[1]).sum(axis=0)
+        return (np.einsum("b,nbi->ni", weights, expansions),
+                np.einsum("b,nbij->nij", weights, jacobians))
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the expansion and its Jacobians at an array of locations.
+
+        Evaluate the expansion and its Jacobians at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape
+            (N, nb*(1 + len(moreCoeffs)), 3)
+            The expansion scaled by each set of coefficients.
+        jacobians : np.ndarray of float, shape
+            (N, nb*(1 + len(moreCoeffs)), 3, 3)
+            Jacobian of each scaled basis function at each location.
+        """
+        (expansions, jacobians) = self.field.differentiateExpansionMany(
+            positions)
+        (n, nb) = expansions.shape[:2]
+        coeffs = self.getCoefficientTable(nb)[np.newaxis, :, :, np.newaxis]
+        scaledExpansions = expansions[:, np.newaxis]*coeffs
+        scaledJacobians = (
+            jacobians[:, np.newaxis]*coeffs[..., np.newaxis]
+        )
+        return (scaledExpansions.reshape((n, -1, 3)),
+                scaledJacobians.reshape((n, -1, 3, 3)))
+
+    def getCoefficientTable(self, nb):
+        """Return the first nb coefficients of each set.
+
+        Return the first nb coefficients of each set, as the rows of a
+        table.
+
+        Parameters
+        ----------
+        nb : int
+            Number of basis functions in the original field.
+
+        Returns
+        -------
+        table : np.ndarray of float, shape (1 + len(moreCoeffs), nb)
+            The first nb coefficients of each set.
+
+        Raises
+        ------
+        ValueError
+            If any coefficient set has fewer than nb coefficients.
+        """
+        if np.any(self.coeffLengths < nb):
+            raise ValueError("Coefficient sets must have at least %d values,"
+                             " got %s" % (nb, self.coeffLengths.tolist()))
+        return self.allCoeffs[self.coeffOffsets[:, np.newaxis] +
+                              np.arange(nb)]
+
+    def getNumberOfBasisFunctions(self):
+        """Return the number of basis functions.
+
+        Return the number of basis functions.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : int
+            The number of basis functions.
+        """
+        return (
+            self.field.getNumberOfBasisFunctions()*(1 + len(self.moreCoeffs))
+        )
+
+
+class RotatedBasisVectorField(BasisVectorField):
+    """A rotated basis vector field.
+
+    Locations are rotated into the frame of the original field, and the
+    values are rotated back.
+
+    Attributes
+    ----------
+    field : BasisVectorField
+        Basis vector field to rotate.
+    matrix : MatrixIJK
+        Rotation matrix to apply to field.
+    m : np.ndarray of float, shape (3, 3)
+        The rotation matrix, as a plain array.
+    """
+
+    def __init__(self, field, matrix):
+        """Initialize a new RotatedBasisVectorField object.
+
+        Initialize a new RotatedBasisVectorField object.
+
+        Parameters
+        ----------
+        field : BasisVectorField
+            Basis vector field to rotate.
+        matrix : MatrixIJK
+            Rotation matrix to apply to field.
+        """
+        self.field = field
+        self.matrix = matrix
+        self.m = np.array(matrix)
+
+    def evaluate(self, location, buffer=None):
+        """Evaluate the rotated field at a location.
+
+        Evaluate the rotated field at a location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the field.
+        buffer : VectorIJK, optional
+            Buffer to hold the result.
+
+        Returns
+        -------
+        buffer : VectorIJK
+            The rotated field evaluated at location.
+        """
+        if buffer is None:
+            buffer = VectorIJK()
+        rotated = VectorIJK()
+        rotated[:] = self.matrix.dot(location)
+        self.field.evaluate(rotated, buffer)
+        buffer[:] = self.matrix.T.dot(buffer)
+        return buffer
+
+    def evaluateExpansion(self, location):
+        """Evaluate the rotated expansion at a location.
+
+        Evaluate the rotated expansion at a location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location to evaluate the expansion.
+
+        Returns
+        -------
+        rotatedExpansions : list of VectorIJK
+            The rotated expansion evaluated at location.
+        """
+        rotated = VectorIJK(self.matrix.dot(location))
+        expansions = self.field.evaluateExpansion(rotated)
+        rotatedExpansions = []
+        for expansion in expansions:
+            rotatedExpansions.append(VectorIJK(self.matrix.T.dot(expansion)))
+        return rotatedExpansions
+
+    def evaluateMany(self, positions):
+        """Evaluate the rotated field at an array of locations.
+
+        Evaluate the rotated field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, 3)
+            The rotated field evaluated at each location.
+        """
+        # For rows of vectors, M.v is v.M^T, and M^T.v is v.M.
+        return self.field.evaluateMany(
+            np.asarray(positions, dtype=float).dot(self.m.T)).dot(self.m)
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the rotated expansion at an array of locations.
+
+        Evaluate the rotated expansion at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (N, nb, 3)
+            The rotated expansion evaluated at each location.
+        """
+        return self.field.evaluateExpansionMany(
+            np.asarray(positions, dtype=float).dot(self.m.T)).dot(self.m)
+
+    def differentiateMany(self, positions):
+        """Evaluate the rotated field and its Jacobian.
+
+        Evaluate the rotated field and its Jacobian at an array of
+        locations. The Jacobian J of the original field becomes M^T.J.M.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The rotated field evaluated at each location.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the rotated field at each location.
+        """
+        (values, jacobian) = self.field.differentiateMany(
+            np.asarray(positions, dtype=float).dot(self.m.T))
+        return (values.dot(self.m), self.m.T @ jacobian @ self.m)
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the rotated expansion and its Jacobians.
+
+        Evaluate the rotated expansion and its Jacobians at an array of
+        locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            The rotated expansion evaluated at each location.
+        jacobians : np.ndarray of float, shape (N, nb, 3, 3)
+            Jacobian of each rotated basis function at each location.
+        """
+        (values, jacobians) = self.field.differentiateExpansionMany(
+            np.asarray(positions, dtype=float).dot(self.m.T))
+        return (values.dot(self.m), self.m.T @ jacobians @ self.m)
+
+    def getNumberOfBasisFunctions(self):
+        """Return the number of basis functions.
+
+        Return the number of basis functions.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : int
+            The number of basis functions of the original field.
+        """
+        return self.field.getNumberOfBasisFunctions()
+
+
 class BasisVectorFields:
     """Utility functions for basis vector fields.
 
@@ -38,13 +872,7 @@ class BasisVectorFields:
         bvf : BasisVectorField
             Basis vector field version of input.
         """
-        bvf = BasisVectorField()
-
-        def my_evaluateExpansion(location):
-            return [field.evaluate(location)]
-        bvf.evaluateExpansion = my_evaluateExpansion
-        bvf.getNumberOfBasisFunctions = lambda: 1
-        return bvf
+        return VectorFieldBasisView(field)
 
     @staticmethod
     def scaleLocation(field, scaleFactor):
@@ -64,19 +892,7 @@ class BasisVectorFields:
         bvf : BasisVectorField
             A wrapped basis vector field that scales input.
         """
-        bvf = BasisVectorField()
-        bvf.evaluate = (
-            lambda location, buffer:
-            field.evaluate(scaleFactor*VectorIJK(location), buffer)
-        )
-        bvf.evaluateExpansion = (
-            lambda location:
-            field.evaluateExpansion(scaleFactor*VectorIJK(location))
-        )
-        bvf.getNumberOfBasisFunctions = (
-            lambda: field.getNumberOfBasisFunctions()
-        )
-        return bvf
+        return ScaledLocationBasisVectorField(field, scaleFactor)
 
     @staticmethod
     def concatAll(fields):
@@ -96,21 +912,7 @@ class BasisVectorFields:
         bvf : BasisVectorField
             A wrapper which concatenates the supplied basis vector fields.
         """
-        bvf = BasisVectorField()
-
-        def my_evaluateExpansion(location):
-            result = []
-            for field in fields:
-                e = field.evaluateExpansion(location)
-                result.extend(e)
-            return result
-        bvf.evaluateExpansion = my_evaluateExpansion
-        bvf.getNumberOfBasisFunctions = (
-            lambda my_self: sum([field.getNumberOfBasisFunctions()
-                                 for field in fields])
-        )
-
-        return bvf
+        return ConcatenatedBasisVectorField(fields)
 
     @staticmethod
     def expandCoefficients2(field, coeffs, moreCoeffs):
@@ -132,28 +934,7 @@ class BasisVectorFields:
         bvf : BasisVectorField
             Expanded coefficients.
         """
-        bvf = BasisVectorField()
-        bvf.getNumberOfBasisFunctions = (
-            lambda my_self:
-            field.getNumberOfBasisFunctions()*(1 + len(moreCoeffs))
-        )
-
-        def my_evaluateExpansion(location):
-            expansions = field.evaluateExpansion(location)
-            scaledExpansions = []
-            expansionIndex = 0
-            for expansion in expansions:
-                scaledExpansions.append(expansion*coeffs[expansionIndex])
-                expansionIndex += 1
-            for c in moreCoeffs:
-                expansionIndex = 0
-                for expansion in expansions:
-                    scaledExpansions.append(expansion*c[expansionIndex])
-                    expansionIndex += 1
-            return scaledExpansions
-        bvf.evaluateExpansion = my_evaluateExpansion
-
-        return bvf
+        return ExpandedCoefficientsBasisVectorField(field, coeffs, moreCoeffs)
 
     @staticmethod
     def rotate(field, matrix):
@@ -173,33 +954,4 @@ class BasisVectorFields:
         bvf : BasisVectorField
             The rotated field.
         """
-        bvf = BasisVectorField()
-
-        def my_evaluate(*myargs):
-            if len(myargs) == 1:
-                (location,) = myargs
-                buffer = VectorIJK()
-            elif len(myargs) == 2:
-                (location, buffer) = myargs
-            else:
-                raise Exception
-            rotated = VectorIJK()
-            rotated[:] = matrix.dot(location)
-            field.evaluate(rotated, buffer)
-            buffer[:] = matrix.T.dot(buffer)
-            return buffer
-        bvf.evaluate = my_evaluate
-        bvf.getNumberOfBasisFunctions = (
-            lambda: field.getNumberOfBasisFunctions()
-        )
-
-        def my_evaluateExpansion(location):
-            rotated = matrix.mxv(location)
-            expansions = field.evaluateExpansion(rotated)
-            rotatedExpansions = []
-            for expansion in expansions:
-                rotatedExpansions.append(matrix.mtxv(expansion))
-            return rotatedExpansions
-        bvf.evaluateExpansion = my_evaluateExpansion
-
-        return bvf
+        return RotatedBasisVectorField(field, matrix)
@@ -12,7 +12,10 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.exceptions.abstractmethodexception import AbstractMethodException
+from emmpy.math.coordinates.cylindricalvector import CylindricalVector
 
 
 class CylindricalBasisVectorField:
@@ -21,3 +24,33 @@ class CylindricalBasisVectorField:
     Represents a VectorField in cylindrical coordinates and provides the
     conversion from a CylindricalVector field to a Cartesian vector field.
     """
+
+    def evaluateExpansionMany(self, locations):
+        """Evaluate the expansion at an array of cylindrical locations.
+
+        Evaluate the basis vectors of the expansion at each of the
+        specified cylindrical locations. This default implementation
+        simply calls evaluateExpansion() once per location. Subclasses
+        which can work on whole arrays at once should override this
+        method.
+
+        Parameters
+        ----------
+        locations : array-like of float, shape (N, 3)
+            Cylindrical (rho, phi, z) locations to evaluate the expansion.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (N, nb, 3)
+            Cylindrical (rho, phi, z) basis vectors at each location,
+            where nb is the number of basis functions.
+        """
+        locations = np.asarray(locations, dtype=float)
+        expansions = [
+            [(v.rho, v.phi, v.z) for v in self.evaluateExpansion(
+                CylindricalVector(rho, phi, z))]
+            for (rho, phi, z) in locations
+        ]
+        if len(expansions) == 0:
+            return np.empty((0, 0, 3))
+        return np.array(expansions, dtype=float)
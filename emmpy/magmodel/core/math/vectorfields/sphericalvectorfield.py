@@ -9,8 +9,13 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.math.coordinates.cartesianvector import CartesianVector
-from emmpy.math.coordinates.sphericalvector import cartesianToSpherical
+from emmpy.math.coordinates.sphericalvector import (
+    SphericalVector, cartesianToSpherical, cartesianToSphericalMany,
+    sphericalBasisToCartesianBasisMany
+)
 from emmpy.math.vectorfields.vectorfield import VectorField
 from emmpy.math.vectorfields.sphericalvectorfieldvalue import (
     SphericalVectorFieldValue,
@@ -58,3 +63,30 @@ class SphericalVectorField(VectorField):
         # Return the value.
         buffer[:] = valueSphere
         return buffer
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of Cartesian locations.
+
+        Evaluate the field at an array of Cartesian locations. Subclasses
+        override evaluate() with the spherical form, which is called for
+        each location. The conversions of the locations to spherical
+        coordinates and of the values to the Cartesian basis are done for
+        all locations at once.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Cartesian locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Cartesian field values.
+        """
+        positions = np.asarray(positions, dtype=float)
+        sphericalPositions = cartesianToSphericalMany(positions)
+        values = np.empty(positions.shape)
+        for (i, (r, theta, phi)) in enumerate(sphericalPositions):
+            values[i] = self.evaluate(SphericalVector(r, theta, phi))
+        return sphericalBasisToCartesianBasisMany(
+            sphericalPositions, values, out=values)
@@ -1,8 +1,11 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.vectorfields.basisvectorfield import (
     BasisVectorField
 )
+from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
 class TestBuilder(unittest.TestCase):
@@ -20,6 +23,30 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(Exception):
             BasisVectorField.evaluateExpansion(None, None)
 
+    def test_evaluateExpansionMany(self):
+        bvf = BasisVectorField()
+        bvf.evaluateExpansion = (
+            lambda location: [VectorIJK(location), 2*VectorIJK(location)]
+        )
+        positions = np.array([[1.0, 2.0, 3.0], [-4.0, 0.5, 2.0]])
+        expansions = bvf.evaluateExpansionMany(positions)
+        self.assertEqual(expansions.shape, (2, 2, 3))
+        self.assertTrue(np.allclose(expansions[:, 0], positions))
+        self.assertTrue(np.allclose(expansions[:, 1], 2*positions))
+
+    def test_differentiateExpansionMany(self):
+        bvf = BasisVectorField()
+        bvf.evaluateExpansion = (
+            lambda location: [VectorIJK(location), location*location]
+        )
+        positions = np.array([[1.0, 2.0, 3.0], [-4.0, 0.5, 2.0]])
+        (expansions, jacobians) = bvf.differentiateExpansionMany(positions)
+        self.assertEqual(jacobians.shape, (2, 2, 3, 3))
+        self.assertTrue(np.allclose(expansions[:, 1], positions**2))
+        self.assertTrue(np.allclose(jacobians[:, 0], np.eye(3)))
+        for (position, jacobian) in zip(positions, jacobians[:, 1]):
+            self.assertTrue(np.allclose(jacobian, np.diag(2*position)))
+
     def test_getNumberOfBasisFunctions(self):
         with self.assertRaises(Exception):
             BasisVectorField.getNumberOfBasisFunctions(None)
@@ -1,8 +1,38 @@
 import unittest
 
+import numpy as np
+
+from emmpy.crucible.core.math.vectorspace.rotationmatrixijk import (
+    RotationMatrixIJK
+)
+from emmpy.crucible.core.rotations.axisandangle import AxisAndAngle
+from emmpy.magmodel.core.math.vectorfields.basisvectorfield import (
+    BasisVectorField
+)
 from emmpy.magmodel.core.math.vectorfields.basisvectorfields import (
     BasisVectorFields
 )
+from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.differentiation import (
+    evaluateExpansionWithDifferences
+)
+
+
+# A 2-function basis field: the location, and the location squared.
+bvf1 = BasisVectorField()
+bvf1.evaluateExpansion = (
+    lambda location: [VectorIJK(location), VectorIJK(location*location)]
+)
+bvf1.getNumberOfBasisFunctions = lambda: 2
+
+positions = np.array([[1.0, 2.0, 3.0], [-4.0, 0.5, 2.0], [0.1, -0.2, 7.0]])
+
+
+def evaluateExpansionLoop(field, positions):
+    return np.array([
+        [np.array(e) for e in field.evaluateExpansion(VectorIJK(p))]
+        for p in positions
+    ])
 
 
 class TestBuilder(unittest.TestCase):
@@ -17,7 +47,9 @@ class TestBuilder(unittest.TestCase):
         pass
 
     def test_concatAll(self):
-        pass
+        field = BasisVectorFields.concatAll([bvf1, bvf1])
+        self.assertEqual(field.getNumberOfBasisFunctions(), 4)
+        self.assertEqual(len(field.evaluateExpansion(VectorIJK(1, 2, 3))), 4)
 
     def test_add(self):
         pass
@@ -26,11 +58,65 @@ class TestBuilder(unittest.TestCase):
         pass
 
     def test_expandCoefficients2(self):
-        pass
+        field = BasisVectorFields.expandCoefficients2(
+            bvf1, np.array([2.0, 3.0]), [np.array([-1.0, 0.5])])
+        self.assertEqual(field.getNumberOfBasisFunctions(), 4)
+        # The coefficient sets may have different lengths.
+        field = BasisVectorFields.expandCoefficients2(
+            bvf1, np.array([2.0, 3.0, 4.0]), [np.array([-1.0, 0.5])])
+        expansions = field.evaluateExpansionMany(positions)
+        self.assertEqual(expansions.shape, (3, 4, 3))
+        self.assertTrue(np.allclose(expansions,
+                                    evaluateExpansionLoop(field, positions)))
+        field = BasisVectorFields.expandCoefficients2(
+            bvf1, np.array([2.0, 3.0]), [np.array([-1.0])])
+        with self.assertRaises(ValueError):
+            field.evaluateExpansionMany(positions)
 
     def test_rotate(self):
         pass
 
+    def test_evaluateExpansionMany(self):
+        rotation = AxisAndAngle(VectorIJK(1, 2, 3), 0.3).getRotation(
+            RotationMatrixIJK())
+        fields = [
+            BasisVectorFields.scaleLocation(bvf1, 1.5),
+            BasisVectorFields.concatAll([bvf1, bvf1]),
+            BasisVectorFields.expandCoefficients2(
+                bvf1, np.array([2.0, 3.0]), [np.array([-1.0, 0.5])]),
+            BasisVectorFields.rotate(bvf1, rotation),
+        ]
+        for field in fields:
+            expansions = field.evaluateExpansionMany(positions)
+            expected = evaluateExpansionLoop(field, positions)
+            self.assertEqual(expansions.shape, expected.shape)
+            self.assertTrue(np.allclose(expansions, expected))
+            values = field.evaluateMany(positions)
+            self.assertTrue(np.allclose(values, expected.sum(axis=1)))
+
+    def test_differentiateExpansionMany(self):
+        rotation = AxisAndAngle(VectorIJK(1, 2, 3), 0.3).getRotation(
+            RotationMatrixIJK())
+        fields = [
+            BasisVectorFields.asBasisField(bvf1),
+            BasisVectorFields.scaleLocation(bvf1, 1.5),
+            BasisVectorFields.concatAll([bvf1, bvf1]),
+            BasisVectorFields.expandCoefficients2(
+                bvf1, np.array([2.0, 3.0]), [np.array([-1.0, 0.5])]),
+            BasisVectorFields.rotate(bvf1, rotation),
+        ]
+        for field in fields:
+            (expansions, jacobians) = field.differentiateExpansionMany(
+                positions)
+            (expected, expectedJacobians) = evaluateExpansionWithDifferences(
+                field, positions, order=4)
+            self.assertTrue(np.allclose(expansions, expected))
+            self.assertTrue(np.allclose(jacobians, expectedJacobians))
+            (values, jacobian) = field.differentiateMany(positions)
+            self.assertTrue(np.allclose(values, expected.sum(axis=1)))
+            self.assertTrue(np.allclose(jacobian,
+                                        expectedJacobians.sum(axis=1)))
+
     def test_filter(self):
         pass
 
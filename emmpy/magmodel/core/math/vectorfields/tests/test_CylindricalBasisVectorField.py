@@ -1,8 +1,19 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.math.vectorfields.cylindricalbasisvectorfield import (
     CylindricalBasisVectorField
 )
+from emmpy.math.coordinates.cylindricalvector import CylindricalVector
+
+
+class LocationField(CylindricalBasisVectorField):
+    """The 2 basis vectors (rho, phi, z) and (z, 0, 1)."""
+
+    def evaluateExpansion(self, location):
+        return [CylindricalVector(location.rho, location.phi, location.z),
+                CylindricalVector(location.z, 0.0, 1.0)]
 
 
 class TestBuilder(unittest.TestCase):
@@ -10,6 +21,15 @@ class TestBuilder(unittest.TestCase):
     def test_evaluateExpansion(self):
         pass
 
+    def test_evaluateExpansionMany(self):
+        locations = np.array([[1.0, 0.5, -2.0], [3.0, 4.0, 2.5]])
+        expansions = LocationField().evaluateExpansionMany(locations)
+        self.assertEqual(expansions.shape, (2, 2, 3))
+        self.assertTrue(np.array_equal(expansions[:, 0], locations))
+        self.assertTrue(np.array_equal(expansions[1, 1], (2.5, 0.0, 1.0)))
+        empty = LocationField().evaluateExpansionMany(np.empty((0, 3)))
+        self.assertEqual(empty.shape, (0, 0, 3))
+
 
 if __name__ == '__main__':
     unittest.main()
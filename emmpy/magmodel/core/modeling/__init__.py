@@ -8,3 +8,9 @@ Packages
 equatorial
 fac
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
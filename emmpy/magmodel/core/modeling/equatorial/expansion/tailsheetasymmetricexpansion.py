@@ -11,13 +11,15 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import atan2, cos, exp, sin, sqrt
 
-from scipy.special import jv
-
 from emmpy.magmodel.core.math.trigparity import ODD
 from emmpy.math.coordinates.cartesianvector import CartesianVector
 from emmpy.math.coordinates.vectorij import VectorIJ
 from emmpy.math.coordinates.vectorijk import VectorIJK
 from emmpy.math.vectorfields.vectorfield import VectorField
+from emmpy.utilities.lazyimport import lazyImport
+
+
+sps = lazyImport("scipy.special")
 
 
 class TailSheetAsymmetricExpansion(VectorField):
@@ -120,10 +122,10 @@ class TailSheetAsymmetricExpansion(VectorField):
         ex = exp(-kn*zDist)
 
         # Calculate the bessel function.
-        jK = jv(m, kn*rho)
+        jK = sps.jv(m, kn*rho)
 
         # Calculate the derivative of the bessel function.
-        jKDer = jv(m - 1, kn*rho) - m*jK/(kn*rho)
+        jKDer = sps.jv(m - 1, kn*rho) - m*jK/(kn*rho)
 
         # Eq. 16 and 17 from Tsyganenko and Sitnov 2007.
         bRho = (-(kn*z*jKDer*ex/zDist) *
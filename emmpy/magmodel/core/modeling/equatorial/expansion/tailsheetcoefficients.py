@@ -72,11 +72,18 @@ class TailSheetCoefficients:
         -------
         result : object
             Value of specified attribute.
+
+        Raises
+        ------
+        AttributeError
+            If the attribute is not a computed attribute.
         """
         if name == "numAzimuthalExpansions":
             result = len(self.tailSheetOddValues)
         elif name == "numRadialExpansions":
             result = len(self.tailSheetSymmetricValues)
+        else:
+            raise AttributeError(name)
         return result
 
     @staticmethod
@@ -11,12 +11,14 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import exp, sqrt
 
-import scipy.special as sps
 from emmpy.math.coordinates.cartesianvector import CartesianVector
-
 from emmpy.math.coordinates.vectorij import VectorIJ
 from emmpy.math.coordinates.vectorijk import VectorIJK
 from emmpy.math.vectorfields.vectorfield import VectorField
+from emmpy.utilities.lazyimport import lazyImport
+
+
+sps = lazyImport("scipy.special")
 
 
 class TailSheetSymmetricExpansion(VectorField):
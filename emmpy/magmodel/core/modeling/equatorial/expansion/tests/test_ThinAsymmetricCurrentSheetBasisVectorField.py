@@ -1,5 +1,25 @@
 import unittest
 
+import numpy as np
+
+from emmpy.crucible.crust.vectorfieldsij.differentiablescalarfieldij import (
+    DifferentiableScalarFieldIJ
+)
+from emmpy.magmodel.core.math.besselfunctioncache import BesselFunctionCache
+from emmpy.magmodel.core.modeling.equatorial.expansion.tailsheetcoefficients import (
+    TailSheetCoefficients
+)
+from emmpy.magmodel.core.modeling.equatorial.expansion.thinasymmetriccurrentsheetbasisvectorfield import (
+    ThinAsymmetricCurrentSheetBasisVectorField
+)
+from emmpy.math.coordinates.cartesianvector import CartesianVector
+from emmpy.math.vectorfields.differentiation import (
+    evaluateExpansionWithDifferences, evaluateWithDifferences
+)
+from emmpy.math.vectorfields.gridevaluation import (
+    CartesianGrid, CylindricalGrid
+)
+
 # from emmpy.crucible.core.math.vectorspace.unwritablevectorijk import (
 #     UnwritableVectorIJK
 # )
@@ -41,7 +61,14 @@ class TestBuilder(unittest.TestCase):
         # self.assertIsNone(tacsbvf.bessel)
 
     def test_evaluate(self):
-        pass
+        currentSheetHalfThickness = DifferentiableScalarFieldIJ.createConstant(
+            2.3)
+        coeffs = TailSheetCoefficients.createUnity(4, 5)
+        model = ThinAsymmetricCurrentSheetBasisVectorField(
+            20.0, currentSheetHalfThickness, coeffs)
+        b = model.evaluate(CartesianVector(4.0, 5.0, -2.0))
+        b_ref = (-0.47654433563669696, 2.0705600362600864, 1.5889255378262552)
+        self.assertTrue(np.allclose(b, b_ref))
         # tailLength = 20.0
         # currSheetThick = 2.3
         # currentSheetHalfThickness = (
@@ -62,6 +89,87 @@ class TestBuilder(unittest.TestCase):
     def test_evaluateExpansions(self):
         pass
 
+    def test_evaluateExpansionMany(self):
+        (M, N) = (3, 4)
+        rng = np.random.default_rng(11)
+        coeffs = TailSheetCoefficients.createFromArray(
+            rng.normal(size=N + 2*M*N), M, N)
+        currentSheetHalfThickness = DifferentiableScalarFieldIJ.createConstant(
+            2.3)
+        model = ThinAsymmetricCurrentSheetBasisVectorField(
+            20.0, currentSheetHalfThickness, coeffs)
+        positions = rng.uniform(-15.0, 15.0, (6, 3))
+        expansions = model.evaluateExpansionMany(positions)
+        self.assertEqual(expansions.shape, (6, N + 2*M*N, 3))
+        for (position, expansion) in zip(positions, expansions):
+            # Compare with the per-basis-function expansion objects.
+            expected = model.evaluateExpansions(
+                CartesianVector(position)).getExpansionsAsList()
+            self.assertTrue(np.allclose(expansion, np.array(expected)))
+        values = model.evaluateMany(positions)
+        self.assertTrue(np.allclose(values, expansions.sum(axis=1)))
+
+    def test_evaluateGrid(self):
+        (M, N) = (3, 4)
+        rng = np.random.default_rng(12)
+        coeffs = TailSheetCoefficients.createFromArray(
+            rng.normal(size=N + 2*M*N), M, N)
+        currentSheetHalfThickness = DifferentiableScalarFieldIJ.createConstant(
+            2.3)
+        for besselCache in (None, BesselFunctionCache()):
+            model = ThinAsymmetricCurrentSheetBasisVectorField(
+                20.0, currentSheetHalfThickness, coeffs, besselCache)
+            for grid in (
+                CartesianGrid([-12.0, -5.0, 3.0], [-6.0, 2.0], [-1.0, 0.5]),
+                CylindricalGrid([2.0, 8.0], [0.5, 2.5, 4.0], [-3.0, 0.0, 1.0])
+            ):
+                values = model.evaluateGrid(grid)
+                self.assertEqual(values.shape, grid.shape + (3,))
+                expected = model.evaluateMany(grid.positions())
+                self.assertTrue(
+                    np.allclose(values.reshape((-1, 3)), expected))
+
+    def test_differentiateMany(self):
+        (M, N) = (3, 4)
+        rng = np.random.default_rng(13)
+        coeffs = TailSheetCoefficients.createFromArray(
+            rng.normal(size=N + 2*M*N), M, N)
+        positions = rng.uniform(-15.0, 15.0, (6, 3))
+        for besselCache in (None, BesselFunctionCache()):
+            model = ThinAsymmetricCurrentSheetBasisVectorField(
+                20.0, DifferentiableScalarFieldIJ.createConstant(2.3), coeffs,
+                besselCache)
+            (values, jacobian) = model.differentiateMany(positions)
+            self.assertTrue(np.allclose(values, model.evaluateMany(positions)))
+            (_, expected) = evaluateWithDifferences(model, positions, 1e-4, 4)
+            self.assertTrue(np.allclose(jacobian, expected, atol=1e-8))
+
+        # A varying thickness falls back to finite differences.
+        thickness = DifferentiableScalarFieldIJ(
+            lambda p: 2.0 + 0.01*p.i, lambda p: 0.01, lambda p: 0.0)
+        model = ThinAsymmetricCurrentSheetBasisVectorField(
+            20.0, thickness, coeffs)
+        (values, jacobian) = model.differentiateMany(positions)
+        (_, expected) = evaluateWithDifferences(model, positions)
+        self.assertTrue(np.allclose(values, model.evaluateMany(positions)))
+        self.assertTrue(np.allclose(jacobian, expected))
+
+    def test_differentiateExpansionMany(self):
+        (M, N) = (2, 3)
+        rng = np.random.default_rng(14)
+        coeffs = TailSheetCoefficients.createFromArray(
+            rng.normal(size=N + 2*M*N), M, N)
+        model = ThinAsymmetricCurrentSheetBasisVectorField(
+            20.0, DifferentiableScalarFieldIJ.createConstant(1.5), coeffs)
+        positions = rng.uniform(-15.0, 15.0, (5, 3))
+        (expansions, jacobians) = model.differentiateExpansionMany(positions)
+        self.assertEqual(jacobians.shape, (5, N + 2*M*N, 3, 3))
+        self.assertTrue(np.allclose(expansions,
+                                    model.evaluateExpansionMany(positions)))
+        (_, expected) = evaluateExpansionWithDifferences(
+            model, positions, 1e-4, 4)
+        self.assertTrue(np.allclose(jacobians, expected, atol=1e-8))
+
     def test_getNumAzimuthalExpansions(self):
         pass
 
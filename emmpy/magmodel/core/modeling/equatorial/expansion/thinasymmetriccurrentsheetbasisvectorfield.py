@@ -11,7 +11,11 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 import numpy as np
 
-
+from emmpy.crucible.crust.vectorfieldsij.differentiablescalarfieldij import (
+    ConstantScalarFieldIJ
+)
+from emmpy.magmodel.core.chebysheviteration import ChebyshevIteration
+from emmpy.magmodel.core.math.besselfunctioncache import besselTable
 from emmpy.magmodel.core.math.expansions.arrayexpansion1d import ArrayExpansion1D
 from emmpy.magmodel.core.math.expansions.arrayexpansion2d import ArrayExpansion2D
 from emmpy.magmodel.core.math.trigparity import EVEN, ODD
@@ -32,6 +36,10 @@ from emmpy.magmodel.core.modeling.equatorial.expansion.tailsheetsymmetricexpansi
 )
 from emmpy.math.coordinates.cartesianvector import CartesianVector
 from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.differentiation import (
+    cylindricalToCartesianJacobian, evaluateWithDifferences
+)
+from emmpy.math.vectorfields.gridevaluation import evaluateGridInRows
 from emmpy.utilities.nones import nones
 
 
@@ -59,9 +67,12 @@ class ThinAsymmetricCurrentSheetBasisVectorField(BasisVectorField):
         Number of azimuthal expansions.
     numRadialExpansions : int
         Number of radial expansions.
+    besselCache : BesselFunctionCache
+        Cache for the Bessel function tables, or None.
     """
 
-    def __init__(self, tailLength, currentSheetHalfThickness, coeffs):
+    def __init__(self, tailLength, currentSheetHalfThickness, coeffs,
+                 besselCache=None):
         """Initialize a new ThinAsymmetricCurrentSheetBasisVectorField object.
 
         Initialize a new ThinAsymmetricCurrentSheetBasisVectorField object.
@@ -74,17 +85,20 @@ class ThinAsymmetricCurrentSheetBasisVectorField(BasisVectorField):
             currentSheetHalfThickness
         coeffs : DifferentiableScalarFieldIJ
             Coefficients for expansion.
+        besselCache : BesselFunctionCache, optional
+            Cache for the Bessel function tables.
         """
         self.coeffs = coeffs
         self.numAzimuthalExpansions = coeffs.numAzimuthalExpansions
         self.numRadialExpansions = coeffs.numRadialExpansions
         self.tailLength = tailLength
         self.currentSheetHalfThickness = currentSheetHalfThickness
+        self.besselCache = besselCache
 
     @staticmethod
     def createUnity(
         tailLength, currentSheetHalfThickness, numAzimuthalExpansions,
-        numRadialExpansions
+        numRadialExpansions, besselCache=None
     ):
         """Create a field where all coefficients are unity.
 
@@ -101,6 +115,8 @@ class ThinAsymmetricCurrentSheetBasisVectorField(BasisVectorField):
             Number of azimuthal expansions.
         numRadialExpansions : int
             Number of radial expansions.
+        besselCache : BesselFunctionCache, optional
+            Cache for the Bessel function tables.
         
         Returns
         -------
@@ -111,7 +127,7 @@ class ThinAsymmetricCurrentSheetBasisVectorField(BasisVectorField):
             numAzimuthalExpansions, numRadialExpansions
         )
         return ThinAsymmetricCurrentSheetBasisVectorField(
-            tailLength, currentSheetHalfThickness, coeffs)
+            tailLength, currentSheetHalfThickness, coeffs, besselCache)
 
     def evaluate(self, location):
         """Evaluate the field.
@@ -129,7 +145,7 @@ class ThinAsymmetricCurrentSheetBasisVectorField(BasisVectorField):
             Vector result of evaluation at location.
         """
         buffer = VectorIJK()
-        buffer[:] = self.evaluateExpansions(location).sum()
+        buffer[:] = self.evaluateExpansionArray(location).sum(axis=0)
         return buffer
 
     def evaluateExpansion(self, location):
@@ -147,7 +163,348 @@ class ThinAsymmetricCurrentSheetBasisVectorField(BasisVectorField):
         result : list of VectorIJK
             Components of expansion at location.
         """
-        return self.evaluateExpansions(location).getExpansionsAsList()
+        return [VectorIJK(v) for v in self.evaluateExpansionArray(location)]
+
+    def evaluateExpansionArray(self, location):
+        """Evaluate the expansion as a single array.
+
+        Evaluate the expansion as a single array.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Cartesian location for evaluation.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (2*M*N + N, 3)
+            Components of expansion at location, in the same order as
+            returned by evaluateExpansion().
+        """
+        positions = np.asarray(location, dtype=float).reshape((1, 3))
+        return self.evaluateExpansionMany(positions)[0]
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Cartesian locations for evaluation.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (P, 3)
+            Field values at the locations.
+        """
+        return self.evaluateExpansionMany(positions).sum(axis=1)
+
+    def evaluateExpansionMany(self, positions):
+        """Evaluate the expansion at an array of locations.
+
+        Compute all of the symmetric, odd, and even basis vectors for all
+        locations in a single pass. The Bessel functions are computed once
+        for each order needed, over all locations and wave numbers.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Cartesian locations for evaluation.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape (P, 2*M*N + N, 3)
+            Components of expansion at each location, in the same order as
+            returned by evaluateExpansion().
+        """
+        positions = np.asarray(positions, dtype=float)
+        x = positions[:, 0]
+        y = positions[:, 1]
+        rho = np.sqrt(x*x + y*y)
+        phi = np.arctan2(y, x)
+        return self._evaluateColumns(x, y, rho, phi, positions[:, 2])
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at an array of locations.
+
+        Evaluate the field and its Jacobian at an array of locations. The
+        Jacobian is computed analytically for a current sheet of constant
+        thickness, and with central differences otherwise.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Cartesian locations for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (P, 3)
+            Field values at the locations.
+        jacobian : np.ndarray of float, shape (P, 3, 3)
+            dB_i/dx_j at the locations, indexed by [p, i, j].
+        """
+        if not isinstance(self.currentSheetHalfThickness,
+                          ConstantScalarFieldIJ):
+            return evaluateWithDifferences(self, positions)
+        return self._differentiate(positions, combine=True)
+
+    def differentiateExpansionMany(self, positions):
+        """Evaluate the expansion and its Jacobians at an array of locations.
+
+        Evaluate the expansion and its Jacobians at an array of locations.
+        The Jacobians are computed analytically for a current sheet of
+        constant thickness, and with central differences otherwise.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (P, 3)
+            Cartesian locations for evaluation.
+
+        Returns
+        -------
+        expansions : np.ndarray of float, shape (P, 2*M*N + N, 3)
+            Components of expansion at each location, in the same order as
+            returned by evaluateExpansion().
+        jacobians : np.ndarray of float, shape (P, 2*M*N + N, 3, 3)
+            Jacobian of each component at each location.
+        """
+        if not isinstance(self.currentSheetHalfThickness,
+                          ConstantScalarFieldIJ):
+            return BasisVectorField.differentiateExpansionMany(
+                self, positions)
+        return self._differentiate(positions, combine=False)
+
+    def evaluateGrid(self, grid):
+        """Evaluate the field on a regular grid.
+
+        Evaluate the field on a regular grid. The Bessel functions, the
+        trig functions and the current sheet thickness are computed once
+        per column of the grid, rather than once per grid point.
+
+        Parameters
+        ----------
+        grid : CartesianGrid or CylindricalGrid
+            Grid of locations for evaluation.
+
+        Returns
+        -------
+        result : np.ndarray of float, shape grid.shape + (3,)
+            Field values at the grid points.
+        """
+        def evaluateRows(rows):
+            (x, y, rho, phi) = rows.columns()
+            return self._evaluateColumns(x, y, rho, phi, rows.z).sum(axis=-2)
+
+        termsPerRow = (
+            grid.shape[1]*grid.shape[2]*self.getNumberOfBasisFunctions()*3
+        )
+        return evaluateGridInRows(evaluateRows, grid, termsPerRow)
+
+    def _evaluateColumns(self, x, y, rho, phi, z):
+        """Evaluate the expansion on columns of locations.
+
+        The column coordinates x, y, rho and phi have a common broadcast
+        shape C, and z broadcasts against C to a shape Q. The result has
+        shape Q + (2*M*N + N, 3). For scattered locations, C and Q are both
+        (P,). For a grid, C is (A, B, 1) and z has shape (Z,).
+        """
+        M = self.numAzimuthalExpansions
+        N = self.numRadialExpansions
+
+        # Get the current sheet half thickness and its derivatives, once
+        # per column.
+        (xColumns, yColumns) = np.broadcast_arrays(x, y)
+        positionsIJ = np.stack(
+            (xColumns.ravel(), yColumns.ravel()), axis=-1)
+        thick = self.currentSheetHalfThickness.evaluateMany(
+            positionsIJ).reshape(xColumns.shape)
+        dThickdx = self.currentSheetHalfThickness.differentiateFDiMany(
+            positionsIJ).reshape(xColumns.shape)
+        dThickdy = self.currentSheetHalfThickness.differentiateFDjMany(
+            positionsIJ).reshape(xColumns.shape)
+
+        # Convert to polar.
+        dThickdRho = (x*dThickdx + y*dThickdy)/rho
+        dThickdPhi = -y*dThickdx + x*dThickdy
+        cosPhi = x/rho
+        sinPhi = y/rho
+
+        # Introduce a finite thickness in z by replacing z with this value.
+        zDist = np.sqrt(z*z + thick*thick)
+
+        # Arrays indexed by [..., n].
+        kn = np.arange(1, N + 1)/self.tailLength
+        knRho = rho[..., np.newaxis]*kn
+        ex = np.exp(-zDist[..., np.newaxis]*kn)
+
+        # Bessel functions of orders 0..M, indexed by [..., n, order].
+        if self.besselCache is None:
+            jTable = besselTable(knRho, M + 1)
+        else:
+            jTable = self.besselCache.evaluate(rho.ravel(), kn, M + 1).reshape(
+                knRho.shape + (M + 1,))
+
+        # Eq. 15 from Tsyganenko and Sitnov 2007 (symmetric).
+        c = z/zDist
+        j0 = jTable[..., 0]
+        j1 = jTable[..., 1]
+        bxy = kn*c[..., np.newaxis]*j1*ex
+        bSym = np.empty(bxy.shape + (3,))
+        bSym[..., 0] = bxy*cosPhi[..., np.newaxis]
+        bSym[..., 1] = bxy*sinPhi[..., np.newaxis]
+        bSym[..., 2] = kn*ex*(
+            j0 - (thick*dThickdRho/zDist)[..., np.newaxis]*j1
+        )
+        bSym *= np.asarray(
+            self.coeffs.tailSheetSymmetricValues, dtype=float
+        )[:, np.newaxis]
+
+        # Eq. 16 and 17 from Tsyganenko and Sitnov 2007 (asymmetric).
+        # Arrays are indexed by [..., n, m].
+        m = np.arange(1, M + 1)
+        (sines, cosines) = ChebyshevIteration.evaluateTrigExpansionsMany(
+            phi, M)
+        sinMPhiOdd = sines[..., np.newaxis, 1:]
+        cosMPhiOdd = cosines[..., np.newaxis, 1:]
+        jK = jTable[..., 1:]
+        jKm1 = jTable[..., :-1]
+        knRho3 = knRho[..., np.newaxis]
+        jKDer = jKm1 - m*jK/knRho3
+        kn3 = kn[:, np.newaxis]
+        z3 = z[..., np.newaxis, np.newaxis]
+        zDist3 = zDist[..., np.newaxis, np.newaxis]
+        thick3 = thick[..., np.newaxis, np.newaxis]
+        rho3 = rho[..., np.newaxis, np.newaxis]
+        ex3 = ex[..., np.newaxis]
+        dThickdPhi3 = dThickdPhi[..., np.newaxis, np.newaxis]
+        dThickdRho3 = dThickdRho[..., np.newaxis, np.newaxis]
+        cosPhi3 = cosPhi[..., np.newaxis, np.newaxis]
+        sinPhi3 = sinPhi[..., np.newaxis, np.newaxis]
+        knPlus = kn3 + 1.0/zDist3
+        rhoFactor = -kn3*z3*jKDer*ex3/zDist3
+        phiFactor = kn3*z3*ex3/zDist3
+        phiTerm = (
+            m*jK/knRho3 -
+            rho3*thick3*dThickdRho3*jKDer*knPlus/(m*zDist3)
+        )
+        sinTerm = thick3*dThickdPhi3*knPlus/(m*zDist3)
+        zFactor = kn3*jK*ex3
+        zTerm = kn3*thick3*dThickdPhi3/(m*zDist3)
+        scale = -m/kn3
+        expansions = [bSym]
+        for (sinMPhi, cosMPhi, coeffs) in (
+            (sinMPhiOdd, cosMPhiOdd, self.coeffs.tailSheetOddValues),
+            (cosMPhiOdd, -sinMPhiOdd, self.coeffs.tailSheetEvenValues)
+        ):
+            bRho = rhoFactor*(cosMPhi - sinTerm*sinMPhi)
+            bPhi = phiFactor*sinMPhi*phiTerm
+            bZ = zFactor*(cosMPhi - zTerm*sinMPhi)
+            b = np.empty(bRho.shape + (3,))
+            b[..., 0] = bRho*cosPhi3 - bPhi*sinPhi3
+            b[..., 1] = bRho*sinPhi3 + bPhi*cosPhi3
+            b[..., 2] = bZ
+            b *= (scale*np.asarray(coeffs, dtype=float).T)[..., np.newaxis]
+            expansions.append(b.reshape(bRho.shape[:-2] + (N*M, 3)))
+
+        return np.concatenate(expansions, axis=-2)
+
+    def _differentiate(self, positions, combine):
+        """Differentiate the expansion for a constant sheet thickness.
+
+        The cylindrical components of each basis vector are differentiated
+        with respect to rho, phi and z, and then converted to Cartesian.
+        With a constant thickness D, z enters only through
+        zDist = sqrt(z**2 + D**2), and the second derivatives of the Bessel
+        functions come from Bessel's equation.
+        """
+        positions = np.asarray(positions, dtype=float)
+        M = self.numAzimuthalExpansions
+        N = self.numRadialExpansions
+        (x, y, z) = positions.T
+        rho = np.sqrt(x*x + y*y)
+        phi = np.arctan2(y, x)
+        rhoInv = 1/rho
+        thick = float(self.currentSheetHalfThickness.constant)
+        zDist = np.sqrt(z*z + thick*thick)
+        c = z/zDist
+
+        # Arrays indexed by [p, n], and Bessel functions of orders 0..M
+        # indexed by [p, n, order].
+        kn = np.arange(1, N + 1)/self.tailLength
+        knRho = rho[:, np.newaxis]*kn
+        knRhoInv = 1/knRho
+        ex = np.exp(-zDist[:, np.newaxis]*kn)
+        if self.besselCache is None:
+            jTable = besselTable(knRho, M + 1)
+        else:
+            jTable = self.besselCache.evaluate(rho, kn, M + 1).reshape(
+                knRho.shape + (M + 1,))
+
+        # Symmetric terms, with c = z/zDist and dc/dz = D**2/zDist**3.
+        j0 = jTable[..., 0]
+        j1 = jTable[..., 1]
+        j1Der = j0 - j1*knRhoInv
+        c2 = c[:, np.newaxis]
+        kEx = kn*ex*np.asarray(self.coeffs.tailSheetSymmetricValues,
+                               dtype=float)
+        zero = np.zeros(kEx.shape)
+        terms = [(
+            np.stack((kEx*c2*j1, zero, kEx*j0), axis=-1),
+            np.stack((kn*kEx*c2*j1Der, zero, -kn*kEx*j1), axis=-1),
+            np.zeros(kEx.shape + (3,)),
+            np.stack((kEx*j1*(thick*thick/zDist**3)[:, np.newaxis] -
+                      kn*kEx*c2*c2*j1, zero, -kn*kEx*c2*j0), axis=-1)
+        )]
+
+        # Asymmetric terms, indexed by [p, n, m], with
+        # g = z*exp(-k*zDist)/zDist and, for the odd parity, C = cos(m*phi)
+        # and S = sin(m*phi). Each derivative with respect to phi turns C
+        # into -m*S and S into m*C.
+        m = np.arange(1, M + 1)
+        jK = jTable[..., 1:]
+        xInv = knRhoInv[..., np.newaxis]
+        jKDer = jTable[..., :-1] - m*jK*xInv
+        jKDer2 = -jKDer*xInv - (1 - (m*xInv)**2)*jK
+        k3 = kn[:, np.newaxis]
+        ex3 = ex[..., np.newaxis]
+        c3 = c[:, np.newaxis, np.newaxis]
+        r3 = rhoInv[:, np.newaxis, np.newaxis]
+        zDist3 = zDist[:, np.newaxis, np.newaxis]
+        g = z[:, np.newaxis, np.newaxis]*ex3/zDist3
+        gDer = ex3*((1 - c3*c3)/zDist3 - k3*c3*c3)
+        (sines, cosines) = ChebyshevIteration.evaluateTrigExpansionsMany(
+            phi, M)
+        sinMPhi = sines[:, np.newaxis, 1:]
+        cosMPhi = cosines[:, np.newaxis, 1:]
+        for (sinTerm, cosTerm, coeffs) in (
+            (sinMPhi, cosMPhi, self.coeffs.tailSheetOddValues),
+            (cosMPhi, -sinMPhi, self.coeffs.tailSheetEvenValues)
+        ):
+            w = -m/k3*np.asarray(coeffs, dtype=float).T
+            C = w*cosTerm
+            S = w*sinTerm
+            b = (-k3*jKDer*g*C, m*jK*g*S*r3, k3*jK*ex3*C)
+            dbdRho = (-k3*k3*jKDer2*g*C, m*g*S*(k3*jKDer - jK*r3)*r3,
+                      k3*k3*jKDer*ex3*C)
+            dbdPhi = (m*k3*jKDer*g*S, m*m*jK*g*C*r3, -m*k3*jK*ex3*S)
+            dbdZ = (-k3*jKDer*gDer*C, m*jK*gDer*S*r3, -k3*k3*c3*jK*ex3*C)
+            terms.append([
+                np.stack(d, axis=-1).reshape((len(positions), N*M, 3))
+                for d in (b, dbdRho, dbdPhi, dbdZ)
+            ])
+
+        # Combine the terms, and convert to Cartesian.
+        (b, dbdRho, dbdPhi, dbdZ) = [
+            np.concatenate(d, axis=1) for d in zip(*terms)]
+        if combine:
+            (b, dbdRho, dbdPhi, dbdZ) = (
+                d.sum(axis=1) for d in (b, dbdRho, dbdPhi, dbdZ))
+        else:
+            (phi, rhoInv) = (phi[:, np.newaxis], rhoInv[:, np.newaxis])
+        return cylindricalToCartesianJacobian(phi, rhoInv, b, dbdRho,
+                                              dbdPhi, dbdZ)
 
     def evaluateExpansions(self, location):
         """Recalculate everything.
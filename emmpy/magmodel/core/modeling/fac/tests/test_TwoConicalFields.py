@@ -1,8 +1,14 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.modeling.fac.twoconicalfields import (
     TwoConicalFields
 )
+from emmpy.magmodel.core.modeling.fac.tests.test_XYPlaneReflectedField import (
+    ProductField
+)
+from emmpy.math.coordinates.vectorijk import VectorIJK
 
 
 class TestBuilder(unittest.TestCase):
@@ -13,6 +19,14 @@ class TestBuilder(unittest.TestCase):
     def test_evaluate(self):
         pass
 
+    def test_evaluateMany(self):
+        field = TwoConicalFields(ProductField())
+        positions = np.random.default_rng(20).uniform(-5.0, 5.0, (4, 3))
+        values = field.evaluateMany(positions)
+        for (position, value) in zip(positions, values):
+            expected = field.evaluate(VectorIJK(position), VectorIJK())
+            self.assertTrue(np.allclose(value, expected))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,27 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.modeling.fac.xyplanereflectedfield import (
     XYPlaneReflectedField
 )
+from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.vectorfield import VectorField
+
+
+class ProductField(VectorField):
+    """The field (y*z, x, x*y)."""
+
+    def evaluate(self, location, buffer=None):
+        if buffer is None:
+            buffer = VectorIJK()
+        (x, y, z) = location
+        buffer[:] = (y*z, x, x*y)
+        return buffer
+
+    def evaluateMany(self, positions):
+        (x, y, z) = np.asarray(positions, dtype=float).T
+        return np.stack((y*z, x, x*y), axis=-1)
 
 
 class TestBuilder(unittest.TestCase):
@@ -13,6 +32,14 @@ class TestBuilder(unittest.TestCase):
     def test_evaluate(self):
         pass
 
+    def test_evaluateMany(self):
+        field = XYPlaneReflectedField(ProductField())
+        positions = np.random.default_rng(19).uniform(-5.0, 5.0, (4, 3))
+        values = field.evaluateMany(positions)
+        for (position, value) in zip(positions, values):
+            expected = field.evaluate(VectorIJK(position), VectorIJK())
+            self.assertTrue(np.allclose(value, expected))
+
 
 if __name__ == '__main__':
     unittest.main()
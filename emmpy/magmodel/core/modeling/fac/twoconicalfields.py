@@ -68,3 +68,20 @@ class TwoConicalFields(VectorField):
             Result of evaluation.
         """
         return self.field.evaluate(location, buffer)
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to evaluate the field.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Result of evaluation at each location.
+        """
+        return self.field.evaluateMany(positions)
@@ -9,6 +9,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 """
 
 
+import numpy as np
+
 from emmpy.math.coordinates.vectorijk import VectorIJK
 from emmpy.math.vectorfields.vectorfield import VectorField
 
@@ -62,3 +64,24 @@ class XYPlaneReflectedField(VectorField):
         self.delgate.evaluate(reflectedLocation, buffer)
         buffer.k = -buffer.k
         return buffer
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of locations.
+
+        Evaluate the field at an array of locations.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            Locations to perform the evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Result of field evaluation at each location.
+        """
+        reflectedPositions = np.array(positions, dtype=float)
+        reflectedPositions[:, 2] *= -1
+        values = self.delgate.evaluateMany(reflectedPositions)
+        values[:, 2] *= -1
+        return values
@@ -1,12 +1,49 @@
 import unittest
 
+import numpy as np
+
 from emmpy.magmodel.core.chebysheviteration import ChebyshevIteration
+from emmpy.magmodel.core.math.trigparity import EVEN, ODD
 
 
 class TestBuilder(unittest.TestCase):
 
     def test_evaluateTrigExpansions(self):
-        pass
+        phi = 0.7
+        m = np.arange(6)
+        (sinMphi, cosMphi) = (np.empty(6), np.empty(6))
+        ChebyshevIteration.evaluateTrigExpansions(phi, sinMphi, cosMphi)
+        self.assertTrue(np.allclose(sinMphi, np.sin(m*phi)))
+        self.assertTrue(np.allclose(cosMphi, np.cos(m*phi)))
+        (trigMphi, dTrigMphi) = (np.empty(6), np.empty(6))
+        ChebyshevIteration.evaluateTrigExpansions(phi, trigMphi, dTrigMphi,
+                                                  ODD)
+        self.assertTrue(np.allclose(trigMphi, np.sin(m*phi)))
+        self.assertTrue(np.allclose(dTrigMphi, np.cos(m*phi)))
+        ChebyshevIteration.evaluateTrigExpansions(phi, trigMphi, dTrigMphi,
+                                                  EVEN)
+        self.assertTrue(np.allclose(trigMphi, np.cos(m*phi)))
+        self.assertTrue(np.allclose(dTrigMphi, -np.sin(m*phi)))
+        with self.assertRaises(TypeError):
+            ChebyshevIteration.evaluateTrigExpansions(phi, trigMphi)
+
+    def test_evaluateTrigExpansionsMany(self):
+        phi = np.linspace(-2*np.pi, 2*np.pi, 41)
+        (sinMphi, cosMphi) = ChebyshevIteration.evaluateTrigExpansionsMany(
+            phi, 12)
+        self.assertEqual(sinMphi.shape, (41, 13))
+        self.assertEqual(cosMphi.shape, (41, 13))
+        mPhi = np.outer(phi, np.arange(13))
+        self.assertTrue(np.allclose(sinMphi, np.sin(mPhi), rtol=0,
+                                    atol=1e-13))
+        self.assertTrue(np.allclose(cosMphi, np.cos(mPhi), rtol=0,
+                                    atol=1e-13))
+        (sinMphi, cosMphi) = ChebyshevIteration.evaluateTrigExpansionsMany(
+            0.5, 0)
+        self.assertTrue(np.array_equal(sinMphi, [0.0]))
+        self.assertTrue(np.array_equal(cosMphi, [1.0]))
+        with self.assertRaises(ValueError):
+            ChebyshevIteration.evaluateTrigExpansionsMany(phi, -1)
 
 
 if __name__ == '__main__':
@@ -16,3 +16,9 @@ rotations
 vectorfields
 vectors
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
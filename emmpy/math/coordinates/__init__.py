@@ -3,12 +3,14 @@
 These modules provide a variety of coordinate-system-specific vector
 classes. These classes are built on top of Numpy, and so objects created
 from these classes should be usable wherever a Numpy ndarray object is
-usable.
+usable. The 3-dimensional vector modules also provide vector array
+classes, which hold (N, 3) arrays of vectors with the components
+available as column views.
 
 Modules
 -------
+cartesianvector.py
 cartesianvector2d.py
-cartesianvector3d.py
 cylindricalvector.py
 latitudinalvector.py
 polarvector.py
@@ -21,3 +23,9 @@ Packages
 --------
 tests
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
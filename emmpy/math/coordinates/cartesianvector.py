@@ -7,6 +7,7 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 
 from emmpy.math.vectors.vector3d import Vector3D
+from emmpy.math.vectors.vectorarray import VectorArray
 
 
 # Map vector component names to indices.
@@ -80,3 +81,24 @@ class CartesianVector(Vector3D):
         None
         """
         self[components[name]] = value
+
+
+class CartesianVectorArray(VectorArray):
+    """An array of vectors in Cartesian (x, y, z) coordinates.
+
+    This class implements an array of vectors in Cartesian (x, y, z)
+    coordinates, stored as an (N, 3) array with one vector per row. The
+    components are views of the columns of the array.
+
+    Attributes
+    ----------
+    x : np.ndarray of float, shape (N,)
+        Values of the x-coordinate.
+    y : np.ndarray of float, shape (N,)
+        Values of the y-coordinate.
+    z : np.ndarray of float, shape (N,)
+        Values of the z-coordinate.
+    """
+
+    # Map vector component names to indices.
+    components = components
@@ -102,9 +102,14 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import atan2, cos, pi, sin, sqrt
 
-from emmpy.math.coordinates.cartesianvector import CartesianVector
+import numpy as np
+
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
 from emmpy.math.matrices.matrix3d import Matrix3D
 from emmpy.math.vectors.vector3d import Vector3D
+from emmpy.math.vectors.vectorarray import VectorArray
 
 
 # Map vector component names to indices.
@@ -187,6 +192,27 @@ class CylindricalVector(Vector3D):
         self[components[name]] = value
 
 
+class CylindricalVectorArray(VectorArray):
+    """An array of vectors in cylindrical (rho, phi, z) coordinates.
+
+    This class implements an array of vectors in cylindrical (rho, phi, z)
+    coordinates, stored as an (N, 3) array with one vector per row. The
+    components are views of the columns of the array.
+
+    Attributes
+    ----------
+    rho : np.ndarray of float, shape (N,)
+        Values of the radius coordinate (unspecified units).
+    phi : np.ndarray of float, shape (N,)
+        Values of the azimuthal angle (radians).
+    z : np.ndarray of float, shape (N,)
+        Values of the axial position (unspecified units).
+    """
+
+    # Map vector component names to indices.
+    components = components
+
+
 def cylindricalToCartesian(cylindrical):
     """Convert a cylindrical vector to Cartesian coordinates.
 
@@ -338,3 +364,222 @@ def cartesianBasisToCylindricalBasis(cartesianPosition, cartesianValue):
     m = getCartesianBasisToCylindricalBasisTransformation(cartesianPosition)
     cylindricalValue = CylindricalVector(m.dot(cartesianValue))
     return cylindricalValue
+
+
+def _cartesianTrig(cartesianPosition):
+    """Return rho, sin(phi) and cos(phi) of Cartesian positions.
+
+    The sine and cosine are computed as ratios of the Cartesian
+    components, with phi = 0 on the z-axis.
+    """
+    cartesianPosition = np.asarray(cartesianPosition, dtype=float)
+    (x, y) = (cartesianPosition[..., 0], cartesianPosition[..., 1])
+    rho = np.hypot(x, y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sin_phi = np.where(rho > 0, y/rho, 0.0)
+        cos_phi = np.where(rho > 0, x/rho, 1.0)
+    return (rho, sin_phi, cos_phi)
+
+
+def _azimuth(cartesianPosition):
+    """Return phi in [0, 2*pi) for Cartesian positions."""
+    (x, y) = (cartesianPosition[..., 0], cartesianPosition[..., 1])
+    # Compare with 0 to map -0.0 on the z-axis to 0.
+    phi = np.where((x == 0) & (y == 0), 0.0, np.arctan2(y, x))
+    return np.where(phi < 0, phi + 2*pi, phi)
+
+
+def _rotate(sin_phi, cos_phi, value, sign, cls, out):
+    """Rotate value vectors about the z-axis with precomputed trig.
+
+    A sign of 1 converts cylindrical values to Cartesian, and a sign of
+    -1 converts Cartesian values to cylindrical.
+    """
+    value = np.asarray(value, dtype=float)
+    # Broadcast the per-position terms over any expansion axes.
+    shape = sin_phi.shape + (1,)*(value.ndim - 1 - sin_phi.ndim)
+    sin_phi = sign*sin_phi.reshape(shape)
+    cos_phi = cos_phi.reshape(shape)
+    (v0, v1, v2) = np.moveaxis(value, -1, 0)
+    return cls.fromComponents(cos_phi*v0 - sin_phi*v1,
+                              sin_phi*v0 + cos_phi*v1, v2, out=out)
+
+
+def cylindricalToCartesianMany(cylindrical, out=None):
+    """Convert an array of cylindrical vectors to Cartesian coordinates.
+
+    Convert an array of cylindrical vectors to Cartesian coordinates.
+
+    Parameters
+    ----------
+    cylindrical : array-like of float, shape (N, 3)
+        Cylindrical (rho, phi, z) vectors to convert.
+    out : np.ndarray of float, shape (N, 3), optional
+        Array to hold the result. It may be cylindrical.
+
+    Returns
+    -------
+    cartesian : CartesianVectorArray
+        Input vectors converted to Cartesian coordinates, or out if it
+        was provided.
+    """
+    cylindrical = np.asarray(cylindrical, dtype=float)
+    (rho, phi, z) = np.moveaxis(cylindrical, -1, 0)
+    return CartesianVectorArray.fromComponents(
+        rho*np.cos(phi), rho*np.sin(phi), z, out=out)
+
+
+def cartesianToCylindricalMany(cartesian, out=None):
+    """Convert an array of Cartesian vectors to cylindrical coordinates.
+
+    Convert an array of Cartesian vectors to cylindrical coordinates. As
+    for cartesianToCylindrical(), phi is in the range [0, 2*pi), and is
+    0 on the z-axis.
+
+    Parameters
+    ----------
+    cartesian : array-like of float, shape (N, 3)
+        Cartesian vectors to convert.
+    out : np.ndarray of float, shape (N, 3), optional
+        Array to hold the result. It may be cartesian.
+
+    Returns
+    -------
+    cylindrical : CylindricalVectorArray
+        Input vectors converted to cylindrical coordinates, or out if it
+        was provided.
+    """
+    cartesian = np.asarray(cartesian, dtype=float)
+    rho = np.hypot(cartesian[..., 0], cartesian[..., 1])
+    return CylindricalVectorArray.fromComponents(
+        rho, _azimuth(cartesian), cartesian[..., 2], out=out)
+
+
+def cylindricalBasisToCartesianBasisMany(cylindricalPosition,
+                                         cylindricalValue, out=None):
+    """Convert an array of cylindrical value vectors to a Cartesian basis.
+
+    Convert an array of cylindrical value vectors to a Cartesian basis,
+    at the matching cylindrical positions. The values may have extra axes
+    between the position axis and the component axis, for example to
+    convert all of the basis vectors of an expansion at once.
+
+    Parameters
+    ----------
+    cylindricalPosition : array-like of float, shape (N, 3)
+        Cylindrical positions which define the transformations.
+    cylindricalValue : array-like of float, shape (N, ..., 3)
+        Cylindrical value vectors to convert.
+    out : np.ndarray of float, shape (N, ..., 3), optional
+        Array to hold the result. It may be cylindricalValue.
+
+    Returns
+    -------
+    cartesianValue : CartesianVectorArray or np.ndarray of float
+        Input values converted to the Cartesian basis, or out if it was
+        provided.
+    """
+    phi = np.asarray(cylindricalPosition, dtype=float)[..., 1]
+    return _rotate(np.sin(phi), np.cos(phi), cylindricalValue, 1,
+                   CartesianVectorArray, out)
+
+
+def cartesianBasisToCylindricalBasisMany(cartesianPosition, cartesianValue,
+                                         out=None):
+    """Convert an array of Cartesian value vectors to a cylindrical basis.
+
+    Convert an array of Cartesian value vectors to a cylindrical basis,
+    at the matching Cartesian positions. The values may have extra axes
+    between the position axis and the component axis.
+
+    Parameters
+    ----------
+    cartesianPosition : array-like of float, shape (N, 3)
+        Cartesian positions which define the transformations.
+    cartesianValue : array-like of float, shape (N, ..., 3)
+        Cartesian value vectors to convert.
+    out : np.ndarray of float, shape (N, ..., 3), optional
+        Array to hold the result. It may be cartesianValue.
+
+    Returns
+    -------
+    cylindricalValue : CylindricalVectorArray or np.ndarray of float
+        Input values converted to the cylindrical basis, or out if it was
+        provided.
+    """
+    (_, sin_phi, cos_phi) = _cartesianTrig(cartesianPosition)
+    return _rotate(sin_phi, cos_phi, cartesianValue, -1,
+                   CylindricalVectorArray, out)
+
+
+def cylindricalFieldToCartesianMany(cylindricalPosition, cylindricalValue,
+                                    positionOut=None, valueOut=None):
+    """Convert cylindrical field positions and values to Cartesian.
+
+    Convert an array of cylindrical positions to Cartesian coordinates,
+    and the cylindrical field values at those positions to the Cartesian
+    basis. sin(phi) and cos(phi) are computed once for both.
+
+    Parameters
+    ----------
+    cylindricalPosition : array-like of float, shape (N, 3)
+        Cylindrical positions of the field values.
+    cylindricalValue : array-like of float, shape (N, ..., 3)
+        Cylindrical field values to convert.
+    positionOut : np.ndarray of float, shape (N, 3), optional
+        Array to hold the Cartesian positions.
+    valueOut : np.ndarray of float, shape (N, ..., 3), optional
+        Array to hold the Cartesian values.
+
+    Returns
+    -------
+    cartesianPosition : CartesianVectorArray
+        Input positions in Cartesian coordinates.
+    cartesianValue : CartesianVectorArray or np.ndarray of float
+        Input values in the Cartesian basis.
+    """
+    cylindricalPosition = np.asarray(cylindricalPosition, dtype=float)
+    (rho, phi, z) = np.moveaxis(cylindricalPosition, -1, 0)
+    (sin_phi, cos_phi) = (np.sin(phi), np.cos(phi))
+    cartesianValue = _rotate(sin_phi, cos_phi, cylindricalValue, 1,
+                             CartesianVectorArray, valueOut)
+    cartesianPosition = CartesianVectorArray.fromComponents(
+        rho*cos_phi, rho*sin_phi, z, out=positionOut)
+    return (cartesianPosition, cartesianValue)
+
+
+def cartesianFieldToCylindricalMany(cartesianPosition, cartesianValue,
+                                    positionOut=None, valueOut=None):
+    """Convert Cartesian field positions and values to cylindrical.
+
+    Convert an array of Cartesian positions to cylindrical coordinates,
+    and the Cartesian field values at those positions to the cylindrical
+    basis. The basis transformations use the ratios of the Cartesian
+    components, so no trigonometric functions are needed for them.
+
+    Parameters
+    ----------
+    cartesianPosition : array-like of float, shape (N, 3)
+        Cartesian positions of the field values.
+    cartesianValue : array-like of float, shape (N, ..., 3)
+        Cartesian field values to convert.
+    positionOut : np.ndarray of float, shape (N, 3), optional
+        Array to hold the cylindrical positions.
+    valueOut : np.ndarray of float, shape (N, ..., 3), optional
+        Array to hold the cylindrical values.
+
+    Returns
+    -------
+    cylindricalPosition : CylindricalVectorArray
+        Input positions in cylindrical coordinates.
+    cylindricalValue : CylindricalVectorArray or np.ndarray of float
+        Input values in the cylindrical basis.
+    """
+    cartesianPosition = np.asarray(cartesianPosition, dtype=float)
+    (rho, sin_phi, cos_phi) = _cartesianTrig(cartesianPosition)
+    cylindricalValue = _rotate(sin_phi, cos_phi, cartesianValue, -1,
+                               CylindricalVectorArray, valueOut)
+    cylindricalPosition = CylindricalVectorArray.fromComponents(
+        rho, _azimuth(cartesianPosition), cartesianPosition[..., 2],
+        out=positionOut)
+    return (cylindricalPosition, cylindricalValue)
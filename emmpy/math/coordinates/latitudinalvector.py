@@ -8,8 +8,13 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import atan2, cos, sin, sqrt
 
-from emmpy.math.coordinates.cartesianvector import CartesianVector
+import numpy as np
+
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
 from emmpy.math.vectors.vector3d import Vector3D
+from emmpy.math.vectors.vectorarray import VectorArray
 
 
 # Map vector component names to indices.
@@ -87,6 +92,27 @@ class LatitudinalVector(Vector3D):
         self[components[name]] = value
 
 
+class LatitudinalVectorArray(VectorArray):
+    """An array of vectors in latitudinal (r, lat, lon) coordinates.
+
+    This class implements an array of vectors in latitudinal (r, lat, lon)
+    coordinates, stored as an (N, 3) array with one vector per row. The
+    components are views of the columns of the array.
+
+    Attributes
+    ----------
+    r : np.ndarray of float, shape (N,)
+        Values of the radius coordinate (unspecified units).
+    lat : np.ndarray of float, shape (N,)
+        Latitudes (radians).
+    lon : np.ndarray of float, shape (N,)
+        Longitudes (radians).
+    """
+
+    # Map vector component names to indices.
+    components = components
+
+
 def latitudinalToCartesian(latitudinal):
     """Convert a latitudinal vector to Cartesian coordinates.
 
@@ -133,3 +159,53 @@ def cartesianToLatitudinal(cartesian):
     lon = atan2(y, x)
     latitudinal = LatitudinalVector(r, lat, lon)
     return latitudinal
+
+
+def latitudinalToCartesianMany(latitudinal, out=None):
+    """Convert an array of latitudinal vectors to Cartesian coordinates.
+
+    Convert an array of latitudinal vectors to Cartesian coordinates.
+
+    Parameters
+    ----------
+    latitudinal : array-like of float, shape (N, 3)
+        Latitudinal (r, lat, lon) vectors to convert.
+    out : np.ndarray of float, shape (N, 3), optional
+        Array to hold the result. It may be latitudinal.
+
+    Returns
+    -------
+    cartesian : CartesianVectorArray
+        Input vectors converted to Cartesian coordinates, or out if it
+        was provided.
+    """
+    latitudinal = np.asarray(latitudinal, dtype=float)
+    (r, lat, lon) = np.moveaxis(latitudinal, -1, 0)
+    rho = r*np.cos(lat)
+    return CartesianVectorArray.fromComponents(
+        rho*np.cos(lon), rho*np.sin(lon), r*np.sin(lat), out=out)
+
+
+def cartesianToLatitudinalMany(cartesian, out=None):
+    """Convert an array of Cartesian vectors to latitudinal coordinates.
+
+    Convert an array of Cartesian vectors to latitudinal coordinates.
+
+    Parameters
+    ----------
+    cartesian : array-like of float, shape (N, 3)
+        Cartesian vectors to convert.
+    out : np.ndarray of float, shape (N, 3), optional
+        Array to hold the result. It may be cartesian.
+
+    Returns
+    -------
+    latitudinal : LatitudinalVectorArray
+        Input vectors converted to latitudinal coordinates, or out if it
+        was provided.
+    """
+    cartesian = np.asarray(cartesian, dtype=float)
+    (x, y, z) = np.moveaxis(cartesian, -1, 0)
+    rho = np.hypot(x, y)
+    return LatitudinalVectorArray.fromComponents(
+        np.hypot(rho, z), np.arctan2(z, rho), np.arctan2(y, x), out=out)
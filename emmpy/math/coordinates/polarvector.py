@@ -8,6 +8,8 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import atan2, cos, sin, sqrt
 
+import numpy as np
+
 from emmpy.math.coordinates.cartesianvector2d import CartesianVector2D
 from emmpy.math.vectors.vector2d import Vector2D
 
@@ -128,3 +130,63 @@ def cartesianToPolar(cartesian):
     phi = atan2(y, x)
     polar = PolarVector(r, phi)
     return polar
+
+
+def _stack2D(c0, c1, out):
+    """Store 2 components in a new array or in out."""
+    (c0, c1) = np.broadcast_arrays(c0, c1)
+    if out is None:
+        out = np.empty(c0.shape + (2,))
+    elif np.may_share_memory(out, c0) or np.may_share_memory(out, c1):
+        (c0, c1) = (np.array(c0), np.array(c1))
+    out[..., 0] = c0
+    out[..., 1] = c1
+    return out
+
+
+def polarToCartesianMany(polar, out=None):
+    """Convert an array of polar vectors to Cartesian coordinates.
+
+    Convert an array of polar coordinate vectors to Cartesian
+    coordinates.
+
+    Parameters
+    ----------
+    polar : array-like of float, shape (N, 2)
+        Polar (r, phi) vectors to convert.
+    out : np.ndarray of float, shape (N, 2), optional
+        Array to hold the result. It may be polar.
+
+    Returns
+    -------
+    cartesian : np.ndarray of float, shape (N, 2)
+        Input vectors converted to Cartesian (x, y) coordinates, or out
+        if it was provided.
+    """
+    polar = np.asarray(polar, dtype=float)
+    (r, phi) = (polar[..., 0], polar[..., 1])
+    return _stack2D(r*np.cos(phi), r*np.sin(phi), out)
+
+
+def cartesianToPolarMany(cartesian, out=None):
+    """Convert an array of Cartesian vectors to polar coordinates.
+
+    Convert an array of 2-dimensional Cartesian vectors to polar
+    coordinates.
+
+    Parameters
+    ----------
+    cartesian : array-like of float, shape (N, 2)
+        Cartesian (x, y) vectors to convert.
+    out : np.ndarray of float, shape (N, 2), optional
+        Array to hold the result. It may be cartesian.
+
+    Returns
+    -------
+    polar : np.ndarray of float, shape (N, 2)
+        Input vectors converted to polar (r, phi) coordinates, or out if
+        it was provided.
+    """
+    cartesian = np.asarray(cartesian, dtype=float)
+    (x, y) = (cartesian[..., 0], cartesian[..., 1])
+    return _stack2D(np.hypot(x, y), np.arctan2(y, x), out)
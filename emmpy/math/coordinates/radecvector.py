@@ -8,8 +8,13 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import atan2, cos, pi, sin, sqrt
 
-from emmpy.math.coordinates.cartesianvector import CartesianVector
+import numpy as np
+
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
 from emmpy.math.vectors.vector3d import Vector3D
+from emmpy.math.vectors.vectorarray import VectorArray
 
 
 # Map vector component names to indices.
@@ -87,6 +92,27 @@ class RaDecVector(Vector3D):
         self[components[name]] = value
 
 
+class RaDecVectorArray(VectorArray):
+    """An array of vectors in celestial (r, ra, dec) coordinates.
+
+    This class implements an array of vectors in celestial (r, ra, dec)
+    coordinates, stored as an (N, 3) array with one vector per row. The
+    components are views of the columns of the array.
+
+    Attributes
+    ----------
+    r : np.ndarray of float, shape (N,)
+        Values of the radius coordinate (unspecified units).
+    ra : np.ndarray of float, shape (N,)
+        Right ascensions (radians).
+    dec : np.ndarray of float, shape (N,)
+        Declinations (radians).
+    """
+
+    # Map vector component names to indices.
+    components = components
+
+
 def raDecToCartesian(celestial):
     """Convert a celestial coordinate vector to Cartesian coordinates.
 
@@ -135,3 +161,58 @@ def cartesianToRaDec(cartesian):
     dec = atan2(z, sqrt(x**2 + y**2))
     celestial = RaDecVector(r, ra, dec)
     return celestial
+
+
+def raDecToCartesianMany(celestial, out=None):
+    """Convert an array of celestial vectors to Cartesian coordinates.
+
+    Convert an array of celestial coordinate vectors to Cartesian
+    coordinates.
+
+    Parameters
+    ----------
+    celestial : array-like of float, shape (N, 3)
+        Celestial (r, ra, dec) vectors to convert.
+    out : np.ndarray of float, shape (N, 3), optional
+        Array to hold the result. It may be celestial.
+
+    Returns
+    -------
+    cartesian : CartesianVectorArray
+        Input vectors converted to Cartesian coordinates, or out if it
+        was provided.
+    """
+    celestial = np.asarray(celestial, dtype=float)
+    (r, ra, dec) = np.moveaxis(celestial, -1, 0)
+    rho = r*np.cos(dec)
+    return CartesianVectorArray.fromComponents(
+        rho*np.cos(ra), rho*np.sin(ra), r*np.sin(dec), out=out)
+
+
+def cartesianToRaDecMany(cartesian, out=None):
+    """Convert an array of Cartesian vectors to celestial coordinates.
+
+    Convert an array of Cartesian vectors to celestial coordinates. As
+    for cartesianToRaDec(), the right ascension is in the range
+    [0, 2*pi).
+
+    Parameters
+    ----------
+    cartesian : array-like of float, shape (N, 3)
+        Cartesian vectors to convert.
+    out : np.ndarray of float, shape (N, 3), optional
+        Array to hold the result. It may be cartesian.
+
+    Returns
+    -------
+    celestial : RaDecVectorArray
+        Input vectors converted to celestial coordinates, or out if it
+        was provided.
+    """
+    cartesian = np.asarray(cartesian, dtype=float)
+    (x, y, z) = np.moveaxis(cartesian, -1, 0)
+    rho = np.hypot(x, y)
+    ra = np.arctan2(y, x)
+    ra = np.where(ra < 0, ra + 2*pi, ra)
+    return RaDecVectorArray.fromComponents(
+        np.hypot(rho, z), ra, np.arctan2(z, rho), out=out)
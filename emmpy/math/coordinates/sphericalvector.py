@@ -102,9 +102,14 @@ Eric Winter (eric.winter@jhuapl.edu)
 
 from math import atan2, cos, sin, sqrt
 
-from emmpy.math.coordinates.cartesianvector import CartesianVector
+import numpy as np
+
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
 from emmpy.math.matrices.matrix3d import Matrix3D
 from emmpy.math.vectors.vector3d import Vector3D
+from emmpy.math.vectors.vectorarray import VectorArray
 
 
 # Map vector component names to indices.
@@ -188,6 +193,27 @@ class SphericalVector(Vector3D):
         self[components[name]] = value
 
 
+class SphericalVectorArray(VectorArray):
+    """An array of vectors in spherical (r, theta, phi) coordinates.
+
+    This class implements an array of vectors in spherical (r, theta, phi)
+    coordinates, stored as an (N, 3) array with one vector per row. The
+    components are views of the columns of the array.
+
+    Attributes
+    ----------
+    r : np.ndarray of float, shape (N,)
+        Values of the radius coordinate (unspecified units).
+    theta : np.ndarray of float, shape (N,)
+        Values of the polar angle (radians).
+    phi : np.ndarray of float, shape (N,)
+        Values of the azimuthal angle (radians).
+    """
+
+    # Map vector component names to indices.
+    components = components
+
+
 def sphericalToCartesian(spherical):
     """Convert a spherical coordinate vector to Cartesian coordinates.
 
@@ -338,3 +364,238 @@ def cartesianBasisToSphericalBasis(cartesianPosition, cartesianValue):
     m = getCartesianBasisToSphericalBasisTransformation(cartesianPosition)
     sphericalValue = SphericalVector(m.dot(cartesianValue))
     return sphericalValue
+
+
+def _sphericalTrig(sphericalPosition):
+    """Return sin and cos of the angles of spherical positions."""
+    sphericalPosition = np.asarray(sphericalPosition, dtype=float)
+    theta = sphericalPosition[..., 1]
+    phi = sphericalPosition[..., 2]
+    return (np.sin(theta), np.cos(theta), np.sin(phi), np.cos(phi))
+
+
+def _cartesianTrig(cartesianPosition):
+    """Return r, sin and cos of the spherical angles of Cartesian positions.
+
+    The sines and cosines are computed as ratios of the Cartesian
+    components, and match atan2() on the z-axis and at the origin.
+    """
+    cartesianPosition = np.asarray(cartesianPosition, dtype=float)
+    (x, y, z) = np.moveaxis(cartesianPosition, -1, 0)
+    rho = np.hypot(x, y)
+    r = np.hypot(rho, z)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sin_theta = np.where(r > 0, rho/r, 0.0)
+        cos_theta = np.where(r > 0, z/r, 1.0)
+        sin_phi = np.where(rho > 0, y/rho, 0.0)
+        cos_phi = np.where(rho > 0, x/rho, 1.0)
+    return (r, sin_theta, cos_theta, sin_phi, cos_phi)
+
+
+def _toCartesianBasis(trig, value, out):
+    """Rotate spherical values to Cartesian with precomputed trig."""
+    value = np.asarray(value, dtype=float)
+    # Broadcast the per-position terms over any expansion axes.
+    shape = trig[0].shape + (1,)*(value.ndim - 1 - trig[0].ndim)
+    (sin_theta, cos_theta, sin_phi, cos_phi) = [
+        t.reshape(shape) for t in trig]
+    (v_r, v_theta, v_phi) = np.moveaxis(value, -1, 0)
+    v_x = v_r*sin_theta*cos_phi + v_theta*cos_theta*cos_phi - v_phi*sin_phi
+    v_y = v_r*sin_theta*sin_phi + v_theta*cos_theta*sin_phi + v_phi*cos_phi
+    v_z = v_r*cos_theta - v_theta*sin_theta
+    return CartesianVectorArray.fromComponents(v_x, v_y, v_z, out=out)
+
+
+def _toSphericalBasis(trig, value, out):
+    """Rotate Cartesian values to spherical with precomputed trig."""
+    value = np.asarray(value, dtype=float)
+    shape = trig[0].shape + (1,)*(value.ndim - 1 - trig[0].ndim)
+    (sin_theta, cos_theta, sin_phi, cos_phi) = [
+        t.reshape(shape) for t in trig]
+    (v_x, v_y, v_z) = np.moveaxis(value, -1, 0)
+    v_rho = v_x*cos_phi + v_y*sin_phi
+    v_r = v_rho*sin_theta + v_z*cos_theta
+    v_theta = v_rho*cos_theta - v_z*sin_theta
+    v_phi = v_y*cos_phi - v_x*sin_phi
+    return SphericalVectorArray.fromComponents(v_r, v_theta, v_phi, out=out)
+
+
+def sphericalToCartesianMany(spherical, out=None):
+    """Convert an array of spherical vectors to Cartesian coordinates.
+
+    Convert an array of spherical coordinate vectors to Cartesian
+    coordinates.
+
+    Parameters
+    ----------
+    spherical : array-like of float, shape (N, 3)
+        Spherical (r, theta, phi) vectors to convert.
+    out : np.ndarray of float, shape (N, 3), optional
+        Array to hold the result. It may be spherical.
+
+    Returns
+    -------
+    cartesian : CartesianVectorArray
+        Input vectors converted to Cartesian coordinates, or out if it
+        was provided.
+    """
+    spherical = np.asarray(spherical, dtype=float)
+    (sin_theta, cos_theta, sin_phi, cos_phi) = _sphericalTrig(spherical)
+    r = spherical[..., 0]
+    return CartesianVectorArray.fromComponents(
+        r*sin_theta*cos_phi, r*sin_theta*sin_phi, r*cos_theta, out=out)
+
+
+def cartesianToSphericalMany(cartesian, out=None):
+    """Convert an array of Cartesian vectors to spherical coordinates.
+
+    Convert an array of Cartesian vectors to spherical coordinates. As
+    for cartesianToSpherical(), phi is in the range [-pi, pi].
+
+    Parameters
+    ----------
+    cartesian : array-like of float, shape (N, 3)
+        Cartesian vectors to convert.
+    out : np.ndarray of float, shape (N, 3), optional
+        Array to hold the result. It may be cartesian.
+
+    Returns
+    -------
+    spherical : SphericalVectorArray
+        Input vectors converted to spherical coordinates, or out if it
+        was provided.
+    """
+    cartesian = np.asarray(cartesian, dtype=float)
+    (x, y, z) = np.moveaxis(cartesian, -1, 0)
+    rho = np.hypot(x, y)
+    return SphericalVectorArray.fromComponents(
+        np.hypot(rho, z), np.arctan2(rho, z), np.arctan2(y, x), out=out)
+
+
+def sphericalBasisToCartesianBasisMany(sphericalPosition, sphericalValue,
+                                       out=None):
+    """Convert an array of spherical value vectors to a Cartesian basis.
+
+    Convert an array of spherical value vectors to a Cartesian basis, at
+    the matching spherical positions. The values may have extra axes
+    between the position axis and the component axis, for example to
+    convert all of the basis vectors of an expansion at once.
+
+    Parameters
+    ----------
+    sphericalPosition : array-like of float, shape (N, 3)
+        Spherical positions which define the transformations.
+    sphericalValue : array-like of float, shape (N, ..., 3)
+        Spherical value vectors to convert.
+    out : np.ndarray of float, shape (N, ..., 3), optional
+        Array to hold the result. It may be sphericalValue.
+
+    Returns
+    -------
+    cartesianValue : CartesianVectorArray or np.ndarray of float
+        Input values converted to the Cartesian basis, or out if it was
+        provided.
+    """
+    trig = _sphericalTrig(sphericalPosition)
+    return _toCartesianBasis(trig, sphericalValue, out)
+
+
+def cartesianBasisToSphericalBasisMany(cartesianPosition, cartesianValue,
+                                       out=None):
+    """Convert an array of Cartesian value vectors to a spherical basis.
+
+    Convert an array of Cartesian value vectors to a spherical basis, at
+    the matching Cartesian positions. The values may have extra axes
+    between the position axis and the component axis.
+
+    Parameters
+    ----------
+    cartesianPosition : array-like of float, shape (N, 3)
+        Cartesian positions which define the transformations.
+    cartesianValue : array-like of float, shape (N, ..., 3)
+        Cartesian value vectors to convert.
+    out : np.ndarray of float, shape (N, ..., 3), optional
+        Array to hold the result. It may be cartesianValue.
+
+    Returns
+    -------
+    sphericalValue : SphericalVectorArray or np.ndarray of float
+        Input values converted to the spherical basis, or out if it was
+        provided.
+    """
+    trig = _cartesianTrig(cartesianPosition)[1:]
+    return _toSphericalBasis(trig, cartesianValue, out)
+
+
+def sphericalFieldToCartesianMany(sphericalPosition, sphericalValue,
+                                  positionOut=None, valueOut=None):
+    """Convert spherical field positions and values to Cartesian.
+
+    Convert an array of spherical positions to Cartesian coordinates, and
+    the spherical field values at those positions to the Cartesian basis.
+    The sines and cosines of the angles are computed once for both.
+
+    Parameters
+    ----------
+    sphericalPosition : array-like of float, shape (N, 3)
+        Spherical positions of the field values.
+    sphericalValue : array-like of float, shape (N, ..., 3)
+        Spherical field values to convert.
+    positionOut : np.ndarray of float, shape (N, 3), optional
+        Array to hold the Cartesian positions.
+    valueOut : np.ndarray of float, shape (N, ..., 3), optional
+        Array to hold the Cartesian values.
+
+    Returns
+    -------
+    cartesianPosition : CartesianVectorArray
+        Input positions in Cartesian coordinates.
+    cartesianValue : CartesianVectorArray or np.ndarray of float
+        Input values in the Cartesian basis.
+    """
+    sphericalPosition = np.asarray(sphericalPosition, dtype=float)
+    trig = _sphericalTrig(sphericalPosition)
+    (sin_theta, cos_theta, sin_phi, cos_phi) = trig
+    r = sphericalPosition[..., 0]
+    cartesianValue = _toCartesianBasis(trig, sphericalValue, valueOut)
+    cartesianPosition = CartesianVectorArray.fromComponents(
+        r*sin_theta*cos_phi, r*sin_theta*sin_phi, r*cos_theta,
+        out=positionOut)
+    return (cartesianPosition, cartesianValue)
+
+
+def cartesianFieldToSphericalMany(cartesianPosition, cartesianValue,
+                                  positionOut=None, valueOut=None):
+    """Convert Cartesian field positions and values to spherical.
+
+    Convert an array of Cartesian positions to spherical coordinates,
+    and the Cartesian field values at those positions to the spherical
+    basis. The basis transformations use the ratios of the Cartesian
+    components, so no trigonometric functions are needed for them.
+
+    Parameters
+    ----------
+    cartesianPosition : array-like of float, shape (N, 3)
+        Cartesian positions of the field values.
+    cartesianValue : array-like of float, shape (N, ..., 3)
+        Cartesian field values to convert.
+    positionOut : np.ndarray of float, shape (N, 3), optional
+        Array to hold the spherical positions.
+    valueOut : np.ndarray of float, shape (N, ..., 3), optional
+        Array to hold the spherical values.
+
+    Returns
+    -------
+    sphericalPosition : SphericalVectorArray
+        Input positions in spherical coordinates.
+    sphericalValue : SphericalVectorArray or np.ndarray of float
+        Input values in the spherical basis.
+    """
+    cartesianPosition = np.asarray(cartesianPosition, dtype=float)
+    (r, *trig) = _cartesianTrig(cartesianPosition)
+    (x, y, z) = np.moveaxis(cartesianPosition, -1, 0)
+    sphericalValue = _toSphericalBasis(trig, cartesianValue, valueOut)
+    sphericalPosition = SphericalVectorArray.fromComponents(
+        r, np.arctan2(np.hypot(x, y), z), np.arctan2(y, x),
+        out=positionOut)
+    return (sphericalPosition, sphericalValue)
@@ -10,7 +10,9 @@ import unittest
 
 import numpy as np
 
-from emmpy.math.coordinates.cartesianvector import CartesianVector
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
 
 
 class TestBuilder(unittest.TestCase):
@@ -54,6 +56,18 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(KeyError):
             v.bad = 0
 
+    def test_CartesianVectorArray(self):
+        """Test the CartesianVectorArray class."""
+        v = CartesianVectorArray([[1.1, 2.2, 3.3], [4.4, 5.5, 6.6]])
+        self.assertIsInstance(v, CartesianVectorArray)
+        self.assertTrue(np.allclose(v.x, (1.1, 4.4)))
+        self.assertTrue(np.allclose(v.y, (2.2, 5.5)))
+        self.assertTrue(np.allclose(v.z, (3.3, 6.6)))
+        v.y = 0.0
+        self.assertTrue(np.allclose(v[:, 1], 0.0))
+        with self.assertRaises(AttributeError):
+            v.bad
+
 
 if __name__ == '__main__':
     unittest.main()
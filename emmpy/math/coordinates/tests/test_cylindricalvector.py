@@ -11,12 +11,18 @@ import unittest
 
 import numpy as np
 
-from emmpy.math.coordinates.cartesianvector import CartesianVector
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
 from emmpy.math.coordinates.cylindricalvector import (
-    CylindricalVector, cylindricalToCartesian, cartesianToCylindrical,
+    CylindricalVector, CylindricalVectorArray, cylindricalToCartesian, cartesianToCylindrical,
     getCylindricalBasisToCartesianBasisTransformation,
     getCartesianBasisToCylindricalBasisTransformation,
-    cylindricalBasisToCartesianBasis, cartesianBasisToCylindricalBasis
+    cylindricalBasisToCartesianBasis, cartesianBasisToCylindricalBasis,
+    CylindricalVectorArray, cylindricalToCartesianMany,
+    cartesianToCylindricalMany, cylindricalBasisToCartesianBasisMany,
+    cartesianBasisToCylindricalBasisMany, cylindricalFieldToCartesianMany,
+    cartesianFieldToCylindricalMany
 )
 from emmpy.math.matrices.matrix3d import Matrix3D
 
@@ -29,6 +35,16 @@ zs = np.linspace(-10, 10, n)
 rhos = np.linspace(0, 10, n)
 phis = np.linspace(0, 2*pi, n)
 
+# Coarser grids of positions and values for the array functions.
+cartesianPositions = np.stack(
+    np.meshgrid(xs[::4], ys[::4], zs[::4], indexing="ij"), axis=-1
+).reshape((-1, 3))
+cylindricalPositions = np.stack(
+    np.meshgrid(rhos[::4], phis[::4], zs[::4], indexing="ij"), axis=-1
+).reshape((-1, 3))
+values = np.random.default_rng(1).uniform(
+    -5, 5, (len(cartesianPositions), 3))
+
 
 class TestBuilder(unittest.TestCase):
     """Tests for the cylindricalvector module."""
@@ -71,6 +87,18 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(KeyError):
             v.bad = 0
 
+    def test_CylindricalVectorArray(self):
+        """Test the CylindricalVectorArray class."""
+        v = CylindricalVectorArray([[1.1, 2.2, 3.3], [4.4, 5.5, 6.6]])
+        self.assertIsInstance(v, CylindricalVectorArray)
+        self.assertTrue(np.allclose(v.rho, (1.1, 4.4)))
+        self.assertTrue(np.allclose(v.phi, (2.2, 5.5)))
+        self.assertTrue(np.allclose(v.z, (3.3, 6.6)))
+        v.phi = 0.0
+        self.assertTrue(np.allclose(v[:, 1], 0.0))
+        with self.assertRaises(AttributeError):
+            v.bad
+
     def test_cylindricalToCartesian(self):
         """Test the cylindricalToCartesian function."""
         for rho in rhos:
@@ -187,6 +215,73 @@ class TestBuilder(unittest.TestCase):
                                                cylindricalValue_ref[row]
                         )
 
+    def test_cylindricalToCartesianMany(self):
+        """Test the cylindricalToCartesianMany function."""
+        cartesian = cylindricalToCartesianMany(cylindricalPositions)
+        self.assertIsInstance(cartesian, CartesianVectorArray)
+        for (v, c) in zip(cylindricalPositions, cartesian):
+            self.assertTrue(np.allclose(
+                c, cylindricalToCartesian(CylindricalVector(*v))))
+        out = cylindricalPositions.copy()
+        self.assertIs(cylindricalToCartesianMany(out, out=out), out)
+        self.assertTrue(np.allclose(out, cartesian))
+
+    def test_cartesianToCylindricalMany(self):
+        """Test the cartesianToCylindricalMany function."""
+        cylindrical = cartesianToCylindricalMany(cartesianPositions)
+        self.assertIsInstance(cylindrical, CylindricalVectorArray)
+        for (v, c) in zip(cartesianPositions, cylindrical):
+            self.assertTrue(np.allclose(
+                c, cartesianToCylindrical(CartesianVector(*v))))
+        self.assertTrue(np.all((cylindrical.phi >= 0) &
+                               (cylindrical.phi < 2*pi)))
+        cylindrical = cartesianToCylindricalMany([[-0.0, 0.0, 1.0]])
+        self.assertEqual(cylindrical[0, 1], 0.0)
+
+    def test_cylindricalBasisToCartesianBasisMany(self):
+        """Test the cylindricalBasisToCartesianBasisMany function."""
+        cartesian = cylindricalBasisToCartesianBasisMany(
+            cylindricalPositions, values)
+        self.assertIsInstance(cartesian, CartesianVectorArray)
+        for (p, v, c) in zip(cylindricalPositions, values, cartesian):
+            self.assertTrue(np.allclose(c, cylindricalBasisToCartesianBasis(
+                CylindricalVector(*p), CylindricalVector(*v))))
+        # Values with an extra axis, converted in place.
+        expansion = np.stack((values, 2*values), axis=1)
+        out = cylindricalBasisToCartesianBasisMany(
+            cylindricalPositions, expansion, out=expansion)
+        self.assertIs(out, expansion)
+        self.assertTrue(np.allclose(expansion[:, 1], 2*cartesian))
+
+    def test_cartesianBasisToCylindricalBasisMany(self):
+        """Test the cartesianBasisToCylindricalBasisMany function."""
+        cylindrical = cartesianBasisToCylindricalBasisMany(
+            cartesianPositions, values)
+        self.assertIsInstance(cylindrical, CylindricalVectorArray)
+        for (p, v, c) in zip(cartesianPositions, values, cylindrical):
+            self.assertTrue(np.allclose(c, cartesianBasisToCylindricalBasis(
+                CartesianVector(*p), CartesianVector(*v))))
+
+    def test_cylindricalFieldToCartesianMany(self):
+        """Test the cylindricalFieldToCartesianMany function."""
+        (p, v) = cylindricalFieldToCartesianMany(
+            cylindricalPositions, values)
+        self.assertTrue(np.allclose(
+            p, cylindricalToCartesianMany(cylindricalPositions)))
+        self.assertTrue(np.allclose(v, cylindricalBasisToCartesianBasisMany(
+            cylindricalPositions, values)))
+
+    def test_cartesianFieldToCylindricalMany(self):
+        """Test the cartesianFieldToCylindricalMany function."""
+        positionOut = cartesianPositions.copy()
+        (p, v) = cartesianFieldToCylindricalMany(
+            positionOut, values, positionOut=positionOut)
+        self.assertIs(p, positionOut)
+        self.assertTrue(np.allclose(
+            p, cartesianToCylindricalMany(cartesianPositions)))
+        self.assertTrue(np.allclose(v, cartesianBasisToCylindricalBasisMany(
+            cartesianPositions, values)))
+
 
 if __name__ == "__main__":
     unittest.main()
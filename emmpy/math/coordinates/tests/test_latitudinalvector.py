@@ -10,10 +10,14 @@ from math import atan2, cos, pi, sin, sqrt
 import unittest
 
 import numpy as np
-from emmpy.math.coordinates.cartesianvector import CartesianVector
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
 
 from emmpy.math.coordinates.latitudinalvector import (
-    LatitudinalVector, latitudinalToCartesian, cartesianToLatitudinal
+    LatitudinalVector, LatitudinalVectorArray, latitudinalToCartesian,
+    cartesianToLatitudinal, latitudinalToCartesianMany,
+    cartesianToLatitudinalMany
 )
 
 
@@ -26,6 +30,14 @@ rs = np.linspace(0, 10, n)
 lats = np.linspace(-pi/2, pi/2, n)
 lons = np.linspace(-pi, pi, n)
 
+# Coarser grids of positions for the array functions.
+cartesianPositions = np.stack(
+    np.meshgrid(xs[::4], ys[::4], zs[::4], indexing="ij"), axis=-1
+).reshape((-1, 3))
+latitudinalPositions = np.stack(
+    np.meshgrid(rs[::4], lats[::4], lons[::4], indexing="ij"), axis=-1
+).reshape((-1, 3))
+
 
 class TestBuilder(unittest.TestCase):
     """Tests for the latitudinalvector module."""
@@ -62,6 +74,18 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(KeyError):
             v.bad = 0
 
+    def test_LatitudinalVectorArray(self):
+        """Test the LatitudinalVectorArray class."""
+        v = LatitudinalVectorArray([[1.1, 2.2, 3.3], [4.4, 5.5, 6.6]])
+        self.assertIsInstance(v, LatitudinalVectorArray)
+        self.assertTrue(np.allclose(v.r, (1.1, 4.4)))
+        self.assertTrue(np.allclose(v.lat, (2.2, 5.5)))
+        self.assertTrue(np.allclose(v.lon, (3.3, 6.6)))
+        v.lat = 0.0
+        self.assertTrue(np.allclose(v[:, 1], 0.0))
+        with self.assertRaises(AttributeError):
+            v.bad
+
     def test_latitudinalToCartesian(self):
         """Test the latitudinalToCartesian function."""
         for r in rs:
@@ -90,6 +114,25 @@ class TestBuilder(unittest.TestCase):
                     self.assertAlmostEqual(latitudinal.lat, lat)
                     self.assertAlmostEqual(latitudinal.lon, lon)
 
+    def test_latitudinalToCartesianMany(self):
+        """Test the latitudinalToCartesianMany function."""
+        cartesian = latitudinalToCartesianMany(latitudinalPositions)
+        self.assertIsInstance(cartesian, CartesianVectorArray)
+        for (v, c) in zip(latitudinalPositions, cartesian):
+            self.assertTrue(np.allclose(
+                c, latitudinalToCartesian(LatitudinalVector(*v))))
+
+    def test_cartesianToLatitudinalMany(self):
+        """Test the cartesianToLatitudinalMany function."""
+        out = cartesianPositions.copy()
+        latitudinal = cartesianToLatitudinalMany(out, out=out)
+        self.assertIs(latitudinal, out)
+        for (v, c) in zip(cartesianPositions, latitudinal):
+            self.assertTrue(np.allclose(
+                c, cartesianToLatitudinal(CartesianVector(*v))))
+        self.assertIsInstance(cartesianToLatitudinalMany(cartesianPositions),
+                              LatitudinalVectorArray)
+
 
 if __name__ == '__main__':
     unittest.main()
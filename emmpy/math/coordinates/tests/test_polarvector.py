@@ -13,7 +13,8 @@ import numpy as np
 from emmpy.math.coordinates.cartesianvector2d import CartesianVector2D
 
 from emmpy.math.coordinates.polarvector import (
-    PolarVector, polarToCartesian, cartesianToPolar
+    PolarVector, polarToCartesian, cartesianToPolar, polarToCartesianMany,
+    cartesianToPolarMany
 )
 
 
@@ -83,6 +84,26 @@ class TestBuilder(unittest.TestCase):
                 self.assertAlmostEqual(polar.r, r)
                 self.assertAlmostEqual(polar.phi, phi)
 
+    def test_polarToCartesianMany(self):
+        """Test the polarToCartesianMany function."""
+        polar = np.stack(np.meshgrid(rs, phis, indexing="ij"),
+                         axis=-1).reshape((-1, 2))
+        cartesian = polarToCartesianMany(polar)
+        self.assertEqual(cartesian.shape, polar.shape)
+        for (p, c) in zip(polar, cartesian):
+            self.assertTrue(np.allclose(c, polarToCartesian(PolarVector(*p))))
+
+    def test_cartesianToPolarMany(self):
+        """Test the cartesianToPolarMany function."""
+        cartesian = np.stack(np.meshgrid(xs, ys, indexing="ij"),
+                             axis=-1).reshape((-1, 2))
+        out = cartesian.copy()
+        polar = cartesianToPolarMany(out, out=out)
+        self.assertIs(polar, out)
+        for (c, p) in zip(cartesian, polar):
+            self.assertTrue(np.allclose(
+                p, cartesianToPolar(CartesianVector2D(*c))))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -11,9 +11,12 @@ import unittest
 
 import numpy as np
 
-from emmpy.math.coordinates.cartesianvector import CartesianVector
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
 from emmpy.math.coordinates.radecvector import (
-    RaDecVector, raDecToCartesian, cartesianToRaDec
+    RaDecVector, RaDecVectorArray, raDecToCartesian, cartesianToRaDec,
+    raDecToCartesianMany, cartesianToRaDecMany
 )
 
 
@@ -26,6 +29,14 @@ rs = np.linspace(0, 10, n)
 ras = np.linspace(0, 2*pi, n)
 decs = np.linspace(-pi/2, pi/2, n)
 
+# Coarser grids of positions for the array functions.
+cartesianPositions = np.stack(
+    np.meshgrid(xs[::4], ys[::4], zs[::4], indexing="ij"), axis=-1
+).reshape((-1, 3))
+celestialPositions = np.stack(
+    np.meshgrid(rs[::4], ras[::4], decs[::4], indexing="ij"), axis=-1
+).reshape((-1, 3))
+
 
 class TestBuilder(unittest.TestCase):
     """Tests for the radecvector module."""
@@ -62,6 +73,18 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(KeyError):
             v.bad = 0
 
+    def test_RaDecVectorArray(self):
+        """Test the RaDecVectorArray class."""
+        v = RaDecVectorArray([[1.1, 2.2, 3.3], [4.4, 5.5, 6.6]])
+        self.assertIsInstance(v, RaDecVectorArray)
+        self.assertTrue(np.allclose(v.r, (1.1, 4.4)))
+        self.assertTrue(np.allclose(v.ra, (2.2, 5.5)))
+        self.assertTrue(np.allclose(v.dec, (3.3, 6.6)))
+        v.ra = 0.0
+        self.assertTrue(np.allclose(v[:, 1], 0.0))
+        with self.assertRaises(AttributeError):
+            v.bad
+
     def test_raDecToCartesian(self):
         """Test the raDecToCartesian function."""
         for r in rs:
@@ -92,6 +115,24 @@ class TestBuilder(unittest.TestCase):
                     self.assertAlmostEqual(celestial.ra, ra)
                     self.assertAlmostEqual(celestial.dec, dec)
 
+    def test_raDecToCartesianMany(self):
+        """Test the raDecToCartesianMany function."""
+        cartesian = raDecToCartesianMany(celestialPositions)
+        self.assertIsInstance(cartesian, CartesianVectorArray)
+        for (v, c) in zip(celestialPositions, cartesian):
+            self.assertTrue(np.allclose(c, raDecToCartesian(RaDecVector(*v))))
+
+    def test_cartesianToRaDecMany(self):
+        """Test the cartesianToRaDecMany function."""
+        out = cartesianPositions.copy()
+        celestial = cartesianToRaDecMany(out, out=out)
+        self.assertIs(celestial, out)
+        for (v, c) in zip(cartesianPositions, celestial):
+            self.assertTrue(np.allclose(
+                c, cartesianToRaDec(CartesianVector(*v))))
+        self.assertIsInstance(cartesianToRaDecMany(cartesianPositions),
+                              RaDecVectorArray)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -10,13 +10,18 @@ from math import atan2, cos, pi, sin, sqrt
 import unittest
 
 import numpy as np
-from emmpy.math.coordinates.cartesianvector import CartesianVector
+from emmpy.math.coordinates.cartesianvector import (
+    CartesianVector, CartesianVectorArray
+)
 from emmpy.math.matrices.matrix3d import Matrix3D
 from emmpy.math.coordinates.sphericalvector import (
-    SphericalVector, sphericalToCartesian, cartesianToSpherical,
+    SphericalVector, SphericalVectorArray, sphericalToCartesian, cartesianToSpherical,
     getSphericalBasisToCartesianBasisTransformation,
     getCartesianBasisToSphericalBasisTransformation,
-    sphericalBasisToCartesianBasis, cartesianBasisToSphericalBasis
+    sphericalBasisToCartesianBasis, cartesianBasisToSphericalBasis,
+    SphericalVectorArray, sphericalToCartesianMany, cartesianToSphericalMany,
+    sphericalBasisToCartesianBasisMany, cartesianBasisToSphericalBasisMany,
+    sphericalFieldToCartesianMany, cartesianFieldToSphericalMany
 )
 
 
@@ -29,6 +34,17 @@ rs = np.linspace(0, 10, n)
 thetas = np.linspace(0, pi, n)
 phis = np.linspace(0, 2*pi, n)
 
+# Coarser grids of positions and values for the array functions. The
+# Cartesian grid includes the origin and points on the z-axis.
+cartesianPositions = np.stack(
+    np.meshgrid(xs[::4], ys[::4], zs[::4], indexing="ij"), axis=-1
+).reshape((-1, 3))
+sphericalPositions = np.stack(
+    np.meshgrid(rs[::4], thetas[::4], phis[::4], indexing="ij"), axis=-1
+).reshape((-1, 3))
+values = np.random.default_rng(1).uniform(
+    -5, 5, (len(cartesianPositions), 3))
+
 
 class TestBuilder(unittest.TestCase):
     """Tests for the sphericalvector module."""
@@ -71,6 +87,18 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(KeyError):
             v.bad = 0
 
+    def test_SphericalVectorArray(self):
+        """Test the SphericalVectorArray class."""
+        v = SphericalVectorArray([[1.1, 2.2, 3.3], [4.4, 5.5, 6.6]])
+        self.assertIsInstance(v, SphericalVectorArray)
+        self.assertTrue(np.allclose(v.r, (1.1, 4.4)))
+        self.assertTrue(np.allclose(v.theta, (2.2, 5.5)))
+        self.assertTrue(np.allclose(v.phi, (3.3, 6.6)))
+        v.theta = 0.0
+        self.assertTrue(np.allclose(v[:, 1], 0.0))
+        with self.assertRaises(AttributeError):
+            v.bad
+
     def test_sphericalToCartesian(self):
         """Test the sphericalToCartesian function."""
         for r in rs:
@@ -205,6 +233,72 @@ class TestBuilder(unittest.TestCase):
                                                sphericalValue_ref[row]
                         )
 
+    def test_sphericalToCartesianMany(self):
+        """Test the sphericalToCartesianMany function."""
+        cartesian = sphericalToCartesianMany(sphericalPositions)
+        self.assertIsInstance(cartesian, CartesianVectorArray)
+        for (v, c) in zip(sphericalPositions, cartesian):
+            self.assertTrue(np.allclose(
+                c, sphericalToCartesian(SphericalVector(*v))))
+        out = sphericalPositions.copy()
+        self.assertIs(sphericalToCartesianMany(out, out=out), out)
+        self.assertTrue(np.allclose(out, cartesian))
+
+    def test_cartesianToSphericalMany(self):
+        """Test the cartesianToSphericalMany function."""
+        spherical = cartesianToSphericalMany(cartesianPositions)
+        self.assertIsInstance(spherical, SphericalVectorArray)
+        for (v, s) in zip(cartesianPositions, spherical):
+            self.assertTrue(np.allclose(
+                s, cartesianToSpherical(CartesianVector(*v))))
+
+    def test_sphericalBasisToCartesianBasisMany(self):
+        """Test the sphericalBasisToCartesianBasisMany function."""
+        cartesian = sphericalBasisToCartesianBasisMany(
+            sphericalPositions, values)
+        self.assertIsInstance(cartesian, CartesianVectorArray)
+        for (p, v, c) in zip(sphericalPositions, values, cartesian):
+            self.assertTrue(np.allclose(c, sphericalBasisToCartesianBasis(
+                SphericalVector(*p), SphericalVector(*v))))
+        # Values with an extra axis.
+        expansion = np.stack((values, 2*values), axis=1)
+        cartesian = sphericalBasisToCartesianBasisMany(
+            sphericalPositions, expansion)
+        self.assertEqual(cartesian.shape, expansion.shape)
+        self.assertTrue(np.allclose(
+            cartesian, np.stack((cartesian[:, 0], 2*cartesian[:, 0]), 1)))
+
+    def test_cartesianBasisToSphericalBasisMany(self):
+        """Test the cartesianBasisToSphericalBasisMany function."""
+        spherical = cartesianBasisToSphericalBasisMany(
+            cartesianPositions, values)
+        self.assertIsInstance(spherical, SphericalVectorArray)
+        for (p, v, s) in zip(cartesianPositions, values, spherical):
+            self.assertTrue(np.allclose(s, cartesianBasisToSphericalBasis(
+                CartesianVector(*p), CartesianVector(*v))))
+
+    def test_sphericalFieldToCartesianMany(self):
+        """Test the sphericalFieldToCartesianMany function."""
+        positionOut = np.empty((len(values), 3))
+        (p, v) = sphericalFieldToCartesianMany(
+            sphericalPositions, values, positionOut=positionOut)
+        self.assertIs(p, positionOut)
+        self.assertTrue(np.allclose(
+            p, sphericalToCartesianMany(sphericalPositions)))
+        self.assertTrue(np.allclose(v, sphericalBasisToCartesianBasisMany(
+            sphericalPositions, values)))
+
+    def test_cartesianFieldToSphericalMany(self):
+        """Test the cartesianFieldToSphericalMany function."""
+        valueOut = values.copy()
+        (p, v) = cartesianFieldToSphericalMany(
+            cartesianPositions, valueOut, valueOut=valueOut)
+        self.assertIs(v, valueOut)
+        self.assertTrue(np.allclose(
+            p, cartesianToSphericalMany(cartesianPositions)))
+        self.assertTrue(np.allclose(v, cartesianBasisToSphericalBasisMany(
+            cartesianPositions, values)))
+
 
 if __name__ == "__main__":
     unittest.main()
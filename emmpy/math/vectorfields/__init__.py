@@ -8,6 +8,9 @@ cartesianvectorfield.py
 cartesianvectorfieldvalue.py
 cylindricalvectorfield.py
 cylindricalvectorfieldvalue.py
+differentiation.py
+gridevaluation.py
+parallelevaluation.py
 sphericalvectorfield.py
 sphericalvectorfieldvalue.py
 vectorfield.py
@@ -17,3 +20,9 @@ Packages
 --------
 tests
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
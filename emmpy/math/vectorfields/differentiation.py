@@ -0,0 +1,406 @@
+"""Finite-difference derivatives, curl and divergence of vector fields.
+
+Finite-difference derivatives, curl and divergence of vector fields.
+
+The derivatives of a field are returned as an array of Jacobian matrices,
+indexed by [..., i, j] for dF_i/dx_j, from which the curl and divergence
+are computed. On a regular Cartesian grid, the field is evaluated once
+on a grid padded by the half-width of the stencil, and every field value
+is shared by the stencils of its neighbours. At scattered locations, the
+field is evaluated at all of the offset locations of all of the stencils
+with a single call to evaluateMany().
+
+Fields which can compute their own derivatives provide a
+differentiateMany() method, which returns the values and Jacobians at an
+array of locations in one pass. The default VectorField.differentiateMany()
+uses evaluateWithDifferences() from this module, and
+cylindricalToCartesianJacobian() converts derivatives computed in
+cylindrical coordinates, as needed by the cylindrical expansions.
+
+For the magnetic field B in nT with locations in Earth radii, the curl is
+in nT/Re, and currentDensity() converts it to the current density
+J = curl(B)/mu0 in nA/m**2. The divergence of a magnetic field should
+vanish, so its size relative to the derivatives measures the accuracy of
+a field model and its deformations.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import numpy as np
+
+from emmpy.math.vectorfields.gridevaluation import (
+    CartesianGrid, evaluateGrid
+)
+
+
+# Central difference stencils for the first derivative, as
+# (offsets, weights) for a unit step, indexed by order of accuracy.
+STENCILS = {
+    2: (np.array([-1, 1]), np.array([-1, 1])/2),
+    4: (np.array([-2, -1, 1, 2]), np.array([1, -8, 8, -1])/12),
+}
+
+# Default step size for scattered locations.
+DEFAULT_STEP = 1e-3
+
+# Magnetic permeability of free space (H/m).
+MU0 = 4e-7*np.pi
+
+# Mean radius of the Earth (m), the length unit of the Tsyganenko models.
+EARTH_RADIUS = 6371.2e3
+
+
+def _stencil(order):
+    """Return the stencil for an order of accuracy."""
+    if order not in STENCILS:
+        raise ValueError("order must be one of %s, got %r" %
+                         (sorted(STENCILS), order))
+    return STENCILS[order]
+
+
+def differentiateMany(field, positions, h=DEFAULT_STEP, order=2):
+    """Compute the Jacobian of a field at an array of locations.
+
+    Compute the Jacobian of a field at an array of locations with central
+    differences. The field is evaluated at the 3*order offset locations
+    around every location with a single call to evaluateMany().
+
+    Parameters
+    ----------
+    field : VectorField
+        The field to differentiate.
+    positions : array-like of float, shape (N, 3)
+        Cartesian locations for the derivatives.
+    h : float, optional
+        Step size.
+    order : int, optional
+        Order of accuracy of the stencil, 2 or 4.
+
+    Returns
+    -------
+    jacobian : np.ndarray of float, shape (N, 3, 3)
+        dF_i/dx_j at each location, indexed by [n, i, j].
+
+    Raises
+    ------
+    ValueError
+        If order is not supported, or h is not positive.
+    """
+    (offsets, weights) = _stencil(order)
+    if h <= 0:
+        raise ValueError("h must be positive, got %r" % h)
+    positions = np.asarray(positions, dtype=float)
+
+    # Offset locations, indexed by [n, j, k] for step k along axis j.
+    steps = h*offsets[:, np.newaxis]*np.eye(3)[:, np.newaxis, :]
+    shifted = positions[:, np.newaxis, np.newaxis, :] + steps
+    values = field.evaluateMany(shifted.reshape((-1, 3))).reshape(
+        shifted.shape)
+    return np.einsum("njki,k->nij", values, weights/h)
+
+
+def _evaluateWithDifferences(evaluate, positions, h, order):
+    """Evaluate a function and its Jacobian with central differences.
+
+    evaluate() maps an array of shape (P, 3) to an array of shape
+    (P, ..., 3), and is called once for the locations and all of the
+    offset locations together.
+    """
+    (offsets, weights) = _stencil(order)
+    if h <= 0:
+        raise ValueError("h must be positive, got %r" % h)
+    positions = np.asarray(positions, dtype=float)
+    N = len(positions)
+    steps = h*offsets[:, np.newaxis]*np.eye(3)[:, np.newaxis, :]
+    shifted = positions[:, np.newaxis, np.newaxis, :] + steps
+    values = evaluate(np.concatenate((positions, shifted.reshape((-1, 3)))))
+    shiftedValues = values[N:].reshape(shifted.shape[:-1] + values.shape[1:])
+    jacobian = np.einsum("njk...i,k->n...ij", shiftedValues, weights/h)
+    return (values[:N], jacobian)
+
+
+def evaluateWithDifferences(field, positions, h=DEFAULT_STEP, order=2):
+    """Evaluate a field and its Jacobian at an array of locations.
+
+    Evaluate a field and its Jacobian at an array of locations, with the
+    Jacobian computed with central differences. The field is evaluated at
+    the locations and at all of the offset locations with a single call
+    to evaluateMany().
+
+    Parameters
+    ----------
+    field : VectorField
+        The field to evaluate.
+    positions : array-like of float, shape (N, 3)
+        Cartesian locations for evaluation.
+    h : float, optional
+        Step size.
+    order : int, optional
+        Order of accuracy of the stencil, 2 or 4.
+
+    Returns
+    -------
+    values : np.ndarray of float, shape (N, 3)
+        Field value at each location.
+    jacobian : np.ndarray of float, shape (N, 3, 3)
+        dF_i/dx_j at each location, indexed by [n, i, j].
+
+    Raises
+    ------
+    ValueError
+        If order is not supported, or h is not positive.
+    """
+    return _evaluateWithDifferences(field.evaluateMany, positions, h, order)
+
+
+def evaluateExpansionWithDifferences(field, positions, h=DEFAULT_STEP,
+                                     order=2):
+    """Evaluate an expansion and its Jacobians at an array of locations.
+
+    Evaluate the expansion of a basis vector field and the Jacobian of
+    each basis function at an array of locations, with the Jacobians
+    computed with central differences. The expansion is evaluated at the
+    locations and at all of the offset locations with a single call to
+    evaluateExpansionMany().
+
+    Parameters
+    ----------
+    field : BasisVectorField
+        The field to evaluate.
+    positions : array-like of float, shape (N, 3)
+        Cartesian locations for evaluation.
+    h : float, optional
+        Step size.
+    order : int, optional
+        Order of accuracy of the stencil, 2 or 4.
+
+    Returns
+    -------
+    values : np.ndarray of float, shape (N, nb, 3)
+        Basis vectors at each location.
+    jacobian : np.ndarray of float, shape (N, nb, 3, 3)
+        Jacobian of each basis function at each location, indexed by
+        [n, b, i, j].
+
+    Raises
+    ------
+    ValueError
+        If order is not supported, or h is not positive.
+    """
+    return _evaluateWithDifferences(field.evaluateExpansionMany, positions,
+                                    h, order)
+
+
+def cylindricalToCartesianJacobian(phi, rhoInv, b, dbdRho, dbdPhi, dbdZ):
+    """Convert a field and its cylindrical derivatives to Cartesian.
+
+    Convert the cylindrical components of a field, and their derivatives
+    with respect to the cylindrical coordinates, to the Cartesian
+    components of the field and its Jacobian. The derivative with respect
+    to phi includes the rotation of the cylindrical unit vectors.
+
+    Parameters
+    ----------
+    phi, rhoInv : array-like of float
+        Azimuth of each location, and the reciprocal of its distance from
+        the z-axis, which broadcast against b[..., 0].
+    b : array-like of float, shape (..., 3)
+        (rho, phi, z) components of the field.
+    dbdRho, dbdPhi, dbdZ : array-like of float, shape (..., 3)
+        Derivatives of the components of b with respect to rho, phi and z.
+
+    Returns
+    -------
+    values : np.ndarray of float, shape (..., 3)
+        Cartesian components of the field.
+    jacobian : np.ndarray of float, shape (..., 3, 3)
+        dF_i/dx_j, indexed by [..., i, j].
+    """
+    b = np.asarray(b, dtype=float)
+    cosPhi = np.cos(phi)
+    sinPhi = np.sin(phi)
+
+    # (1/rho)*d/dphi of the cylindrical components, as seen in a fixed
+    # frame.
+    dPhi = np.array(dbdPhi, dtype=float)
+    dPhi[..., 0] -= b[..., 1]
+    dPhi[..., 1] += b[..., 0]
+    dPhi *= np.asarray(rhoInv)[..., np.newaxis]
+
+    # d/dx, d/dy and d/dz of the cylindrical components, indexed by
+    # [..., component, j].
+    c = cosPhi[..., np.newaxis]
+    s = sinPhi[..., np.newaxis]
+    d = np.stack((c*dbdRho - s*dPhi, s*dbdRho + c*dPhi,
+                  np.broadcast_to(dbdZ, dPhi.shape)), axis=-1)
+
+    # Rotate the components from cylindrical to Cartesian.
+    values = np.empty(b.shape)
+    values[..., 0] = cosPhi*b[..., 0] - sinPhi*b[..., 1]
+    values[..., 1] = sinPhi*b[..., 0] + cosPhi*b[..., 1]
+    values[..., 2] = b[..., 2]
+    jacobian = np.empty(d.shape)
+    jacobian[..., 0, :] = c*d[..., 0, :] - s*d[..., 1, :]
+    jacobian[..., 1, :] = s*d[..., 0, :] + c*d[..., 1, :]
+    jacobian[..., 2, :] = d[..., 2, :]
+    return (values, jacobian)
+
+
+def differentiateGridValues(values, spacing, order=2):
+    """Compute the Jacobian of a field from its values on a grid.
+
+    Compute the Jacobian of a field from its values on a regular Cartesian
+    grid, with central differences. The derivatives are computed at the
+    interior points of the grid, which are at least order/2 points from
+    every edge.
+
+    Parameters
+    ----------
+    values : array-like of float, shape (A, B, C, 3)
+        Field values on the grid.
+    spacing : array-like of float, shape (3,)
+        Spacing of the grid along each axis.
+    order : int, optional
+        Order of accuracy of the stencil, 2 or 4.
+
+    Returns
+    -------
+    jacobian : np.ndarray of float, shape (A - order, B - order,
+        C - order, 3, 3)
+        dF_i/dx_j at each interior point, indexed by [a, b, c, i, j].
+
+    Raises
+    ------
+    ValueError
+        If order is not supported, or the grid has no interior points.
+    """
+    (offsets, weights) = _stencil(order)
+    values = np.asarray(values, dtype=float)
+    w = order//2
+    interior = tuple(n - 2*w for n in values.shape[:3])
+    if min(interior) < 1:
+        raise ValueError("a grid of shape %s has no interior points for "
+                         "order %d" % (values.shape[:3], order))
+    jacobian = np.zeros(interior + (3, 3))
+    for j in range(3):
+        for (offset, weight) in zip(offsets, weights):
+            index = [slice(w, w + n) for n in interior]
+            index[j] = slice(w + offset, w + offset + interior[j])
+            jacobian[..., j] += weight*values[tuple(index)]
+        jacobian[..., j] /= spacing[j]
+    return jacobian
+
+
+def differentiateGrid(field, grid, order=2):
+    """Compute the Jacobian of a field on a regular Cartesian grid.
+
+    Compute the Jacobian of a field at every point of a regular Cartesian
+    grid. The field is evaluated once, with evaluateGrid(), on the grid
+    extended by order/2 points beyond each edge, and the derivatives are
+    computed from those values.
+
+    Parameters
+    ----------
+    field : VectorField
+        The field to differentiate.
+    grid : CartesianGrid
+        Grid with uniform spacing along each axis, and at least 2 points
+        along each axis.
+    order : int, optional
+        Order of accuracy of the stencil, 2 or 4.
+
+    Returns
+    -------
+    jacobian : np.ndarray of float, shape grid.shape + (3, 3)
+        dF_i/dx_j at each grid point, indexed by [a, b, c, i, j].
+
+    Raises
+    ------
+    TypeError
+        If grid is not a CartesianGrid.
+    ValueError
+        If order is not supported, or the grid spacing is not uniform.
+    """
+    _stencil(order)
+    if not isinstance(grid, CartesianGrid):
+        raise TypeError("grid must be a CartesianGrid, got %s" %
+                        type(grid).__name__)
+    w = order//2
+    axes = []
+    spacing = []
+    for coordinates in (grid.x, grid.y, grid.z):
+        steps = np.diff(coordinates)
+        if len(steps) == 0 or steps[0] == 0 or (
+                not np.allclose(steps, steps[0])):
+            raise ValueError("grid spacing must be uniform and nonzero")
+        d = steps[0]
+        axes.append(np.concatenate((
+            coordinates[0] + d*np.arange(-w, 0), coordinates,
+            coordinates[-1] + d*np.arange(1, w + 1))))
+        spacing.append(d)
+    values = evaluateGrid(field, CartesianGrid(*axes))
+    return differentiateGridValues(values, spacing, order)
+
+
+def curl(jacobian):
+    """Compute the curl of a field from its Jacobian.
+
+    Compute the curl of a field from its Jacobian.
+
+    Parameters
+    ----------
+    jacobian : array-like of float, shape (..., 3, 3)
+        dF_i/dx_j, indexed by [..., i, j].
+
+    Returns
+    -------
+    result : np.ndarray of float, shape (..., 3)
+        Curl of the field.
+    """
+    jacobian = np.asarray(jacobian, dtype=float)
+    result = np.empty(jacobian.shape[:-1])
+    result[..., 0] = jacobian[..., 2, 1] - jacobian[..., 1, 2]
+    result[..., 1] = jacobian[..., 0, 2] - jacobian[..., 2, 0]
+    result[..., 2] = jacobian[..., 1, 0] - jacobian[..., 0, 1]
+    return result
+
+
+def divergence(jacobian):
+    """Compute the divergence of a field from its Jacobian.
+
+    Compute the divergence of a field from its Jacobian.
+
+    Parameters
+    ----------
+    jacobian : array-like of float, shape (..., 3, 3)
+        dF_i/dx_j, indexed by [..., i, j].
+
+    Returns
+    -------
+    result : np.ndarray of float, shape (...)
+        Divergence of the field.
+    """
+    return np.trace(jacobian, axis1=-2, axis2=-1)
+
+
+def currentDensity(jacobian):
+    """Compute the current density from the Jacobian of a magnetic field.
+
+    Compute the current density J = curl(B)/mu0 from the Jacobian of a
+    magnetic field in nT, with locations in Earth radii.
+
+    Parameters
+    ----------
+    jacobian : array-like of float, shape (..., 3, 3)
+        dB_i/dx_j in nT/Re, indexed by [..., i, j].
+
+    Returns
+    -------
+    result : np.ndarray of float, shape (..., 3)
+        Current density (nA/m**2).
+    """
+    # nT/Re to T/m is 1e-9/EARTH_RADIUS, and A/m**2 to nA/m**2 is 1e9.
+    return curl(jacobian)/(EARTH_RADIUS*MU0)
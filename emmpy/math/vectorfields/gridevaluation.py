@@ -0,0 +1,332 @@
+"""Evaluation of vector fields on regular grids.
+
+Evaluation of vector fields on regular grids.
+
+A regular grid is the outer product of three 1-D arrays of coordinates,
+either (x, y, z) or (rho, phi, z). The grid is a set of columns parallel
+to the z-axis, one per (x, y) or (rho, phi) pair, and each column holds
+the same set of z values.
+
+Fields whose expansions separate in cylindrical coordinates (the thin
+current sheets and their cylindrical harmonic shielding fields) provide
+an evaluateGrid() method, which computes the rho-only Bessel terms once
+per column (or once per rho value for a cylindrical grid), the phi-only
+trig terms once per column (or once per phi value), and the z-only terms
+once per z value, and combines them with broadcasting. All other fields
+are evaluated with evaluateMany() at the grid positions, in chunks of
+rows to limit memory use.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import numpy as np
+
+
+# Default maximum number of grid positions evaluated at once by fields
+# without a grid evaluation method.
+DEFAULT_CHUNK_SIZE = 2**16
+
+
+def _coordinates(values, name):
+    """Convert grid coordinates to a 1-D array of float."""
+    values = np.array(values, dtype=float)
+    if values.ndim != 1 or len(values) == 0:
+        raise ValueError("%s must be a non-empty 1-D array, got shape %s" %
+                         (name, values.shape))
+    return values
+
+
+class CartesianGrid:
+    """A regular grid in Cartesian coordinates.
+
+    The grid is indexed by [i, j, k] for the location
+    (x[i], y[j], z[k]).
+
+    Attributes
+    ----------
+    x, y, z : np.ndarray of float
+        Coordinates of the grid lines along each axis.
+    shape : tuple of int
+        Shape (len(x), len(y), len(z)) of the grid.
+    """
+
+    def __init__(self, x, y, z):
+        """Initialize a new CartesianGrid object.
+
+        Initialize a new CartesianGrid object.
+
+        Parameters
+        ----------
+        x, y, z : array-like of float
+            Coordinates of the grid lines along each axis.
+
+        Raises
+        ------
+        ValueError
+            If any of the coordinates is not a non-empty 1-D array.
+        """
+        self.x = _coordinates(x, "x")
+        self.y = _coordinates(y, "y")
+        self.z = _coordinates(z, "z")
+        self.shape = (len(self.x), len(self.y), len(self.z))
+
+    def positions(self):
+        """Return the Cartesian locations of the grid points.
+
+        Return the Cartesian locations of the grid points.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        positions : np.ndarray of float, shape (A*B*C, 3)
+            Location of each grid point, in the order of the flattened
+            grid.
+        """
+        grids = np.meshgrid(self.x, self.y, self.z, indexing="ij")
+        return np.stack(grids, axis=-1).reshape((-1, 3))
+
+    def columns(self):
+        """Return the coordinates of the columns of the grid.
+
+        Return the Cartesian and cylindrical coordinates of the columns of
+        the grid, as arrays which broadcast to shape (A, B, 1).
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        x, y, rho, phi : np.ndarray of float
+            Coordinates of each column, with phi in (-pi, pi].
+        """
+        x = self.x[:, np.newaxis, np.newaxis]
+        y = self.y[np.newaxis, :, np.newaxis]
+        return (x, y, np.hypot(x, y), np.arctan2(y, x))
+
+    def select(self, rows):
+        """Return the grid for a subset of the first axis.
+
+        Return the grid for a subset of the first axis.
+
+        Parameters
+        ----------
+        rows : slice or array-like of int
+            Indices of the grid lines to keep along the first axis.
+
+        Returns
+        -------
+        grid : CartesianGrid
+            The selected part of the grid.
+        """
+        return CartesianGrid(self.x[rows], self.y, self.z)
+
+    def scaled(self, scaleFactor):
+        """Return the grid with all locations scaled.
+
+        Return the grid with all locations scaled.
+
+        Parameters
+        ----------
+        scaleFactor : float
+            Scale factor for the locations.
+
+        Returns
+        -------
+        grid : CartesianGrid
+            The grid of scaled locations.
+        """
+        return CartesianGrid(scaleFactor*self.x, scaleFactor*self.y,
+                             scaleFactor*self.z)
+
+
+class CylindricalGrid:
+    """A regular grid in cylindrical coordinates.
+
+    The grid is indexed by [i, j, k] for the location
+    (rho[i], phi[j], z[k]), where phi is measured from the x-axis toward
+    the y-axis.
+
+    Attributes
+    ----------
+    rho, phi, z : np.ndarray of float
+        Coordinates of the grid lines along each axis.
+    shape : tuple of int
+        Shape (len(rho), len(phi), len(z)) of the grid.
+    """
+
+    def __init__(self, rho, phi, z):
+        """Initialize a new CylindricalGrid object.
+
+        Initialize a new CylindricalGrid object.
+
+        Parameters
+        ----------
+        rho, phi, z : array-like of float
+            Coordinates of the grid lines along each axis.
+
+        Raises
+        ------
+        ValueError
+            If any of the coordinates is not a non-empty 1-D array, or if
+            any rho is negative.
+        """
+        self.rho = _coordinates(rho, "rho")
+        self.phi = _coordinates(phi, "phi")
+        self.z = _coordinates(z, "z")
+        if np.any(self.rho < 0):
+            raise ValueError("rho must not be negative")
+        self.shape = (len(self.rho), len(self.phi), len(self.z))
+
+    def positions(self):
+        """Return the Cartesian locations of the grid points.
+
+        Return the Cartesian locations of the grid points.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        positions : np.ndarray of float, shape (A*B*C, 3)
+            Location of each grid point, in the order of the flattened
+            grid.
+        """
+        (x, y, _, _) = self.columns()
+        grids = np.broadcast_arrays(x, y, self.z)
+        return np.stack(grids, axis=-1).reshape((-1, 3))
+
+    def columns(self):
+        """Return the coordinates of the columns of the grid.
+
+        Return the Cartesian and cylindrical coordinates of the columns of
+        the grid, as arrays which broadcast to shape (A, B, 1). rho only
+        varies along the first axis, and phi along the second.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        x, y, rho, phi : np.ndarray of float
+            Coordinates of each column.
+        """
+        rho = self.rho[:, np.newaxis, np.newaxis]
+        phi = self.phi[np.newaxis, :, np.newaxis]
+        return (rho*np.cos(phi), rho*np.sin(phi), rho, phi)
+
+    def select(self, rows):
+        """Return the grid for a subset of the first axis.
+
+        Return the grid for a subset of the first axis.
+
+        Parameters
+        ----------
+        rows : slice or array-like of int
+            Indices of the grid lines to keep along the first axis.
+
+        Returns
+        -------
+        grid : CylindricalGrid
+            The selected part of the grid.
+        """
+        return CylindricalGrid(self.rho[rows], self.phi, self.z)
+
+    def scaled(self, scaleFactor):
+        """Return the grid with all locations scaled.
+
+        Return the grid with all locations scaled.
+
+        Parameters
+        ----------
+        scaleFactor : float
+            Scale factor for the locations.
+
+        Returns
+        -------
+        grid : CylindricalGrid
+            The grid of scaled locations.
+        """
+        # A negative scale factor reflects each column through the z-axis.
+        phi = self.phi if scaleFactor >= 0 else self.phi + np.pi
+        return CylindricalGrid(abs(scaleFactor)*self.rho, phi,
+                               scaleFactor*self.z)
+
+
+def evaluateGrid(field, grid, chunkSize=DEFAULT_CHUNK_SIZE):
+    """Evaluate a vector field on a regular grid.
+
+    Evaluate a vector field on a regular grid. Fields with an
+    evaluateGrid() method are evaluated with it, and all other fields are
+    evaluated with evaluateMany(), one chunk of rows of the grid at a
+    time.
+
+    Parameters
+    ----------
+    field : VectorField
+        The field to evaluate.
+    grid : CartesianGrid or CylindricalGrid
+        The grid of locations.
+    chunkSize : int, optional
+        Approximate maximum number of grid points passed to evaluateMany()
+        at once.
+
+    Returns
+    -------
+    values : np.ndarray of float, shape grid.shape + (3,)
+        Cartesian field vector at each grid point.
+    """
+    if hasattr(field, "evaluateGrid"):
+        return field.evaluateGrid(grid)
+    values = np.empty(grid.shape + (3,))
+    rowSize = grid.shape[1]*grid.shape[2]
+    rowsPerChunk = max(1, chunkSize//rowSize)
+    for i in range(0, grid.shape[0], rowsPerChunk):
+        rows = slice(i, i + rowsPerChunk)
+        chunk = field.evaluateMany(grid.select(rows).positions())
+        values[rows] = chunk.reshape(values[rows].shape)
+    return values
+
+
+def evaluateGridInRows(evaluateRows, grid, termsPerRow,
+                       maxTerms=DEFAULT_CHUNK_SIZE*64, valueShape=(3,)):
+    """Evaluate a separable field on a grid, one chunk of rows at a time.
+
+    Evaluate a field on a grid by calling evaluateRows() for chunks of
+    rows of the grid, so that no more than about maxTerms intermediate
+    values are held at once. This is a helper for the evaluateGrid()
+    methods of separable fields.
+
+    Parameters
+    ----------
+    evaluateRows : callable
+        Function which takes a grid and returns the values on it, with
+        shape grid.shape + valueShape.
+    grid : CartesianGrid or CylindricalGrid
+        The grid of locations.
+    termsPerRow : int
+        Number of intermediate values needed per row of the grid.
+    maxTerms : int, optional
+        Approximate maximum number of intermediate values to hold at once.
+    valueShape : tuple of int, optional
+        Shape of the value at each grid point.
+
+    Returns
+    -------
+    values : np.ndarray of float, shape grid.shape + valueShape
+        Value at each grid point.
+    """
+    values = np.empty(grid.shape + tuple(valueShape))
+    rowsPerChunk = max(1, maxTerms//max(1, termsPerRow))
+    for i in range(0, grid.shape[0], rowsPerChunk):
+        rows = slice(i, i + rowsPerChunk)
+        values[rows] = evaluateRows(grid.select(rows))
+    return values
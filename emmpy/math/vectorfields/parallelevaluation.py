@@ -0,0 +1,303 @@
+"""Evaluate a vector field in a pool of worker processes.
+
+Evaluate a vector field in a pool of worker processes.
+
+The field is pickled once, and unpickled once in each worker process when
+the worker starts. The positions are split into chunks, and each chunk is
+evaluated with a single call to evaluateMany() in whichever worker is
+free. Fields built with the TS07DModelBuilder, or composed with the
+functions in the vectorfield and basisvectorfields modules, can be
+pickled.
+
+evaluateParallel() sends each chunk of positions to a worker, and each
+chunk of values back, through a pipe. For very large arrays,
+evaluateShared() instead places the positions and values in shared
+memory, or in memory-mapped files, which every worker maps. Each worker
+reads its positions and writes its values in place, so the only messages
+are the bounds of each chunk.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.util import Finalize
+import os
+import pickle
+
+import numpy as np
+
+
+# Default maximum number of positions in each chunk.
+DEFAULT_CHUNK_SIZE = 10000
+
+# The field evaluated by this worker process, set by _initializeWorker().
+_workerField = None
+
+# The positions and values arrays mapped by this worker process, and the
+# shared memory blocks which hold them, set by _initializeSharedWorker().
+_workerPositions = None
+_workerValues = None
+_workerSharedMemory = []
+
+
+def _initializeWorker(pickledField):
+    """Unpickle the field to evaluate in a worker process."""
+    global _workerField
+    _workerField = pickle.loads(pickledField)
+
+
+def _evaluateChunk(positions):
+    """Evaluate the worker field at a chunk of positions."""
+    return _workerField.evaluateMany(positions)
+
+
+def _initializeSharedWorker(pickledField, positionsDescriptor,
+                            valuesDescriptor):
+    """Unpickle the field and map the arrays in a worker process."""
+    global _workerPositions, _workerValues
+    _initializeWorker(pickledField)
+    # Worker processes do not run atexit hooks with every start method,
+    # but they do run the multiprocessing finalizers.
+    Finalize(None, _closeWorkerSharedMemory, exitpriority=0)
+    _workerPositions = _openArray(positionsDescriptor, writable=False)
+    _workerValues = _openArray(valuesDescriptor, writable=True)
+
+
+def _closeWorkerSharedMemory():
+    """Release the mapped arrays and close the shared memory blocks."""
+    global _workerPositions, _workerValues
+    # The arrays must be released before their blocks are closed. Only
+    # the parent process unlinks the blocks.
+    _workerPositions = None
+    _workerValues = None
+    while _workerSharedMemory:
+        _workerSharedMemory.pop().close()
+
+
+def _evaluateSlice(start, stop):
+    """Evaluate the worker field at a slice of the mapped positions."""
+    positions = np.asarray(_workerPositions[start:stop], dtype=float)
+    _workerValues[start:stop] = _workerField.evaluateMany(positions)
+    return stop - start
+
+
+def _checkPoolSettings(workers, chunkSize):
+    """Check the pool settings, and return the number of workers."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1, got %r" % workers)
+    if chunkSize < 1:
+        raise ValueError("chunkSize must be at least 1, got %r" % chunkSize)
+    return workers
+
+
+def _numChunks(numPositions, workers, chunkSize):
+    """Return the number of chunks to split the positions into."""
+    numChunks = max(workers, -(-numPositions//chunkSize))
+    return min(numChunks, numPositions)
+
+
+def _fileDescriptor(array):
+    """Describe an array which is a view of a memory-mapped file.
+
+    Return a description of an array which can be used to map the same
+    data in another process, if the array is a C-contiguous view of a
+    memory-mapped file which is shared with other processes. Otherwise,
+    return None.
+    """
+    if (not isinstance(array, np.memmap) or array.filename is None or
+            array.mode == "c" or not array.flags.c_contiguous):
+        return None
+    base = array
+    while isinstance(base, np.ndarray):
+        base = base.base
+    if not isinstance(base, mmap.mmap):
+        return None
+    # The mapping starts at the allocation boundary before the offset.
+    mapStart = array.offset - array.offset % mmap.ALLOCATIONGRANULARITY
+    mapAddress = np.frombuffer(base, dtype=np.uint8).ctypes.data
+    offset = mapStart + array.ctypes.data - mapAddress
+    return ("file", array.filename, offset, array.shape, array.dtype.str)
+
+
+def _openArray(descriptor, writable):
+    """Map an array described by _fileDescriptor() or a shared block."""
+    (kind, name, offset, shape, dtype) = descriptor
+    if kind == "file":
+        return np.memmap(name, dtype=dtype, mode="r+" if writable else "r",
+                         offset=offset, shape=shape)
+    sharedMemory = SharedMemory(name=name)
+    _workerSharedMemory.append(sharedMemory)
+    return np.ndarray(shape, dtype=dtype, buffer=sharedMemory.buf,
+                      offset=offset)
+
+
+def _createSharedArray(shape, sharedMemory):
+    """Create an array of float in a new shared memory block."""
+    size = int(np.prod(shape))*np.dtype(float).itemsize
+    block = SharedMemory(create=True, size=max(size, 1))
+    sharedMemory.append(block)
+    array = np.ndarray(shape, dtype=float, buffer=block.buf)
+    return (array, ("shared", block.name, 0, shape, array.dtype.str))
+
+
+def evaluateParallel(field, positions, workers=None,
+                     chunkSize=DEFAULT_CHUNK_SIZE, mpContext=None):
+    """Evaluate a vector field at an array of positions in parallel.
+
+    Evaluate a vector field at an array of positions, using a pool of
+    worker processes. The field is sent to each worker only once, when
+    the worker starts. The positions are split into at least one chunk
+    per worker, with at most chunkSize positions in each chunk.
+
+    Parameters
+    ----------
+    field : VectorField
+        The field to evaluate. It must be picklable.
+    positions : array-like of float, shape (N, 3)
+        Positions to evaluate the field.
+    workers : int, optional
+        Number of worker processes. By default, one per CPU.
+    chunkSize : int, optional
+        Maximum number of positions sent to a worker at once.
+    mpContext : multiprocessing context, optional
+        Context used to start the workers. By default, the multiprocessing
+        default context is used.
+
+    Returns
+    -------
+    values : np.ndarray of float, shape (N, 3)
+        Values of the field at the positions.
+
+    Raises
+    ------
+    ValueError
+        If workers or chunkSize is less than 1.
+    """
+    workers = _checkPoolSettings(workers, chunkSize)
+    positions = np.asarray(positions, dtype=float)
+    if len(positions) == 0:
+        return np.empty(positions.shape)
+
+    # Pickle the field here, so a field which cannot be pickled fails
+    # before any workers are started.
+    pickledField = pickle.dumps(field)
+    chunks = np.array_split(
+        positions, _numChunks(len(positions), workers, chunkSize))
+    with ProcessPoolExecutor(
+            max_workers=workers, mp_context=mpContext,
+            initializer=_initializeWorker,
+            initargs=(pickledField,)) as executor:
+        values = list(executor.map(_evaluateChunk, chunks))
+    return np.concatenate(values)
+
+
+def evaluateShared(field, positions, out=None, workers=None,
+                   chunkSize=DEFAULT_CHUNK_SIZE, mpContext=None):
+    """Evaluate a vector field in parallel, using shared arrays.
+
+    Evaluate a vector field at an array of positions, using a pool of
+    worker processes which share the positions and values arrays. Arrays
+    which are views of a memory-mapped file (np.memmap objects, not opened
+    in copy-on-write mode) are mapped directly by each worker, so
+    positions and values larger than memory can be used. Other positions
+    are copied once into a shared memory block. If out is not a
+    memory-mapped file, the values are computed in a shared memory block,
+    and copied to out at the end.
+
+    Parameters
+    ----------
+    field : VectorField
+        The field to evaluate. It must be picklable.
+    positions : array-like of float, shape (N, 3)
+        Positions to evaluate the field.
+    out : np.ndarray of float, shape (N, 3), optional
+        Array to hold the values.
+    workers : int, optional
+        Number of worker processes. By default, one per CPU.
+    chunkSize : int, optional
+        Maximum number of positions evaluated by a worker at once.
+    mpContext : multiprocessing context, optional
+        Context used to start the workers. By default, the multiprocessing
+        default context is used.
+
+    Returns
+    -------
+    out : np.ndarray of float, shape (N, 3)
+        Values of the field at the positions.
+
+    Raises
+    ------
+    ValueError
+        If workers or chunkSize is less than 1, or if out is not a
+        writable array of the same shape as positions.
+    """
+    workers = _checkPoolSettings(workers, chunkSize)
+    if not isinstance(positions, np.ndarray):
+        positions = np.asarray(positions, dtype=float)
+    if out is None:
+        out = np.empty(positions.shape)
+    elif out.shape != positions.shape or not out.flags.writeable:
+        raise ValueError("out must be a writable array of shape %r" %
+                         (positions.shape,))
+    if len(positions) == 0:
+        return out
+
+    pickledField = pickle.dumps(field)
+    sharedMemory = []
+    sharedPositions = None
+    sharedValues = None
+    try:
+        try:
+            # Share the positions, copying them only if they are not already
+            # in a memory-mapped file.
+            positionsDescriptor = _fileDescriptor(positions)
+            if positionsDescriptor is None:
+                (sharedPositions, positionsDescriptor) = _createSharedArray(
+                    positions.shape, sharedMemory)
+                sharedPositions[...] = positions
+            valuesDescriptor = _fileDescriptor(out)
+            if valuesDescriptor is None:
+                (sharedValues, valuesDescriptor) = _createSharedArray(
+                    positions.shape, sharedMemory)
+
+            # Each worker maps the arrays once, and evaluates slices of them.
+            bounds = np.linspace(
+                0, len(positions),
+                _numChunks(len(positions), workers, chunkSize) + 1
+            ).astype(int)
+            with ProcessPoolExecutor(
+                    max_workers=workers, mp_context=mpContext,
+                    initializer=_initializeSharedWorker,
+                    initargs=(pickledField, positionsDescriptor,
+                              valuesDescriptor)) as executor:
+                futures = [
+                    executor.submit(_evaluateSlice, int(start), int(stop))
+                    for (start, stop) in zip(bounds[:-1], bounds[1:])
+                ]
+                for future in futures:
+                    future.result()
+
+            if sharedValues is not None:
+                out[...] = sharedValues
+            elif isinstance(out, np.memmap):
+                out.flush()
+        finally:
+            # The arrays must be released before their blocks are closed,
+            # or closing them fails.
+            sharedPositions = None
+            sharedValues = None
+    finally:
+        # Unlink every block, even if closing it fails.
+        for block in sharedMemory:
+            try:
+                block.close()
+            finally:
+                block.unlink()
+    return out
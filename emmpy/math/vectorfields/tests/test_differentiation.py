@@ -0,0 +1,181 @@
+"""Tests for the differentiation module."""
+
+
+import unittest
+
+import numpy as np
+
+from emmpy.math.vectorfields.differentiation import (
+    EARTH_RADIUS, MU0, curl, currentDensity, cylindricalToCartesianJacobian,
+    differentiateGrid, differentiateGridValues, differentiateMany,
+    divergence, evaluateExpansionWithDifferences, evaluateWithDifferences
+)
+from emmpy.math.vectorfields.gridevaluation import (
+    CartesianGrid, CylindricalGrid
+)
+from emmpy.math.vectorfields.vectorfield import VectorField
+
+
+class CubicField(VectorField):
+    """The field (y**3, x*z, x**2*y), which records evaluateMany() calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def evaluateMany(self, positions):
+        self.calls += 1
+        (x, y, z) = np.asarray(positions, dtype=float).T
+        return np.stack((y**3, x*z, x*x*y), axis=-1)
+
+
+class CylindricalField(VectorField):
+    """The field (rho*z, rho**2*cos(phi), rho*sin(phi)) in (rho, phi, z)."""
+
+    def evaluateMany(self, positions):
+        (x, y, z) = np.asarray(positions, dtype=float).T
+        rho = np.hypot(x, y)
+        phi = np.arctan2(y, x)
+        b = np.stack((rho*z, rho*rho*np.cos(phi), rho*np.sin(phi)), axis=-1)
+        return np.stack((np.cos(phi)*b[:, 0] - np.sin(phi)*b[:, 1],
+                         np.sin(phi)*b[:, 0] + np.cos(phi)*b[:, 1],
+                         b[:, 2]), axis=-1)
+
+
+def cubicJacobian(positions, h=0.0):
+    """Return the Jacobian of CubicField, plus the error of step h."""
+    (x, y, z) = np.asarray(positions, dtype=float).T
+    jacobian = np.zeros((len(x), 3, 3))
+    jacobian[:, 0, 1] = 3*y*y + h*h
+    jacobian[:, 1, 0] = z
+    jacobian[:, 1, 2] = x
+    jacobian[:, 2, 0] = 2*x*y
+    jacobian[:, 2, 1] = x*x
+    return jacobian
+
+
+class TestBuilder(unittest.TestCase):
+    """Tests for the differentiation module."""
+
+    def test_differentiateMany(self):
+        """Test the differentiateMany function."""
+        rng = np.random.default_rng(2)
+        positions = rng.uniform(-3.0, 3.0, (5, 3))
+        field = CubicField()
+        jacobian = differentiateMany(field, positions, h=0.1)
+        self.assertEqual(jacobian.shape, (5, 3, 3))
+        self.assertTrue(np.allclose(jacobian, cubicJacobian(positions, 0.1)))
+        self.assertEqual(field.calls, 1)
+        jacobian = differentiateMany(field, positions, h=0.1, order=4)
+        self.assertTrue(np.allclose(jacobian, cubicJacobian(positions)))
+        with self.assertRaises(ValueError):
+            differentiateMany(field, positions, order=3)
+        with self.assertRaises(ValueError):
+            differentiateMany(field, positions, h=0.0)
+
+    def test_evaluateWithDifferences(self):
+        """Test the evaluateWithDifferences function."""
+        rng = np.random.default_rng(3)
+        positions = rng.uniform(-3.0, 3.0, (4, 3))
+        field = CubicField()
+        (values, jacobian) = evaluateWithDifferences(field, positions, 0.1)
+        self.assertTrue(np.allclose(values, field.evaluateMany(positions)))
+        self.assertTrue(np.allclose(jacobian, cubicJacobian(positions, 0.1)))
+        self.assertEqual(field.calls, 2)
+        (_, jacobian) = evaluateWithDifferences(field, positions, 0.1, 4)
+        self.assertTrue(np.allclose(jacobian, cubicJacobian(positions)))
+        with self.assertRaises(ValueError):
+            evaluateWithDifferences(field, positions, -0.1)
+
+    def test_evaluateExpansionWithDifferences(self):
+        """Test the evaluateExpansionWithDifferences function."""
+        field = CubicField()
+        field.evaluateExpansionMany = lambda positions: np.stack(
+            (field.evaluateMany(positions), 2*np.asarray(positions)), axis=1)
+        positions = np.array([[1.0, 2.0, 3.0], [-2.0, 0.5, 4.0]])
+        (values, jacobians) = evaluateExpansionWithDifferences(
+            field, positions, order=4)
+        self.assertEqual(values.shape, (2, 2, 3))
+        self.assertEqual(jacobians.shape, (2, 2, 3, 3))
+        self.assertTrue(np.allclose(values[:, 1], 2*positions))
+        self.assertTrue(np.allclose(jacobians[:, 0], cubicJacobian(positions)))
+        self.assertTrue(np.allclose(jacobians[:, 1], 2*np.eye(3)))
+        self.assertEqual(field.calls, 1)
+
+    def test_cylindricalToCartesianJacobian(self):
+        """Test the cylindricalToCartesianJacobian function."""
+        rng = np.random.default_rng(4)
+        positions = rng.uniform(-3.0, 3.0, (5, 3))
+        (x, y, z) = positions.T
+        rho = np.hypot(x, y)
+        phi = np.arctan2(y, x)
+        (c, s) = (np.cos(phi), np.sin(phi))
+        zero = np.zeros(5)
+        b = np.stack((rho*z, rho*rho*c, rho*s), axis=-1)
+        dbdRho = np.stack((z, 2*rho*c, s), axis=-1)
+        dbdPhi = np.stack((zero, -rho*rho*s, rho*c), axis=-1)
+        dbdZ = np.stack((rho, zero, zero), axis=-1)
+        (values, jacobian) = cylindricalToCartesianJacobian(
+            phi, 1/rho, b, dbdRho, dbdPhi, dbdZ)
+        field = CylindricalField()
+        self.assertTrue(np.allclose(values, field.evaluateMany(positions)))
+        self.assertTrue(np.allclose(
+            jacobian, differentiateMany(field, positions, 1e-4, 4)))
+
+    def test_differentiateGridValues(self):
+        """Test the differentiateGridValues function."""
+        grid = CartesianGrid(np.arange(5.0), 0.5*np.arange(6), [1.0, 3.0, 5.0])
+        values = CubicField().evaluateMany(grid.positions()).reshape(
+            grid.shape + (3,))
+        jacobian = differentiateGridValues(values, (1.0, 0.5, 2.0))
+        self.assertEqual(jacobian.shape, (3, 4, 1, 3, 3))
+        interior = grid.positions().reshape(grid.shape + (3,))[1:-1, 1:-1, 1:-1]
+        expected = cubicJacobian(interior.reshape((-1, 3)), 0.5)
+        self.assertTrue(np.allclose(jacobian.reshape((-1, 3, 3)), expected))
+        with self.assertRaises(ValueError):
+            differentiateGridValues(values, (1.0, 0.5, 2.0), order=4)
+
+    def test_differentiateGrid(self):
+        """Test the differentiateGrid function."""
+        grid = CartesianGrid([-1.0, 0.0, 1.0], [2.0, 2.5], [0.0, -2.0, -4.0])
+        field = CubicField()
+        positions = grid.positions()
+        for (order, h) in ((2, 0.5), (4, 0.0)):
+            jacobian = differentiateGrid(field, grid, order)
+            self.assertEqual(jacobian.shape, (3, 2, 3, 3, 3))
+            self.assertTrue(np.allclose(jacobian.reshape((-1, 3, 3)),
+                                        cubicJacobian(positions, h)))
+        self.assertEqual(field.calls, 2)
+        with self.assertRaises(TypeError):
+            differentiateGrid(field, CylindricalGrid([1.0], [0.0], [0.0]))
+        for bad in (CartesianGrid([0.0, 1.0, 3.0], [0.0, 1.0], [0.0, 1.0]),
+                    CartesianGrid([0.0], [0.0, 1.0], [0.0, 1.0])):
+            with self.assertRaises(ValueError):
+                differentiateGrid(field, bad)
+
+    def test_curl(self):
+        """Test the curl function."""
+        positions = np.array([[1.0, 2.0, 3.0], [-2.0, 0.5, 4.0]])
+        (x, y, z) = positions.T
+        expected = np.stack((x*x - x, -2*x*y, z - 3*y*y), axis=-1)
+        self.assertTrue(np.allclose(curl(cubicJacobian(positions)), expected))
+
+    def test_divergence(self):
+        """Test the divergence function."""
+        positions = np.array([[1.0, 2.0, 3.0], [-2.0, 0.5, 4.0]])
+        jacobian = cubicJacobian(positions)
+        self.assertTrue(np.allclose(divergence(jacobian), 0.0))
+        jacobian[:, 0, 0] = 1.0
+        jacobian[:, 2, 2] = 2.0
+        self.assertTrue(np.allclose(divergence(jacobian), 3.0))
+
+    def test_currentDensity(self):
+        """Test the currentDensity function."""
+        jacobian = np.zeros((3, 3))
+        jacobian[1, 0] = 1.0
+        j = currentDensity(jacobian)
+        self.assertTrue(np.allclose(j, (0.0, 0.0, 1/(EARTH_RADIUS*MU0))))
+        self.assertAlmostEqual(j[2], 0.1249, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the gridevaluation module."""
+
+
+import unittest
+
+import numpy as np
+
+from emmpy.math.vectorfields.gridevaluation import (
+    CartesianGrid, CylindricalGrid, evaluateGrid, evaluateGridInRows
+)
+from emmpy.math.vectorfields.vectorfield import VectorField
+
+
+class CountingField(VectorField):
+    """A field equal to its location, which records evaluateMany() calls."""
+
+    def __init__(self):
+        self.sizes = []
+
+    def evaluateMany(self, positions):
+        self.sizes.append(len(positions))
+        return np.array(positions, dtype=float)
+
+
+class GridField(CountingField):
+    """A field with its own grid evaluation method."""
+
+    def evaluateGrid(self, grid):
+        return np.zeros(grid.shape + (3,))
+
+
+class TestBuilder(unittest.TestCase):
+    """Tests for the gridevaluation module."""
+
+    def test_CartesianGrid(self):
+        """Test the CartesianGrid class."""
+        grid = CartesianGrid([1.0, 2.0], [-1.0, 0.0, 1.0], [0.5, 1.5, 2.5, 3.5])
+        self.assertEqual(grid.shape, (2, 3, 4))
+        positions = grid.positions()
+        self.assertEqual(positions.shape, (24, 3))
+        self.assertTrue(np.array_equal(positions[0], (1.0, -1.0, 0.5)))
+        self.assertTrue(np.array_equal(positions[5], (1.0, 0.0, 1.5)))
+        self.assertTrue(np.array_equal(positions[-1], (2.0, 1.0, 3.5)))
+        (x, y, rho, phi) = grid.columns()
+        self.assertEqual(np.broadcast_shapes(x.shape, y.shape), (2, 3, 1))
+        self.assertTrue(np.allclose(rho*np.cos(phi), x))
+        self.assertTrue(np.allclose(rho*np.sin(phi), y))
+        rows = grid.select(slice(1, 2))
+        self.assertEqual(rows.shape, (1, 3, 4))
+        self.assertTrue(np.array_equal(rows.positions(), positions[12:]))
+        scaled = grid.scaled(2.0)
+        self.assertTrue(np.array_equal(scaled.positions(), 2*positions))
+        for bad in ([], [[1.0, 2.0]]):
+            with self.assertRaises(ValueError):
+                CartesianGrid(bad, [0.0], [0.0])
+
+    def test_CylindricalGrid(self):
+        """Test the CylindricalGrid class."""
+        grid = CylindricalGrid([2.0, 4.0], [0.0, np.pi/2, np.pi], [-1.0, 1.0])
+        self.assertEqual(grid.shape, (2, 3, 2))
+        positions = grid.positions()
+        self.assertEqual(positions.shape, (12, 3))
+        self.assertTrue(np.allclose(positions[0], (2.0, 0.0, -1.0)))
+        self.assertTrue(np.allclose(positions[3], (0.0, 2.0, 1.0)))
+        self.assertTrue(np.allclose(positions[-1], (-4.0, 0.0, 1.0)))
+        (x, y, rho, phi) = grid.columns()
+        self.assertEqual(rho.shape, (2, 1, 1))
+        self.assertEqual(phi.shape, (1, 3, 1))
+        self.assertEqual(np.broadcast_shapes(x.shape, y.shape), (2, 3, 1))
+        rows = grid.select([1])
+        self.assertTrue(np.allclose(rows.positions(), positions[6:]))
+        scaled = grid.scaled(0.5)
+        self.assertTrue(np.allclose(scaled.positions(), 0.5*positions))
+        scaled = grid.scaled(-1.5)
+        self.assertTrue(np.allclose(scaled.positions(), -1.5*positions))
+        with self.assertRaises(ValueError):
+            CylindricalGrid([-1.0], [0.0], [0.0])
+
+    def test_evaluateGrid(self):
+        """Test the evaluateGrid function."""
+        grid = CartesianGrid(np.linspace(-2, 2, 5), [0.0, 1.0, 2.0],
+                             [3.0, 4.0])
+        field = CountingField()
+        values = evaluateGrid(field, grid, chunkSize=12)
+        self.assertEqual(values.shape, (5, 3, 2, 3))
+        self.assertTrue(np.array_equal(values.reshape((-1, 3)),
+                                       grid.positions()))
+        self.assertEqual(field.sizes, [12, 12, 6])
+        field = GridField()
+        values = evaluateGrid(field, grid)
+        self.assertTrue(np.array_equal(values, np.zeros((5, 3, 2, 3))))
+        self.assertEqual(field.sizes, [])
+
+    def test_evaluateGridInRows(self):
+        """Test the evaluateGridInRows function."""
+        grid = CylindricalGrid([1.0, 2.0, 3.0], [0.0, 1.0], [0.0])
+        chunks = []
+
+        def evaluateRows(rows):
+            chunks.append(rows.shape)
+            return np.broadcast_to(rows.rho[:, None, None, None],
+                                   rows.shape + (1,))
+
+        values = evaluateGridInRows(evaluateRows, grid, 10, maxTerms=20,
+                                    valueShape=(1,))
+        self.assertEqual(chunks, [(2, 2, 1), (1, 2, 1)])
+        self.assertEqual(values.shape, (3, 2, 1, 1))
+        self.assertTrue(np.array_equal(values[:, 1, 0, 0], grid.rho))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Tests for the parallelevaluation module."""
+
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from emmpy.geomagmodel.ts07.tests.examplecoefficients import (
+    createExampleBuilder, haveExamples
+)
+from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields import parallelevaluation
+from emmpy.math.vectorfields.parallelevaluation import (
+    evaluateParallel, evaluateShared
+)
+from emmpy.math.vectorfields.vectorfield import (
+    VectorField, add, scaleLocation
+)
+
+
+class ShiftedField(VectorField):
+    """A field equal to the location plus a constant."""
+
+    def __init__(self, shift):
+        self.shift = shift
+
+    def evaluate(self, location, buffer=None):
+        if buffer is None:
+            buffer = VectorIJK()
+        buffer[:] = location + self.shift
+        return buffer
+
+
+class FailingField(VectorField):
+    """A field which cannot be evaluated."""
+
+    def evaluate(self, location, buffer=None):
+        raise ZeroDivisionError("cannot evaluate")
+
+
+class TestBuilder(unittest.TestCase):
+    """Tests for the parallelevaluation module."""
+
+    def test_evaluateParallel(self):
+        """Test the evaluateParallel function."""
+        field = add(ShiftedField(1.0), scaleLocation(ShiftedField(2.0), 3.0))
+        positions = np.arange(30.0).reshape((10, 3))
+        values = evaluateParallel(field, positions, workers=2, chunkSize=3)
+        self.assertEqual(values.shape, positions.shape)
+        self.assertTrue(np.allclose(values, 4*positions + 3))
+        # No positions.
+        values = evaluateParallel(field, np.empty((0, 3)), workers=2)
+        self.assertEqual(values.shape, (0, 3))
+        # Invalid pool settings.
+        with self.assertRaises(ValueError):
+            evaluateParallel(field, positions, workers=0)
+        with self.assertRaises(ValueError):
+            evaluateParallel(field, positions, chunkSize=0)
+
+    @unittest.skipUnless(haveExamples, "example coefficients not found")
+    def test_evaluateParallel_model(self):
+        """Test evaluateParallel with a built TS07D model."""
+        model = createExampleBuilder().build()
+        rng = np.random.default_rng(11)
+        positions = rng.uniform(-12.0, 12.0, (20, 3))
+        values = evaluateParallel(model, positions, workers=2)
+        expected = model.evaluateMany(positions)
+        self.assertTrue(np.allclose(values, expected, rtol=0, atol=1e-12))
+
+    def test_evaluateShared(self):
+        """Test the evaluateShared function."""
+        field = add(ShiftedField(1.0), scaleLocation(ShiftedField(2.0), 3.0))
+        positions = np.arange(30.0).reshape((10, 3))
+        values = evaluateShared(field, positions, workers=2, chunkSize=3)
+        self.assertTrue(np.allclose(values, 4*positions + 3))
+        # Into an existing array.
+        out = np.zeros((10, 3))
+        self.assertIs(evaluateShared(field, positions, out, workers=2), out)
+        self.assertTrue(np.allclose(out, 4*positions + 3))
+        # Invalid output arrays.
+        with self.assertRaises(ValueError):
+            evaluateShared(field, positions, np.zeros((9, 3)))
+        with self.assertRaises(ValueError):
+            evaluateShared(field, positions, workers=0)
+        # Errors in the workers are raised after the shared memory is
+        # released.
+        with self.assertRaises(ZeroDivisionError):
+            evaluateShared(FailingField(), positions, workers=2)
+
+    def test_closeWorkerSharedMemory(self):
+        """Test closing the shared memory mapped by a worker."""
+        sharedMemory = []
+        (array, descriptor) = parallelevaluation._createSharedArray(
+            (4, 3), sharedMemory)
+        array[...] = 2.0
+        try:
+            parallelevaluation._workerValues = parallelevaluation._openArray(
+                descriptor, writable=True)
+            self.assertTrue(np.all(parallelevaluation._workerValues == 2.0))
+            self.assertEqual(len(parallelevaluation._workerSharedMemory), 1)
+            parallelevaluation._closeWorkerSharedMemory()
+            self.assertIsNone(parallelevaluation._workerValues)
+            self.assertEqual(parallelevaluation._workerSharedMemory, [])
+        finally:
+            del array
+            sharedMemory[0].close()
+            sharedMemory[0].unlink()
+
+    def test_evaluateShared_memmap(self):
+        """Test evaluateShared with memory-mapped arrays."""
+        field = ShiftedField(1.0)
+        with tempfile.TemporaryDirectory() as directory:
+            # Positions in single precision, after a header, and values in
+            # a second file.
+            positionsFile = os.path.join(directory, "positions.dat")
+            positions = np.memmap(positionsFile, dtype=np.float32,
+                                  mode="w+", offset=20, shape=(50, 3))
+            positions[...] = np.arange(150.0).reshape((50, 3))
+            positions.flush()
+            valuesFile = os.path.join(directory, "values.dat")
+            out = np.memmap(valuesFile, dtype=float, mode="w+",
+                            shape=(50, 3))
+            evaluateShared(field, positions, out, workers=2, chunkSize=7)
+            values = np.fromfile(valuesFile).reshape((50, 3))
+            self.assertTrue(np.allclose(values, positions + 1))
+            # Slices of the mapped files.
+            evaluateShared(ShiftedField(2.0), positions[10:20], out[30:40],
+                           workers=2)
+            self.assertTrue(np.allclose(out[30:40], positions[10:20] + 2))
+            self.assertTrue(np.allclose(out[:30], positions[:30] + 1))
+            del positions, out
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,17 @@
 """Tests for the vectorfield module."""
 
 
+import pickle
 import unittest
 
+import numpy as np
+
 from emmpy.exceptions.abstractmethodexception import AbstractMethodException
+from emmpy.math.coordinates.cartesianvector import CartesianVectorArray
 from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.gridevaluation import (
+    CartesianGrid, CylindricalGrid
+)
 from emmpy.math.vectorfields.vectorfield import (
     VectorField, add, addAll, negate, scaleLocation
 )
@@ -40,6 +47,54 @@ class TestBuilder(unittest.TestCase):
         with self.assertRaises(AbstractMethodException):
             VectorField.evaluate(None, None)
 
+    def test_evaluateMany(self):
+        """Test the evaluateMany method."""
+        positions = np.array([[1.0, 2.0, 3.0], [-4.0, 0.5, 2.0]])
+        values = vf3.evaluateMany(positions)
+        self.assertEqual(values.shape, (2, 3))
+        self.assertTrue(np.allclose(values, positions + 2))
+        # Composed fields evaluate arrays through their components.
+        values = add(vf1, vf2).evaluateMany(positions)
+        self.assertTrue(np.allclose(values, positions + 1))
+        values = addAll([vf1, vf2, vf3]).evaluateMany(positions)
+        self.assertTrue(np.allclose(values, 2*positions + 3))
+        values = negate(vf1).evaluateMany(positions)
+        self.assertTrue(np.allclose(values, -positions))
+        values = scaleLocation(vf1, -1.1).evaluateMany(positions)
+        self.assertTrue(np.allclose(values, -1.1*positions))
+        # Vector arrays are accepted as positions.
+        values = vf3.evaluateMany(CartesianVectorArray(positions))
+        self.assertTrue(np.allclose(values, positions + 2))
+
+    def test_evaluateGrid(self):
+        """Test grid evaluation of composed fields."""
+        for grid in (CartesianGrid([1.0, -2.0], [0.5, 3.0], [-1.0, 1.0, 2.0]),
+                     CylindricalGrid([1.0, 2.0], [0.3, 2.0], [-1.0, 1.0])):
+            positions = grid.positions()
+            for vf in (add(vf1, vf2), addAll([vf1, negate(vf2), vf3]),
+                       scaleLocation(vf3, -1.1),
+                       scaleLocation(vf3, 2.0)):
+                values = vf.evaluateGrid(grid)
+                self.assertEqual(values.shape, grid.shape + (3,))
+                self.assertTrue(np.allclose(values.reshape((-1, 3)),
+                                            vf.evaluateMany(positions)))
+
+    def test_differentiateMany(self):
+        """Test the differentiateMany method."""
+        positions = np.array([[1.0, 2.0, 3.0], [-4.0, 0.5, 2.0]])
+        (values, jacobian) = vf3.differentiateMany(positions)
+        self.assertTrue(np.allclose(values, positions + 2))
+        self.assertTrue(np.allclose(jacobian, np.eye(3)))
+        # Composed fields differentiate through their components.
+        for (vf, value, scale) in (
+            (addAll([vf1, vf2, vf3]), 2*positions + 3, 2.0),
+            (negate(vf1), -positions, -1.0),
+            (scaleLocation(vf3, -1.1), -1.1*positions + 2, -1.1),
+        ):
+            (values, jacobian) = vf.differentiateMany(positions)
+            self.assertTrue(np.allclose(values, value))
+            self.assertTrue(np.allclose(jacobian, scale*np.eye(3)))
+
     def test_add(self):
         """Test the add function."""
         vf = add(vf1, vf2)
@@ -90,6 +145,14 @@ class TestBuilder(unittest.TestCase):
         for i in range(3):
             self.assertAlmostEqual(v[i], vs[i])
 
+    def test_pickle(self):
+        """Test pickling of composed vector fields."""
+        vf = addAll([add(vf1, negate(vf2)), scaleLocation(vf3, 2.0)])
+        vf_copy = pickle.loads(pickle.dumps(vf))
+        positions = np.array([[1.0, 2.0, 3.0], [-4.0, 0.5, 2.0]])
+        self.assertTrue(np.allclose(vf_copy.evaluateMany(positions),
+                                    vf.evaluateMany(positions)))
+
 
 if __name__ == "__main__":
     unittest.main()
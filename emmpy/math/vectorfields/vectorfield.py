@@ -17,6 +17,8 @@ import numpy as np
 
 from emmpy.exceptions.abstractmethodexception import AbstractMethodException
 from emmpy.math.coordinates.vectorijk import VectorIJK
+from emmpy.math.vectorfields.differentiation import evaluateWithDifferences
+from emmpy.math.vectorfields.gridevaluation import evaluateGrid
 
 
 class VectorField:
@@ -57,6 +59,386 @@ class VectorField:
         """
         raise AbstractMethodException
 
+    def evaluateMany(self, positions):
+        """Evaluate the vector field at an array of positions.
+
+        Evaluate the vector field at each of the specified positions. This
+        default implementation simply calls evaluate() once per position.
+        Subclasses which can work on whole arrays at once should override
+        this method.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation in the vector space.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Values of the vector field at the specified positions.
+        """
+        positions = np.asarray(positions, dtype=float)
+        values = np.empty(positions.shape)
+        buffer = VectorIJK()
+        for (i, position) in enumerate(positions):
+            values[i] = self.evaluate(VectorIJK(position), buffer)
+        return values
+
+    def differentiateMany(self, positions):
+        """Evaluate the vector field and its Jacobian at an array of points.
+
+        Evaluate the vector field and its Jacobian at each of the specified
+        positions. This default implementation uses central differences,
+        with a single call to evaluateMany(). Subclasses which can compute
+        their derivatives analytically should override this method.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation in the vector space.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            Values of the vector field at the specified positions.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            dF_i/dx_j at each position, indexed by [n, i, j].
+        """
+        return evaluateWithDifferences(self, positions)
+
+
+class SumVectorField(VectorField):
+    """A vector field which is the sum of other vector fields.
+
+    The fields maintain their separate nature, and are only added when
+    this sum field is evaluated.
+
+    Attributes
+    ----------
+    fields : list of VectorField
+        The vector fields to add.
+    """
+
+    def __init__(self, fields):
+        """Initialize a new SumVectorField object.
+
+        Initialize a new SumVectorField object.
+
+        Parameters
+        ----------
+        fields : array-like of VectorField
+            The vector fields to add.
+        """
+        self.fields = list(fields)
+
+    def evaluate(self, location, buffer=None):
+        """Evaluate the sum of the fields at a location.
+
+        Evaluate the sum of the fields at a location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location for evaluation.
+        buffer : VectorIJK, optional
+            Buffer to hold the result.
+
+        Returns
+        -------
+        buffer : VectorIJK
+            The sum of the fields at location.
+        """
+        if buffer is None:
+            buffer = VectorIJK()
+        vsum = np.zeros((3,))
+        for field in self.fields:
+            vsum[:] += field.evaluate(location, VectorIJK())
+        buffer[:] = vsum
+        return buffer
+
+    def evaluateMany(self, positions):
+        """Evaluate the sum of the fields at an array of positions.
+
+        Evaluate the sum of the fields at an array of positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The sum of the fields at each position.
+        """
+        values = np.zeros(np.shape(positions))
+        for field in self.fields:
+            values += field.evaluateMany(positions)
+        return values
+
+    def differentiateMany(self, positions):
+        """Evaluate the sum of the fields and its Jacobian.
+
+        Evaluate the sum of the fields and its Jacobian at an array of
+        positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The sum of the fields at each position.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the sum at each position.
+        """
+        values = np.zeros(np.shape(positions))
+        jacobian = np.zeros(np.shape(positions) + (3,))
+        for field in self.fields:
+            (v, j) = field.differentiateMany(positions)
+            values += v
+            jacobian += j
+        return (values, jacobian)
+
+    def evaluateGrid(self, grid):
+        """Evaluate the sum of the fields on a regular grid.
+
+        Evaluate the sum of the fields on a regular grid, using the grid
+        evaluation of each field which has one.
+
+        Parameters
+        ----------
+        grid : CartesianGrid or CylindricalGrid
+            The grid of positions.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape grid.shape + (3,)
+            The sum of the fields at each grid point.
+        """
+        values = np.zeros(grid.shape + (3,))
+        for field in self.fields:
+            values += evaluateGrid(field, grid)
+        return values
+
+
+class NegatedVectorField(VectorField):
+    """The negation of a vector field.
+
+    The original field maintains its separate nature, and is only negated
+    when this field is evaluated.
+
+    Attributes
+    ----------
+    field : VectorField
+        The vector field to negate.
+    """
+
+    def __init__(self, field):
+        """Initialize a new NegatedVectorField object.
+
+        Initialize a new NegatedVectorField object.
+
+        Parameters
+        ----------
+        field : VectorField
+            The vector field to negate.
+        """
+        self.field = field
+
+    def evaluate(self, location, buffer=None):
+        """Evaluate the negated field at a location.
+
+        Evaluate the negated field at a location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location for evaluation.
+        buffer : VectorIJK, optional
+            Buffer to hold the result.
+
+        Returns
+        -------
+        buffer : VectorIJK
+            The negated field at location.
+        """
+        if buffer is None:
+            buffer = VectorIJK()
+        self.field.evaluate(location, buffer)
+        buffer[:] = -buffer
+        return buffer
+
+    def evaluateMany(self, positions):
+        """Evaluate the negated field at an array of positions.
+
+        Evaluate the negated field at an array of positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The negated field at each position.
+        """
+        return -self.field.evaluateMany(positions)
+
+    def differentiateMany(self, positions):
+        """Evaluate the negated field and its Jacobian.
+
+        Evaluate the negated field and its Jacobian at an array of
+        positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The negated field at each position.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian of the negated field at each position.
+        """
+        (values, jacobian) = self.field.differentiateMany(positions)
+        return (-values, -jacobian)
+
+    def evaluateGrid(self, grid):
+        """Evaluate the negated field on a regular grid.
+
+        Evaluate the negated field on a regular grid.
+
+        Parameters
+        ----------
+        grid : CartesianGrid or CylindricalGrid
+            The grid of positions.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape grid.shape + (3,)
+            The negated field at each grid point.
+        """
+        return -evaluateGrid(self.field, grid)
+
+
+class ScaledLocationVectorField(VectorField):
+    """A vector field evaluated at scaled locations.
+
+    The value of this field at a location is the value of the original
+    field at scaleFactor times the location.
+
+    Attributes
+    ----------
+    field : VectorField
+        The vector field for which to scale locations.
+    scaleFactor : float
+        Scale factor for vector field locations.
+    """
+
+    def __init__(self, field, scaleFactor):
+        """Initialize a new ScaledLocationVectorField object.
+
+        Initialize a new ScaledLocationVectorField object.
+
+        Parameters
+        ----------
+        field : VectorField
+            The vector field for which to scale locations.
+        scaleFactor : float
+            Scale factor for vector field locations.
+        """
+        self.field = field
+        self.scaleFactor = scaleFactor
+
+    def evaluate(self, location, buffer=None):
+        """Evaluate the field at a scaled location.
+
+        Evaluate the field at a scaled location.
+
+        Parameters
+        ----------
+        location : VectorIJK
+            Location for evaluation, before scaling.
+        buffer : VectorIJK, optional
+            Buffer to hold the result.
+
+        Returns
+        -------
+        buffer : VectorIJK
+            The field at the scaled location.
+        """
+        if buffer is None:
+            buffer = VectorIJK()
+        scaledLocation = self.scaleFactor*VectorIJK(location)
+        self.field.evaluate(scaledLocation, buffer)
+        return buffer
+
+    def evaluateMany(self, positions):
+        """Evaluate the field at an array of scaled positions.
+
+        Evaluate the field at an array of scaled positions.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation, before scaling.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The field at each scaled position.
+        """
+        scaledPositions = self.scaleFactor*np.asarray(positions, dtype=float)
+        return self.field.evaluateMany(scaledPositions)
+
+    def differentiateMany(self, positions):
+        """Evaluate the field and its Jacobian at scaled positions.
+
+        Evaluate the field and its Jacobian at an array of scaled
+        positions. By the chain rule, the Jacobian of the original field
+        is multiplied by the scale factor.
+
+        Parameters
+        ----------
+        positions : array-like of float, shape (N, 3)
+            The positions for evaluation, before scaling.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape (N, 3)
+            The field at each scaled position.
+        jacobian : np.ndarray of float, shape (N, 3, 3)
+            Jacobian with respect to the unscaled positions.
+        """
+        scaledPositions = self.scaleFactor*np.asarray(positions, dtype=float)
+        (values, jacobian) = self.field.differentiateMany(scaledPositions)
+        return (values, self.scaleFactor*jacobian)
+
+    def evaluateGrid(self, grid):
+        """Evaluate the field on a regular grid of scaled positions.
+
+        Evaluate the field on a regular grid of scaled positions. Scaling
+        a grid gives another grid of the same kind, so the grid evaluation
+        of the original field can still be used.
+
+        Parameters
+        ----------
+        grid : CartesianGrid or CylindricalGrid
+            The grid of positions, before scaling.
+
+        Returns
+        -------
+        values : np.ndarray of float, shape grid.shape + (3,)
+            The field at each scaled grid point.
+        """
+        return evaluateGrid(self.field, grid.scaled(self.scaleFactor))
+
 
 def add(a, b):
     """Create a vector field by adding two vector fields.
@@ -72,21 +454,10 @@ def add(a, b):
     
     Returns
     -------
-    sumVectorField : VectorField
+    sumVectorField : SumVectorField
         A VectorField that computes the component-wise sum (a + b).
     """
-    sumVectorField = VectorField()
-
-    # This custom evaluate() method dynamically sums the individual vector
-    # fields and stores the sum in the buffer.
-    def my_evaluate(location, buffer):
-        va = a.evaluate(location, VectorIJK())
-        vb = b.evaluate(location, VectorIJK())
-        buffer[:] = va + vb
-        return buffer
-
-    sumVectorField.evaluate = my_evaluate
-    return sumVectorField
+    return SumVectorField([a, b])
 
 
 def addAll(fields):
@@ -103,23 +474,10 @@ def addAll(fields):
     
     Returns
     -------
-    vf : VectorField
+    vf : SumVectorField
         A VectorField that computes the component-wise sum of the fields.
     """
-    vf = VectorField()
-
-    # This custom evaluate() method dynamically sums the individual vector
-    # fields and stores the sum in the buffer.
-    def my_evaluate(location, buffer):
-        vsum = np.zeros((3,))
-        for field in fields:
-            field.evaluate(location, buffer)
-            vsum[:] += buffer
-        buffer[:] = vsum
-        return buffer
-
-    vf.evaluate = my_evaluate
-    return vf
+    return SumVectorField(fields)
 
 
 def negate(vectorField):
@@ -139,20 +497,10 @@ def negate(vectorField):
     
     Returns
     -------
-    negation : VectorField
+    negation : NegatedVectorField
         A VectorField that computes the negation of the original field.
     """
-    negation = VectorField()
-
-    # This custom evaluate() method dynamically negates the original vector
-    # field and stores the result in the buffer.
-    def my_evaluate(location, buffer):
-        vectorField.evaluate(location, buffer)
-        buffer[:] = -buffer
-        return buffer
-
-    negation.evaluate = my_evaluate
-    return negation
+    return NegatedVectorField(vectorField)
 
 
 def scaleLocation(vectorField, scaleFactor):
@@ -169,17 +517,7 @@ def scaleLocation(vectorField, scaleFactor):
     
     Returns
     -------
-    scaledLocationField : VectorField
+    scaledLocationField : ScaledLocationVectorField
         A vector field that computes the value at a scaled location.
     """
-    scaledLocationField = VectorField()
-
-    # This custom evaluate() method dynamically scales the location of the
-    # original vector field and stores the result in the buffer.
-    def my_evaluate(location, buffer):
-        scaledLocation = scaleFactor*VectorIJK(location)
-        vectorField.evaluate(scaledLocation, buffer)
-        return buffer
-
-    scaledLocationField.evaluate = my_evaluate
-    return scaledLocationField
+    return ScaledLocationVectorField(vectorField, scaleFactor)
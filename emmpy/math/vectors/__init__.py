@@ -10,8 +10,15 @@ Modules
 vector.py
 vector2d.py
 vector3d.py
+vectorarray.py
 
 Packages
 --------
 tests
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
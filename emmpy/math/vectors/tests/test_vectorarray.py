@@ -0,0 +1,104 @@
+"""Tests for the vectorarray module.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import unittest
+
+import numpy as np
+
+from emmpy.math.vectors.vectorarray import VectorArray
+
+
+class ABCArray(VectorArray):
+    """A vector array with components named a, b and c."""
+
+    components = {'a': 0, 'b': 1, 'c': 2}
+
+
+class TestBuilder(unittest.TestCase):
+    """Tests for the vectorarray module."""
+
+    def test___new__(self):
+        """Test the __new__ method."""
+        v = ABCArray(length=4)
+        self.assertIsInstance(v, ABCArray)
+        self.assertEqual(v.shape, (4, 3))
+        data = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+        v = ABCArray(data)
+        self.assertTrue(np.array_equal(v, data))
+        v = ABCArray(data[0])
+        self.assertEqual(v.shape, (1, 3))
+        # The data is copied.
+        data = np.zeros((2, 3))
+        ABCArray(data).a = 1.0
+        self.assertTrue(np.all(data == 0.0))
+        for bad in ([1.0, 2.0], np.zeros((2, 3, 3))):
+            with self.assertRaises(ValueError):
+                ABCArray(bad)
+
+    def test_fromComponents(self):
+        """Test the fromComponents method."""
+        v = ABCArray.fromComponents([1.0, 2.0], 3.0, [4, 5])
+        self.assertIsInstance(v, ABCArray)
+        self.assertTrue(np.array_equal(v, [[1.0, 3.0, 4.0], [2.0, 3.0, 5.0]]))
+        self.assertEqual(v.dtype, float)
+        # Components with extra axes give a plain array.
+        v = ABCArray.fromComponents(np.ones((2, 4)), 0.0, 1.0)
+        self.assertIs(type(v), np.ndarray)
+        self.assertEqual(v.shape, (2, 4, 3))
+        # The output array may hold the components.
+        out = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        v = ABCArray.fromComponents(out[:, 2], out[:, 0], out[:, 1], out=out)
+        self.assertIs(v, out)
+        self.assertTrue(np.array_equal(out, [[3.0, 1.0, 2.0],
+                                             [6.0, 4.0, 5.0]]))
+        with self.assertRaises(ValueError):
+            ABCArray.fromComponents([1.0], [2.0])
+
+    def test___array_wrap__(self):
+        """Test the __array_wrap__ method."""
+        v = ABCArray([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        self.assertIsInstance(2*v + 1, ABCArray)
+        self.assertIsInstance(np.sin(v), ABCArray)
+        self.assertIs(type(v.sum(axis=0)), np.ndarray)
+        norms = np.linalg.norm(v, axis=1)
+        self.assertIs(type(norms), np.ndarray)
+        self.assertIs(type(v.sum(axis=1)), np.ndarray)
+        self.assertEqual(v.sum(), 21.0)
+
+    def test___getitem__(self):
+        """Test the __getitem__ method."""
+        v = ABCArray([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]])
+        self.assertIsInstance(v[1:], ABCArray)
+        self.assertIsInstance(v[[0, 2]], ABCArray)
+        self.assertIs(type(v[1]), np.ndarray)
+        self.assertIs(type(v[:, 0]), np.ndarray)
+        self.assertIs(type(v[:, :2]), np.ndarray)
+        self.assertEqual(v[2, 1], 8.0)
+
+    def test___getattr__(self):
+        """Test the __getattr__ method."""
+        v = ABCArray([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        self.assertIs(type(v.a), np.ndarray)
+        self.assertTrue(np.array_equal(v.a, [1.0, 4.0]))
+        self.assertTrue(np.array_equal(v.c, [3.0, 6.0]))
+        # Components are views.
+        v.b[1] = 0.0
+        self.assertEqual(v[1, 1], 0.0)
+        with self.assertRaises(AttributeError):
+            v.d
+
+    def test___setattr__(self):
+        """Test the __setattr__ method."""
+        v = ABCArray(np.zeros((2, 3)))
+        v.a = [1.0, 2.0]
+        v.c = 3.0
+        self.assertTrue(np.array_equal(v, [[1.0, 0.0, 3.0], [2.0, 0.0, 3.0]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
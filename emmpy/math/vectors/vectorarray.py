@@ -0,0 +1,244 @@
+"""Abstract base class for arrays of 3-dimensional vectors.
+
+A VectorArray holds N vectors as the rows of an (N, 3) array of float, so
+that array-level code can work on many vectors at once without creating a
+Vector object for each one. Each coordinate-specific subclass defines a
+components dictionary which maps the component names to column indices,
+and the components are available as attributes which are views of the
+columns. For example, if v is a CartesianVectorArray, v.x is the first
+column of v, and setting v.x sets that column.
+
+Arrays derived from a VectorArray keep its type while they are still
+(M, 3) arrays of vectors. Single vectors, columns, elements and
+reductions are returned as plain np.ndarray objects.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import numpy as np
+
+
+# Number of components in each vector.
+N = 3
+
+
+def _isVectorArrayShape(shape):
+    """Return True if shape is the shape of an array of vectors."""
+    return len(shape) == 2 and shape[1] == N
+
+
+class VectorArray(np.ndarray):
+    """Abstract base class for arrays of 3-dimensional vectors.
+
+    This class is the base class for all of the coordinate-specific
+    vector array classes.
+
+    This abstract class should not be instantiated directly, since it
+    has no component names.
+
+    Attributes
+    ----------
+    components : dict of str: int
+        Map of component names to column indices.
+    """
+
+    # Map vector component names to indices (set by subclasses).
+    components = {}
+
+    def __new__(cls, data=None, length=0):
+        """Allocate a new VectorArray object.
+
+        Allocate a new VectorArray object, as a copy of the vectors in
+        data, or with length undefined vectors.
+
+        Parameters
+        ----------
+        data : array-like of float, shape (N, 3) or (3,), optional
+            Vectors to copy into the array. A single vector is stored as
+            an array of 1 vector.
+        length : int, optional
+            Number of vectors to allocate if data is not provided.
+
+        Returns
+        -------
+        v : VectorArray
+            The newly-created object.
+
+        Raises
+        ------
+        ValueError
+            If data is not an array of 3-element vectors.
+        """
+        if data is None:
+            return super().__new__(cls, shape=(length, N), dtype=float)
+        data = np.array(data, dtype=float, ndmin=2)
+        if data.ndim != 2 or data.shape[1] != N:
+            raise ValueError("Vector array must have shape (N, %d), got %s" %
+                             (N, data.shape))
+        return data.view(cls)
+
+    @classmethod
+    def fromComponents(cls, *columns, out=None):
+        """Create a new VectorArray from its component arrays.
+
+        Create a new VectorArray from its component arrays, in the order
+        of the components dictionary. Scalar components are broadcast
+        against the others. Components with more than 1 dimension give
+        an array of shape columns.shape + (3,), which is returned as a
+        plain np.ndarray.
+
+        Parameters
+        ----------
+        *columns : array-like of float
+            Values of each component.
+        out : np.ndarray of float, optional
+            Array to hold the result, with a shape of 3 along the last
+            axis. It may share memory with the components.
+
+        Returns
+        -------
+        v : VectorArray or np.ndarray of float
+            The new array, or out if it was provided.
+
+        Raises
+        ------
+        ValueError
+            If the number of components is not 3.
+        """
+        if len(columns) != N:
+            raise ValueError("Expected %d components, got %d" %
+                             (N, len(columns)))
+        columns = np.broadcast_arrays(*np.atleast_1d(*columns))
+        if out is None:
+            out = np.empty(columns[0].shape + (N,))
+            if _isVectorArrayShape(out.shape):
+                out = out.view(cls)
+        elif any(np.may_share_memory(out, c) for c in columns):
+            # Copy the components before any of them are overwritten.
+            columns = [np.array(c) for c in columns]
+        view = out.view(np.ndarray)
+        for (i, column) in enumerate(columns):
+            view[..., i] = column
+        return out
+
+    def __array_finalize__(self, obj):
+        """Finish the creation of a new VectorArray.
+
+        Nothing is stored outside the array data, so there is nothing to
+        copy from obj.
+
+        Parameters
+        ----------
+        obj : np.ndarray
+            The array from which this array was created.
+
+        Returns
+        -------
+        None
+        """
+
+    def __array_wrap__(self, obj, context=None, return_scalar=False):
+        """Wrap the result of a ufunc or reduction.
+
+        Wrap the result as a VectorArray if it is still an (M, 3) array
+        of vectors, and as a plain np.ndarray (or scalar) otherwise.
+
+        Parameters
+        ----------
+        obj : np.ndarray
+            Result of the operation.
+        context : tuple, optional
+            The ufunc, arguments and output index of the operation.
+        return_scalar : bool, optional
+            True if a 0-dimensional result should be returned as a scalar.
+
+        Returns
+        -------
+        result : VectorArray, np.ndarray or scalar
+            The wrapped result.
+        """
+        if _isVectorArrayShape(obj.shape):
+            return obj.view(type(self))
+        obj = obj.view(np.ndarray)
+        if return_scalar and obj.ndim == 0:
+            return obj[()]
+        return obj
+
+    def __getitem__(self, key):
+        """Return an element, a vector or a subset of the vectors.
+
+        Return the selected part of the array, as a VectorArray if it is
+        still an (M, 3) array of vectors, and as a plain np.ndarray (or
+        scalar) otherwise.
+
+        Parameters
+        ----------
+        key : int, slice, array-like or tuple
+            Index into the array.
+
+        Returns
+        -------
+        result : VectorArray, np.ndarray or float
+            The selected part of the array.
+        """
+        result = super().__getitem__(key)
+        if (isinstance(result, VectorArray) and
+                not _isVectorArrayShape(result.shape)):
+            return result.view(np.ndarray)
+        return result
+
+    def __getattr__(self, name):
+        """Return the values of a component.
+
+        Return the values of the component with the given name, as a view
+        of its column. The valid names are listed in the components
+        dictionary.
+
+        Parameters
+        ----------
+        name : str
+            Name of the component.
+
+        Returns
+        -------
+        column : np.ndarray of float, shape (N,)
+            View of the values of the component.
+
+        Raises
+        ------
+        AttributeError
+            If name is not a component name.
+        """
+        try:
+            index = type(self).components[name]
+        except KeyError:
+            raise AttributeError("%r object has no attribute %r" %
+                                 (type(self).__name__, name)) from None
+        return self.view(np.ndarray)[..., index]
+
+    def __setattr__(self, name, value):
+        """Set the values of a component.
+
+        Set the values of the component with the given name. Names which
+        are not listed in the components dictionary are set as ordinary
+        attributes.
+
+        Parameters
+        ----------
+        name : str
+            Name of the component.
+        value : float or array-like of float, shape (N,)
+            New values of the component.
+
+        Returns
+        -------
+        None
+        """
+        index = type(self).components.get(name)
+        if index is None:
+            super().__setattr__(name, value)
+        else:
+            self.view(np.ndarray)[..., index] = value
@@ -2,9 +2,17 @@
 
 Modules
 -------
+lazyimport.py
+lrucache.py
 nones.py
 
 Packages
 --------
 tests
 """
+
+
+from emmpy.utilities.lazyimport import lazySubmodules
+
+
+__getattr__ = lazySubmodules(__name__)
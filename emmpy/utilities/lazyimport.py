@@ -0,0 +1,124 @@
+"""Defer the import of modules until they are used.
+
+Defer the import of modules until they are used.
+
+Importing scipy.special, or the whole chain of modules used to build a
+model, takes much longer than the work done by a short-lived program which
+only needs part of the package. The functions in this module defer those
+imports until the module is first used.
+
+lazyImport() returns a stand-in for a module, which imports the module
+the first time one of its attributes is used. Use it at module level in
+place of an import statement:
+
+    sps = lazyImport("scipy.special")
+    ...
+    j0 = sps.jv(0, x)
+
+lazySubmodules() returns a module-level __getattr__() function for a
+package, which imports a submodule or subpackage the first time it is
+used as an attribute of the package, so that after "import emmpy", the
+name emmpy.geomagmodel.ts07.ts07dmodelbuilder works without importing
+the rest of the package.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """A module which is imported when it is first used.
+
+    A stand-in for a module, which imports the module the first time one
+    of its attributes is used, and then copies the attributes of the
+    module, so later attribute lookups are as fast as for the module
+    itself.
+    """
+
+    def __getattr__(self, name):
+        """Import the module, and return one of its attributes.
+
+        Import the module, copy its attributes to this object, and return
+        the requested attribute. This method is only called for attributes
+        which have not already been copied.
+
+        Parameters
+        ----------
+        name : str
+            Name of the attribute.
+
+        Returns
+        -------
+        value : object
+            Value of the attribute in the module.
+
+        Raises
+        ------
+        AttributeError
+            If the module does not have the attribute.
+        """
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, name)
+
+
+def lazyImport(name):
+    """Return a module, deferring its import until it is used.
+
+    Return a module, deferring its import until one of its attributes is
+    used. If the module has already been imported, it is returned as is.
+
+    Parameters
+    ----------
+    name : str
+        Full name of the module, such as "scipy.special".
+
+    Returns
+    -------
+    module : module or LazyModule
+        The module, or a stand-in which imports it when it is used.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def lazySubmodules(packageName):
+    """Create a __getattr__() function which imports submodules.
+
+    Create a module-level __getattr__() function for a package, which
+    imports a submodule or subpackage of the package the first time it is
+    used as an attribute of the package. Use it in the __init__.py of the
+    package:
+
+        __getattr__ = lazySubmodules(__name__)
+
+    Parameters
+    ----------
+    packageName : str
+        Full name of the package.
+
+    Returns
+    -------
+    __getattr__ : callable
+        Function which returns the named submodule of the package.
+    """
+    def __getattr__(name):
+        """Import and return a submodule of the package."""
+        if not name.startswith("_"):
+            fullName = packageName + "." + name
+            try:
+                return importlib.import_module(fullName)
+            except ModuleNotFoundError as e:
+                if e.name != fullName:
+                    raise
+        raise AttributeError(
+            "module %r has no attribute %r" % (packageName, name))
+    return __getattr__
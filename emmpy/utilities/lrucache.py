@@ -0,0 +1,224 @@
+"""A least recently used cache of objects.
+
+A least recently used cache of objects.
+
+Authors
+-------
+Eric Winter (eric.winter@jhuapl.edu)
+"""
+
+
+from collections import OrderedDict
+import threading
+
+
+# Default maximum total size of the objects held by an LRUCache.
+DEFAULT_MAX_SIZE = 8
+
+
+class LRUCache:
+    """A least recently used cache of objects.
+
+    Holds objects by key, up to a total size of maxSize. By default, each
+    object has a size of 1, so maxSize is the number of objects held; a
+    sizeOf function may be provided to weight the objects instead. When
+    the cache is full, adding an object discards the least recently used
+    objects, but the most recently added object is always kept.
+
+    This class is thread-safe. Each method holds the lock of the cache,
+    so objects are looked up, added and discarded atomically. Objects are
+    created by the callers, outside of the lock. A pickled cache has its
+    own lock.
+
+    Attributes
+    ----------
+    maxSize : int
+        Maximum total size of the objects to hold.
+    sizeOf : callable
+        Function returning the size of an object, or None if each object
+        has a size of 1.
+    items : OrderedDict
+        Cached objects, in least recently used order.
+    size : int
+        Current total size of the objects held.
+    hits : int
+        Number of lookups which found an object.
+    misses : int
+        Number of lookups which did not find an object.
+    evictions : int
+        Number of objects discarded to make room for new objects.
+    lock : threading.Lock
+        Lock for the cached objects and statistics.
+    """
+
+    def __init__(self, maxSize=DEFAULT_MAX_SIZE, sizeOf=None):
+        """Initialize a new LRUCache object.
+
+        Initialize a new LRUCache object.
+
+        Parameters
+        ----------
+        maxSize : int, optional
+            Maximum total size of the objects to hold.
+        sizeOf : callable, optional
+            Function returning the size of an object. It must be picklable
+            if the cache is pickled.
+
+        Raises
+        ------
+        ValueError
+            If maxSize is less than 1.
+        """
+        if maxSize < 1:
+            raise ValueError("maxSize must be at least 1, got %r" % maxSize)
+        self.maxSize = maxSize
+        self.sizeOf = sizeOf
+        self.items = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the state to pickle, without the lock."""
+        with self.lock:
+            state = self.__dict__.copy()
+            state["items"] = self.items.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore the pickled state, with a new lock."""
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of cached objects."""
+        with self.lock:
+            return len(self.items)
+
+    def __contains__(self, key):
+        """Return True if an object is cached for the key."""
+        with self.lock:
+            return key in self.items
+
+    def _sizeOf(self, value):
+        """Return the size of an object."""
+        return 1 if self.sizeOf is None else self.sizeOf(value)
+
+    def get(self, key, default=None):
+        """Return the object for a key.
+
+        Return the cached object for a key, and mark it as the most
+        recently used.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the object.
+        default : object, optional
+            Value to return if there is no object for the key.
+
+        Returns
+        -------
+        value : object
+            The cached object, or default.
+        """
+        with self.lock:
+            if key not in self.items:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def put(self, key, value):
+        """Add an object to the cache.
+
+        Add an object to the cache as the most recently used, replacing
+        any object for the same key, and discard the least recently used
+        objects if the cache is full.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the object.
+        value : object
+            Object to cache.
+
+        Returns
+        -------
+        None
+        """
+        size = self._sizeOf(value)
+        with self.lock:
+            if key in self.items:
+                self.size -= self._sizeOf(self.items.pop(key))
+            self.items[key] = value
+            self.size += size
+            while self.size > self.maxSize and len(self.items) > 1:
+                (_, oldValue) = self.items.popitem(last=False)
+                self.size -= self._sizeOf(oldValue)
+                self.evictions += 1
+
+    def values(self):
+        """Return the cached objects.
+
+        Return the cached objects, from least to most recently used.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        values : list of object
+            The cached objects.
+        """
+        with self.lock:
+            return list(self.items.values())
+
+    def getStatistics(self):
+        """Return the cache statistics.
+
+        Return the cache statistics.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        result : dict
+            The current size and maximum size of the cache, and the
+            numbers of hits, misses and evictions.
+        """
+        with self.lock:
+            return {
+                "size": self.size,
+                "maxSize": self.maxSize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        """Discard all cached objects and reset the statistics.
+
+        Discard all cached objects and reset the statistics.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        with self.lock:
+            self.items.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
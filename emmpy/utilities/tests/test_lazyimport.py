@@ -0,0 +1,57 @@
+"""Test the lazyimport module."""
+
+
+import subprocess
+import sys
+import unittest
+
+import emmpy.utilities
+from emmpy.utilities.lazyimport import LazyModule, lazyImport, lazySubmodules
+
+
+class TestBuilder(unittest.TestCase):
+    """Build and run tests for the lazyimport module."""
+
+    def test_LazyModule(self):
+        """Test the LazyModule class."""
+        module = LazyModule("json.decoder")
+        self.assertEqual(module.__name__, "json.decoder")
+        self.assertNotIn("JSONDecoder", module.__dict__)
+        import json.decoder
+        self.assertIs(module.JSONDecoder, json.decoder.JSONDecoder)
+        self.assertIn("JSONDecoder", module.__dict__)
+        with self.assertRaises(AttributeError):
+            module.notAnAttribute
+
+    def test_lazyImport(self):
+        """Test the lazyImport function."""
+        self.assertIs(lazyImport("unittest"), unittest)
+        self.assertIsInstance(lazyImport("emmpy.notAModule"), LazyModule)
+        with self.assertRaises(ModuleNotFoundError):
+            lazyImport("emmpy.notAModule").attribute
+
+    def test_lazySubmodules(self):
+        """Test the lazySubmodules function."""
+        __getattr__ = lazySubmodules("emmpy.utilities")
+        from emmpy.utilities import nones
+        self.assertIs(__getattr__("nones"), nones)
+        for name in ("notAModule", "_private"):
+            with self.assertRaises(AttributeError):
+                __getattr__(name)
+        self.assertIs(emmpy.utilities.lazyimport.lazyImport, lazyImport)
+
+    def test_startup(self):
+        """Check that importing the model builder does not import SciPy."""
+        code = (
+            "import sys\n"
+            "import emmpy\n"
+            "emmpy.geomagmodel.ts07.ts07dmodelbuilder.TS07DModelBuilder\n"
+            "print('scipy.special' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], check=True,
+                                capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Test the lrucache module."""
+
+
+import pickle
+import unittest
+
+from emmpy.utilities.lrucache import LRUCache
+
+
+class TestBuilder(unittest.TestCase):
+    """Build and run tests for the lrucache module."""
+
+    def test___init__(self):
+        """Test the __init__ method."""
+        cache = LRUCache(3)
+        self.assertEqual(cache.maxSize, 3)
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+    def test___getstate__(self):
+        """Test the __getstate__ method."""
+        cache = LRUCache(2, len)
+        cache.put("a", [1, 2])
+        copy = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(copy.values(), [[1, 2]])
+        self.assertEqual(copy.size, 2)
+        self.assertIsNot(copy.lock, cache.lock)
+
+    def test_get(self):
+        """Test the get method."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("b", 2), 2)
+
+    def test_put(self):
+        """Test the put method."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        # Using "a" makes "b" the least recently used.
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.values(), [1, 3])
+        cache.put("a", 4)
+        self.assertEqual(cache.values(), [3, 4])
+        # Weighted objects.
+        cache = LRUCache(5, len)
+        cache.put("a", "xx")
+        cache.put("b", "yyy")
+        cache.put("a", "x")
+        self.assertEqual(cache.size, 4)
+        cache.put("c", "zz")
+        self.assertEqual(cache.values(), ["x", "zz"])
+        # The newest object is kept, even if it is too large.
+        cache.put("d", "wwwwww")
+        self.assertEqual(cache.values(), ["wwwwww"])
+        self.assertEqual(cache.size, 6)
+
+    def test_getStatistics(self):
+        """Test the getStatistics method."""
+        cache = LRUCache(1)
+        cache.get("a")
+        cache.put("a", 1)
+        cache.get("a")
+        cache.put("b", 2)
+        self.assertEqual(cache.getStatistics(), {
+            "size": 1, "maxSize": 1, "hits": 1, "misses": 1, "evictions": 1
+        })
+
+    def test_clear(self):
+        """Test the clear method."""
+        cache = LRUCache()
+        cache.put("a", 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.getStatistics()["hits"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
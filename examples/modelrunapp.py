@@ -73,12 +73,12 @@ def runThinSheet():
 def runTs07D(coeffsFile):
     """Build and run the TS07D model."""
 
-    # read the coeffs/parameters from the file
-    coeffs = TS07DVariableCoefficientsUtils.create(coeffsFile)
-
-    # read the dipole tilt angle and dynamic pressure from the coeffs file
-    dipoleTilt = TS07DVariableCoefficientsUtils.readDipoleTiltAngle(coeffsFile)
-    pDyn = TS07DVariableCoefficientsUtils.readDynamicPressure(coeffsFile)
+    # read the coeffs/parameters, dipole tilt angle and dynamic pressure
+    # from the coeffs file
+    contents = TS07DVariableCoefficientsUtils.parse(coeffsFile)
+    coeffs = contents.coefficients
+    dipoleTilt = contents.dipoleTiltAngle
+    pDyn = contents.dynamicPressure
 
     # construct the model builder
     modelBuilder = TS07DModelBuilder.create(dipoleTilt, pDyn, coeffs)
@@ -0,0 +1,104 @@
+"""Measure the startup time of the TS07D model.
+
+Measure the time a new Python process takes to import the TS07D model
+builder, and to build and evaluate its first model. Each measurement is
+made in a new interpreter, since a module is only imported once per
+process, and the minimum and median over several runs are reported.
+
+Usage: python startupbenchmark.py coeffsFile [numRuns [staticCoeffsDir]]
+
+By default, the static coefficients in staticcoefficients/coeffs_n8_m6
+next to this script are used.
+"""
+
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+# Static coefficients used by default.
+DEFAULT_STATIC_COEFFICIENTS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "staticcoefficients",
+    "coeffs_n8_m6"
+)
+
+# Code run in each child process. It reports its own timings, so the
+# interpreter startup time is not included in them.
+CHILD_CODE = """
+import json, sys, time
+t0 = time.perf_counter()
+from emmpy.geomagmodel.ts07.ts07dmodelbuilder import TS07DModelBuilder
+from emmpy.geomagmodel.ts07.coefficientreader.ts07dvariablecoefficientsutils import (
+    TS07DVariableCoefficientsUtils
+)
+t1 = time.perf_counter()
+contents = TS07DVariableCoefficientsUtils.parse(sys.argv[1])
+builder = TS07DModelBuilder.create(
+    contents.dipoleTiltAngle, contents.dynamicPressure, contents.coefficients)
+builder.withStaticCoefficients(sys.argv[2])
+model = builder.build()
+t2 = time.perf_counter()
+model.evaluateMany([[4.0, 5.0, -2.0]])
+t3 = time.perf_counter()
+print(json.dumps({
+    "import": t1 - t0, "first build": t2 - t1, "first evaluate": t3 - t2
+}))
+"""
+
+
+def runChild(code, *args):
+    """Run Python code in a new interpreter, and return its wall time.
+
+    If the code fails, its error output is printed before the error is
+    raised.
+    """
+    environment = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [root] + [p for p in [environment.get("PYTHONPATH")] if p])
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code] + list(args), env=environment,
+        capture_output=True, text=True)
+    wallTime = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        result.check_returncode()
+    return (wallTime, result.stdout)
+
+
+def benchmark(coeffsFile, numRuns=5, staticCoefficientsDirectory=None):
+    """Run the startup benchmark, and return the timings in seconds."""
+    if staticCoefficientsDirectory is None:
+        staticCoefficientsDirectory = DEFAULT_STATIC_COEFFICIENTS_DIRECTORY
+    timings = {}
+
+    def record(name, value):
+        timings.setdefault(name, []).append(value)
+
+    for _ in range(numRuns):
+        record("python -c pass", runChild("pass")[0])
+        record("import numpy", runChild("import numpy")[0])
+        record("import ts07dmodelbuilder", runChild(
+            "import emmpy.geomagmodel.ts07.ts07dmodelbuilder")[0])
+        (wallTime, output) = runChild(CHILD_CODE, coeffsFile,
+                                      staticCoefficientsDirectory)
+        record("import, build and evaluate", wallTime)
+        for (name, value) in json.loads(output).items():
+            record("  " + name, value)
+    return timings
+
+
+if __name__ == "__main__":
+    coeffsFile = sys.argv[1]
+    numRuns = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    staticCoefficientsDirectory = sys.argv[3] if len(sys.argv) > 3 else None
+    timings = benchmark(coeffsFile, numRuns, staticCoefficientsDirectory)
+    print("%-28s %10s %10s" % ("", "min (ms)", "median (ms)"))
+    for (name, values) in timings.items():
+        print("%-28s %10.1f %10.1f" % (name, 1e3*min(values),
+                                       1e3*statistics.median(values)))